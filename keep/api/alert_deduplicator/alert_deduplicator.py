@@ -71,9 +71,11 @@ class AlertDeduplicator:
         # Check if the hash is already in the database.
         # If last_alert_fingerprint_to_hash is provided, use it
         # else, get the hash from the database
+        # (an empty dict means none of the fingerprints has a last alert)
         last_alerts_hash_by_fingerprint = (
             last_alert_fingerprint_to_hash
-            or get_last_alert_hashes_by_fingerprints(
+            if last_alert_fingerprint_to_hash is not None
+            else get_last_alert_hashes_by_fingerprints(
                 self.tenant_id, [alert.fingerprint]
             )
         )
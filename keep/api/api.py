@@ -15,7 +15,6 @@ from fastapi import FastAPI, Request
 from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse
 from prometheus_fastapi_instrumentator import Instrumentator
-from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from slowapi.middleware import SlowAPIMiddleware
 from starlette.middleware.cors import CORSMiddleware
@@ -30,7 +29,8 @@ import keep.api.utils.import_ee
 from keep.api.core.config import config
 from keep.api.core.db import dispose_session
 from keep.api.core.dependencies import SINGLE_TENANT_UUID
-from keep.api.core.limiter import limiter
+from keep.api.core.json_response import KeepJSONResponse
+from keep.api.core.limiter import limiter, rate_limit_exceeded_handler
 from keep.api.logging import CONFIG as logging_config
 from keep.api.middlewares import LoggingMiddleware
 from keep.api.routes import (
@@ -67,7 +67,13 @@ from keep.identitymanager.identitymanagerfactory import (
     IdentityManagerTypes,
 )
 from keep.topologies.topology_processor import TopologyProcessor
-from keep.api.consts import KEEP_ARQ_QUEUE_MAINTENANCE, MAINTENANCE_WINDOW_ALERT_STRATEGY, REDIS
+from keep.api.consts import (
+    KEEP_ALERT_RETENTION_DAYS,
+    KEEP_ARQ_QUEUE_MAINTENANCE,
+    KEEP_DASHBOARD_ROLLUPS_ENABLED,
+    MAINTENANCE_WINDOW_ALERT_STRATEGY,
+    REDIS,
+)
 
 # load all providers into cache
 from keep.workflowmanager.workflowmanager import WorkflowManager
@@ -161,7 +167,15 @@ async def startup():
         except Exception:
             logger.exception("Failed to start the topology processor")
 
-    if WATCHER or (MAINTENANCE_WINDOWS and MAINTENANCE_WINDOW_ALERT_STRATEGY == "recover_previous_status"):
+    if (
+        WATCHER
+        or KEEP_ALERT_RETENTION_DAYS
+        or KEEP_DASHBOARD_ROLLUPS_ENABLED
+        or (
+            MAINTENANCE_WINDOWS
+            and MAINTENANCE_WINDOW_ALERT_STRATEGY == "recover_previous_status"
+        )
+    ):
         if REDIS:
             try:
                 logger.info("Starting the watcher process")
@@ -267,6 +281,7 @@ def get_app(
         description="Rest API powering https://platform.keephq.dev and friends 🏄‍♀️",
         version=KEEP_VERSION,
         lifespan=lifespan,
+        default_response_class=KeepJSONResponse,
     )
 
     @app.get("/", include_in_schema=False)
@@ -277,7 +292,7 @@ def get_app(
         return {"message": app.description, "version": KEEP_VERSION}
 
     app.add_middleware(RawContextMiddleware, plugins=(plugins.RequestIdPlugin(),))
-    app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+    app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded_handler)
     app.add_middleware(
         GZipMiddleware, minimum_size=30 * 1024 * 1024
     )  # Approximately 30 MiB, https://cloud.google.com/run/quotas
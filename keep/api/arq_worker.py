@@ -1,12 +1,13 @@
 import asyncio
 import functools
 import logging
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from typing import Optional
 from uuid import uuid4
 
 import redis
-from arq import Worker, cron
+from arq import Retry, Worker, cron
 from arq.worker import create_worker
 from dotenv import find_dotenv, load_dotenv
 from pydantic.utils import import_string
@@ -22,7 +23,13 @@ from keep.api.consts import (
 )
 from keep.api.core.config import config
 from keep.api.redis_settings import get_redis_settings
-from keep.api.tasks.process_event_task import process_event
+from keep.api.tasks.process_event_pool import (
+    KEEP_EVENT_PROCESSING_MODE,
+    create_event_executor,
+    get_job_context,
+    run_process_event,
+)
+from keep.api.tasks.process_event_task import TIMES_TO_RETRY_JOB, process_event
 
 # Load environment variables
 load_dotenv(find_dotenv())
@@ -88,10 +95,7 @@ async def process_event_in_worker(
             "tract_id": trace_id,
         },
     )
-    # Create a new context that includes both the arq ctx and any other parameters
-    process_event_func_sync = functools.partial(
-        process_event,
-        ctx=ctx,  # Pass ctx as a named parameter
+    kwargs = dict(
         tenant_id=tenant_id,
         provider_type=provider_type,
         provider_id=provider_id,
@@ -102,9 +106,29 @@ async def process_event_in_worker(
         notify_client=notify_client,
         timestamp_forced=timestamp_forced,
     )
+    event_pool = ctx.get("event_pool", ctx["pool"])
+    if isinstance(event_pool, ProcessPoolExecutor):
+        # only picklable arguments are sent to the worker processes
+        process_event_func_sync = functools.partial(
+            run_process_event, get_job_context(ctx), kwargs
+        )
+    else:
+        # Create a new context that includes both the arq ctx and any other parameters
+        process_event_func_sync = functools.partial(process_event, ctx=ctx, **kwargs)
     loop = asyncio.get_running_loop()
-    # run the function in the thread pool
-    resp = await loop.run_in_executor(ctx["pool"], process_event_func_sync)
+    try:
+        resp = await loop.run_in_executor(event_pool, process_event_func_sync)
+    except BrokenProcessPool:
+        # a worker process died (e.g. killed for its memory), the pool can't be used
+        # anymore so it's replaced and the event retried
+        logger.exception(
+            "Event processing pool is broken, replacing it",
+            extra={"tenant_id": tenant_id, "tract_id": trace_id},
+        )
+        if ctx.get("event_pool") is event_pool:
+            ctx["event_pool"] = create_event_executor()
+            event_pool.shutdown(wait=False)
+        raise Retry(defer=ctx.get("job_try", 1) * TIMES_TO_RETRY_JOB)
     logger.info(
         "Event processed in worker",
         extra={
@@ -126,15 +150,25 @@ async def startup(ctx):
     """ARQ worker startup callback"""
     EVENT_WORKERS = int(config("KEEP_EVENT_WORKERS", default=5, cast=int))
     # Create dedicated threadpool
-    process_event_executor = ThreadPoolExecutor(
-        max_workers=EVENT_WORKERS, thread_name_prefix="process_event_worker"
-    )
-    ctx["pool"] = process_event_executor
+    ctx["pool"] = create_event_executor("thread", EVENT_WORKERS)
+    ctx["event_pool"] = ctx["pool"]
+    if KEEP_EVENT_PROCESSING_MODE == "process":
+        ctx["event_pool"] = create_event_executor("process", EVENT_WORKERS)
+        # spawn and warm up the worker processes before the first event
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *[
+                loop.run_in_executor(ctx["event_pool"], int)
+                for _ in range(EVENT_WORKERS)
+            ]
+        )
 
 
 async def shutdown(ctx):
     """ARQ worker shutdown callback"""
     # Clean up any resources if needed
+    if "event_pool" in ctx and ctx["event_pool"] is not ctx.get("pool"):
+        ctx["event_pool"].shutdown(wait=True)
     if "pool" in ctx:
         ctx["pool"].shutdown(wait=True)
 
@@ -0,0 +1,276 @@
+"""
+Business logic for alert history retention.
+
+Every non-deduplicated event is stored as a new `Alert` row (plus `AlertAudit` and,
+optionally, `AlertRaw`), so the history grows forever unless it is pruned. This
+module prunes history older than the tenant retention policy while keeping the rows
+the product still points at, and compacts what it removes into per-fingerprint
+counters (`AlertHistorySummary`).
+"""
+
+import datetime
+import logging
+from collections import defaultdict
+from typing import Optional
+
+from sqlalchemy import delete, exists
+from sqlalchemy_utils import UUIDType
+from sqlmodel import Session, select
+
+from keep.api.bl.dashboard_rollups_bl import DashboardRollupsBl
+from keep.api.consts import KEEP_ALERT_RETENTION_DAYS
+from keep.api.core.config import config
+from keep.api.core.db import get_session_sync, get_tenants_configurations
+from keep.api.core.db_utils import get_json_extract_field
+from keep.api.models.action_type import ActionType
+from keep.api.models.db.alert import (
+    Alert,
+    AlertAudit,
+    AlertEnrichment,
+    AlertHistorySummary,
+    AlertRaw,
+    AlertToIncident,
+    LastAlert,
+)
+
+# tenant configuration key overriding KEEP_ALERT_RETENTION_DAYS
+RETENTION_DAYS_CONFIGURATION_KEY = "alert_retention_days"
+RETENTION_BATCH_SIZE = config("KEEP_ALERT_RETENTION_BATCH_SIZE", default=1000, cast=int)
+# bounds a single run per tenant and table, the rest is picked up by the next run
+RETENTION_MAX_BATCHES = config(
+    "KEEP_ALERT_RETENTION_MAX_BATCHES", default=100, cast=int
+)
+# comments are user content, they are never pruned
+RETAINED_AUDIT_ACTIONS = [ActionType.COMMENT.value]
+
+
+class AlertRetentionBl:
+
+    @staticmethod
+    def get_retention_policies(
+        default_days: int = KEEP_ALERT_RETENTION_DAYS,
+    ) -> dict[str, int]:
+        """
+        Returns the retention in days of every tenant that has one.
+
+        The default comes from KEEP_ALERT_RETENTION_DAYS and can be overridden per tenant
+        with the `alert_retention_days` tenant configuration (0 disables retention).
+        """
+        policies = {}
+        for tenant_id, tenant_configuration in get_tenants_configurations().items():
+            days = tenant_configuration.get(
+                RETENTION_DAYS_CONFIGURATION_KEY, default_days
+            )
+            try:
+                days = int(days or 0)
+            except (TypeError, ValueError):
+                logging.getLogger(__name__).warning(
+                    "Invalid alert retention configuration, ignoring",
+                    extra={"tenant_id": tenant_id, "retention_days": days},
+                )
+                days = default_days
+            if days > 0:
+                policies[tenant_id] = days
+        return policies
+
+    @staticmethod
+    def compact_alerts(
+        session: Session, tenant_id: str, cutoff: datetime.datetime
+    ) -> int:
+        """
+        Deletes alerts older than `cutoff` in batches and adds them to the history summary.
+
+        Alerts still referenced as the last alert of their fingerprint or linked to an
+        incident are kept.
+        """
+        status_field = get_json_extract_field(session, Alert.event, "status")
+        uuid_type = UUIDType(binary=False)
+        compacted = 0
+
+        for _ in range(RETENTION_MAX_BATCHES):
+            rows = session.exec(
+                select(Alert.id, Alert.fingerprint, Alert.timestamp, status_field)
+                .where(Alert.tenant_id == tenant_id)
+                .where(Alert.timestamp < cutoff)
+                .where(
+                    ~exists().where(
+                        LastAlert.tenant_id == Alert.tenant_id,
+                        LastAlert.fingerprint == Alert.fingerprint,
+                        LastAlert.alert_id == Alert.id,
+                    )
+                )
+                .where(~exists().where(AlertToIncident.alert_id == Alert.id))
+                .order_by(Alert.timestamp)
+                .limit(RETENTION_BATCH_SIZE)
+            ).all()
+            if not rows:
+                break
+
+            counters = defaultdict(
+                lambda: {
+                    "count": 0,
+                    "statuses": defaultdict(int),
+                    "first": None,
+                    "last": None,
+                }
+            )
+            for _, fingerprint, timestamp, status in rows:
+                counter = counters[fingerprint]
+                counter["count"] += 1
+                counter["statuses"][status or "unknown"] += 1
+                if counter["first"] is None or timestamp < counter["first"]:
+                    counter["first"] = timestamp
+                if counter["last"] is None or timestamp > counter["last"]:
+                    counter["last"] = timestamp
+
+            summaries = {
+                summary.fingerprint: summary
+                for summary in session.exec(
+                    select(AlertHistorySummary)
+                    .where(AlertHistorySummary.tenant_id == tenant_id)
+                    .where(AlertHistorySummary.fingerprint.in_(list(counters)))
+                ).all()
+            }
+            for fingerprint, counter in counters.items():
+                summary = summaries.get(fingerprint) or AlertHistorySummary(
+                    tenant_id=tenant_id, fingerprint=fingerprint
+                )
+                status_counts = dict(summary.status_counts or {})
+                for status, count in counter["statuses"].items():
+                    status_counts[status] = status_counts.get(status, 0) + count
+                summary.status_counts = status_counts
+                summary.compacted_count += counter["count"]
+                if (
+                    not summary.first_timestamp
+                    or counter["first"] < summary.first_timestamp
+                ):
+                    summary.first_timestamp = counter["first"]
+                if (
+                    not summary.last_timestamp
+                    or counter["last"] > summary.last_timestamp
+                ):
+                    summary.last_timestamp = counter["last"]
+                summary.updated_at = datetime.datetime.utcnow()
+                session.add(summary)
+
+            alert_ids = [row[0] for row in rows]
+            # instance enrichments are keyed by the alert id
+            session.execute(
+                delete(AlertEnrichment)
+                .where(AlertEnrichment.tenant_id == tenant_id)
+                .where(
+                    AlertEnrichment.alert_fingerprint.in_(
+                        [
+                            uuid_type.process_bind_param(alert_id, session.bind.dialect)
+                            for alert_id in alert_ids
+                        ]
+                    )
+                )
+            )
+            session.execute(delete(Alert).where(Alert.id.in_(alert_ids)))
+            session.commit()
+            compacted += len(rows)
+
+            if len(rows) < RETENTION_BATCH_SIZE:
+                break
+
+        return compacted
+
+    @staticmethod
+    def prune_audit(session: Session, tenant_id: str, cutoff: datetime.datetime) -> int:
+        pruned = 0
+        for _ in range(RETENTION_MAX_BATCHES):
+            audit_ids = session.exec(
+                select(AlertAudit.id)
+                .where(AlertAudit.tenant_id == tenant_id)
+                .where(AlertAudit.timestamp < cutoff)
+                .where(AlertAudit.action.not_in(RETAINED_AUDIT_ACTIONS))
+                .limit(RETENTION_BATCH_SIZE)
+            ).all()
+            if not audit_ids:
+                break
+            session.execute(delete(AlertAudit).where(AlertAudit.id.in_(audit_ids)))
+            session.commit()
+            pruned += len(audit_ids)
+            if len(audit_ids) < RETENTION_BATCH_SIZE:
+                break
+        return pruned
+
+    @staticmethod
+    def prune_raw_alerts(
+        session: Session, tenant_id: str, cutoff: datetime.datetime
+    ) -> int:
+        pruned = 0
+        for _ in range(RETENTION_MAX_BATCHES):
+            raw_ids = session.exec(
+                select(AlertRaw.id)
+                .where(AlertRaw.tenant_id == tenant_id)
+                .where(AlertRaw.timestamp < cutoff)
+                .limit(RETENTION_BATCH_SIZE)
+            ).all()
+            if not raw_ids:
+                break
+            session.execute(delete(AlertRaw).where(AlertRaw.id.in_(raw_ids)))
+            session.commit()
+            pruned += len(raw_ids)
+            if len(raw_ids) < RETENTION_BATCH_SIZE:
+                break
+        return pruned
+
+    @staticmethod
+    def apply_retention(logger: logging.Logger, session: Optional[Session] = None):
+        """
+        Prunes and compacts the alert history of every tenant with a retention policy.
+
+        Args:
+            logger: Logger instance for detailed logging
+            session: Optional database session (creates new if None)
+        """
+        policies = AlertRetentionBl.get_retention_policies()
+        if not policies:
+            logger.debug("No alert retention policies configured")
+            return
+
+        _owns_session = session is None
+        if session is None:
+            session = get_session_sync()
+
+        try:
+            now = datetime.datetime.utcnow()
+            for tenant_id, retention_days in policies.items():
+                cutoff = now - datetime.timedelta(days=retention_days)
+                try:
+                    compacted = AlertRetentionBl.compact_alerts(
+                        session, tenant_id, cutoff
+                    )
+                    if compacted:
+                        # the rolled up hours still count the compacted alerts
+                        DashboardRollupsBl.refresh_tenant(
+                            session, tenant_id, "alerts", cutoff
+                        )
+                    pruned_audit = AlertRetentionBl.prune_audit(
+                        session, tenant_id, cutoff
+                    )
+                    pruned_raw = AlertRetentionBl.prune_raw_alerts(
+                        session, tenant_id, cutoff
+                    )
+                except Exception:
+                    logger.exception(
+                        "Failed to apply alert retention",
+                        extra={"tenant_id": tenant_id},
+                    )
+                    session.rollback()
+                    continue
+                logger.info(
+                    "Applied alert retention",
+                    extra={
+                        "tenant_id": tenant_id,
+                        "retention_days": retention_days,
+                        "compacted_alerts": compacted,
+                        "pruned_audit": pruned_audit,
+                        "pruned_raw_alerts": pruned_raw,
+                    },
+                )
+        finally:
+            if _owns_session:
+                session.close()
@@ -0,0 +1,147 @@
+"""
+Business logic for the hourly dashboard rollups.
+
+The dashboard distributions (alerts per provider, workflow executions) aggregate the
+largest tables per hour. This module maintains those hourly counts in
+`DashboardRollup`, for every tenant at once, so the endpoints only read the raw
+tables for the partial hours at the edges of the requested range and the hours that
+are not rolled up yet (see `get_hourly_counts`).
+"""
+
+import datetime
+import logging
+from typing import Optional
+
+from sqlmodel import Session
+
+from keep.api.core.config import config
+from keep.api.core.db import (
+    DASHBOARD_ROLLUP_METRICS,
+    floor_hour,
+    get_dashboard_rollup_coverage,
+    get_hourly_counts,
+    get_session_sync,
+    rollup_dashboard_hours,
+    set_dashboard_rollup_coverage,
+)
+
+# hours of history rolled up on the first run
+ROLLUP_BACKFILL_HOURS = config(
+    "KEEP_DASHBOARD_ROLLUP_BACKFILL_HOURS", default=24 * 30, cast=int
+)
+# an hour is rolled up once it ended this long ago, so rows still being committed
+# (e.g. a large batch of events) are not missed
+ROLLUP_GRACE_SECONDS = config(
+    "KEEP_DASHBOARD_ROLLUP_GRACE_SECONDS", default=900, cast=int
+)
+# hours aggregated per transaction
+ROLLUP_BATCH_HOURS = config("KEEP_DASHBOARD_ROLLUP_BATCH_HOURS", default=24, cast=int)
+
+
+class DashboardRollupsBl:
+
+    @staticmethod
+    def update_rollups(
+        logger: logging.Logger,
+        session: Optional[Session] = None,
+        now: Optional[datetime.datetime] = None,
+    ):
+        """
+        Rolls up the hours that ended since the previous run, for every tenant.
+
+        Args:
+            logger: Logger instance for detailed logging
+            session: Optional database session (creates new if None)
+            now: Optional current time, for tests
+        """
+        _owns_session = session is None
+        if session is None:
+            session = get_session_sync()
+
+        now = now or datetime.datetime.utcnow()
+        closed_until = floor_hour(
+            now - datetime.timedelta(seconds=ROLLUP_GRACE_SECONDS)
+        )
+        try:
+            for metric in DASHBOARD_ROLLUP_METRICS:
+                coverage = get_dashboard_rollup_coverage(session, metric)
+                if coverage:
+                    covered_from, start = coverage
+                else:
+                    covered_from = start = closed_until - datetime.timedelta(
+                        hours=ROLLUP_BACKFILL_HOURS
+                    )
+
+                rows = 0
+                while start < closed_until:
+                    end = min(
+                        start + datetime.timedelta(hours=ROLLUP_BATCH_HOURS),
+                        closed_until,
+                    )
+                    rows += rollup_dashboard_hours(session, metric, start, end)
+                    set_dashboard_rollup_coverage(session, metric, covered_from, end)
+                    session.commit()
+                    start = end
+
+                logger.info(
+                    "Updated dashboard rollups",
+                    extra={
+                        "metric": metric,
+                        "rolled_up_until": closed_until.isoformat(),
+                        "rollup_rows": rows,
+                    },
+                )
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            if _owns_session:
+                session.close()
+
+    @staticmethod
+    def refresh_tenant(
+        session: Session,
+        tenant_id: str,
+        metric: str,
+        until: datetime.datetime,
+    ):
+        """
+        Recomputes the rolled up hours of a tenant before `until`, after rows were
+        deleted from the table (e.g. by the retention job).
+        """
+        coverage = get_dashboard_rollup_coverage(session, metric)
+        if not coverage:
+            return
+        covered_from, covered_until = coverage
+        end = min(floor_hour(until) + datetime.timedelta(hours=1), covered_until)
+        if covered_from < end:
+            rollup_dashboard_hours(session, metric, covered_from, end, tenant_id)
+            session.commit()
+
+    @staticmethod
+    def verify(
+        tenant_id: str,
+        metric: str,
+        lower: datetime.datetime,
+        upper: datetime.datetime,
+    ) -> dict:
+        """
+        Compares the counts served with the rollups to the raw aggregation of the table.
+
+        Returns the mismatching (provider_id, provider_type, hour) -> (served, raw) counts.
+        """
+
+        def totals(rows) -> dict:
+            counts = {}
+            for provider_id, provider_type, hour, hits, _ in rows:
+                key = (provider_id, provider_type, hour)
+                counts[key] = counts.get(key, 0) + hits
+            return counts
+
+        served = totals(get_hourly_counts(tenant_id, metric, lower, upper, True))
+        raw = totals(get_hourly_counts(tenant_id, metric, lower, upper, False))
+        return {
+            key: (served.get(key, 0), raw.get(key, 0))
+            for key in served.keys() | raw.keys()
+            if served.get(key, 0) != raw.get(key, 0)
+        }
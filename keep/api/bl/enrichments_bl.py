@@ -26,8 +26,7 @@ from keep.api.core.db import (
     get_last_alert_by_fingerprint,
     get_mapping_rule_by_id,
     get_session_sync,
-    get_topology_data_by_dynamic_matcher,
-    is_all_alerts_resolved,
+    is_incident_resolution_required,
 )
 from keep.api.core.elastic import ElasticClient
 from keep.api.models.action_type import ActionType
@@ -44,6 +43,7 @@ from keep.api.models.db.incident import IncidentStatus
 from keep.api.models.db.mapping import MappingRule
 from keep.api.models.db.rule import ResolveOn
 from keep.identitymanager.authenticatedentity import AuthenticatedEntity
+from keep.topologies.topology_matcher_index import TopologyMatcherIndex
 
 
 def is_valid_uuid(uuid_str):
@@ -400,26 +400,18 @@ class EnrichmentsBl:
             for matcher in rule.matchers:
                 # [0] because topology is always 1 matcher
                 matcher_value[matcher[0]] = get_nested_attribute(alert, matcher[0])
-            topology_service = get_topology_data_by_dynamic_matcher(
+            topology_enrichments = TopologyMatcherIndex.get_instance().get_enrichments(
                 self.tenant_id, matcher_value
             )
 
-            if not topology_service:
+            if not topology_enrichments:
                 self._add_enrichment_log(
                     "No topology service found to match on",
                     "debug",
                     {"matcher_value": matcher_value},
                 )
             else:
-                enrichments = topology_service.dict(exclude_none=True)
-                # repository could be taken from application too
-                if not topology_service.repository and topology_service.applications:
-                    for application in topology_service.applications:
-                        if application.repository:
-                            enrichments["repository"] = application.repository
-                # Remove redundant fields
-                enrichments.pop("tenant_id", None)
-                enrichments.pop("id", None)
+                enrichments = topology_enrichments
         elif rule.type == "csv":
             if not rule.is_multi_level:
                 for row in rule.rows:
@@ -976,8 +968,9 @@ class EnrichmentsBl:
 
         self.db_session.expire_on_commit = False
         for incident in incidents:
-            if incident.resolve_on == ResolveOn.ALL.value and is_all_alerts_resolved(
-                incident=incident, session=self.db_session
+            if (
+                incident.resolve_on == ResolveOn.ALL.value
+                and is_incident_resolution_required(incident, session=self.db_session)
             ):
                 incident.status = IncidentStatus.RESOLVED.value
                 self.db_session.add(incident)
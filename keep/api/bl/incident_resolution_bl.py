@@ -0,0 +1,120 @@
+"""
+Business logic for the incident resolution state.
+
+Whether an incident resolves (all, first or last alert resolved) is read from counters
+and edge alerts maintained on the incident as its alerts are linked, unlinked and
+change status (see `update_incidents_resolution_state`). The updates are incremental,
+so a link and a status change of the same alert committed concurrently may leave an
+incident off by one. This module recomputes the state of the active incidents, repairs
+the ones that drifted and resolves those the repaired state says are resolved.
+"""
+
+import logging
+from collections import defaultdict
+from typing import Optional
+
+from sqlmodel import Session, select
+
+from keep.api.bl.incidents_bl import IncidentBl
+from keep.api.core.config import config
+from keep.api.core.db import (
+    get_incident_by_id,
+    get_incidents_resolution_drift,
+    get_session_sync,
+    recompute_incidents_resolution_state,
+)
+from keep.api.core.metrics import incident_resolution_drift_total
+from keep.api.models.db.incident import Incident, IncidentStatus
+
+RECONCILIATION_BATCH_SIZE = config(
+    "KEEP_INCIDENT_RESOLUTION_RECONCILE_BATCH_SIZE", default=500, cast=int
+)
+
+
+class IncidentResolutionBl:
+
+    @staticmethod
+    def reconcile(logger: logging.Logger, session: Optional[Session] = None) -> int:
+        """
+        Recomputes the resolution state of the active incidents, in batches, repairs
+        the ones that drifted from their alerts and resolves the repaired incidents
+        their alerts resolve.
+
+        Args:
+            logger: Logger instance for detailed logging
+            session: Optional database session (creates new if None)
+
+        Returns:
+            The number of repaired incidents
+        """
+        _owns_session = session is None
+        if session is None:
+            session = get_session_sync()
+
+        repaired = 0
+        last_id = None
+        try:
+            while True:
+                query = (
+                    select(Incident.tenant_id, Incident.id)
+                    # resolved, merged and deleted incidents are not resolved again
+                    .where(
+                        Incident.status.in_(
+                            IncidentStatus.get_active(return_values=True)
+                        )
+                    )
+                    .order_by(Incident.id)
+                    .limit(RECONCILIATION_BATCH_SIZE)
+                )
+                if last_id is not None:
+                    query = query.where(Incident.id > last_id)
+                rows = session.exec(query).all()
+                if not rows:
+                    break
+                last_id = rows[-1][1]
+
+                incidents_by_tenant = defaultdict(list)
+                drifted_by_tenant = {}
+                for tenant_id, incident_id in rows:
+                    incidents_by_tenant[tenant_id].append(incident_id)
+
+                for tenant_id, incident_ids in incidents_by_tenant.items():
+                    drifted = get_incidents_resolution_drift(
+                        session, tenant_id, incident_ids
+                    )
+                    if not drifted:
+                        continue
+                    logger.warning(
+                        "Incident resolution state drifted, repairing it",
+                        extra={
+                            "tenant_id": tenant_id,
+                            "incident_ids": [str(id_) for id_ in drifted],
+                        },
+                    )
+                    recompute_incidents_resolution_state(session, tenant_id, drifted)
+                    incident_resolution_drift_total.inc(len(drifted))
+                    repaired += len(drifted)
+                    drifted_by_tenant[tenant_id] = drifted
+                session.commit()
+
+                # the drift may have hidden a resolution, check it on the repaired state
+                for tenant_id, drifted in drifted_by_tenant.items():
+                    incident_bl = IncidentBl(tenant_id, session)
+                    for incident_id in drifted:
+                        incident = get_incident_by_id(
+                            tenant_id, incident_id, session=session
+                        )
+                        if incident:
+                            incident_bl.resolve_incident_if_require(incident)
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            if _owns_session:
+                session.close()
+
+        logger.info(
+            "Reconciled the incident resolution state",
+            extra={"repaired_incidents": repaired},
+        )
+        return repaired
@@ -20,21 +20,23 @@ from keep.api.core.db import (
     create_incident_from_dto,
     delete_incident_by_id,
     enrich_alerts_with_incidents,
+    existed_or_new_session,
     get_all_alerts_by_fingerprints,
     get_incident_by_id,
     get_incident_unique_fingerprint_count,
-    is_all_alerts_resolved,
-    is_first_incident_alert_resolved,
-    is_last_incident_alert_resolved,
+    is_incident_resolution_required,
     remove_alerts_to_incident_by_incident_id,
     update_incident_from_dto_by_id,
     update_incident_severity,
 )
 from keep.api.core.elastic import ElasticClient
+from keep.api.core.incident_changes import (
+    IncidentChange,
+    get_incident_change_dispatcher,
+)
 from keep.api.core.incidents import get_last_incidents_by_cel
 from keep.api.models.action_type import ActionType
 from keep.api.models.db.incident import Incident, IncidentSeverity, IncidentStatus
-from keep.api.models.db.rule import ResolveOn
 from keep.api.models.incident import IncidentDto, IncidentDtoIn, IncidentSorting
 from keep.api.utils.enrichment_helpers import convert_db_alerts_to_dto_alerts
 from keep.api.utils.pagination import IncidentsPaginatedResultsDto
@@ -159,6 +161,18 @@ class IncidentBl:
                 "alert_fingerprints": alert_fingerprints,
             },
         )
+        dispatcher = get_incident_change_dispatcher()
+        if dispatcher.deferred:
+            dispatcher.submit(
+                IncidentChange(
+                    tenant_id=self.tenant_id,
+                    incident_id=incident.id,
+                    fingerprints=set(alert_fingerprints),
+                    generate_summary=True,
+                    pusher_client=self.pusher_client,
+                )
+            )
+            return
         self.__postprocess_alerts_change(incident, alert_fingerprints)
         await self.__generate_summary(incident_id, incident)
         self.logger.info(
@@ -169,6 +183,48 @@ class IncidentBl:
             },
         )
 
+    @classmethod
+    def process_incident_change(cls, change: IncidentChange) -> None:
+        """
+        Runs the side effects of the coalesced changes to the alerts of an incident,
+        see keep.api.core.incident_changes.
+        """
+        fingerprints = list(change.fingerprints)
+        with existed_or_new_session() as session:
+            incident_bl = cls(change.tenant_id, session, change.pusher_client)
+            change.run_stage("elastic", incident_bl.__update_elastic, fingerprints)
+            incident = get_incident_by_id(
+                tenant_id=change.tenant_id,
+                incident_id=change.incident_id,
+                session=session,
+            )
+            if not incident:
+                # deleted meanwhile, the alerts were reindexed without it
+                return
+            # the stages raise so that the dispatcher retries them
+            change.run_stage(
+                "client",
+                lambda: incident_bl.update_client_on_incident_change(
+                    incident.id, raise_on_error=True
+                ),
+            )
+            incident_dto = IncidentDto.from_db_incident(incident)
+            change.run_stage(
+                "workflow",
+                lambda: incident_bl.send_workflow_event(
+                    incident_dto, "updated", raise_on_error=True
+                ),
+            )
+            if change.generate_summary:
+                change.run_stage(
+                    "summary",
+                    lambda: asyncio.run(
+                        incident_bl.__generate_summary(
+                            incident.id, incident, raise_on_error=True
+                        )
+                    ),
+                )
+
     def __update_elastic(self, alert_fingerprints: List[str]):
         try:
             elastic_client = ElasticClient(self.tenant_id)
@@ -189,7 +245,9 @@ class IncidentBl:
             self.logger.exception("Failed to push alert to elasticsearch")
             raise
 
-    def update_client_on_incident_change(self, incident_id: Optional[UUID] = None):
+    def update_client_on_incident_change(
+        self, incident_id: Optional[UUID] = None, raise_on_error: bool = False
+    ):
         if self.pusher_client is not None:
             self.logger.info(
                 "Pushing incident change to client",
@@ -210,8 +268,12 @@ class IncidentBl:
                     "Failed to push incident change to client",
                     extra={"incident_id": incident_id, "tenant_id": self.tenant_id},
                 )
+                if raise_on_error:
+                    raise
 
-    def send_workflow_event(self, incident_dto: IncidentDto, action: str) -> None:
+    def send_workflow_event(
+        self, incident_dto: IncidentDto, action: str, raise_on_error: bool = False
+    ) -> None:
         try:
             workflow_manager = WorkflowManager.get_instance()
             workflow_manager.insert_incident(self.tenant_id, incident_dto, action)
@@ -220,8 +282,12 @@ class IncidentBl:
                 "Failed to run workflows based on incident",
                 extra={"incident_id": incident_dto.id, "tenant_id": self.tenant_id},
             )
+            if raise_on_error:
+                raise
 
-    async def __generate_summary(self, incident_id: UUID, incident: Incident):
+    async def __generate_summary(
+        self, incident_id: UUID, incident: Incident, raise_on_error: bool = False
+    ):
         try:
             fingerprints_count = get_incident_unique_fingerprint_count(
                 self.tenant_id, incident_id
@@ -250,6 +316,8 @@ class IncidentBl:
                 "Failed to generate summary for incident",
                 extra={"incident_id": incident_id, "tenant_id": self.tenant_id},
             )
+            if raise_on_error:
+                raise
 
     def delete_alerts_from_incident(
         self, incident_id: UUID, alert_fingerprints: List[str]
@@ -268,6 +336,17 @@ class IncidentBl:
         remove_alerts_to_incident_by_incident_id(
             self.tenant_id, incident_id, alert_fingerprints
         )
+        dispatcher = get_incident_change_dispatcher()
+        if dispatcher.deferred:
+            dispatcher.submit(
+                IncidentChange(
+                    tenant_id=self.tenant_id,
+                    incident_id=incident.id,
+                    fingerprints=set(alert_fingerprints),
+                    pusher_client=self.pusher_client,
+                )
+            )
+            return
         self.__postprocess_alerts_change(incident, alert_fingerprints)
 
     def delete_incident(self, incident_id: UUID) -> None:
@@ -433,24 +512,8 @@ class IncidentBl:
         self, incident: Incident, max_retries=3, handle_workflow_event: bool = True
     ) -> Incident:
 
-        should_resolve = False
-
-        if incident.resolve_on == ResolveOn.ALL.value and is_all_alerts_resolved(
-            incident=incident, session=self.session
-        ):
-            should_resolve = True
-
-        elif (
-            incident.resolve_on == ResolveOn.FIRST.value
-            and is_first_incident_alert_resolved(incident, session=self.session)
-        ):
-            should_resolve = True
-
-        elif (
-            incident.resolve_on == ResolveOn.LAST.value
-            and is_last_incident_alert_resolved(incident, session=self.session)
-        ):
-            should_resolve = True
+        # O(1), from the resolution state maintained on the incident
+        should_resolve = is_incident_resolution_required(incident, session=self.session)
 
         incident_id = incident.id
 
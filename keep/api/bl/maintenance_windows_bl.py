@@ -1,27 +1,33 @@
 import datetime
 import json
 import logging
+import time
+from collections import defaultdict
+from uuid import UUID
 
 import celpy
-from sqlmodel import Session
+from sqlalchemy import update
+from sqlmodel import Session, select
 
 from keep.api.consts import KEEP_CORRELATION_ENABLED, MAINTENANCE_WINDOW_ALERT_STRATEGY
 from opentelemetry import trace
+from keep.api.core.config import config
 from keep.api.core.db import (
-    add_audit,
-    get_alert_by_event_id,
     get_alerts_by_status,
     get_all_presets_dtos,
-    get_last_alert_by_fingerprint,
     get_maintenance_windows_started,
     get_session_sync,
-    recover_prev_alert_status,
-    set_maintenance_windows_trace,
+    refresh_last_alerts_state,
 )
 from keep.api.core.dependencies import get_pusher_client
+from keep.api.core.metrics import (
+    maintenance_recovery_alerts_total,
+    maintenance_recovery_duration,
+    maintenance_recovery_lag,
+)
 from keep.api.models.action_type import ActionType
 from keep.api.models.alert import AlertDto, AlertStatus
-from keep.api.models.db.alert import Alert, AlertAudit
+from keep.api.models.db.alert import Alert, AlertAudit, LastAlert
 from keep.api.models.db.maintenance_window import MaintenanceWindowRule
 from keep.api.tasks.notification_cache import get_notification_cache
 from keep.api.utils.cel_utils import preprocess_cel_expression
@@ -30,6 +36,11 @@ from keep.workflowmanager.workflowmanager import WorkflowManager
 
 tracer = trace.get_tracer(__name__)
 
+# alerts in maintenance of a tenant reviewed (and recovered) per transaction
+MAINTENANCE_RECOVERY_BATCH_SIZE = config(
+    "KEEP_MAINTENANCE_RECOVERY_BATCH_SIZE", default=500, cast=int
+)
+
 class MaintenanceWindowsBl:
 
     def __init__(self, tenant_id: str, session: Session | None) -> None:
@@ -118,16 +129,30 @@ class MaintenanceWindowsBl:
         return False
 
     @staticmethod
-    def evaluate_cel(maintenance_window: MaintenanceWindowRule, alert: AlertDto | Alert, environment: celpy.Environment, logger, logger_extra_info: dict) -> bool:
-
+    def compile_cel(maintenance_window: MaintenanceWindowRule, environment: celpy.Environment) -> celpy.Runner:
         cel = preprocess_cel_expression(maintenance_window.cel_query)
         ast = environment.compile(cel)
-        prgm = environment.program(ast)
+        return environment.program(ast)
+
+    @staticmethod
+    def evaluate_cel(
+        maintenance_window: MaintenanceWindowRule,
+        alert: AlertDto | Alert,
+        environment: celpy.Environment,
+        logger,
+        logger_extra_info: dict,
+        program: celpy.Runner | None = None,
+    ) -> bool:
+        """
+        Evaluates the CEL of the maintenance window against the alert, pass the
+        `program` of the window (see compile_cel) to not compile it again.
+        """
+        prgm = program or MaintenanceWindowsBl.compile_cel(maintenance_window, environment)
 
         if isinstance(alert, AlertDto):
             payload = alert.dict()
         else:
-            payload = alert.event
+            payload = dict(alert.event)
         # todo: fix this in the future
         payload["source"] = payload["source"][0]
 
@@ -172,157 +197,276 @@ class MaintenanceWindowsBl:
         Once the status is recovered, Workflows, Correlations/Incidents and Presets will be launched, in the
         same way that a new alert.
 
+        Tenants with alerts in maintenance are reviewed one at a time, in batches of
+        KEEP_MAINTENANCE_RECOVERY_BATCH_SIZE alerts, see recover_tenant_alerts.
 
         Args:
             logger (logging.Logger): The logger to use.
             session (Session | None): The SQLAlchemy session to use. If None, a new session will be created.
         """
         logger.info("Starting recover strategy for maintenance windows review.")
-        env = celpy.Environment()
         _owns_session = session is None
         if session is None:
             session = get_session_sync()
         try:
-            windows = get_maintenance_windows_started(session)
-            alerts_in_maint = get_alerts_by_status(AlertStatus.MAINTENANCE, session)
-            fingerprints_to_check: set = set()
-            for alert in alerts_in_maint:
-                active = False
-                for window in windows:
-                    w_start = window.start_time
-                    w_end = window.end_time
-                    is_enable = window.enabled
-                    if window.tenant_id != alert.tenant_id:
-                        continue
-                    # Check active windows
-                    if (
-                        w_start < alert.timestamp
-                        and alert.timestamp < w_end
-                        and w_end > datetime.datetime.utcnow()
-                        and is_enable
-                    ):
-                        logger.info("Checking alert %s in maintenance window %s", alert.id, window.id)
-                        is_in_cel = MaintenanceWindowsBl.evaluate_cel(
-                            window, alert, env, logger, {"tenant_id": alert.tenant_id, "alert_id": alert.id}
-                        )
-                        # Recover source structure
-                        if not isinstance(alert.event.get("source"), list):
-                            alert.event["source"] = [alert.event["source"]]
-                        if is_in_cel:
-                            active = True
-                            set_maintenance_windows_trace(alert, window, session)
-                            logger.info("Alert %s is blocked due to the maintenance window: %s.", alert.id, window.id)
-                            break
-                if not active:
-                    recover_prev_alert_status(alert, session)
-                    fingerprints_to_check.add((alert.tenant_id, alert.fingerprint))
-                    add_audit(
-                        tenant_id=alert.tenant_id,
-                        fingerprint=alert.fingerprint,
-                        user_id="system",
-                        action=ActionType.MAINTENANCE_EXPIRED,
-                        description=(
-                            f"Alert {alert.id} has recover its previous status, "
-                            f"from {alert.event.get('previous_status')} to {alert.event.get('status')}"
-                        ),
-                    )
+            windows_by_tenant = defaultdict(list)
+            for window in get_maintenance_windows_started(session):
+                windows_by_tenant[window.tenant_id].append(window)
 
-            for (tenant, fp) in fingerprints_to_check:
-                last_alert = get_last_alert_by_fingerprint(tenant, fp, session)
-                alert = get_alert_by_event_id(tenant, str(last_alert.alert_id), session)
-                if "previous_status" not in alert.event:
-                    logger.info(
-                        f"Alert {alert.id} does not have previous status, cannot proceed with recover strategy",
-                        extra={"tenant_id": tenant, "fingerprint": fp, "alert_id": alert.id, "alert.status": alert.event.get("status")},
-                    )
+            # only the tenants with alerts in maintenance, over the indexed status
+            tenant_ids = session.exec(
+                select(LastAlert.tenant_id)
+                .where(LastAlert.status == AlertStatus.MAINTENANCE.value)
+                .distinct()
+            ).all()
+            for tenant_id in tenant_ids:
+                MaintenanceWindowsBl.recover_tenant_alerts(
+                    logger, session, tenant_id, windows_by_tenant.get(tenant_id, [])
+                )
+            logger.info("Finished recover strategy for maintenance windows review.")
+        finally:
+            if _owns_session:
+                session.close()
+
+    @staticmethod
+    def recover_tenant_alerts(
+        logger: logging.Logger,
+        session: Session,
+        tenant_id: str,
+        windows: list[MaintenanceWindowRule],
+        batch_size: int = MAINTENANCE_RECOVERY_BATCH_SIZE,
+    ) -> int:
+        """
+        Recovers the previous status of the alerts of a tenant which are no longer in an
+        active maintenance window, paginating over its alerts in maintenance.
+
+        The CEL of every window is compiled once and evaluated against all the alerts of a
+        batch in a single pass, each batch is committed at once and its recovered alerts
+        are handed to workflows, rules and presets together.
+
+        Returns:
+            int: The number of recovered alerts
+        """
+        extra = {"tenant_id": tenant_id}
+        now = datetime.datetime.utcnow()
+        env = celpy.Environment()
+        try:
+            active_windows = [
+                (window, MaintenanceWindowsBl.compile_cel(window, env))
+                for window in windows
+                if window.enabled and window.end_time > now
+            ]
+        except Exception:
+            # better late than recovering alerts which may still be in maintenance
+            logger.exception("Failed to compile the maintenance windows, skipping the tenant", extra=extra)
+            return 0
+        ended_windows = [window for window in windows if window.end_time <= now]
+
+        started = time.monotonic()
+        recovered_count = 0
+        after = None
+        while True:
+            alerts = get_alerts_by_status(
+                AlertStatus.MAINTENANCE, session, tenant_id=tenant_id, after=after, limit=batch_size
+            )
+            if not alerts:
+                break
+            after = (alerts[-1].timestamp, alerts[-1].id)
+            recovered_count += MaintenanceWindowsBl._recover_alerts_batch(
+                logger, session, tenant_id, alerts, active_windows, ended_windows, env, now
+            )
+            if len(alerts) < batch_size:
+                break
+
+        if after is not None:
+            maintenance_recovery_duration.observe(time.monotonic() - started)
+            logger.info(
+                "Reviewed the alerts in maintenance",
+                extra={**extra, "recovered_count": recovered_count},
+            )
+        return recovered_count
+
+    @staticmethod
+    def _recover_alerts_batch(
+        logger: logging.Logger,
+        session: Session,
+        tenant_id: str,
+        alerts: list[Alert],
+        active_windows: list[tuple[MaintenanceWindowRule, celpy.Runner]],
+        ended_windows: list[MaintenanceWindowRule],
+        env: celpy.Environment,
+        now: datetime.datetime,
+    ) -> int:
+        # alert id -> event to write
+        updated_events: dict[UUID, dict] = {}
+        remaining = alerts
+        for window, program in active_windows:
+            window_id = str(window.id)
+            blocked_ids = set()
+            for alert in remaining:
+                if not (window.start_time < alert.timestamp < window.end_time):
                     continue
-                if not isinstance(alert.event.get("source"), list):
-                    alert.event["source"] = [alert.event["source"]]
-                alert_dto = AlertDto(**alert.event)
-                with tracer.start_as_current_span("mw_recover_strategy_push_to_workflows"):
-                    try:
-                        # Now run any workflow that should run based on this alert
-                        # TODO: this should publish event
-                        workflow_manager = WorkflowManager.get_instance()
-                        # insert the events to the workflow manager process queue
-                        logger.info("Adding event to the workflow manager queue")
-                        workflow_manager.insert_events(tenant, [alert_dto])
-                        logger.info("Added event to the workflow manager queue")
-                    except Exception:
-                        logger.exception(
-                            "Failed to run workflows based on alerts",
-                            extra={
-                                "provider_type": alert_dto.providerType,
-                                "provider_id": alert_dto.providerId,
-                                "tenant_id": tenant,
-                            },
-                        )
+                if not MaintenanceWindowsBl.evaluate_cel(
+                    window, alert, env, logger, {"tenant_id": tenant_id, "alert_id": alert.id}, program=program
+                ):
+                    continue
+                blocked_ids.add(alert.id)
+                windows_trace = alert.event.get("maintenance_windows_trace", [])
+                if window_id not in windows_trace:
+                    updated_events[alert.id] = {**alert.event, "maintenance_windows_trace": [*windows_trace, window_id]}
+            if blocked_ids:
+                logger.info(
+                    "%d alerts are blocked due to the maintenance window: %s.", len(blocked_ids), window.id
+                )
+                remaining = [alert for alert in remaining if alert.id not in blocked_ids]
 
-                with tracer.start_as_current_span("mw_recover_strategy_run_rules_engine"):
-                    # Now we need to run the rules engine
-                    if KEEP_CORRELATION_ENABLED:
-                        incidents = []
-                        try:
-                            rules_engine = RulesEngine(tenant_id=tenant)
-                            # handle incidents, also handle workflow execution as
-                            incidents = rules_engine.run_rules(
-                                [alert_dto], session=session
-                            )
-                        except Exception:
-                            logger.exception(
-                                "Failed to run rules engine",
-                                extra={
-                                    "provider_type": alert_dto.providerType,
-                                    "provider_id": alert_dto.providerId,
-                                    "tenant_id": tenant,
-                                },
-                            )
-                        pusher_cache = get_notification_cache()
-                        if incidents and pusher_cache.should_notify(tenant, "incident-change"):
-                            pusher_client = get_pusher_client()
-                            try:
-                                pusher_client.trigger(
-                                    f"private-{tenant}",
-                                    "incident-change",
-                                    {},
-                                )
-                            except Exception:
-                                logger.exception("Failed to tell the client to pull incidents")
+        audits = []
+        # alert id -> (fingerprint, event to write, whether it had a previous status)
+        recovered: dict[UUID, tuple[str, dict, bool]] = {}
+        for alert in remaining:
+            event = dict(alert.event)
+            has_previous_status = "previous_status" in event
+            event["status"], event["previous_status"] = event.get("previous_status"), event.get("status")
+            updated_events[alert.id] = event
+            recovered[alert.id] = (alert.fingerprint, event, has_previous_status)
+            audits.append(
+                AlertAudit(
+                    tenant_id=tenant_id,
+                    fingerprint=alert.fingerprint,
+                    user_id="system",
+                    action=ActionType.MAINTENANCE_EXPIRED.value,
+                    description=(
+                        f"Alert {alert.id} has recover its previous status, "
+                        f"from {event.get('previous_status')} to {event.get('status')}"
+                    ),
+                )
+            )
+            # the latest window which held the alert, if it still exists
+            window_ends = [
+                window.end_time.replace(tzinfo=None)
+                for window in ended_windows
+                if window.start_time < alert.timestamp < window.end_time
+            ]
+            if window_ends:
+                maintenance_recovery_lag.observe((now - max(window_ends)).total_seconds())
+
+        if updated_events:
+            session.execute(
+                update(Alert),
+                [{"id": alert_id, "event": event} for alert_id, event in updated_events.items()],
+            )
+            # the bulk update does not synchronize the loaded alerts
+            for alert in alerts:
+                if alert.id in updated_events:
+                    session.expire(alert)
+        session.add_all(audits)
+        refresh_last_alerts_state(
+            session, tenant_id, list({fingerprint for fingerprint, _, _ in recovered.values()})
+        )
+        session.commit()
 
+        maintenance_recovery_alerts_total.labels(result="blocked").inc(len(alerts) - len(recovered))
+        maintenance_recovery_alerts_total.labels(result="recovered").inc(len(recovered))
+        if not recovered:
+            return 0
+
+        # only the alerts still the last alert of their fingerprint are processed again
+        last_alert_ids = session.exec(
+            select(LastAlert.alert_id)
+            .where(LastAlert.tenant_id == tenant_id)
+            .where(LastAlert.alert_id.in_(list(recovered)))
+        ).all()
+        alert_dtos = []
+        for alert_id in last_alert_ids:
+            fingerprint, event, has_previous_status = recovered[alert_id]
+            if not has_previous_status:
+                logger.info(
+                    f"Alert {alert_id} does not have previous status, cannot proceed with recover strategy",
+                    extra={"tenant_id": tenant_id, "fingerprint": fingerprint, "alert_id": alert_id, "alert.status": event.get("status")},
+                )
+                continue
+            if not isinstance(event.get("source"), list):
+                event = {**event, "source": [event.get("source")]}
+            alert_dtos.append(AlertDto.from_stored_event(event))
+
+        MaintenanceWindowsBl.process_recovered_alerts(logger, session, tenant_id, alert_dtos)
+        return len(recovered)
+
+    @staticmethod
+    def process_recovered_alerts(
+        logger: logging.Logger,
+        session: Session,
+        tenant_id: str,
+        alert_dtos: list[AlertDto],
+    ):
+        """
+        Runs the workflows, the rules engine and the presets notifications for a batch of
+        recovered alerts, the same way as for new alerts.
+        """
+        if not alert_dtos:
+            return
+
+        with tracer.start_as_current_span("mw_recover_strategy_push_to_workflows"):
+            try:
+                # Now run any workflow that should run based on these alerts
+                # TODO: this should publish event
+                workflow_manager = WorkflowManager.get_instance()
+                # insert the events to the workflow manager process queue
+                logger.info("Adding events to the workflow manager queue")
+                workflow_manager.insert_events(tenant_id, alert_dtos)
+                logger.info("Added events to the workflow manager queue")
+            except Exception:
+                logger.exception(
+                    "Failed to run workflows based on alerts",
+                    extra={"tenant_id": tenant_id},
+                )
+
+        pusher_cache = get_notification_cache()
+        pusher_client = get_pusher_client()
+        with tracer.start_as_current_span("mw_recover_strategy_run_rules_engine"):
+            # Now we need to run the rules engine
+            if KEEP_CORRELATION_ENABLED:
+                incidents = []
+                try:
+                    rules_engine = RulesEngine(tenant_id=tenant_id)
+                    # handle incidents, also handle workflow execution as
+                    incidents = rules_engine.run_rules(alert_dtos, session=session)
+                except Exception:
+                    logger.exception(
+                        "Failed to run rules engine",
+                        extra={"tenant_id": tenant_id},
+                    )
+                if incidents and pusher_client and pusher_cache.should_notify(tenant_id, "incident-change"):
                     try:
-                        presets = get_all_presets_dtos(tenant)
-                        rules_engine = RulesEngine(tenant_id=tenant)
-                        presets_do_update = []
-                        for preset_dto in presets:
-                            # filter the alerts based on the search query
-                            filtered_alerts = rules_engine.filter_alerts(
-                                [alert_dto], preset_dto.cel_query
-                            )
-                            # if not related alerts, no need to update
-                            if not filtered_alerts:
-                                continue
-                            presets_do_update.append(preset_dto)
-                        if pusher_cache.should_notify(tenant, "poll-presets"):
-                            try:
-                                pusher_client.trigger(
-                                    f"private-{tenant}",
-                                    "poll-presets",
-                                    json.dumps(
-                                        [p.name.lower() for p in presets_do_update], default=str
-                                    ),
-                                )
-                            except Exception:
-                                logger.exception("Failed to send presets via pusher")
-                    except Exception:
-                        logger.exception(
-                            "Failed to send presets via pusher",
-                            extra={
-                                "provider_type": alert_dto.providerType,
-                                "provider_id": alert_dto.providerId,
-                                "tenant_id": tenant,
-                            },
+                        pusher_client.trigger(
+                            f"private-{tenant_id}",
+                            "incident-change",
+                            {},
                         )
-            logger.info("Finished recover strategy for maintenance windows review.")
-        finally:
-            if _owns_session:
-                session.close()
+                    except Exception:
+                        logger.exception("Failed to tell the client to pull incidents")
+
+            if not pusher_client:
+                return
+            try:
+                presets = get_all_presets_dtos(tenant_id)
+                rules_engine = RulesEngine(tenant_id=tenant_id)
+                alerts_activation = (
+                    rules_engine.get_alerts_activation(alert_dtos) if presets else []
+                )
+                presets_do_update = []
+                for preset_dto in presets:
+                    # filter the alerts based on the search query
+                    filtered_alerts = rules_engine.filter_alerts(
+                        alert_dtos, preset_dto.cel_query, alerts_activation
+                    )
+                    # if not related alerts, no need to update
+                    if not filtered_alerts:
+                        continue
+                    presets_do_update.append(preset_dto.name.lower())
+                pusher_cache.notify_presets(pusher_client, tenant_id, presets_do_update)
+            except Exception:
+                logger.exception(
+                    "Failed to send presets via pusher",
+                    extra={"tenant_id": tenant_id},
+                )
@@ -32,6 +32,21 @@ MAINTENANCE_WINDOW_ALERT_STRATEGY = os.environ.get(
     "MAINTENANCE_WINDOW_STRATEGY", "default"
 )  # recover_previous_status or default
 WATCHER_LAPSED_TIME = int(os.environ.get("KEEP_WATCHER_LAPSED_TIME", 60))  # in seconds
+KEEP_ALERT_RETENTION_DAYS = int(
+    os.environ.get("KEEP_ALERT_RETENTION_DAYS", 0)
+)  # 0 keeps the alert history forever, can be overridden per tenant
+KEEP_ALERT_RETENTION_INTERVAL = int(
+    os.environ.get("KEEP_ALERT_RETENTION_INTERVAL", 3600)
+)  # in seconds
+KEEP_DASHBOARD_ROLLUPS_ENABLED = (
+    os.environ.get("KEEP_DASHBOARD_ROLLUPS_ENABLED", "false") == "true"
+)  # serve the dashboard distributions from hourly rollups
+KEEP_DASHBOARD_ROLLUP_INTERVAL = int(
+    os.environ.get("KEEP_DASHBOARD_ROLLUP_INTERVAL", 300)
+)  # in seconds
+KEEP_INCIDENT_RESOLUTION_RECONCILE_INTERVAL = int(
+    os.environ.get("KEEP_INCIDENT_RESOLUTION_RECONCILE_INTERVAL", 3600)
+)  # in seconds, 0 disables the reconciliation
 ###
 # Set ARQ_TASK_POOL_TO_EXECUTE to "none", "all", "basic_processing" or "ai"
 # to split the tasks between the workers.
@@ -0,0 +1,258 @@
+"""
+Write-through cache of the last alert hash per fingerprint, used by deduplication.
+
+Entries are written by `set_last_alert` only, so a full duplicate of the last alert of
+a fingerprint is detected without querying the database. A stale entry must never
+turn an alert into a full duplicate, so writers follow a two step protocol:
+
+1. `invalidate` before committing a new last alert replaces the entry with a marker
+   carrying the alert timestamp (or the newer one already there). Markers are misses.
+2. `set` after the commit stores the hash, only if the entry still exists and holds
+   no newer timestamp. So an older writer finishing late can't overwrite a newer
+   one, and an evicted or expired marker stays a miss.
+
+Entries are never populated from database reads, which could race with a writer.
+"""
+
+import datetime
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+from keep.api.consts import REDIS
+from keep.api.core.config import config
+from keep.api.core.metrics import alert_hash_cache_lookups_total
+
+# "redis" shares the cache between processes, "memory" is only correct when a single
+# process processes the events of a tenant, "none" disables the cache
+KEEP_ALERT_HASH_CACHE_BACKEND = config(
+    "KEEP_ALERT_HASH_CACHE_BACKEND", default="redis" if REDIS else "none"
+)
+# number of fingerprints kept by the memory backend, least recently used are evicted
+KEEP_ALERT_HASH_CACHE_SIZE = config(
+    "KEEP_ALERT_HASH_CACHE_SIZE", default=100000, cast=int
+)
+KEEP_ALERT_HASH_CACHE_TTL = config("KEEP_ALERT_HASH_CACHE_TTL", default=3600, cast=int)
+REDIS_KEY_PREFIX = "keep:alert_hash"
+
+logger = logging.getLogger(__name__)
+
+# (timestamp in microseconds, alert hash or None for a marker)
+Entry = Tuple[int, Optional[str]]
+
+
+def _to_micros(timestamp: datetime.datetime) -> int:
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=datetime.timezone.utc)
+    return int(timestamp.timestamp() * 1_000_000)
+
+
+class InMemoryAlertHashBackend:
+    """Per-process LRU backend, also the local fake in tests."""
+
+    def __init__(self, max_size: int, ttl: int):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries: "OrderedDict[str, Tuple[Entry, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key: str) -> Optional[Entry]:
+        item = self.entries.get(key)
+        if item is None:
+            return None
+        entry, expires_at = item
+        if time.time() >= expires_at:
+            del self.entries[key]
+            return None
+        return entry
+
+    def _put(self, key: str, entry: Entry):
+        self.entries[key] = (entry, time.time() + self.ttl)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def get_many(self, keys: list[str]) -> Dict[str, str]:
+        hashes = {}
+        with self._lock:
+            for key in keys:
+                entry = self._get(key)
+                if entry is not None and entry[1] is not None:
+                    self.entries.move_to_end(key)
+                    hashes[key] = entry[1]
+        return hashes
+
+    def invalidate(self, key: str, timestamp: int):
+        with self._lock:
+            entry = self._get(key)
+            if entry is not None:
+                timestamp = max(timestamp, entry[0])
+            self._put(key, (timestamp, None))
+
+    def set(self, key: str, alert_hash: str, timestamp: int) -> bool:
+        with self._lock:
+            entry = self._get(key)
+            if entry is None or entry[0] > timestamp:
+                return False
+            self._put(key, (timestamp, alert_hash))
+            return True
+
+
+# values are "<timestamp>:<hash>", a marker has an empty hash
+REDIS_INVALIDATE_SCRIPT = """
+local current = redis.call('GET', KEYS[1])
+local timestamp = tonumber(ARGV[1])
+if current then
+    local current_timestamp = tonumber(string.match(current, '^(%d+):'))
+    if current_timestamp and current_timestamp > timestamp then
+        timestamp = current_timestamp
+    end
+end
+redis.call('SET', KEYS[1], string.format('%d:', timestamp), 'EX', ARGV[2])
+return 1
+"""
+
+REDIS_SET_SCRIPT = """
+local current = redis.call('GET', KEYS[1])
+if not current then
+    return 0
+end
+local current_timestamp = tonumber(string.match(current, '^(%d+):'))
+if not current_timestamp or current_timestamp > tonumber(ARGV[1]) then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[1] .. ':' .. ARGV[2], 'EX', ARGV[3])
+return 1
+"""
+
+
+class RedisAlertHashBackend:
+    """Backend shared by every process through redis, bounded by the entries TTL."""
+
+    def __init__(self, ttl: int, client=None):
+        if client is None:
+            from keep.api.redis_settings import get_redis_client
+
+            client = get_redis_client()
+        self.client = client
+        self.ttl = ttl
+        self._invalidate = client.register_script(REDIS_INVALIDATE_SCRIPT)
+        self._set = client.register_script(REDIS_SET_SCRIPT)
+
+    def get_many(self, keys: list[str]) -> Dict[str, str]:
+        hashes = {}
+        for key, value in zip(keys, self.client.mget(keys)):
+            if value is None:
+                continue
+            if isinstance(value, bytes):
+                value = value.decode()
+            _, _, alert_hash = value.partition(":")
+            if alert_hash:
+                hashes[key] = alert_hash
+        return hashes
+
+    def invalidate(self, key: str, timestamp: int):
+        self._invalidate(keys=[key], args=[timestamp, self.ttl])
+
+    def set(self, key: str, alert_hash: str, timestamp: int) -> bool:
+        return bool(self._set(keys=[key], args=[timestamp, alert_hash, self.ttl]))
+
+
+class AlertHashCache:
+    def __init__(self, backend=None):
+        self.backend = backend
+
+    @staticmethod
+    def _key(tenant_id: str, fingerprint: str) -> str:
+        return f"{REDIS_KEY_PREFIX}:{tenant_id}:{fingerprint}"
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    def get_many(self, tenant_id: str, fingerprints: Iterable[str]) -> Dict[str, str]:
+        """Returns the cached hashes, fingerprints that are missing must be read from the db."""
+        fingerprints = list(fingerprints)
+        if not self.enabled or not fingerprints:
+            return {}
+        keys = [self._key(tenant_id, fingerprint) for fingerprint in fingerprints]
+        try:
+            cached = self.backend.get_many(keys)
+        except Exception:
+            logger.warning("Failed to read the alert hash cache", exc_info=True)
+            cached = {}
+        hashes = {
+            fingerprint: cached[key]
+            for fingerprint, key in zip(fingerprints, keys)
+            if key in cached
+        }
+        alert_hash_cache_lookups_total.labels(result="hit").inc(len(hashes))
+        alert_hash_cache_lookups_total.labels(result="miss").inc(
+            len(fingerprints) - len(hashes)
+        )
+        return hashes
+
+    def invalidate(
+        self, tenant_id: str, fingerprint: str, timestamp: datetime.datetime
+    ):
+        """
+        Must be called before committing a new last alert for the fingerprint.
+
+        Errors are raised: if the entry can't be invalidated the last alert must not be
+        committed, or the cache could keep reporting its previous hash.
+        """
+        if self.enabled:
+            self.backend.invalidate(
+                self._key(tenant_id, fingerprint), _to_micros(timestamp)
+            )
+
+    def set(
+        self,
+        tenant_id: str,
+        fingerprint: str,
+        alert_hash: str | None,
+        timestamp: datetime.datetime,
+    ):
+        """Called after the last alert was committed, the entry stays a miss on errors."""
+        if not self.enabled or not alert_hash:
+            return
+        try:
+            self.backend.set(
+                self._key(tenant_id, fingerprint), alert_hash, _to_micros(timestamp)
+            )
+        except Exception:
+            logger.warning(
+                "Failed to update the alert hash cache",
+                extra={"tenant_id": tenant_id, "fingerprint": fingerprint},
+                exc_info=True,
+            )
+
+
+def _create_backend():
+    if KEEP_ALERT_HASH_CACHE_BACKEND == "memory":
+        return InMemoryAlertHashBackend(
+            KEEP_ALERT_HASH_CACHE_SIZE, KEEP_ALERT_HASH_CACHE_TTL
+        )
+    if KEEP_ALERT_HASH_CACHE_BACKEND == "redis":
+        try:
+            return RedisAlertHashBackend(KEEP_ALERT_HASH_CACHE_TTL)
+        except Exception:
+            logger.exception(
+                "Failed to create the redis alert hash cache, disabling it"
+            )
+    return None
+
+
+_alert_hash_cache: AlertHashCache | None = None
+_alert_hash_cache_lock = threading.Lock()
+
+
+def get_alert_hash_cache() -> AlertHashCache:
+    global _alert_hash_cache
+    if _alert_hash_cache is None:
+        with _alert_hash_cache_lock:
+            if _alert_hash_cache is None:
+                _alert_hash_cache = AlertHashCache(_create_backend())
+    return _alert_hash_cache
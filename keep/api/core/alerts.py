@@ -2,10 +2,11 @@ import datetime
 import json
 import logging
 import os
-from typing import Tuple
+from typing import Iterator, Optional, Tuple
 
-from sqlalchemy import and_, func, select
+from sqlalchemy import and_, func, or_, select
 from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlmodel import Session, text
 
 from keep.api.core.cel_to_sql.ast_nodes import DataType
@@ -17,7 +18,11 @@ from keep.api.core.cel_to_sql.properties_metadata import (
 from keep.api.core.cel_to_sql.sql_providers.get_cel_to_sql_provider_for_dialect import (
     get_cel_to_sql_provider,
 )
-from keep.api.core.db import engine
+from keep.api.core.db import (
+    engine,
+    enrich_alerts_with_incidents,
+    existed_or_new_session,
+)
 
 # This import is required to create the tables
 from keep.api.core.facets import get_facet_options, get_facets
@@ -34,11 +39,34 @@ from keep.api.models.db.facet import FacetType
 from keep.api.models.db.incident import IncidentStatus
 from keep.api.models.facet import FacetDto, FacetOptionDto, FacetOptionsQueryDto
 from keep.api.models.query import QueryDto, SortOptionsDto
+from keep.api.utils.enrichment_helpers import convert_db_alerts_to_dto_alerts
+from keep.api.utils.export_helpers import (
+    EXPORT_BATCH_SIZE,
+    EXPORT_CURSOR_FIELD,
+    decode_export_cursor,
+    encode_export_cursor,
+)
 
 logger = logging.getLogger(__name__)
 
 alerts_hard_limit = int(os.environ.get("KEEP_LAST_ALERTS_LIMIT", 50000))
 
+# the CSV columns of an alerts export when none are requested
+ALERT_EXPORT_COLUMNS = [
+    "fingerprint",
+    "name",
+    "status",
+    "severity",
+    "source",
+    "environment",
+    "service",
+    "description",
+    "lastReceived",
+    "startedAt",
+    "providerType",
+    "providerId",
+]
+
 alert_field_configurations = [
     FieldMappingConfiguration(
         map_from_pattern="id", map_to="lastalert.alert_id", data_type=DataType.UUID
@@ -97,10 +125,7 @@ alert_field_configurations = [
     ),
     FieldMappingConfiguration(
         map_from_pattern="severity",
-        map_to=[
-            "JSON(alertenrichment.enrichments).*",
-            "JSON(alert.event).*",
-        ],
+        map_to="lastalert.severity",
         enum_values=[
             severity.value
             for severity in sorted(
@@ -120,16 +145,13 @@ alert_field_configurations = [
     ),
     FieldMappingConfiguration(
         map_from_pattern="status",
-        map_to=[
-            "JSON(alertenrichment.enrichments).*",
-            "JSON(alert.event).*",
-        ],
+        map_to="lastalert.status",
         enum_values=list(reversed([item.value for _, item in enumerate(AlertStatus)])),
         data_type=DataType.STRING,
     ),
     FieldMappingConfiguration(
         map_from_pattern="dismissed",
-        map_to=["JSON(alertenrichment.enrichments).*"],
+        map_to="lastalert.dismissed",
         data_type=DataType.BOOLEAN,
     ),
     FieldMappingConfiguration(
@@ -238,6 +260,7 @@ def __build_query_for_filtering(
     fetch_alerts_data=True,
     fetch_incidents=False,
     force_fetch=False,
+    with_hard_limit=True,
 ):
     fetch_incidents = fetch_incidents or (cel and "incident." in cel)
     cel_to_sql_instance = get_cel_to_sql_provider(properties_metadata)
@@ -245,7 +268,9 @@ def __build_query_for_filtering(
     involved_fields = []
 
     if cel:
-        cel_to_sql_result = cel_to_sql_instance.convert_to_sql_str_v2(cel)
+        cel_to_sql_result = cel_to_sql_instance.convert_to_sql_str_v2(
+            cel, parameterized=True
+        )
         sql_filter = cel_to_sql_result.sql
         involved_fields = cel_to_sql_result.involved_fields
         fetch_incidents = next(
@@ -304,13 +329,15 @@ def __build_query_for_filtering(
             ),
         )
 
-    sql_query = sql_query.filter(LastAlert.tenant_id == tenant_id).filter(
-        LastAlert.timestamp >= get_threeshold_query(tenant_id)
-    )
+    sql_query = sql_query.filter(LastAlert.tenant_id == tenant_id)
+    if with_hard_limit:
+        sql_query = sql_query.filter(
+            LastAlert.timestamp >= get_threeshold_query(tenant_id)
+        )
     involved_fields = []
 
     if sql_filter:
-        sql_query = sql_query.where(text(sql_filter))
+        sql_query = sql_query.where(cel_to_sql_result.as_text_clause())
     return {
         "query": sql_query,
         "involved_fields": involved_fields,
@@ -434,16 +461,121 @@ def query_last_alerts(tenant_id, query: QueryDto) -> Tuple[list[Alert], int]:
         for alert_data in alerts_with_start:
             alert: Alert = alert_data[0]
             alert.alert_enrichment = alert_data[1]
-            if not alert.event.get("startedAt"):
-                alert.event["startedAt"] = str(alert_data[2])
-            else:
-                alert.event["firstTimestamp"] = str(alert_data[2])
-            alert.event["event_id"] = str(alert.id)
+            __set_started_at(alert, alert_data[2])
             alerts.append(alert)
 
         return alerts, total_count
 
 
+def __set_started_at(alert: Alert, started_at):
+    if not alert.event.get("startedAt"):
+        alert.event["startedAt"] = str(started_at)
+    else:
+        alert.event["firstTimestamp"] = str(started_at)
+    alert.event["event_id"] = str(alert.id)
+
+
+def build_alerts_export_query(
+    tenant_id: str, cel: Optional[str] = None, cursor: Optional[str] = None
+):
+    """
+    Builds the query of an alerts export: the last alert of every fingerprint matching
+    the CEL expression, newest first, after the export cursor. Unlike
+    `query_last_alerts`, it is not capped to the KEEP_LAST_ALERTS_LIMIT latest alerts
+    and pages by keyset, so resuming deep in the export costs the same as starting it.
+
+    Raises:
+        CelToSqlException: if the CEL expression can't be translated
+        InvalidExportCursor: if the cursor is malformed
+    """
+    select_args = [
+        Alert,
+        AlertEnrichment,
+        LastAlert.first_timestamp.label("startedAt"),
+        LastAlert.timestamp,
+        LastAlert.fingerprint,
+    ]
+    built_query_result = __build_query_for_filtering(
+        tenant_id, select_args=select_args, cel=cel, with_hard_limit=False
+    )
+    sql_query = built_query_result["query"]
+
+    if built_query_result["fetch_incidents"]:
+        # an alert is joined once per incident, filter on the fingerprints instead
+        filtered_fingerprints = __build_query_for_filtering(
+            tenant_id,
+            select_args=[LastAlert.fingerprint],
+            cel=cel,
+            with_hard_limit=False,
+        )["query"].subquery()
+        sql_query = __build_query_for_filtering(
+            tenant_id, select_args=select_args, with_hard_limit=False
+        )["query"].where(
+            LastAlert.fingerprint.in_(select(filtered_fingerprints.c.fingerprint))
+        )
+
+    if cursor:
+        timestamp, fingerprint = decode_export_cursor(
+            cursor, datetime.datetime.fromisoformat, str
+        )
+        sql_query = sql_query.where(
+            or_(
+                LastAlert.timestamp < timestamp,
+                and_(
+                    LastAlert.timestamp == timestamp,
+                    LastAlert.fingerprint < fingerprint,
+                ),
+            )
+        )
+
+    return sql_query.order_by(LastAlert.timestamp.desc(), LastAlert.fingerprint.desc())
+
+
+def export_last_alerts(
+    tenant_id: str,
+    sql_query,
+    limit: Optional[int] = None,
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> Iterator[list[dict]]:
+    """
+    Streams the alerts of an export query (see `build_alerts_export_query`) through a
+    server-side cursor, in batches of records with their export cursor.
+
+    Args:
+        tenant_id: the tenant of the export
+        sql_query: the export query
+        limit: the maximum number of exported alerts, all if None
+        batch_size: the number of alerts read and converted at once
+    """
+    if limit is not None:
+        sql_query = sql_query.limit(limit)
+    # the incidents are read with another connection, the cursor is still open
+    with (
+        existed_or_new_session() as session,
+        existed_or_new_session() as lookup_session,
+    ):
+        result = session.execute(sql_query.execution_options(yield_per=batch_size))
+        for rows in result.partitions():
+            alerts = []
+            cursors = {}
+            for alert, enrichment, started_at, timestamp, fingerprint in rows:
+                set_committed_value(alert, "alert_enrichment", enrichment)
+                __set_started_at(alert, started_at)
+                alerts.append(alert)
+                cursors[str(alert.id)] = encode_export_cursor(timestamp, fingerprint)
+
+            enrich_alerts_with_incidents(tenant_id, alerts, lookup_session)
+            records = []
+            for alert_dto in convert_db_alerts_to_dto_alerts(
+                alerts, with_incidents=True, session=lookup_session
+            ):
+                record = alert_dto.dict()
+                record[EXPORT_CURSOR_FIELD] = cursors[alert_dto.event_id]
+                records.append(record)
+            lookup_session.expunge_all()
+            yield records
+
+
 def get_alert_facets_data(
     tenant_id: str,
     facet_options_query: FacetOptionsQueryDto,
@@ -0,0 +1,288 @@
+"""
+Cache of the verified API keys, shared by the logging middleware and the auth verifiers.
+
+Requests authenticated with an API key look the key up by its hash. The entity of a
+valid key is cached for KEEP_API_KEY_CACHE_TTL seconds, invalid keys for
+KEEP_API_KEY_CACHE_NEGATIVE_TTL seconds, so webhooks posting thousands of events don't
+query the database for every one of them. Committing a created, rotated or deleted key
+invalidates its entries (see `_invalidate_committed_api_keys`): immediately everywhere
+with the redis backend, in the current process with the memory backend (the other
+processes see it after the TTL).
+
+The last use of the keys is recorded in memory and written at most once per
+KEEP_UPDATE_KEY_INTERVAL seconds, in one batch for all the keys used meanwhile. A failed
+batch is kept and written with the next one.
+"""
+
+import atexit
+import dataclasses
+import datetime
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import get_history
+
+from keep.api.consts import REDIS
+from keep.api.core.config import config
+from keep.api.core.db import get_api_key, update_keys_last_used
+from keep.api.core.metrics import api_key_cache_lookups_total
+from keep.api.models.db.tenant import TenantApiKey
+
+# "redis" shares the cache between processes, "memory" is per process, "none" disables
+KEEP_API_KEY_CACHE_BACKEND = config(
+    "KEEP_API_KEY_CACHE_BACKEND", default="redis" if REDIS else "memory"
+)
+KEEP_API_KEY_CACHE_TTL = config("KEEP_API_KEY_CACHE_TTL", default=30, cast=int)
+KEEP_API_KEY_CACHE_NEGATIVE_TTL = config(
+    "KEEP_API_KEY_CACHE_NEGATIVE_TTL", default=5, cast=int
+)
+KEEP_API_KEY_CACHE_SIZE = config("KEEP_API_KEY_CACHE_SIZE", default=10000, cast=int)
+KEEP_UPDATE_KEY_INTERVAL = config("KEEP_UPDATE_KEY_INTERVAL", default=60, cast=int)
+REDIS_KEY_PREFIX = "keep:api_key"
+# cached value of an invalid key
+INVALID_KEY = ""
+SESSION_INFO_KEY = "keep_api_key_hashes"
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass(frozen=True)
+class CachedApiKey:
+    tenant_id: str
+    reference_id: str
+    created_by: str
+    role: str
+
+
+def hash_api_key(api_key: str) -> str:
+    return hashlib.sha256(api_key.encode()).hexdigest()
+
+
+class InMemoryApiKeyBackend:
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            item = self.entries.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if time.monotonic() >= expires_at:
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, ttl: int):
+        with self._lock:
+            self.entries[key] = (value, time.monotonic() + ttl)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def delete(self, key: str):
+        with self._lock:
+            self.entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+
+
+class RedisApiKeyBackend:
+    def __init__(self, client=None):
+        if client is None:
+            from keep.api.redis_settings import get_redis_client
+
+            client = get_redis_client()
+        self.client = client
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.client.get(key)
+        if isinstance(value, bytes):
+            value = value.decode()
+        return value
+
+    def set(self, key: str, value: str, ttl: int):
+        self.client.set(key, value, ex=ttl)
+
+    def delete(self, key: str):
+        self.client.delete(key)
+
+    def clear(self):
+        for key in self.client.scan_iter(f"{REDIS_KEY_PREFIX}:*"):
+            self.client.delete(key)
+
+
+class ApiKeyCache:
+    def __init__(self, backend=None):
+        self.backend = backend
+
+    @staticmethod
+    def _key(key_hash: str) -> str:
+        return f"{REDIS_KEY_PREFIX}:{key_hash}"
+
+    def get(self, api_key: str) -> Optional[CachedApiKey]:
+        """The entity of a valid, not deleted, API key, None if the key is invalid."""
+        key = self._key(hash_api_key(api_key))
+        if self.backend is not None:
+            try:
+                value = self.backend.get(key)
+            except Exception:
+                logger.warning("Failed to read the API key cache", exc_info=True)
+                value = None
+            if value is not None:
+                api_key_cache_lookups_total.labels(result="hit").inc()
+                return CachedApiKey(**json.loads(value)) if value else None
+        api_key_cache_lookups_total.labels(result="miss").inc()
+
+        tenant_api_key = get_api_key(api_key)
+        entity = (
+            CachedApiKey(
+                tenant_id=tenant_api_key.tenant_id,
+                reference_id=tenant_api_key.reference_id,
+                created_by=tenant_api_key.created_by,
+                role=tenant_api_key.role,
+            )
+            if tenant_api_key
+            else None
+        )
+        if self.backend is not None:
+            try:
+                if entity:
+                    self.backend.set(
+                        key,
+                        json.dumps(dataclasses.asdict(entity)),
+                        KEEP_API_KEY_CACHE_TTL,
+                    )
+                else:
+                    self.backend.set(key, INVALID_KEY, KEEP_API_KEY_CACHE_NEGATIVE_TTL)
+            except Exception:
+                logger.warning("Failed to update the API key cache", exc_info=True)
+        return entity
+
+    def invalidate(self, key_hash: str):
+        if self.backend is not None:
+            try:
+                self.backend.delete(self._key(key_hash))
+            except Exception:
+                logger.exception(
+                    "Failed to invalidate the API key cache, the key stays valid until the entry expires"
+                )
+
+    def clear(self):
+        if self.backend is not None:
+            self.backend.clear()
+
+
+class ApiKeyLastUsedWriter:
+    """
+    Coalesces the last used updates of the API keys: every key used during the
+    interval is written by the first request after it, in one batch.
+    """
+
+    def __init__(self, interval: int = KEEP_UPDATE_KEY_INTERVAL):
+        self.interval = interval
+        self.pending: Dict[Tuple[str, str], datetime.datetime] = {}
+        # the first request writes right away
+        self.last_flush = float("-inf")
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+
+    def record(self, tenant_id: str, reference_id: str):
+        with self._lock:
+            self.pending[(tenant_id, reference_id)] = datetime.datetime.utcnow()
+        if time.monotonic() - self.last_flush >= self.interval:
+            self.flush()
+
+    def flush(self, log_errors: bool = True):
+        # a single request writes the batch, the others don't wait for it
+        if not self._flush_lock.acquire(blocking=False):
+            return
+        try:
+            with self._lock:
+                pending, self.pending = self.pending, {}
+                self.last_flush = time.monotonic()
+            if pending:
+                update_keys_last_used(pending)
+        except Exception:
+            with self._lock:
+                # retried with the next batch, the uses recorded meanwhile are newer
+                for key, used_at in pending.items():
+                    self.pending.setdefault(key, used_at)
+            if log_errors:
+                logger.exception(
+                    "Failed to update API keys last used", extra={"keys": len(pending)}
+                )
+        finally:
+            self._flush_lock.release()
+
+    def flush_at_exit(self):
+        # the log handlers may be closed already when the interpreter exits
+        self.flush(log_errors=False)
+
+
+def _create_backend():
+    if KEEP_API_KEY_CACHE_BACKEND == "memory":
+        return InMemoryApiKeyBackend(KEEP_API_KEY_CACHE_SIZE)
+    if KEEP_API_KEY_CACHE_BACKEND == "redis":
+        try:
+            return RedisApiKeyBackend()
+        except Exception:
+            logger.exception("Failed to create the redis API key cache, disabling it")
+    return None
+
+
+_api_key_cache: ApiKeyCache | None = None
+_api_key_last_used_writer: ApiKeyLastUsedWriter | None = None
+_lock = threading.Lock()
+
+
+def get_api_key_cache() -> ApiKeyCache:
+    global _api_key_cache
+    if _api_key_cache is None:
+        with _lock:
+            if _api_key_cache is None:
+                _api_key_cache = ApiKeyCache(_create_backend())
+    return _api_key_cache
+
+
+def get_api_key_last_used_writer() -> ApiKeyLastUsedWriter:
+    global _api_key_last_used_writer
+    if _api_key_last_used_writer is None:
+        with _lock:
+            if _api_key_last_used_writer is None:
+                _api_key_last_used_writer = ApiKeyLastUsedWriter()
+                atexit.register(_api_key_last_used_writer.flush_at_exit)
+    return _api_key_last_used_writer
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_api_key_changes(session, flush_context):
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(instance, TenantApiKey):
+            key_hashes = session.info.setdefault(SESSION_INFO_KEY, set())
+            key_hashes.add(instance.key_hash)
+            # the previous hash of a rotated key
+            key_hashes.update(get_history(instance, "key_hash").deleted)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_api_keys(session):
+    for key_hash in session.info.pop(SESSION_INFO_KEY, ()):
+        get_api_key_cache().invalidate(key_hash)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_api_key_changes(session):
+    session.info.pop(SESSION_INFO_KEY, None)
@@ -1,4 +1,5 @@
 import fnmatch
+import hashlib
 import re
 
 from keep.api.core.cel_to_sql.ast_nodes import DataType
@@ -84,6 +85,7 @@ class PropertiesMetadata:
     Attributes:
         known_fields_mapping (dict): A dictionary containing known field mappings.
         known_fields_wildcards (dict): A dictionary containing wildcard patterns from known field mappings.
+        version (str): Identifies the mappings, equal mappings have the same version.
     Methods:
         __init__(known_fields_mapping: dict):
             Initializes the PropertiesMetadata with known field mappings.
@@ -115,6 +117,27 @@ class PropertiesMetadata:
                 new_field_mapping_config
             )
 
+        self.version = self.__get_version()
+
+    def __get_version(self) -> str:
+        """
+        Hashes the mapping configurations, the translated SQL is cached by this version.
+        Wildcard patterns are matched in order, so the order is part of the version.
+        """
+        configurations = [
+            (
+                field_mapping.map_from_pattern,
+                field_mapping.map_to,
+                field_mapping.data_type,
+                field_mapping.enum_values,
+            )
+            for field_mapping in [
+                *self.known_configurations.values(),
+                *self.wildcard_configurations.values(),
+            ]
+        ]
+        return hashlib.sha256(repr(configurations).encode()).hexdigest()
+
     def get_property_metadata_for_str(self, prop_path_str: str) -> PropertyMetadataInfo:
         return self.get_property_metadata(self.__extract_fields(prop_path_str))
 
@@ -1,6 +1,6 @@
 from typing import Any, List
 
-from sqlalchemy import Dialect, String
+from sqlalchemy import Dialect, String, TextClause, bindparam, text
 
 from keep.api.core.cel_to_sql.ast_nodes import (
     ComparisonNodeOperator,
@@ -26,8 +26,12 @@ from keep.api.core.cel_to_sql.properties_metadata import (
     PropertyMetadataInfo,
     SimpleFieldMapping,
 )
+from keep.api.core.cel_to_sql.translation_cache import cel_ast_cache, cel_sql_cache
 from celpy import CELParseError
 
+# prefix of the bound parameters of parameterized translations
+BIND_PARAM_PREFIX = "cel_param_"
+
 
 class CelToSqlException(Exception):
     pass
@@ -35,9 +39,25 @@ class CelToSqlException(Exception):
 
 class CelToSqlResult:
 
-    def __init__(self, sql: str, involved_fields: List[PropertyMetadataInfo]):
+    def __init__(
+        self,
+        sql: str,
+        involved_fields: List[PropertyMetadataInfo],
+        params: dict[str, Any] = None,
+    ):
         self.sql = sql
         self.involved_fields = involved_fields
+        # values of the bound parameters in a parameterized sql
+        self.params = params or {}
+
+    def as_text_clause(self) -> TextClause:
+        """
+        The sql as a text clause with its parameters bound. The parameters are unique,
+        so the clauses of several results can be used in the same statement.
+        """
+        return text(self.sql).bindparams(
+            *[bindparam(key, value, unique=True) for key, value in self.params.items()]
+        )
 
 
 class BaseCelToSqlProvider:
@@ -99,17 +119,25 @@ class BaseCelToSqlProvider:
     def __init__(self, dialect: Dialect, properties_metadata: PropertiesMetadata):
         super().__init__()
         self.__literal_proc = String("").literal_processor(dialect=dialect)
+        self.dialect_name = dialect.name
         self.properties_metadata = properties_metadata
         self.properties_mapper = PropertiesMapper(properties_metadata)
+        # values bound while building a parameterized sql, None when literals are inlined
+        self._bound_params: dict[str, Any] = None
 
     def convert_to_sql_str(self, cel: str) -> str:
         return self.convert_to_sql_str_v2(cel).sql
 
-    def convert_to_sql_str_v2(self, cel: str) -> CelToSqlResult:
+    def convert_to_sql_str_v2(
+        self, cel: str, parameterized: bool = False
+    ) -> CelToSqlResult:
         """
         Converts a CEL (Common Expression Language) expression to an SQL string.
+        The results are cached per process (see translation_cache.py).
         Args:
             cel (str): The CEL expression to convert.
+            parameterized (bool): Bind the string literals as parameters (see CelToSqlResult.as_text_clause)
+                instead of inlining them, so the sql is the same for any literal values.
         Returns:
             str: The resulting SQL string. Returns an empty string if the input CEL expression is empty.
         Raises:
@@ -119,8 +147,23 @@ class BaseCelToSqlProvider:
         if not cel:
             return CelToSqlResult(sql="", involved_fields=[])
 
+        return cel_sql_cache.get_or_create(
+            (
+                type(self).__name__,
+                self.dialect_name,
+                self.properties_metadata.version,
+                cel,
+                parameterized,
+            ),
+            lambda: self.__convert_to_sql(cel, parameterized),
+        )
+
+    def __convert_to_sql(self, cel: str, parameterized: bool) -> CelToSqlResult:
         try:
-            original_query = CelToAstConverter.convert_to_ast(cel)
+            # the AST is not modified by the mapping, so it is shared by all the providers
+            original_query = cel_ast_cache.get_or_create(
+                cel, lambda: CelToAstConverter.convert_to_ast(cel)
+            )
         except CELParseError as e:
             raise CelToSqlException(f"Error parsing CEL expression: {str(e)}") from e
 
@@ -134,11 +177,18 @@ class BaseCelToSqlProvider:
         if not with_mapped_props:
             return CelToSqlResult(sql="", involved_fields=[])
 
+        self._bound_params = {} if parameterized else None
         try:
             sql_filter = self._build_sql_filter(with_mapped_props, [])
-            return CelToSqlResult(sql=sql_filter, involved_fields=involved_fields)
+            return CelToSqlResult(
+                sql=sql_filter,
+                involved_fields=involved_fields,
+                params=self._bound_params,
+            )
         except NotImplementedError as e:
             raise CelToSqlException(f"Error while converting CEL expression tree to SQL: {str(e)}") from e
+        finally:
+            self._bound_params = None
 
     def get_order_by_expression(self, sort_options: list[tuple[str, str]]) -> str:
         sort_expressions: list[str] = []
@@ -178,11 +228,29 @@ class BaseCelToSqlProvider:
             return field_expressions[0]
 
     def literal_proc(self, value: Any) -> str:
+        if self._bound_params is not None:
+            return self._bind_param(str(value))
+
         if isinstance(value, str):
             return self.__literal_proc(value)
 
         return f"'{str(value)}'"
 
+    def _bind_param(self, value: Any) -> str:
+        key = f"{BIND_PARAM_PREFIX}{len(self._bound_params)}"
+        self._bound_params[key] = value
+        return f":{key}"
+
+    def _like_pattern(self, value: Any, prefix: str = "", suffix: str = "") -> str:
+        """
+        The LIKE pattern matching the value with the given prefix and suffix wildcards.
+        """
+        if self._bound_params is not None:
+            return self._bind_param(f"{prefix}{value}{suffix}")
+
+        unquoted_literal = self.literal_proc(value)[1:-1]
+        return f"'{prefix}{unquoted_literal}{suffix}'"
+
     def _get_order_by_field(self, cel_sort_by: str) -> str:
         return self.get_field_expression(cel_sort_by)
 
@@ -337,7 +405,8 @@ class BaseCelToSqlProvider:
         if first_operand is None:
             first_operand = self._build_sql_filter(comparison_node.first_operand, stack)
 
-        if second_operand is None:
+        # the method calls (contains, startsWith, endsWith) visit the constant node themselves
+        if second_operand is None and should_cast:
             second_operand = self._build_sql_filter(
                 comparison_node.second_operand, stack
             )
@@ -128,9 +128,8 @@ class CelToMySqlProvider(BaseCelToSqlProvider):
             if isinstance(method_args[0].value, str)
             else method_args[0].value
         )
-        processed_literal = self.literal_proc(value)
-        unquoted_literal = processed_literal[1:-1]
-        return f"{property_path} IS NOT NULL AND LOWER({property_path}) LIKE '%{unquoted_literal}%'"
+        pattern = self._like_pattern(value, "%", "%")
+        return f"{property_path} IS NOT NULL AND LOWER({property_path}) LIKE {pattern}"
 
     def _visit_starts_with_method_calling(
         self, property_path: str, method_args: List[ConstantNode]
@@ -142,9 +141,8 @@ class CelToMySqlProvider(BaseCelToSqlProvider):
             if isinstance(method_args[0].value, str)
             else method_args[0].value
         )
-        processed_literal = self.literal_proc(value)
-        unquoted_literal = processed_literal[1:-1]
-        return f"{property_path} IS NOT NULL AND LOWER({property_path}) LIKE '{unquoted_literal}%'"
+        pattern = self._like_pattern(value, suffix="%")
+        return f"{property_path} IS NOT NULL AND LOWER({property_path}) LIKE {pattern}"
 
     def _visit_ends_with_method_calling(
         self, property_path: str, method_args: List[ConstantNode]
@@ -156,9 +154,8 @@ class CelToMySqlProvider(BaseCelToSqlProvider):
             if isinstance(method_args[0].value, str)
             else method_args[0].value
         )
-        processed_literal = self.literal_proc(value)
-        unquoted_literal = processed_literal[1:-1]
-        return f"{property_path} IS NOT NULL AND LOWER({property_path}) LIKE '%{unquoted_literal}'"
+        pattern = self._like_pattern(value, prefix="%")
+        return f"{property_path} IS NOT NULL AND LOWER({property_path}) LIKE {pattern}"
 
     def _visit_equal_for_array_datatype(
         self, first_operand: Node, second_operand: Node
@@ -174,6 +171,11 @@ class CelToMySqlProvider(BaseCelToSqlProvider):
             )
 
         prop = self._visit_property_access_node(first_operand, [])
+
+        if self._bound_params is not None and second_operand.value is not None:
+            value = self._bind_param(str(second_operand.value))
+            return f"JSON_CONTAINS({prop}, JSON_ARRAY({value}))"
+
         constant_node_value = self._visit_constant_node(second_operand.value)
 
         if constant_node_value == "NULL":
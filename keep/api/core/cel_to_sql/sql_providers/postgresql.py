@@ -118,27 +118,24 @@ class CelToPostgreSqlProvider(BaseCelToSqlProvider):
         if len(method_args) != 1:
             raise ValueError(f'{property_path}.contains accepts 1 argument but got {len(method_args)}')
 
-        processed_literal = self.literal_proc(method_args[0].value)
-        unquoted_literal = processed_literal[1:-1]
-        return f"{property_path} IS NOT NULL AND {property_path} ILIKE '%{unquoted_literal}%'"
+        pattern = self._like_pattern(method_args[0].value, "%", "%")
+        return f"{property_path} IS NOT NULL AND {property_path} ILIKE {pattern}"
 
     def _visit_starts_with_method_calling(
         self, property_path: str, method_args: List[ConstantNode]
     ) -> str:
         if len(method_args) != 1:
             raise ValueError(f'{property_path}.startsWith accepts 1 argument but got {len(method_args)}')
-        processed_literal = self.literal_proc(method_args[0].value)
-        unquoted_literal = processed_literal[1:-1]
-        return f"{property_path} IS NOT NULL AND {property_path} ILIKE '{unquoted_literal}%'"
+        pattern = self._like_pattern(method_args[0].value, suffix="%")
+        return f"{property_path} IS NOT NULL AND {property_path} ILIKE {pattern}"
 
     def _visit_ends_with_method_calling(
         self, property_path: str, method_args: List[ConstantNode]
     ) -> str:
         if len(method_args) != 1:
             raise ValueError(f'{property_path}.endsWith accepts 1 argument but got {len(method_args)}')
-        processed_literal = self.literal_proc(method_args[0].value)
-        unquoted_literal = processed_literal[1:-1]
-        return f"{property_path} IS NOT NULL AND {property_path} ILIKE '%{unquoted_literal}'"
+        pattern = self._like_pattern(method_args[0].value, prefix="%")
+        return f"{property_path} IS NOT NULL AND {property_path} ILIKE {pattern}"
 
     def _visit_equal_for_array_datatype(
         self, first_operand: Node, second_operand: Node
@@ -154,6 +151,11 @@ class CelToPostgreSqlProvider(BaseCelToSqlProvider):
             )
 
         prop = self._visit_property_access_node(first_operand, [])
+
+        if self._bound_params is not None and second_operand.value is not None:
+            value = self._bind_param(str(second_operand.value))
+            return f"{prop}::jsonb @> jsonb_build_array(CAST({value} AS TEXT))"
+
         constant_node_value = self._visit_constant_node(second_operand.value)
 
         if constant_node_value == "NULL":
@@ -119,18 +119,16 @@ class CelToSqliteProvider(BaseCelToSqlProvider):
         if len(method_args) != 1:
             raise ValueError(f'{property_path}.contains accepts 1 argument but got {len(method_args)}')
 
-        processed_literal = self.literal_proc(method_args[0].value)
-        unquoted_literal = processed_literal[1:-1]
-        return f"{property_path} IS NOT NULL AND {property_path} LIKE '%{unquoted_literal}%'"
+        pattern = self._like_pattern(method_args[0].value, "%", "%")
+        return f"{property_path} IS NOT NULL AND {property_path} LIKE {pattern}"
 
     def _visit_starts_with_method_calling(
         self, property_path: str, method_args: List[ConstantNode]
     ) -> str:
         if len(method_args) != 1:
             raise ValueError(f'{property_path}.startsWith accepts 1 argument but got {len(method_args)}')
-        processed_literal = self.literal_proc(method_args[0].value)
-        unquoted_literal = processed_literal[1:-1]
-        return f"{property_path} IS NOT NULL AND {property_path} LIKE '{unquoted_literal}%'"
+        pattern = self._like_pattern(method_args[0].value, suffix="%")
+        return f"{property_path} IS NOT NULL AND {property_path} LIKE {pattern}"
 
     def _visit_ends_with_method_calling(
         self, property_path: str, method_args: List[ConstantNode]
@@ -138,9 +136,8 @@ class CelToSqliteProvider(BaseCelToSqlProvider):
         if len(method_args) != 1:
             raise ValueError(f'{property_path}.endsWith accepts 1 argument but got {len(method_args)}')
 
-        processed_literal = self.literal_proc(method_args[0].value)
-        unquoted_literal = processed_literal[1:-1]
-        return f"{property_path} IS NOT NULL AND {property_path} LIKE '%{unquoted_literal}'"
+        pattern = self._like_pattern(method_args[0].value, prefix="%")
+        return f"{property_path} IS NOT NULL AND {property_path} LIKE {pattern}"
 
     def _visit_equal_for_array_datatype(
         self, first_operand: Node, second_operand: Node
@@ -159,6 +156,10 @@ class CelToSqliteProvider(BaseCelToSqlProvider):
         if second_operand.value is None:
             return f"({prop} IS NULL OR {prop} = '[]')"
 
+        if self._bound_params is not None:
+            value = self._bind_param(str(second_operand.value))
+            return f"(SELECT 1 FROM json_each({prop}) as json_array WHERE json_array.value = {value})"
+
         value = self._visit_constant_node(second_operand.value)[1:-1]
 
         return f"(SELECT 1 FROM json_each({prop}) as json_array WHERE json_array.value = '{value}')"
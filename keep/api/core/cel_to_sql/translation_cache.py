@@ -0,0 +1,67 @@
+"""
+Per-process LRU caches of the CEL to SQL translation.
+
+Presets polling and dashboards issue the same CEL expressions every few seconds, so
+the parsed ASTs are cached by CEL and the translated SQL by provider, dialect,
+properties metadata version and CEL. Failed translations are not cached.
+KEEP_CEL_TO_SQL_CACHE_SIZE bounds the entries of every cache, 0 disables them.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+from keep.api.core.config import config
+from keep.api.core.metrics import cel_to_sql_cache_lookups_total
+
+KEEP_CEL_TO_SQL_CACHE_SIZE = config(
+    "KEEP_CEL_TO_SQL_CACHE_SIZE", default=1024, cast=int
+)
+
+
+class TranslationCache:
+    def __init__(self, name: str, max_size: int):
+        self.name = name
+        self.max_size = max_size
+        self.entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_create(self, key: Hashable, create: Callable[[], Any]) -> Any:
+        """
+        Returns the cached value of the key, or caches the value created by `create`.
+        The values are shared between the callers and must not be modified.
+        """
+        with self._lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                cel_to_sql_cache_lookups_total.labels(
+                    cache=self.name, result="hit"
+                ).inc()
+                return self.entries[key]
+        cel_to_sql_cache_lookups_total.labels(cache=self.name, result="miss").inc()
+
+        # created outside of the lock, concurrent misses of a key create the same value
+        value = create()
+        if self.max_size > 0:
+            with self._lock:
+                self.entries[key] = value
+                self.entries.move_to_end(key)
+                while len(self.entries) > self.max_size:
+                    self.entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+cel_ast_cache = TranslationCache("ast", KEEP_CEL_TO_SQL_CACHE_SIZE)
+cel_sql_cache = TranslationCache("sql", KEEP_CEL_TO_SQL_CACHE_SIZE)
+
+
+def clear_translation_caches():
+    cel_ast_cache.clear()
+    cel_sql_cache.clear()
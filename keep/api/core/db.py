@@ -25,8 +25,10 @@ from retry import retry
 from sqlalchemy import (
     String,
     and_,
+    bindparam,
     case,
     cast,
+    delete,
     desc,
     func,
     literal,
@@ -39,18 +41,19 @@ from sqlalchemy.dialects.mysql import insert as mysql_insert
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.exc import IntegrityError, OperationalError
-from sqlalchemy.orm import foreign, joinedload, subqueryload
+from sqlalchemy.orm import aliased, foreign, joinedload, subqueryload
 from sqlalchemy.orm.exc import StaleDataError
 from sqlalchemy.sql import exists, expression
 from sqlalchemy.sql.functions import count
 from sqlmodel import Session, SQLModel, col, or_, select, text
-from sqlalchemy.orm.attributes import flag_modified
 
-from keep.api.consts import STATIC_PRESETS
+from keep.api.consts import KEEP_DASHBOARD_ROLLUPS_ENABLED, STATIC_PRESETS
+from keep.api.core.alert_hash_cache import get_alert_hash_cache
 from keep.api.core.config import config
 from keep.api.core.db_utils import (
     create_db_engine,
     custom_serialize,
+    get_hour_bucket_field,
     get_json_extract_field,
     get_or_create,
 )
@@ -106,6 +109,10 @@ KEEP_AUDIT_EVENTS_ENABLED = config("KEEP_AUDIT_EVENTS_ENABLED", cast=bool, defau
 
 INTERVAL_WORKFLOWS_RELAUNCH_TIMEOUT = timedelta(minutes=60)
 WORKFLOWS_TIMEOUT = timedelta(minutes=120)
+# executions kept in the workflow summaries, the workflows list shows up to 25
+WORKFLOW_SUMMARY_EXECUTIONS = config(
+    "KEEP_WORKFLOW_SUMMARY_EXECUTIONS", default=25, cast=int
+)
 
 
 def dispose_session():
@@ -250,13 +257,13 @@ def create_workflow_execution(
                     session.add(workflow_to_incident_execution)
 
             session.commit()
-            return execution_id
         except IntegrityError:
             session.rollback()
             logger.debug(
                 f"Failed to create a new execution for workflow {workflow_id}. Constraint is met."
             )
             raise
+        return execution_id
 
 
 def get_mapping_rule_by_id(
@@ -998,6 +1005,118 @@ def finish_workflow_execution(tenant_id, workflow_id, execution_id, status, erro
                 "execution_time": execution_time,
             },
         )
+        if not workflow_execution.is_test_run:
+            _refresh_workflow_summary(session, tenant_id, workflow_id)
+
+
+def _set_workflow_summary_executions(session: Session, summary: WorkflowSummary):
+    executions = session.exec(
+        select(
+            WorkflowExecution.id,
+            WorkflowExecution.started,
+            WorkflowExecution.execution_time,
+            WorkflowExecution.status,
+        )
+        .where(
+            WorkflowExecution.tenant_id == summary.tenant_id,
+            WorkflowExecution.workflow_id == summary.workflow_id,
+            WorkflowExecution.is_test_run == False,
+        )
+        .order_by(desc(WorkflowExecution.started))
+        .limit(WORKFLOW_SUMMARY_EXECUTIONS)
+    ).all()
+    summary.last_executions = [
+        {
+            "id": id_,
+            "started": started.isoformat() if started else None,
+            "execution_time": execution_time,
+            "status": status,
+        }
+        for id_, started, execution_time, status in executions
+    ]
+    last = executions[0] if executions else (None, None, None, None)
+    (
+        summary.last_execution_id,
+        summary.last_execution_started,
+        summary.last_execution_time,
+        summary.last_execution_status,
+    ) = last
+
+
+def update_workflow_summary(
+    tenant_id: str,
+    workflow_id: str,
+    definition: Optional[dict] = None,
+    session: Optional[Session] = None,
+    max_retries: int = 3,
+) -> Optional[WorkflowSummary]:
+    """
+    Updates the summary of a workflow: its latest executions and, when given, the
+    fields computed from its definition (revision included). Creates it if missing.
+    """
+    with existed_or_new_session(session) as session:
+        for _ in range(max_retries):
+            summary = session.get(WorkflowSummary, workflow_id)
+            if summary is None:
+                summary = WorkflowSummary(workflow_id=workflow_id, tenant_id=tenant_id)
+            for key, value in (definition or {}).items():
+                setattr(summary, key, value)
+            _set_workflow_summary_executions(session, summary)
+            session.add(summary)
+            try:
+                session.commit()
+                return summary
+            except IntegrityError:
+                # created concurrently, update that one
+                session.rollback()
+        return None
+
+
+def _refresh_workflow_summary(session: Session, tenant_id: str, workflow_id: str):
+    # the summary is a projection, a failure to update it must not fail the execution
+    try:
+        update_workflow_summary(tenant_id, workflow_id, session=session)
+    except Exception:
+        session.rollback()
+        logger.warning(
+            "Failed to update the workflow summary",
+            exc_info=True,
+            extra={"tenant_id": tenant_id, "workflow_id": workflow_id},
+        )
+
+
+def _build_stale_summary_query(tenant_id: str, *columns):
+    return (
+        select(*columns)
+        .outerjoin(WorkflowSummary, WorkflowSummary.workflow_id == Workflow.id)
+        .where(
+            Workflow.tenant_id == tenant_id,
+            Workflow.is_deleted == False,
+            Workflow.is_test == False,
+            or_(
+                WorkflowSummary.workflow_id.is_(None),
+                WorkflowSummary.revision != Workflow.revision,
+            ),
+        )
+    )
+
+
+def has_workflows_with_stale_summary(
+    tenant_id: str, session: Optional[Session] = None
+) -> bool:
+    """Whether get_workflows_with_stale_summary would return anything, without loading it."""
+    with existed_or_new_session(session) as session:
+        return session.query(
+            exists(_build_stale_summary_query(tenant_id, Workflow.id))
+        ).scalar()
+
+
+def get_workflows_with_stale_summary(
+    tenant_id: str, session: Optional[Session] = None
+) -> List[Workflow]:
+    """Workflows with no summary or a summary computed from another revision."""
+    with existed_or_new_session(session) as session:
+        return session.exec(_build_stale_summary_query(tenant_id, Workflow)).all()
 
 
 def get_workflow_executions(
@@ -1309,6 +1428,7 @@ def _enrich_entity(
             .values(enrichments=new_enrichment_data)
         )
         session.execute(stmt)
+        refresh_last_alerts_state(session, tenant_id, [fingerprint])
         if audit_enabled:
             # add audit event
             audit = AlertAudit(
@@ -1331,6 +1451,8 @@ def _enrich_entity(
                 enrichments=enrichments,
             )
             session.add(alert_enrichment)
+            session.flush()
+            refresh_last_alerts_state(session, tenant_id, [fingerprint])
             # add audit event
             if audit_enabled:
                 audit = AlertAudit(
@@ -1437,6 +1559,9 @@ def batch_enrich(
         # Bulk insert new enrichments
         if to_create:
             session.add_all(to_create)
+            session.flush()
+
+        refresh_last_alerts_state(session, tenant_id, fingerprints)
 
         # Bulk insert audit entries
         if audit_entries:
@@ -2016,14 +2141,49 @@ def get_previous_alert_by_fingerprint(tenant_id: str, fingerprint: str) -> Alert
 
 
 def get_alerts_by_status(
-    status: AlertStatus, session: Optional[Session] = None
+    status: AlertStatus,
+    session: Optional[Session] = None,
+    tenant_id: Optional[str] = None,
+    after: Optional[tuple[datetime, UUID]] = None,
+    limit: Optional[int] = None,
 ) -> List[Alert]:
+    """
+    Returns the last alerts whose effective status is the given one, of a single tenant
+    if `tenant_id` is set.
+
+    The alerts are ordered by (timestamp, id), pass the (timestamp, id) of the last alert
+    of a page as `after` to get the next one.
+    """
     with existed_or_new_session(session) as session:
-        status_field = get_json_extract_field(session, Alert.event, "status")
+        # the indexed effective status, see get_effective_alert_state
         query = (
-            select(Alert).
-            where(status_field == status.value)
+            select(Alert)
+            .join(
+                LastAlert,
+                and_(
+                    LastAlert.tenant_id == Alert.tenant_id,
+                    LastAlert.alert_id == Alert.id,
+                ),
+            )
+            .where(LastAlert.status == status.value)
         )
+        if tenant_id is not None:
+            query = query.where(LastAlert.tenant_id == tenant_id)
+        if after is not None:
+            after_timestamp, after_id = after
+            query = query.where(
+                or_(
+                    LastAlert.timestamp > after_timestamp,
+                    and_(
+                        LastAlert.timestamp == after_timestamp,
+                        LastAlert.alert_id > after_id,
+                    ),
+                )
+            )
+        if after is not None or limit is not None:
+            query = query.order_by(LastAlert.timestamp, LastAlert.alert_id)
+        if limit is not None:
+            query = query.limit(limit)
         return session.exec(query).all()
 
 
@@ -2844,25 +3004,48 @@ def get_last_alert_hashes_by_fingerprints(
     tenant_id, fingerprints: list[str]
 ) -> dict[str, str | None]:
     # get the last alert hashes for a list of fingerprints
-    # to check deduplication
+    # to check deduplication, the cached ones are not read from the db
+    alert_hash_dict = get_alert_hash_cache().get_many(tenant_id, fingerprints)
+    missing_fingerprints = [
+        fingerprint for fingerprint in fingerprints if fingerprint not in alert_hash_dict
+    ]
+    if not missing_fingerprints:
+        return alert_hash_dict
+
     with Session(engine) as session:
         query = (
             select(LastAlert.fingerprint, LastAlert.alert_hash)
             .where(LastAlert.tenant_id == tenant_id)
-            .where(LastAlert.fingerprint.in_(fingerprints))
+            .where(LastAlert.fingerprint.in_(missing_fingerprints))
         )
 
         results = session.execute(query).all()
 
     # Create a dictionary from the results
-    alert_hash_dict = {
-        fingerprint: alert_hash
-        for fingerprint, alert_hash in results
-        if alert_hash is not None
-    }
+    alert_hash_dict.update(
+        {
+            fingerprint: alert_hash
+            for fingerprint, alert_hash in results
+            if alert_hash is not None
+        }
+    )
     return alert_hash_dict
 
 
+def get_last_alerts_max_timestamp(
+    tenant_id: str, fingerprints: list[str], session: Optional[Session] = None
+) -> Optional[datetime]:
+    # the timestamp of the most recent alert among the given fingerprints
+    if not fingerprints:
+        return None
+    with existed_or_new_session(session) as session:
+        return session.exec(
+            select(func.max(LastAlert.timestamp))
+            .where(LastAlert.tenant_id == tenant_id)
+            .where(LastAlert.fingerprint.in_(fingerprints))
+        ).one()
+
+
 def update_key_last_used(
     tenant_id: str,
     reference_id: str,
@@ -2915,6 +3098,33 @@ def update_key_last_used(
                     raise
 
 
+def update_keys_last_used(last_used: Dict[Tuple[str, str], datetime]):
+    """
+    Updates the last used time of several API keys, with one batched statement.
+
+    Args:
+        last_used: the last use of every key, by (tenant_id, reference_id)
+    """
+    api_keys = TenantApiKey.__table__
+    with Session(engine) as session:
+        # every key gets its own last use, executed as a single executemany
+        session.execute(
+            update(api_keys)
+            .where(api_keys.c.tenant_id == bindparam("key_tenant_id"))
+            .where(api_keys.c.reference_id == bindparam("key_reference_id"))
+            .values(last_used=bindparam("key_last_used")),
+            [
+                {
+                    "key_tenant_id": tenant_id,
+                    "key_reference_id": reference_id,
+                    "key_last_used": used_at,
+                }
+                for (tenant_id, reference_id), used_at in last_used.items()
+            ],
+        )
+        session.commit()
+
+
 def get_linked_providers(tenant_id: str) -> List[Tuple[str, str, datetime]]:
     # Alert table may be too huge, so cutting the query without mercy
     LIMIT_BY_ALERTS = 10000
@@ -2962,6 +3172,202 @@ def is_linked_provider(tenant_id: str, provider_id: str) -> bool:
     return linked_provider is not None
 
 
+# tables aggregated per hour by the dashboard widgets:
+# metric -> (model, timestamp column, whether the rows are grouped by provider)
+DASHBOARD_ROLLUP_METRICS = {
+    "alerts": (Alert, Alert.timestamp, True),
+    "workflow_executions": (WorkflowExecution, WorkflowExecution.started, False),
+}
+DASHBOARD_ROLLUP_COVERAGE_KEY = "dashboard_rollup_coverage:{metric}"
+HOUR_BUCKET_FORMAT = "%Y-%m-%d %H"
+
+
+def floor_hour(timestamp: datetime) -> datetime:
+    return timestamp.replace(minute=0, second=0, microsecond=0)
+
+
+def _ceil_hour(timestamp: datetime) -> datetime:
+    hour = floor_hour(timestamp)
+    return hour if hour == timestamp else hour + timedelta(hours=1)
+
+
+def _as_datetime(value) -> datetime | None:
+    # sqlite returns aggregated timestamps as strings
+    return datetime.fromisoformat(value) if isinstance(value, str) else value
+
+
+def query_hourly_counts(
+    session: Session,
+    metric: str,
+    lower: datetime | None = None,
+    upper: datetime | None = None,
+    tenant_id: str | None = None,
+    upper_inclusive: bool = False,
+) -> list[tuple]:
+    """
+    Aggregates the rows of a dashboard metric per hour straight from its table.
+
+    Returns (tenant_id, provider_id, provider_type, hour, count, last timestamp) tuples
+    for the rows with lower <= timestamp < upper (<= with upper_inclusive).
+    """
+    model, timestamp_column, by_provider = DASHBOARD_ROLLUP_METRICS[metric]
+    dimensions = [model.provider_id, model.provider_type] if by_provider else []
+    query = select(
+        model.tenant_id,
+        *dimensions,
+        get_hour_bucket_field(session, timestamp_column).label("bucket"),
+        func.count().label("hits"),
+        func.max(timestamp_column).label("last_timestamp"),
+    )
+    if tenant_id:
+        query = query.where(model.tenant_id == tenant_id)
+    if lower:
+        query = query.where(timestamp_column >= lower)
+    if upper:
+        query = query.where(
+            timestamp_column <= upper if upper_inclusive else timestamp_column < upper
+        )
+    query = query.group_by(model.tenant_id, *dimensions, "bucket")
+
+    counts = []
+    for row in session.execute(query).all():
+        row_tenant_id, *provider, bucket, hits, last_timestamp = row
+        provider_id, provider_type = provider if by_provider else (None, None)
+        counts.append(
+            (
+                row_tenant_id,
+                provider_id,
+                provider_type,
+                datetime.strptime(bucket, HOUR_BUCKET_FORMAT),
+                hits,
+                _as_datetime(last_timestamp),
+            )
+        )
+    return counts
+
+
+def get_dashboard_rollup_coverage(
+    session: Session, metric: str
+) -> tuple[datetime, datetime] | None:
+    """The [from, until) range of hours rolled up for every tenant, if any."""
+    system = session.exec(
+        select(System).where(
+            System.name == DASHBOARD_ROLLUP_COVERAGE_KEY.format(metric=metric)
+        )
+    ).first()
+    if not system:
+        return None
+    coverage = json.loads(system.value)
+    return (
+        datetime.fromisoformat(coverage["from"]),
+        datetime.fromisoformat(coverage["until"]),
+    )
+
+
+def set_dashboard_rollup_coverage(
+    session: Session, metric: str, covered_from: datetime, covered_until: datetime
+):
+    name = DASHBOARD_ROLLUP_COVERAGE_KEY.format(metric=metric)
+    system = session.exec(select(System).where(System.name == name)).first()
+    if not system:
+        system = System(id=str(uuid4()), name=name, value="")
+    system.value = json.dumps(
+        {"from": covered_from.isoformat(), "until": covered_until.isoformat()}
+    )
+    session.add(system)
+
+
+def rollup_dashboard_hours(
+    session: Session,
+    metric: str,
+    start: datetime,
+    end: datetime,
+    tenant_id: str | None = None,
+) -> int:
+    """
+    Recomputes the rollups of the hours in [start, end) from the table, for one tenant
+    or all of them. The caller commits.
+    """
+    query = (
+        delete(DashboardRollup)
+        .where(DashboardRollup.metric == metric)
+        .where(DashboardRollup.bucket >= start)
+        .where(DashboardRollup.bucket < end)
+    )
+    if tenant_id:
+        query = query.where(DashboardRollup.tenant_id == tenant_id)
+    session.execute(query)
+
+    rows = query_hourly_counts(session, metric, start, end, tenant_id)
+    session.add_all(
+        DashboardRollup(
+            tenant_id=row_tenant_id,
+            metric=metric,
+            bucket=bucket,
+            dimension=json.dumps([provider_id, provider_type]),
+            provider_id=provider_id,
+            provider_type=provider_type,
+            count=hits,
+            last_timestamp=last_timestamp,
+        )
+        for row_tenant_id, provider_id, provider_type, bucket, hits, last_timestamp in rows
+    )
+    return len(rows)
+
+
+def get_hourly_counts(
+    tenant_id: str,
+    metric: str,
+    lower: datetime | None,
+    upper: datetime | None = None,
+    use_rollups: bool | None = None,
+) -> list[tuple]:
+    """
+    Per hour counts of a dashboard metric for lower <= timestamp <= upper.
+
+    Returns (provider_id, provider_type, hour, count, last timestamp) tuples, an hour
+    may appear more than once. Whole hours covered by the rollups are read from them,
+    the partial hours at the edges of the range and the recent ones from the table.
+    """
+    if use_rollups is None:
+        use_rollups = KEEP_DASHBOARD_ROLLUPS_ENABLED
+    with Session(engine) as session:
+        coverage = get_dashboard_rollup_coverage(session, metric) if use_rollups else None
+        rollup_start = rollup_end = None
+        if coverage:
+            rollup_start = max(_ceil_hour(lower), coverage[0]) if lower else coverage[0]
+            rollup_end = min(floor_hour(upper), coverage[1]) if upper else coverage[1]
+
+        if not coverage or rollup_start >= rollup_end:
+            rows = query_hourly_counts(
+                session, metric, lower, upper, tenant_id, upper_inclusive=True
+            )
+        else:
+            rows = session.exec(
+                select(
+                    DashboardRollup.tenant_id,
+                    DashboardRollup.provider_id,
+                    DashboardRollup.provider_type,
+                    DashboardRollup.bucket,
+                    DashboardRollup.count,
+                    DashboardRollup.last_timestamp,
+                )
+                .where(DashboardRollup.tenant_id == tenant_id)
+                .where(DashboardRollup.metric == metric)
+                .where(DashboardRollup.bucket >= rollup_start)
+                .where(DashboardRollup.bucket < rollup_end)
+            ).all()
+            if lower is None or lower < rollup_start:
+                rows += query_hourly_counts(
+                    session, metric, lower, rollup_start, tenant_id
+                )
+            rows += query_hourly_counts(
+                session, metric, rollup_end, upper, tenant_id, upper_inclusive=True
+            )
+
+    return [tuple(row[1:]) for row in rows]
+
+
 def get_provider_distribution(
     tenant_id: str,
     aggregate_all: bool = False,
@@ -2989,112 +3395,69 @@ def get_provider_distribution(
         - If no timestamp_filter is provided, defaults to the last 24 hours.
         - Supports MySQL, PostgreSQL, and SQLite for timestamp formatting.
     """
-    with Session(engine) as session:
-        twenty_four_hours_ago = datetime.utcnow() - timedelta(hours=24)
-        time_format = "%Y-%m-%d %H"
+    twenty_four_hours_ago = datetime.utcnow() - timedelta(hours=24)
+    time_format = "%Y-%m-%d %H"
 
-        filters = [Alert.tenant_id == tenant_id]
-
-        if timestamp_filter:
-            if timestamp_filter.lower_timestamp:
-                filters.append(Alert.timestamp >= timestamp_filter.lower_timestamp)
-            if timestamp_filter.upper_timestamp:
-                filters.append(Alert.timestamp <= timestamp_filter.upper_timestamp)
-        else:
-            filters.append(Alert.timestamp >= twenty_four_hours_ago)
+    if timestamp_filter:
+        rows = get_hourly_counts(
+            tenant_id,
+            "alerts",
+            timestamp_filter.lower_timestamp,
+            timestamp_filter.upper_timestamp,
+        )
+    else:
+        rows = get_hourly_counts(tenant_id, "alerts", twenty_four_hours_ago)
 
-        if session.bind.dialect.name == "mysql":
-            timestamp_format = func.date_format(Alert.timestamp, time_format)
-        elif session.bind.dialect.name == "postgresql":
-            # PostgreSQL requires a different syntax for the timestamp format
-            # cf: https://www.postgresql.org/docs/current/functions-formatting.html#FUNCTIONS-FORMATTING
-            timestamp_format = func.to_char(Alert.timestamp, "YYYY-MM-DD HH")
-        elif session.bind.dialect.name == "sqlite":
-            timestamp_format = func.strftime(time_format, Alert.timestamp)
+    if aggregate_all:
+        # Combined alert distribution across all providers
+        results = defaultdict(int)
+        for _, _, time, hits, _ in rows:
+            results[time.strftime(time_format)] += hits
 
-        if aggregate_all:
-            # Query for combined alert distribution across all providers
-            query = (
-                session.query(
-                    timestamp_format.label("time"), func.count().label("hits")
-                )
-                .filter(*filters)
-                .group_by("time")
-                .order_by("time")
+        # Create a complete list of timestamps within the specified range
+        distribution = []
+        current_time = timestamp_filter.lower_timestamp.replace(
+            minute=0, second=0, microsecond=0
+        )
+        while current_time <= timestamp_filter.upper_timestamp:
+            timestamp_str = current_time.strftime(time_format)
+            distribution.append(
+                {
+                    "timestamp": timestamp_str + ":00",
+                    "number": results.get(timestamp_str, 0),
+                }
             )
+            current_time += timedelta(hours=1)
+        return distribution
 
-            results = query.all()
-
-            results = {str(time): hits for time, hits in results}
+    # Alert distribution grouped by provider
+    provider_distribution = {}
 
-            # Create a complete list of timestamps within the specified range
-            distribution = []
-            current_time = timestamp_filter.lower_timestamp.replace(
-                minute=0, second=0, microsecond=0
-            )
-            while current_time <= timestamp_filter.upper_timestamp:
-                timestamp_str = current_time.strftime(time_format)
-                distribution.append(
-                    {
-                        "timestamp": timestamp_str + ":00",
-                        "number": results.get(timestamp_str, 0),
-                    }
-                )
-                current_time += timedelta(hours=1)
-            return distribution
+    for provider_id, provider_type, time, hits, last_alert_timestamp in rows:
+        provider_key = f"{provider_id}_{provider_type}"
 
+        if provider_key not in provider_distribution:
+            provider_distribution[provider_key] = {
+                "provider_id": provider_id,
+                "provider_type": provider_type,
+                "alert_last_24_hours": [{"hour": i, "number": 0} for i in range(24)],
+                "last_alert_received": last_alert_timestamp,
+            }
         else:
-            # Query for alert distribution grouped by provider
-            query = (
-                session.query(
-                    Alert.provider_id,
-                    Alert.provider_type,
-                    timestamp_format.label("time"),
-                    func.count().label("hits"),
-                    func.max(Alert.timestamp).label("last_alert_timestamp"),
-                )
-                .filter(*filters)
-                .group_by(Alert.provider_id, Alert.provider_type, "time")
-                .order_by(Alert.provider_id, Alert.provider_type, "time")
-            )
 
-            results = query.all()
-
-            provider_distribution = {}
-
-            for provider_id, provider_type, time, hits, last_alert_timestamp in results:
-                provider_key = f"{provider_id}_{provider_type}"
-                last_alert_timestamp = (
-                    datetime.fromisoformat(last_alert_timestamp)
-                    if isinstance(last_alert_timestamp, str)
-                    else last_alert_timestamp
-                )
-
-                if provider_key not in provider_distribution:
-                    provider_distribution[provider_key] = {
-                        "provider_id": provider_id,
-                        "provider_type": provider_type,
-                        "alert_last_24_hours": [
-                            {"hour": i, "number": 0} for i in range(24)
-                        ],
-                        "last_alert_received": last_alert_timestamp,
-                    }
-                else:
-
-                    provider_distribution[provider_key]["last_alert_received"] = max(
-                        provider_distribution[provider_key]["last_alert_received"],
-                        last_alert_timestamp,
-                    )
+            provider_distribution[provider_key]["last_alert_received"] = max(
+                provider_distribution[provider_key]["last_alert_received"],
+                last_alert_timestamp,
+            )
 
-                time = datetime.strptime(time, time_format)
-                index = int((time - twenty_four_hours_ago).total_seconds() // 3600)
+        index = int((time - twenty_four_hours_ago).total_seconds() // 3600)
 
-                if 0 <= index < 24:
-                    provider_distribution[provider_key]["alert_last_24_hours"][index][
-                        "number"
-                    ] += hits
+        if 0 <= index < 24:
+            provider_distribution[provider_key]["alert_last_24_hours"][index][
+                "number"
+            ] += hits
 
-            return provider_distribution
+    return provider_distribution
 
 
 def get_combined_workflow_execution_distribution(
@@ -3119,60 +3482,42 @@ def get_combined_workflow_execution_distribution(
         - If no timestamp_filter is provided, defaults to the last 24 hours.
         - Supports MySQL, PostgreSQL, and SQLite for timestamp formatting.
     """
-    with Session(engine) as session:
-        twenty_four_hours_ago = datetime.utcnow() - timedelta(hours=24)
-        time_format = "%Y-%m-%d %H"
-
-        filters = [WorkflowExecution.tenant_id == tenant_id]
-
-        if timestamp_filter:
-            if timestamp_filter.lower_timestamp:
-                filters.append(
-                    WorkflowExecution.started >= timestamp_filter.lower_timestamp
-                )
-            if timestamp_filter.upper_timestamp:
-                filters.append(
-                    WorkflowExecution.started <= timestamp_filter.upper_timestamp
-                )
-        else:
-            filters.append(WorkflowExecution.started >= twenty_four_hours_ago)
-
-        # Database-specific timestamp formatting
-        if session.bind.dialect.name == "mysql":
-            timestamp_format = func.date_format(WorkflowExecution.started, time_format)
-        elif session.bind.dialect.name == "postgresql":
-            timestamp_format = func.to_char(WorkflowExecution.started, "YYYY-MM-DD HH")
-        elif session.bind.dialect.name == "sqlite":
-            timestamp_format = func.strftime(time_format, WorkflowExecution.started)
+    time_format = "%Y-%m-%d %H"
 
-        # Query for combined execution count across all workflows
-        query = (
-            session.query(
-                timestamp_format.label("time"),
-                func.count().label("executions"),
-            )
-            .filter(*filters)
-            .group_by("time")
-            .order_by("time")
+    if timestamp_filter:
+        rows = get_hourly_counts(
+            tenant_id,
+            "workflow_executions",
+            timestamp_filter.lower_timestamp,
+            timestamp_filter.upper_timestamp,
+        )
+    else:
+        rows = get_hourly_counts(
+            tenant_id,
+            "workflow_executions",
+            datetime.utcnow() - timedelta(hours=24),
         )
 
-        results = {str(time): executions for time, executions in query.all()}
+    # Combined execution count across all workflows
+    results = defaultdict(int)
+    for _, _, time, executions, _ in rows:
+        results[time.strftime(time_format)] += executions
 
-        distribution = []
-        current_time = timestamp_filter.lower_timestamp.replace(
-            minute=0, second=0, microsecond=0
+    distribution = []
+    current_time = timestamp_filter.lower_timestamp.replace(
+        minute=0, second=0, microsecond=0
+    )
+    while current_time <= timestamp_filter.upper_timestamp:
+        timestamp_str = current_time.strftime(time_format)
+        distribution.append(
+            {
+                "timestamp": timestamp_str + ":00",
+                "number": results.get(timestamp_str, 0),
+            }
         )
-        while current_time <= timestamp_filter.upper_timestamp:
-            timestamp_str = current_time.strftime(time_format)
-            distribution.append(
-                {
-                    "timestamp": timestamp_str + ":00",
-                    "number": results.get(timestamp_str, 0),
-                }
-            )
-            current_time += timedelta(hours=1)
+        current_time += timedelta(hours=1)
 
-        return distribution
+    return distribution
 
 
 def get_incidents_created_distribution(
@@ -3575,6 +3920,17 @@ def get_tenants_configurations(only_with_config=False) -> dict:
     return tenants_configurations
 
 
+def get_tenant_configuration(tenant_id: str) -> dict | None:
+    """The configuration of a tenant, None if the tenant doesn't exist."""
+    with Session(engine) as session:
+        tenant = session.exec(
+            select(Tenant.id, Tenant.configuration).where(Tenant.id == tenant_id)
+        ).first()
+    if tenant is None:
+        return None
+    return tenant.configuration or {}
+
+
 def update_preset_options(tenant_id: str, preset_id: str, options: dict) -> Preset:
     if isinstance(preset_id, str):
         preset_id = __convert_to_uuid(preset_id)
@@ -4535,6 +4891,7 @@ def add_alerts_to_incident(
                             affected_services=new_affected_services,
                             severity=new_severity,
                             sources=new_sources,
+                            **_incident_resolution_state_columns(),
                         )
                     )
                     session.commit()
@@ -4789,6 +5146,7 @@ def remove_alerts_to_incident_by_incident_id(
                 affected_services=new_affected_services,
                 severity=new_severity,
                 sources=new_sources,
+                **_incident_resolution_state_columns(),
             )
         )
         session.commit()
@@ -5325,26 +5683,8 @@ def is_all_alerts_in_status(
 
     with existed_or_new_session(session) as session:
 
-        enriched_status_field = get_json_extract_field(
-            session, AlertEnrichment.enrichments, "status"
-        )
-        status_field = get_json_extract_field(session, Alert.event, "status")
-
-        subquery = (
-            select(
-                enriched_status_field.label("enriched_status"),
-                status_field.label("status"),
-            )
-            .select_from(LastAlert)
-            .join(Alert, LastAlert.alert_id == Alert.id)
-            .outerjoin(
-                AlertEnrichment,
-                and_(
-                    Alert.tenant_id == AlertEnrichment.tenant_id,
-                    Alert.fingerprint == AlertEnrichment.alert_fingerprint,
-                ),
-            )
-        )
+        # the effective status, enrichments over the event, see get_effective_alert_state
+        subquery = select(LastAlert.status).where(LastAlert.status != status.value)
 
         if fingerprints:
             subquery = subquery.where(LastAlert.fingerprint.in_(fingerprints))
@@ -5361,26 +5701,7 @@ def is_all_alerts_in_status(
                 LastAlertToIncident.incident_id == incident.id,
             )
 
-        subquery = subquery.subquery()
-
-        not_in_status_exists = session.query(
-            exists(
-                select(
-                    subquery.c.enriched_status,
-                    subquery.c.status,
-                )
-                .select_from(subquery)
-                .where(
-                    or_(
-                        subquery.c.enriched_status != status.value,
-                        and_(
-                            subquery.c.enriched_status.is_(None),
-                            subquery.c.status != status.value,
-                        ),
-                    )
-                )
-            )
-        ).scalar()
+        not_in_status_exists = session.query(exists(subquery)).scalar()
 
         return not not_in_status_exists
 
@@ -5439,6 +5760,199 @@ def is_edge_incident_alert_resolved(
         )
 
 
+def _linked_last_alerts(*columns):
+    """Selects from the last alerts linked to the incident of the enclosing statement."""
+    return (
+        select(*columns)
+        .select_from(LastAlert)
+        .join(
+            LastAlertToIncident,
+            and_(
+                LastAlertToIncident.tenant_id == LastAlert.tenant_id,
+                LastAlertToIncident.fingerprint == LastAlert.fingerprint,
+            ),
+        )
+        .where(
+            LastAlertToIncident.deleted_at == NULL_FOR_DELETED_AT,
+            LastAlertToIncident.incident_id == Incident.id,
+        )
+    )
+
+
+def _incident_resolution_state_columns() -> dict:
+    """
+    The resolution state of an incident computed from its linked last alerts: the
+    first alert is the earliest to fire, the last one the least recently updated.
+    """
+    return {
+        "resolved_alerts_count": _linked_last_alerts(func.count())
+        .where(LastAlert.status == AlertStatus.RESOLVED.value)
+        .scalar_subquery(),
+        "total_alerts_count": _linked_last_alerts(func.count()).scalar_subquery(),
+        "first_alert_fingerprint": _linked_last_alerts(LastAlert.fingerprint)
+        .order_by(LastAlert.first_timestamp, LastAlert.fingerprint)
+        .limit(1)
+        .scalar_subquery(),
+        "last_alert_fingerprint": _linked_last_alerts(LastAlert.fingerprint)
+        .order_by(LastAlert.timestamp, LastAlert.fingerprint)
+        .limit(1)
+        .scalar_subquery(),
+    }
+
+
+def recompute_incidents_resolution_state(
+    session: Session, tenant_id: str, incident_ids: List[UUID]
+) -> None:
+    """
+    Recomputes the resolution state of the incidents from their linked alerts.
+
+    Must be called in the transaction that changed the links, the caller commits.
+    """
+    if not incident_ids:
+        return
+    session.exec(
+        update(Incident)
+        .where(Incident.tenant_id == tenant_id, Incident.id.in_(incident_ids))
+        .values(**_incident_resolution_state_columns())
+    )
+
+
+def get_incidents_resolution_drift(
+    session: Session, tenant_id: str, incident_ids: List[UUID]
+) -> List[UUID]:
+    """Returns the incidents whose stored resolution state differs from their alerts."""
+    if not incident_ids:
+        return []
+    computed = _incident_resolution_state_columns()
+    rows = session.exec(
+        select(
+            Incident.id,
+            Incident.resolved_alerts_count,
+            Incident.total_alerts_count,
+            Incident.first_alert_fingerprint,
+            Incident.last_alert_fingerprint,
+            *computed.values(),
+        ).where(Incident.tenant_id == tenant_id, Incident.id.in_(incident_ids))
+    ).all()
+    return [row[0] for row in rows if tuple(row[1:5]) != tuple(row[5:])]
+
+
+def update_incidents_resolution_state(
+    session: Session,
+    tenant_id: str,
+    status_changes: Dict[str, Tuple[Optional[str], Optional[str]]],
+    updated_fingerprints: Optional[List[str]] = None,
+) -> None:
+    """
+    Keeps the resolution state of the incidents linked to the given last alerts in
+    sync with their changes.
+
+    Args:
+        status_changes: fingerprint -> (previous status, status) of the last alerts
+            whose effective status changed
+        updated_fingerprints: last alerts replaced by a newer alert, which may no
+            longer be the least recently updated alert of their incidents
+
+    Must be called in the transaction that changed the last alerts, the caller commits.
+    """
+    updated_fingerprints = set(updated_fingerprints or [])
+    fingerprints = set(status_changes) | updated_fingerprints
+    if not fingerprints:
+        return
+
+    links = session.exec(
+        select(
+            LastAlertToIncident.fingerprint,
+            Incident.id,
+            Incident.last_alert_fingerprint,
+        )
+        .join(Incident, Incident.id == LastAlertToIncident.incident_id)
+        .where(
+            LastAlertToIncident.tenant_id == tenant_id,
+            LastAlertToIncident.deleted_at == NULL_FOR_DELETED_AT,
+            LastAlertToIncident.fingerprint.in_(fingerprints),
+        )
+    ).all()
+
+    resolved = AlertStatus.RESOLVED.value
+    deltas = defaultdict(int)
+    to_recompute = set()
+    for fingerprint, incident_id, last_alert_fingerprint in links:
+        if fingerprint in status_changes:
+            previous_status, status = status_changes[fingerprint]
+            deltas[incident_id] += (status == resolved) - (previous_status == resolved)
+        if (
+            fingerprint in updated_fingerprints
+            and fingerprint == last_alert_fingerprint
+        ):
+            to_recompute.add(incident_id)
+
+    incidents_by_delta = defaultdict(list)
+    for incident_id, delta in deltas.items():
+        if delta and incident_id not in to_recompute:
+            incidents_by_delta[delta].append(incident_id)
+    for delta, incident_ids in incidents_by_delta.items():
+        session.exec(
+            update(Incident)
+            .where(Incident.tenant_id == tenant_id, Incident.id.in_(incident_ids))
+            .values(resolved_alerts_count=Incident.resolved_alerts_count + delta)
+        )
+    recompute_incidents_resolution_state(session, tenant_id, list(to_recompute))
+
+
+def is_incident_resolution_required(
+    incident: Incident, session: Optional[Session] = None
+) -> bool:
+    """
+    Whether the alerts of the incident resolve it according to its resolve_on,
+    read from the resolution state maintained on the incident.
+    """
+    if incident.resolve_on not in (
+        ResolveOn.ALL.value,
+        ResolveOn.FIRST.value,
+        ResolveOn.LAST.value,
+    ):
+        return False
+
+    with existed_or_new_session(session) as session:
+        first_alert = aliased(LastAlert)
+        last_alert = aliased(LastAlert)
+        state = session.exec(
+            select(
+                Incident.alerts_count,
+                Incident.resolved_alerts_count,
+                Incident.total_alerts_count,
+                first_alert.status,
+                last_alert.status,
+            )
+            .select_from(Incident)
+            .outerjoin(
+                first_alert,
+                and_(
+                    first_alert.tenant_id == Incident.tenant_id,
+                    first_alert.fingerprint == Incident.first_alert_fingerprint,
+                ),
+            )
+            .outerjoin(
+                last_alert,
+                and_(
+                    last_alert.tenant_id == Incident.tenant_id,
+                    last_alert.fingerprint == Incident.last_alert_fingerprint,
+                ),
+            )
+            .where(Incident.id == incident.id)
+        ).first()
+
+    if not state or not state.alerts_count:
+        return False
+    alerts_count, resolved_count, total_count, first_status, last_status = state
+    if incident.resolve_on == ResolveOn.ALL.value:
+        return resolved_count == total_count
+    if incident.resolve_on == ResolveOn.FIRST.value:
+        return first_status == AlertStatus.RESOLVED.value
+    return last_status == AlertStatus.RESOLVED.value
+
+
 def get_alerts_metrics_by_provider(
     tenant_id: str,
     start_date: Optional[datetime] = None,
@@ -5705,11 +6219,81 @@ def get_last_alert_by_fingerprint(
         return session.exec(query).first()
 
 
+def refresh_last_alerts_state(
+    session: Session, tenant_id: str, fingerprints: list[str]
+) -> None:
+    """
+    Recomputes the effective status/severity/dismissal columns of the last alerts
+    with the given fingerprints from their event and current enrichments, and the
+    resolution state of their incidents.
+
+    Must be called in the same transaction that changed the enrichments, the caller commits.
+    """
+    if not fingerprints:
+        return
+    rows = session.exec(
+        select(
+            LastAlert.fingerprint,
+            LastAlert.status,
+            Alert.event,
+            AlertEnrichment.enrichments,
+        )
+        .select_from(LastAlert)
+        .join(
+            Alert,
+            and_(Alert.id == LastAlert.alert_id, Alert.tenant_id == LastAlert.tenant_id),
+        )
+        .outerjoin(
+            AlertEnrichment,
+            and_(
+                AlertEnrichment.tenant_id == LastAlert.tenant_id,
+                AlertEnrichment.alert_fingerprint == LastAlert.fingerprint,
+            ),
+        )
+        .where(LastAlert.tenant_id == tenant_id)
+        .where(LastAlert.fingerprint.in_(fingerprints))
+    ).all()
+    if not rows:
+        return
+    states = {
+        fingerprint: (previous_status, get_effective_alert_state(event, enrichments))
+        for fingerprint, previous_status, event, enrichments in rows
+    }
+    session.execute(
+        update(LastAlert),
+        [
+            {"tenant_id": tenant_id, "fingerprint": fingerprint, **state}
+            for fingerprint, (_, state) in states.items()
+        ],
+    )
+    update_incidents_resolution_state(
+        session,
+        tenant_id,
+        {
+            fingerprint: (previous_status, state["status"])
+            for fingerprint, (previous_status, state) in states.items()
+            if previous_status != state["status"]
+        },
+    )
+
+
+def _get_alert_state_with_enrichments(
+    session: Session, tenant_id: str, alert: Alert
+) -> dict:
+    enrichments = session.exec(
+        select(AlertEnrichment.enrichments)
+        .where(AlertEnrichment.tenant_id == tenant_id)
+        .where(AlertEnrichment.alert_fingerprint == alert.fingerprint)
+    ).first()
+    return get_effective_alert_state(alert.event, enrichments)
+
+
 def set_last_alert(
     tenant_id: str, alert: Alert, session: Optional[Session] = None, max_retries=3
 ) -> None:
     fingerprint = alert.fingerprint
     logger.info(f"Setting last alert for `{fingerprint}`")
+    alert_hash_cache = get_alert_hash_cache()
     with existed_or_new_session(session) as session:
         for attempt in range(max_retries):
             logger.info(
@@ -5740,13 +6324,31 @@ def set_last_alert(
                             "fingerprint": fingerprint,
                         },
                     )
+                    previous_status = last_alert.status
                     last_alert.timestamp = alert.timestamp
                     last_alert.alert_id = alert.id
                     last_alert.alert_hash = alert.alert_hash
+                    for key, value in _get_alert_state_with_enrichments(
+                        session, tenant_id, alert
+                    ).items():
+                        setattr(last_alert, key, value)
                     session.add(last_alert)
+                    session.flush()
+                    update_incidents_resolution_state(
+                        session,
+                        tenant_id,
+                        (
+                            {fingerprint: (previous_status, last_alert.status)}
+                            if previous_status != last_alert.status
+                            else {}
+                        ),
+                        updated_fingerprints=[fingerprint],
+                    )
+                    is_new_last_alert = True
 
                 elif not last_alert:
                     logger.info(f"No last alert for `{fingerprint}`, creating new")
+                    is_new_last_alert = True
                     last_alert = LastAlert(
                         tenant_id=tenant_id,
                         fingerprint=alert.fingerprint,
@@ -5754,10 +6356,22 @@ def set_last_alert(
                         first_timestamp=alert.timestamp,
                         alert_id=alert.id,
                         alert_hash=alert.alert_hash,
+                        **_get_alert_state_with_enrichments(session, tenant_id, alert),
                     )
 
+                else:
+                    # a newer alert is already the last one
+                    is_new_last_alert = False
+
                 session.add(last_alert)
+                if is_new_last_alert:
+                    # deduplication must not see the previous hash once this commits
+                    alert_hash_cache.invalidate(tenant_id, fingerprint, alert.timestamp)
                 session.commit()
+                if is_new_last_alert:
+                    alert_hash_cache.set(
+                        tenant_id, fingerprint, alert.alert_hash, alert.timestamp
+                    )
                 break
             except OperationalError as ex:
                 if "no such savepoint" in ex.args[0]:
@@ -5798,20 +6412,6 @@ def set_last_alert(
             # break the retry loop
             break
 
-def set_maintenance_windows_trace(alert: Alert, maintenance_w: MaintenanceWindowRule,  session: Optional[Session] = None):
-    mw_id = str(maintenance_w.id)
-    if mw_id in alert.event.get("maintenance_windows_trace", []):
-        return
-    with existed_or_new_session(session) as session:
-        if "maintenance_windows_trace" in alert.event:
-            if mw_id not in alert.event['maintenance_windows_trace']:
-                alert.event['maintenance_windows_trace'].append(mw_id)
-        else:
-            alert.event['maintenance_windows_trace'] = [mw_id]
-        flag_modified(alert, "event")
-        session.add(alert)
-        session.commit()
-
 def get_provider_logs(
     tenant_id: str, provider_id: str, limit: int = 100
 ) -> List[ProviderExecutionLog]:
@@ -5971,25 +6571,3 @@ def get_maintenance_windows_started(session: Optional[Session] = None) -> List[M
             .where(MaintenanceWindowRule.start_time <= datetime.now(tz=timezone.utc))
         )
         return session.exec(query).all()
-
-def recover_prev_alert_status(alert: Alert, session: Optional[Session] = None):
-    """
-    It'll restore the previous status of the alert.
-    """
-    with existed_or_new_session(session) as session:
-        try:
-            status = alert.event.get("status")
-            prev_status = alert.event.get("previous_status")
-            alert.event["status"] = prev_status
-            alert.event["previous_status"] = status
-        except KeyError:
-            logger.warning(f"Alert {alert.id} does not have previous status.")
-        query = (
-            update(Alert)
-            .where(Alert.id == alert.id)
-            .values(
-                event = alert.event
-            )
-        )
-        session.exec(query)
-        session.commit()
@@ -0,0 +1,203 @@
+"""
+Query and connection pool instrumentation of the database engine.
+
+- Query latency per normalized statement (`keep_db_query_duration_seconds`), the
+  statement label is a short fingerprint of the SQL with literals, parameters and
+  comments removed. The first time a fingerprint is seen it is logged with its SQL.
+- A sampled slow query log, with the bound parameters redacted and the calling
+  function, also added as an event to the current OpenTelemetry span.
+- Connection pool checkout wait time, checkout timeouts and in use / idle / overflow
+  connections, so pool starvation shows in the metrics.
+"""
+
+import hashlib
+import logging
+import random
+import re
+import sys
+import threading
+import time
+from functools import lru_cache
+
+from opentelemetry import trace
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+from keep.api.core.config import config
+from keep.api.core.metrics import (
+    db_pool_checkout_timeouts_total,
+    db_pool_checkout_wait,
+    db_pool_connections,
+    db_query_duration,
+    db_slow_queries_total,
+)
+
+KEEP_DB_INSTRUMENTATION_ENABLED = config(
+    "KEEP_DB_INSTRUMENTATION_ENABLED", default=True, cast=bool
+)
+# queries slower than this (in seconds) are logged, 0 disables the slow query log
+KEEP_DB_SLOW_QUERY_THRESHOLD = config(
+    "KEEP_DB_SLOW_QUERY_THRESHOLD", default=1.0, cast=float
+)
+# share of the slow queries that are logged
+KEEP_DB_SLOW_QUERY_SAMPLE_RATE = config(
+    "KEEP_DB_SLOW_QUERY_SAMPLE_RATE", default=1.0, cast=float
+)
+# distinct statement fingerprints with their own label, the others are "other"
+KEEP_DB_METRICS_MAX_STATEMENTS = config(
+    "KEEP_DB_METRICS_MAX_STATEMENTS", default=500, cast=int
+)
+SLOW_QUERY_MAX_STATEMENT_LENGTH = 2000
+
+logger = logging.getLogger(__name__)
+
+_COMMENTS = re.compile(r"/\*.*?\*/|--[^\n]*", re.DOTALL)
+_STRINGS = re.compile(r"'(?:[^']|'')*'")
+_NUMBERS = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_PARAMETERS = re.compile(r"%\(\w+\)s|%s|:\w+|\$\d+|\?")
+_PARAMETER_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+# frames of these modules are skipped when looking for the caller of a slow query
+_INTERNAL_MODULES = (
+    "sqlalchemy",
+    "sqlmodel",
+    "opentelemetry",
+    "contextlib",
+    __name__,
+)
+
+
+@lru_cache(maxsize=2048)
+def normalize_statement(statement: str) -> str:
+    """The statement without comments, literals and parameter values."""
+    statement = _COMMENTS.sub(" ", statement)
+    statement = _STRINGS.sub("?", statement)
+    statement = _PARAMETERS.sub("?", statement)
+    statement = _NUMBERS.sub("?", statement)
+    statement = _PARAMETER_LISTS.sub("(?)", statement)
+    return _WHITESPACE.sub(" ", statement).strip()
+
+
+@lru_cache(maxsize=2048)
+def get_statement_fingerprint(statement: str) -> tuple[str, str, str]:
+    """Returns the (operation, fingerprint, normalized statement) of a statement."""
+    normalized = normalize_statement(statement)
+    operation = normalized.split(" ", 1)[0].upper() if normalized else "UNKNOWN"
+    fingerprint = hashlib.sha1(normalized.encode()).hexdigest()[:12]
+    return operation, fingerprint, normalized
+
+
+_known_fingerprints: set[str] = set()
+_known_fingerprints_lock = threading.Lock()
+
+
+def _get_statement_label(fingerprint: str, normalized: str) -> str:
+    if fingerprint in _known_fingerprints:
+        return fingerprint
+    with _known_fingerprints_lock:
+        if fingerprint in _known_fingerprints:
+            return fingerprint
+        if len(_known_fingerprints) >= KEEP_DB_METRICS_MAX_STATEMENTS:
+            return "other"
+        _known_fingerprints.add(fingerprint)
+    logger.info(
+        "New database statement fingerprint",
+        extra={"statement_fingerprint": fingerprint, "statement": normalized},
+    )
+    return fingerprint
+
+
+def redact_parameters(parameters, executemany: bool = False):
+    """The shape of the bound parameters, without their values."""
+    if executemany:
+        return f"<{len(parameters)} parameter sets>"
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def get_caller() -> str:
+    """The first function outside of the database libraries on the stack."""
+    frame = sys._getframe(1)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if not module.startswith(_INTERNAL_MODULES):
+            return f"{module}.{frame.f_code.co_name}:{frame.f_lineno}"
+        frame = frame.f_back
+    return "unknown"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._keep_query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, "_keep_query_start", None)
+    if start is None:
+        return
+    duration = time.perf_counter() - start
+    operation, fingerprint, normalized = get_statement_fingerprint(statement)
+    label = _get_statement_label(fingerprint, normalized)
+    db_query_duration.labels(operation=operation, statement=label).observe(duration)
+
+    if not KEEP_DB_SLOW_QUERY_THRESHOLD or duration < KEEP_DB_SLOW_QUERY_THRESHOLD:
+        return
+    db_slow_queries_total.labels(operation=operation, statement=label).inc()
+    if random.random() >= KEEP_DB_SLOW_QUERY_SAMPLE_RATE:
+        return
+    caller = get_caller()
+    logger.warning(
+        "Slow database query",
+        extra={
+            "duration": round(duration, 3),
+            "statement_fingerprint": fingerprint,
+            "statement": normalized[:SLOW_QUERY_MAX_STATEMENT_LENGTH],
+            "parameters": redact_parameters(parameters, executemany),
+            "caller": caller,
+        },
+    )
+    trace.get_current_span().add_event(
+        "slow_query",
+        {
+            "db.duration": duration,
+            "db.statement_fingerprint": fingerprint,
+            "code.caller": caller,
+        },
+    )
+
+
+class InstrumentedQueuePool(QueuePool):
+    """A QueuePool measuring the checkout wait time and its connections."""
+
+    def _update_gauges(self):
+        db_pool_connections.labels(state="in_use").set(self.checkedout())
+        db_pool_connections.labels(state="idle").set(self.checkedin())
+        db_pool_connections.labels(state="overflow").set(max(self.overflow(), 0))
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            db_pool_checkout_timeouts_total.inc()
+            raise
+        finally:
+            db_pool_checkout_wait.observe(time.perf_counter() - start)
+        self._update_gauges()
+        return connection
+
+    def _do_return_conn(self, record):
+        super()._do_return_conn(record)
+        self._update_gauges()
+
+
+def instrument_engine(engine):
+    if not KEEP_DB_INSTRUMENTATION_ENABLED:
+        return engine
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    return engine
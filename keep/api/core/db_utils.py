@@ -25,6 +25,7 @@ from sqlmodel import Session, SQLModel, create_engine, select
 # This import is required to create the tables
 from keep.api.consts import RUNNING_IN_CLOUD_RUN
 from keep.api.core.config import config
+from keep.api.core.db_instrumentation import InstrumentedQueuePool, instrument_engine
 
 logger = logging.getLogger(__name__)
 
@@ -146,6 +147,7 @@ def create_db_engine():
             creator=__get_conn,
             echo=DB_ECHO,
             json_serializer=dumps,
+            poolclass=InstrumentedQueuePool,
             pool_size=DB_POOL_SIZE,
             max_overflow=DB_MAX_OVERFLOW,
             pool_recycle=DB_POOL_RECYCLE,
@@ -163,6 +165,12 @@ def create_db_engine():
             logger.info(f"Creating a connection pool with size {DB_POOL_SIZE}")
             engine = create_engine(
                 DB_CONNECTION_STRING,
+                # SQLite keeps its default pool, which rejects the pool arguments below
+                poolclass=(
+                    None
+                    if DB_CONNECTION_STRING.startswith("sqlite")
+                    else InstrumentedQueuePool
+                ),
                 pool_size=DB_POOL_SIZE,
                 max_overflow=DB_MAX_OVERFLOW,
                 pool_recycle=DB_POOL_RECYCLE,
@@ -183,7 +191,7 @@ def create_db_engine():
             echo=DB_ECHO,
             json_serializer=dumps,
         )
-    return engine
+    return instrument_engine(engine)
 
 
 def get_json_extract_field(session, base_field, key):
@@ -195,6 +203,17 @@ def get_json_extract_field(session, base_field, key):
         return func.json_extract(base_field, "$.{}".format(key))
 
 
+def get_hour_bucket_field(session: Session, column):
+    """The hour of a timestamp column, formatted as "YYYY-MM-DD HH" (24h) on every dialect."""
+    if session.bind.dialect.name == "mysql":
+        return func.date_format(column, "%Y-%m-%d %H")
+    elif session.bind.dialect.name == "postgresql":
+        return func.to_char(column, "YYYY-MM-DD HH24")
+    elif session.bind.dialect.name == "sqlite":
+        return func.strftime("%Y-%m-%d %H", column)
+    raise ValueError("Unsupported database dialect")
+
+
 def get_aggreated_field(session: Session, column_name: str, alias: str):
     if session.bind is None:
         raise ValueError("Session is not bound to a database")
@@ -1,5 +1,5 @@
 from typing import Any
-from sqlalchemy import CTE, func, literal, literal_column, select, text
+from sqlalchemy import CTE, case, func, literal, literal_column, select, true
 from keep.api.core.cel_to_sql.ast_nodes import DataType
 from keep.api.core.cel_to_sql.properties_metadata import (
     JsonFieldMapping,
@@ -112,7 +112,9 @@ class BaseFacetsQueryBuilder:
         sql_filter = None
 
         if facet_cel:
-            cel_to_sql_result = self.cel_to_sql.convert_to_sql_str_v2(facet_cel)
+            cel_to_sql_result = self.cel_to_sql.convert_to_sql_str_v2(
+                facet_cel, parameterized=True
+            )
             involved_fields = cel_to_sql_result.involved_fields
             sql_filter = cel_to_sql_result.sql
 
@@ -127,7 +129,7 @@ class BaseFacetsQueryBuilder:
         )
 
         if sql_filter:
-            base_query = base_query.filter(text(sql_filter))
+            base_query = base_query.filter(cel_to_sql_result.as_text_clause())
 
         if metadata.data_type == DataType.ARRAY:
             facet_source_subquery = self._build_facet_subquery_for_json_array(
@@ -163,6 +165,13 @@ class BaseFacetsQueryBuilder:
         if should_cast:
             return self._cast_column(select_expression, property_metadata.data_type)
 
+        if property_metadata.data_type == DataType.BOOLEAN:
+            # report boolean columns the same way as booleans extracted from JSON
+            return case(
+                (select_expression == true(), literal("true")),
+                else_=literal("false"),
+            )
+
         return select_expression
 
     def _cast_column(
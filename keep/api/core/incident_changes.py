@@ -0,0 +1,198 @@
+"""
+Deferred side effects of the changes to the alerts of an incident.
+
+Attaching alerts to an incident reindexes them in elastic, notifies the clients, sends a
+workflow event and may schedule a summary generation. During an alert storm
+`process_incident` and the correlation attach alerts to the same incident over and
+over, so the changes are coalesced per incident for KEEP_INCIDENT_CHANGE_WINDOW seconds
+and a background thread runs the side effects once for all of them.
+
+A stage that fails is retried, with the stages after it, up to
+KEEP_INCIDENT_CHANGE_MAX_ATTEMPTS times: every change is processed at least once,
+possibly more. The pending changes are processed at exit.
+"""
+
+import atexit
+import dataclasses
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+from uuid import UUID
+
+from keep.api.core.config import config
+from keep.api.core.metrics import incident_change_stage_duration, incident_changes_total
+
+# 0 runs the side effects right away, in the request or the task changing the incident
+KEEP_INCIDENT_CHANGE_WINDOW = config(
+    "KEEP_INCIDENT_CHANGE_WINDOW", default=1.0, cast=float
+)
+KEEP_INCIDENT_CHANGE_MAX_ATTEMPTS = config(
+    "KEEP_INCIDENT_CHANGE_MAX_ATTEMPTS", default=5, cast=int
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass
+class IncidentChange:
+    tenant_id: str
+    incident_id: UUID
+    fingerprints: Set[str]
+    generate_summary: bool = False
+    pusher_client: Any = None
+    due_at: float = 0
+    attempts: int = 0
+    # stages already run for the changes coalesced so far, skipped by a retry
+    completed_stages: Set[str] = dataclasses.field(default_factory=set)
+    durations: Dict[str, float] = dataclasses.field(default_factory=dict)
+
+    def merge(self, other: "IncidentChange"):
+        self.fingerprints |= other.fingerprints
+        self.generate_summary = self.generate_summary or other.generate_summary
+        self.pusher_client = other.pusher_client or self.pusher_client
+        self.completed_stages.clear()
+
+    def run_stage(self, stage: str, func: Callable, *args):
+        if stage in self.completed_stages:
+            return
+        start = time.perf_counter()
+        try:
+            func(*args)
+        finally:
+            self.durations[stage] = time.perf_counter() - start
+            incident_change_stage_duration.labels(stage=stage).observe(
+                self.durations[stage]
+            )
+        self.completed_stages.add(stage)
+
+
+class IncidentChangeDispatcher:
+    def __init__(
+        self,
+        handler: Callable[[IncidentChange], None],
+        window: float = KEEP_INCIDENT_CHANGE_WINDOW,
+        max_attempts: int = KEEP_INCIDENT_CHANGE_MAX_ATTEMPTS,
+    ):
+        self.handler = handler
+        self.window = window
+        self.max_attempts = max_attempts
+        self.pending: Dict[Tuple[str, UUID], IncidentChange] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def deferred(self) -> bool:
+        return self.window > 0
+
+    def submit(self, change: IncidentChange):
+        key = (change.tenant_id, change.incident_id)
+        with self._lock:
+            pending = self.pending.get(key)
+            if pending is not None:
+                pending.merge(change)
+                incident_changes_total.labels(result="coalesced").inc()
+                return
+            # the deadline of the first change, a storm doesn't postpone it
+            change.due_at = time.monotonic() + self.window
+            self.pending[key] = change
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="incident_changes", daemon=True
+                )
+                self._thread.start()
+        self._wakeup.set()
+
+    def _pop_due(self, now: float) -> list[IncidentChange]:
+        with self._lock:
+            due = [change for change in self.pending.values() if change.due_at <= now]
+            for change in due:
+                del self.pending[(change.tenant_id, change.incident_id)]
+            return due
+
+    def _next_due_at(self) -> Optional[float]:
+        with self._lock:
+            if not self.pending:
+                return None
+            return min(change.due_at for change in self.pending.values())
+
+    def _run(self):
+        while True:
+            next_due_at = self._next_due_at()
+            timeout = None if next_due_at is None else next_due_at - time.monotonic()
+            if timeout is None or timeout > 0:
+                self._wakeup.wait(timeout)
+                self._wakeup.clear()
+            for change in self._pop_due(time.monotonic()):
+                self.process(change)
+
+    def process(self, change: IncidentChange, retry: bool = True):
+        extra = {"tenant_id": change.tenant_id, "incident_id": change.incident_id}
+        change.attempts += 1
+        try:
+            self.handler(change)
+        except Exception:
+            if not retry or change.attempts >= self.max_attempts:
+                incident_changes_total.labels(result="failed").inc()
+                logger.exception(
+                    "Failed to process incident change, giving up",
+                    extra={**extra, "attempts": change.attempts},
+                )
+                return
+            incident_changes_total.labels(result="retried").inc()
+            logger.warning(
+                "Failed to process incident change, retrying",
+                exc_info=True,
+                extra={**extra, "attempts": change.attempts},
+            )
+            self._retry(change)
+            return
+        incident_changes_total.labels(result="processed").inc()
+        logger.info(
+            "Incident change processed",
+            extra={
+                **extra,
+                "alerts": len(change.fingerprints),
+                "durations": change.durations,
+            },
+        )
+
+    def _retry(self, change: IncidentChange):
+        key = (change.tenant_id, change.incident_id)
+        with self._lock:
+            pending = self.pending.get(key)
+            if pending is not None:
+                # changed meanwhile, every stage runs again for the newer change
+                pending.merge(change)
+                return
+            change.due_at = time.monotonic() + self.window * 2**change.attempts
+            self.pending[key] = change
+        self._wakeup.set()
+
+    def flush(self):
+        """Processes the pending changes now, once."""
+        with self._lock:
+            pending, self.pending = list(self.pending.values()), {}
+        for change in pending:
+            self.process(change, retry=False)
+
+
+_dispatcher: IncidentChangeDispatcher | None = None
+_lock = threading.Lock()
+
+
+def _process_incident_change(change: IncidentChange):
+    from keep.api.bl.incidents_bl import IncidentBl
+
+    IncidentBl.process_incident_change(change)
+
+
+def get_incident_change_dispatcher() -> IncidentChangeDispatcher:
+    global _dispatcher
+    if _dispatcher is None:
+        with _lock:
+            if _dispatcher is None:
+                _dispatcher = IncidentChangeDispatcher(_process_incident_change)
+                atexit.register(_dispatcher.flush)
+    return _dispatcher
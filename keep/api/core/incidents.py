@@ -1,8 +1,9 @@
 import logging
 from datetime import datetime, timedelta, timezone
-from typing import List, Optional, Tuple
+from typing import Iterator, List, Optional, Tuple
+from uuid import UUID
 
-from sqlalchemy import String, and_, case, cast, func, select
+from sqlalchemy import String, and_, case, cast, func, or_, select
 from sqlmodel import Session, col, text
 from sqlalchemy.orm import foreign, aliased
 
@@ -19,7 +20,11 @@ from keep.api.core.cel_to_sql.sql_providers.base import CelToSqlException
 from keep.api.core.cel_to_sql.sql_providers.get_cel_to_sql_provider_for_dialect import (
     get_cel_to_sql_provider,
 )
-from keep.api.core.db import engine, enrich_incidents_with_alerts
+from keep.api.core.db import (
+    engine,
+    enrich_incidents_with_alerts,
+    existed_or_new_session,
+)
 from keep.api.core.facets import get_facet_options, get_facets
 from keep.api.models.db.alert import (
     Alert,
@@ -30,12 +35,35 @@ from keep.api.models.db.alert import (
 )
 from keep.api.models.db.facet import FacetType
 from keep.api.models.facet import FacetDto, FacetOptionDto, FacetOptionsQueryDto
-from keep.api.models.incident import IncidentSorting
+from keep.api.models.incident import IncidentDto, IncidentSorting
 from keep.api.models.query import SortOptionsDto
 from keep.api.core.cel_to_sql.ast_nodes import DataType
+from keep.api.utils.export_helpers import (
+    EXPORT_BATCH_SIZE,
+    EXPORT_CURSOR_FIELD,
+    decode_export_cursor,
+    encode_export_cursor,
+)
 
 logger = logging.getLogger(__name__)
 
+# the CSV columns of an incidents export when none are requested
+INCIDENT_EXPORT_COLUMNS = [
+    "id",
+    "user_generated_name",
+    "ai_generated_name",
+    "status",
+    "severity",
+    "assignee",
+    "alerts_count",
+    "alert_sources",
+    "services",
+    "creation_time",
+    "start_time",
+    "last_seen_time",
+    "end_time",
+]
+
 incident_field_configurations = [
     FieldMappingConfiguration(
         map_from_pattern="id", map_to=["incident.id"], data_type=DataType.UUID
@@ -204,7 +232,9 @@ def __build_base_incident_query(
     is_visible_filter_present = False
 
     if cel:
-        cel_to_sql_result = cel_to_sql_instance.convert_to_sql_str_v2(cel)
+        cel_to_sql_result = cel_to_sql_instance.convert_to_sql_str_v2(
+            cel, parameterized=True
+        )
         sql_filter = cel_to_sql_result.sql
         involved_fields = cel_to_sql_result.involved_fields
         fetch_alerts = next(
@@ -297,7 +327,7 @@ def __build_base_incident_query(
             Incident.is_visible == True
         )
     if sql_filter:
-        sql_query = sql_query.where(text(sql_filter))
+        sql_query = sql_query.where(cel_to_sql_result.as_text_clause())
 
     return {
         "query": sql_query,
@@ -546,6 +576,98 @@ def get_last_incidents_by_cel(
     return incidents, total_count
 
 
+def build_incidents_export_query(
+    tenant_id: str,
+    cel: Optional[str] = None,
+    cursor: Optional[str] = None,
+    is_candidate: bool = False,
+    allowed_incident_ids: Optional[List[str]] = None,
+):
+    """
+    Builds the query of an incidents export: the incidents matching the CEL
+    expression, newest first, after the export cursor.
+
+    Raises:
+        CelToSqlException: if the CEL expression can't be translated
+        InvalidExportCursor: if the cursor is malformed
+    """
+    select_args = [Incident, incident_enrichment]
+    built_query_result = __build_base_incident_query(
+        tenant_id=tenant_id, cel=cel, select_args=select_args
+    )
+    sql_query = built_query_result["query"]
+
+    if built_query_result["fetch_alerts"]:
+        # an incident is joined once per alert, filter on the ids instead
+        filtered_ids = __build_base_incident_query(
+            tenant_id=tenant_id, cel=cel, select_args=[Incident.id]
+        )["query"].subquery()
+        sql_query = (
+            select(*select_args)
+            .select_from(Incident)
+            .outerjoin(
+                incident_enrichment,
+                and_(
+                    Incident.tenant_id == incident_enrichment.tenant_id,
+                    cast(col(Incident.id), String)
+                    == foreign(incident_enrichment.alert_fingerprint),
+                ),
+            )
+            .where(Incident.id.in_(select(filtered_ids.c.id)))
+        )
+
+    sql_query = sql_query.filter(Incident.is_candidate == is_candidate)
+    if allowed_incident_ids:
+        sql_query = sql_query.filter(Incident.id.in_(allowed_incident_ids))
+
+    if cursor:
+        creation_time, incident_id = decode_export_cursor(
+            cursor, datetime.fromisoformat, UUID
+        )
+        sql_query = sql_query.where(
+            or_(
+                Incident.creation_time < creation_time,
+                and_(
+                    Incident.creation_time == creation_time,
+                    Incident.id < incident_id,
+                ),
+            )
+        )
+
+    return sql_query.order_by(Incident.creation_time.desc(), Incident.id.desc())
+
+
+def export_incidents(
+    sql_query,
+    limit: Optional[int] = None,
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> Iterator[list[dict]]:
+    """
+    Streams the incidents of an export query (see `build_incidents_export_query`)
+    through a server-side cursor, in batches of records with their export cursor.
+
+    Args:
+        sql_query: the export query
+        limit: the maximum number of exported incidents, all if None
+        batch_size: the number of incidents read and converted at once
+    """
+    if limit is not None:
+        sql_query = sql_query.limit(limit)
+    with existed_or_new_session() as session:
+        result = session.execute(sql_query.execution_options(yield_per=batch_size))
+        for rows in result.partitions():
+            records = []
+            for incident, enrichment in rows:
+                if enrichment:
+                    incident.set_enrichments(enrichment.enrichments)
+                record = IncidentDto.from_db_incident(incident).dict()
+                record[EXPORT_CURSOR_FIELD] = encode_export_cursor(
+                    incident.creation_time, str(incident.id)
+                )
+                records.append(record)
+            yield records
+
+
 def get_incident_facets_data(
     tenant_id: str,
     allowed_incident_ids: list[str],
@@ -0,0 +1,27 @@
+"""
+JSON responses of the API.
+
+orjson is used when installed (`pip install orjson`), it serializes large alert pages
+several times faster than the standard library. Without it, or for content orjson
+can't serialize (e.g. integers larger than 64 bits), responses are rendered by
+starlette's JSONResponse as before.
+"""
+
+import typing
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class KeepJSONResponse(JSONResponse):
+    def render(self, content: typing.Any) -> bytes:
+        if orjson is not None:
+            try:
+                return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+            except (orjson.JSONEncodeError, TypeError):
+                pass
+        return super().render(content)
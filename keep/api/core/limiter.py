@@ -1,17 +1,161 @@
 # https://slowapi.readthedocs.io/en/latest/#fastapi
+import hashlib
 import logging
+import math
+import time
 
+from fastapi import HTTPException, Request
+from fastapi.responses import JSONResponse
 from slowapi import Limiter
+from slowapi.errors import RateLimitExceeded
 from slowapi.util import get_remote_address
 
+from keep.api.consts import KEEP_ARQ_QUEUE_BASIC, REDIS
+from keep.api.core.api_key_cache import get_api_key_cache
 from keep.api.core.config import config
+from keep.api.core.metrics import ingestion_shed_total, rate_limit_exceeded_total
 
 logger = logging.getLogger(__name__)
 limiter_enabled = config("KEEP_USE_LIMITER", default="false", cast=bool)
 default_limit = config("KEEP_LIMIT_CONCURRENCY", default="100/minute", cast=str)
+# shared by all the ingestion endpoints, separately from the other endpoints
+KEEP_LIMIT_INGESTION = config("KEEP_LIMIT_INGESTION", default=default_limit, cast=str)
+# "redis" shares the budgets between the API processes, "memory" is per process
+KEEP_LIMITER_STORAGE = config(
+    "KEEP_LIMITER_STORAGE", default="redis" if REDIS else "memory"
+)
+# 0 disables the shedding of ingestion requests
+KEEP_INGESTION_MAX_BACKLOG = config("KEEP_INGESTION_MAX_BACKLOG", default=0, cast=int)
+KEEP_INGESTION_RETRY_AFTER = config("KEEP_INGESTION_RETRY_AFTER", default=10, cast=int)
+KEEP_INGESTION_BACKLOG_CHECK_INTERVAL = config(
+    "KEEP_INGESTION_BACKLOG_CHECK_INTERVAL", default=1.0, cast=float
+)
 
 logger.warning(f"Rate limiter is {'enabled' if limiter_enabled else 'disabled'}")
 
+
+def get_rate_limit_key(request: Request) -> str:
+    """
+    The budget a request is counted against: the tenant and reference of a valid API
+    key, the token of a bearer, the remote address otherwise.
+    """
+    api_key = request.headers.get("x-api-key")
+    if api_key:
+        entity = get_api_key_cache().get(api_key)
+        if entity:
+            return f"tenant:{entity.tenant_id}:key:{entity.reference_id}"
+    authorization = request.headers.get("Authorization")
+    if authorization:
+        # the token isn't verified yet, a forged one only spends its own budget
+        return f"token:{hashlib.sha256(authorization.encode()).hexdigest()}"
+    return get_remote_address(request)
+
+
+def get_ingestion_limit() -> str:
+    return KEEP_LIMIT_INGESTION
+
+
+def _get_storage_options() -> dict:
+    if KEEP_LIMITER_STORAGE != "redis":
+        return {"storage_uri": "memory://"}
+    from keep.api.redis_settings import get_redis_client
+
+    # the connection pool of the configured redis, sentinel included
+    return {
+        "storage_uri": "redis://",
+        "storage_options": {"connection_pool": get_redis_client().connection_pool},
+    }
+
+
 limiter = Limiter(
-    key_func=get_remote_address, enabled=limiter_enabled, default_limits=[default_limit]
+    key_func=get_rate_limit_key,
+    enabled=limiter_enabled,
+    default_limits=[default_limit],
+    # keep limiting per process while redis is unreachable
+    in_memory_fallback_enabled=KEEP_LIMITER_STORAGE == "redis",
+    **_get_storage_options(),
 )
+ingestion_limit = limiter.shared_limit(get_ingestion_limit, scope="ingestion")
+
+
+def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded):
+    scope = exc.limit.scope if exc.limit.scope == "ingestion" else "default"
+    rate_limit_exceeded_total.labels(scope=scope).inc()
+    retry_after = exc.limit.limit.get_expiry()
+    view_rate_limit = getattr(request.state, "view_rate_limit", None)
+    if view_rate_limit is not None:
+        try:
+            reset_time, _ = limiter.limiter.get_window_stats(
+                view_rate_limit[0], *view_rate_limit[1]
+            )
+            retry_after = reset_time - time.time()
+        except Exception:
+            logger.warning("Failed to read the rate limit window", exc_info=True)
+    return JSONResponse(
+        {"error": f"Rate limit exceeded: {exc.detail}"},
+        status_code=429,
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+
+class IngestionAdmission:
+    """
+    Sheds ingestion requests while the event processing backlog (the arq queue with
+    REDIS, the events submitted to this process otherwise) is over max_backlog, so an
+    overload is answered with 503 and Retry-After instead of piling up latency.
+    """
+
+    def __init__(
+        self,
+        max_backlog: int = KEEP_INGESTION_MAX_BACKLOG,
+        retry_after: int = KEEP_INGESTION_RETRY_AFTER,
+        check_interval: float = KEEP_INGESTION_BACKLOG_CHECK_INTERVAL,
+    ):
+        self.max_backlog = max_backlog
+        self.retry_after = retry_after
+        self.check_interval = check_interval
+        self._queue_length = 0
+        self._checked_at = float("-inf")
+        self._redis = None
+
+    async def _get_queue_length(self) -> int:
+        # read at most once per interval, not on every event
+        if time.monotonic() - self._checked_at >= self.check_interval:
+            self._checked_at = time.monotonic()
+            if self._redis is None:
+                from keep.api.arq_pool import get_pool
+
+                self._redis = await get_pool()
+            self._queue_length = await self._redis.zcard(KEEP_ARQ_QUEUE_BASIC)
+        return self._queue_length
+
+    async def get_backlog(self, request: Request) -> int:
+        if REDIS:
+            return await self._get_queue_length()
+        return len(request.state.background_tasks)
+
+    async def __call__(self, request: Request):
+        if self.max_backlog <= 0:
+            return
+        try:
+            backlog = await self.get_backlog(request)
+        except Exception:
+            logger.warning(
+                "Failed to read the event processing backlog, admitting the request",
+                exc_info=True,
+            )
+            return
+        if backlog >= self.max_backlog:
+            ingestion_shed_total.inc()
+            logger.warning(
+                "Event processing backlog is full, shedding the request",
+                extra={"backlog": backlog, "max_backlog": self.max_backlog},
+            )
+            raise HTTPException(
+                status_code=503,
+                detail="Event processing is overloaded, retry later",
+                headers={"Retry-After": str(self.retry_after)},
+            )
+
+
+admit_ingestion = IngestionAdmission()
@@ -25,6 +25,138 @@ processing_time_summary = Summary(
     "Average time spent processing events",
 )
 
+# Per-stage event processing latency, the tenant label is opt-in to keep cardinality bounded
+KEEP_EVENTS_STAGE_METRICS_TENANT_LABEL = (
+    os.environ.get("KEEP_EVENTS_STAGE_METRICS_TENANT_LABEL", "false") == "true"
+)
+events_stage_duration_histogram = Histogram(
+    f"{METRIC_PREFIX}events_stage_duration_seconds",
+    "Time spent in each stage of event processing",
+    labelnames=["stage", "provider_type"]
+    + (["tenant_id"] if KEEP_EVENTS_STAGE_METRICS_TENANT_LABEL else []),
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+
+# Provider HTTP clients (keep/providers/base/provider_http.py)
+provider_http_requests_total = Counter(
+    f"{METRIC_PREFIX}provider_http_requests_total",
+    "Total number of HTTP requests sent by providers",
+    labelnames=["provider_type", "method", "status"],
+)
+provider_http_request_duration = Histogram(
+    f"{METRIC_PREFIX}provider_http_request_duration_seconds",
+    "Duration of the HTTP requests sent by providers, retries included",
+    labelnames=["provider_type"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+provider_http_connections_total = Counter(
+    f"{METRIC_PREFIX}provider_http_connections_total",
+    "Total number of connections opened by providers, requests minus connections were served by the pool",
+    labelnames=["provider_type"],
+)
+provider_http_in_flight = Gauge(
+    f"{METRIC_PREFIX}provider_http_in_flight",
+    "Current number of HTTP requests sent by providers",
+    labelnames=["provider_type"],
+    multiprocess_mode="livesum",
+)
+
+# Deduplication (keep/api/core/alert_hash_cache.py)
+alert_hash_cache_lookups_total = Counter(
+    f"{METRIC_PREFIX}alert_hash_cache_lookups_total",
+    "Total number of fingerprints looked up in the alert hash cache, misses are read from the db",
+    labelnames=["result"],
+)
+
+# Authentication (keep/api/core/api_key_cache.py)
+api_key_cache_lookups_total = Counter(
+    f"{METRIC_PREFIX}api_key_cache_lookups_total",
+    "Total number of API keys looked up in the API key cache, misses are read from the db",
+    labelnames=["result"],
+)
+
+# CEL to SQL (keep/api/core/cel_to_sql/translation_cache.py)
+cel_to_sql_cache_lookups_total = Counter(
+    f"{METRIC_PREFIX}cel_to_sql_cache_lookups_total",
+    "Total number of CEL expressions looked up in the translation caches, misses are parsed or translated",
+    labelnames=["cache", "result"],
+)
+
+# Rate limiting and admission control (keep/api/core/limiter.py)
+rate_limit_exceeded_total = Counter(
+    f"{METRIC_PREFIX}rate_limit_exceeded_total",
+    "Total number of requests rejected by the rate limiter, by budget (ingestion, default)",
+    labelnames=["scope"],
+)
+ingestion_shed_total = Counter(
+    f"{METRIC_PREFIX}ingestion_shed_total",
+    "Total number of ingestion requests shed because the event processing backlog was full",
+)
+
+# Incident changes (keep/api/core/incident_changes.py)
+incident_changes_total = Counter(
+    f"{METRIC_PREFIX}incident_changes_total",
+    "Total number of incident alert changes, by result (coalesced, processed, retried, failed)",
+    labelnames=["result"],
+)
+incident_change_stage_duration = Histogram(
+    f"{METRIC_PREFIX}incident_change_stage_duration_seconds",
+    "Time spent in each side effect of an incident alert change",
+    labelnames=["stage"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+
+# Incident resolution state (keep/api/bl/incident_resolution_bl.py)
+incident_resolution_drift_total = Counter(
+    f"{METRIC_PREFIX}incident_resolution_drift_total",
+    "Total number of incidents whose resolution state was repaired by the reconciliation",
+)
+
+# Maintenance windows recovery (keep/api/bl/maintenance_windows_bl.py)
+maintenance_recovery_alerts_total = Counter(
+    f"{METRIC_PREFIX}maintenance_recovery_alerts_total",
+    "Total number of alerts in maintenance reviewed by the recovery, by result (recovered, blocked)",
+    labelnames=["result"],
+)
+maintenance_recovery_lag = Histogram(
+    f"{METRIC_PREFIX}maintenance_recovery_lag_seconds",
+    "Time between the end of a maintenance window and the recovery of its alerts",
+    buckets=(1, 5, 10, 30, 60, 120, 300, 600, 1800, 3600, 14400),
+)
+maintenance_recovery_duration = Histogram(
+    f"{METRIC_PREFIX}maintenance_recovery_duration_seconds",
+    "Time spent recovering the alerts in maintenance of a tenant",
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300),
+)
+
+# Database (keep/api/core/db_instrumentation.py)
+db_query_duration = Histogram(
+    f"{METRIC_PREFIX}db_query_duration_seconds",
+    "Duration of the database queries, by operation and normalized statement fingerprint",
+    labelnames=["operation", "statement"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+db_slow_queries_total = Counter(
+    f"{METRIC_PREFIX}db_slow_queries_total",
+    "Total number of database queries slower than KEEP_DB_SLOW_QUERY_THRESHOLD",
+    labelnames=["operation", "statement"],
+)
+db_pool_checkout_wait = Histogram(
+    f"{METRIC_PREFIX}db_pool_checkout_wait_seconds",
+    "Time spent waiting for a connection from the database pool",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 2.5, 5, 10, 30),
+)
+db_pool_checkout_timeouts_total = Counter(
+    f"{METRIC_PREFIX}db_pool_checkout_timeouts_total",
+    "Total number of database pool checkouts that timed out",
+)
+db_pool_connections = Gauge(
+    f"{METRIC_PREFIX}db_pool_connections",
+    "Current number of database pool connections, by state (in_use, idle, overflow)",
+    labelnames=["state"],
+    multiprocess_mode="livesum",
+)
+
 running_tasks_gauge = Gauge(
     f"{METRIC_PREFIX}running_tasks_current",
     "Current number of running tasks",
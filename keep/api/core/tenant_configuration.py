@@ -1,24 +1,49 @@
 import logging
-from datetime import datetime, timedelta
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 
 from fastapi import HTTPException
+from sqlalchemy import event
+from sqlalchemy.orm import Session
 
 from keep.api.core.config import config
-from keep.api.core.db import get_tenants_configurations
+from keep.api.core.db import get_tenant_configuration, get_tenants_configurations
+from keep.api.models.db.tenant import Tenant
+
+SESSION_INFO_KEY = "keep_tenant_configuration_ids"
 
 
 class TenantConfiguration:
+    """
+    Per-process store of the tenants configuration.
+
+    Every tenant is loaded once at startup. A tenant missing from the store (new, or
+    invalidated) is loaded on its own, and concurrent lookups of the same tenant wait
+    for a single load. A configuration older than TENANT_CONFIGURATION_RELOAD_TIME
+    minutes is still served while it's reloaded in the background.
+    """
+
     _instance = None
+    _lock = threading.Lock()
 
     class _TenantConfiguration:
 
         def __init__(self):
             self.logger = logging.getLogger(__name__)
-            self.configurations = self._load_tenant_configurations()
-            self.last_loaded = datetime.now()
             self.reload_time = config(
                 "TENANT_CONFIGURATION_RELOAD_TIME", default=5, cast=int
             )
+            self._lock = threading.Lock()
+            # tenant id -> load in progress, shared by the concurrent lookups
+            self._loading: dict[str, Future] = {}
+            # bumped by invalidations, so a load started before one isn't stored
+            self._generations: dict[str, int] = {}
+            self._loaded_at: dict[str, float] = {}
+            self._refresh_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="tenant_configuration"
+            )
+            self.configurations = self._load_tenant_configurations()
 
         def _load_tenant_configurations(self):
             self.logger.debug("Loading tenants configurations")
@@ -29,29 +54,82 @@ class TenantConfiguration:
                     "number_of_tenants": len(tenants_configuration),
                 },
             )
-            self.last_loaded = datetime.now()
+            now = time.monotonic()
+            self._loaded_at = {tenant_id: now for tenant_id in tenants_configuration}
             return tenants_configuration
 
-        def _reload_if_needed(self):
-            if datetime.now() - self.last_loaded > timedelta(minutes=self.reload_time):
-                self.logger.info("Reloading tenants configurations")
-                updated_configurations = self._load_tenant_configurations()
-                if updated_configurations:
-                    self.configurations = updated_configurations
-                    self.logger.info("Tenants configurations reloaded")
-                else:
-                    self.logger.warning("No tenants configurations found in db, maybe error")
+        def _load_tenant_configuration(self, tenant_id: str, generation: int):
+            tenant_config = get_tenant_configuration(tenant_id)
+            with self._lock:
+                if self._generations.get(tenant_id, 0) == generation:
+                    if tenant_config is None:
+                        self.configurations.pop(tenant_id, None)
+                    else:
+                        self.configurations[tenant_id] = tenant_config
+                    self._loaded_at[tenant_id] = time.monotonic()
+            return tenant_config
+
+        def _load(self, tenant_id: str, background: bool = False) -> Future:
+            """Loads a tenant, or joins the load already in progress."""
+            with self._lock:
+                future = self._loading.get(tenant_id)
+                if future is not None:
+                    return future
+                future = self._loading[tenant_id] = Future()
+                generation = self._generations.get(tenant_id, 0)
+
+            def load():
+                try:
+                    future.set_result(
+                        self._load_tenant_configuration(tenant_id, generation)
+                    )
+                except Exception as e:
+                    future.set_exception(e)
+                finally:
+                    with self._lock:
+                        if self._loading.get(tenant_id) is future:
+                            del self._loading[tenant_id]
+
+            if background:
+                self._refresh_executor.submit(load)
+            else:
+                load()
+            return future
+
+        def _refresh_if_needed(self, tenant_id: str):
+            loaded_at = self._loaded_at.get(tenant_id, 0)
+            if time.monotonic() - loaded_at > self.reload_time * 60:
+                self.logger.debug(
+                    "Reloading tenant configuration", extra={"tenant_id": tenant_id}
+                )
+                future = self._load(tenant_id, background=True)
+                future.add_done_callback(self._log_refresh_error)
+
+        def _log_refresh_error(self, future: Future):
+            if future.exception() is not None:
+                self.logger.warning(
+                    "Failed to reload tenant configuration, keeping the previous one",
+                    exc_info=future.exception(),
+                )
+
+        def invalidate(self, tenant_id: str):
+            """The next lookup of the tenant loads its configuration from the db."""
+            with self._lock:
+                self._generations[tenant_id] = self._generations.get(tenant_id, 0) + 1
+                self.configurations.pop(tenant_id, None)
+                self._loaded_at.pop(tenant_id, None)
+                # a load in progress may have read the previous configuration
+                self._loading.pop(tenant_id, None)
 
         def get_configuration(self, tenant_id, config_name=None):
-            self._reload_if_needed()
-            # tenant_config = self.configurations.get(tenant_id, {})
             tenant_config = self.configurations.get(tenant_id)
-            if not tenant_config:
+            if tenant_config is not None:
+                self._refresh_if_needed(tenant_id)
+            else:
                 self.logger.debug(f"Tenant {tenant_id} not found in memory, loading it")
-                self.configurations = self._load_tenant_configurations()
-                tenant_config = self.configurations.get(tenant_id, {})
+                tenant_config = self._load(tenant_id).result()
 
-            if tenant_id not in self.configurations:
+            if tenant_config is None:
                 self.logger.exception(
                     f"Tenant not found [id: {tenant_id}]",
                     extra={
@@ -69,5 +147,28 @@ class TenantConfiguration:
 
     def __new__(cls):
         if not cls._instance:
-            cls._instance = cls._TenantConfiguration()
+            with cls._lock:
+                if not cls._instance:
+                    cls._instance = cls._TenantConfiguration()
         return cls._instance
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_tenant_changes(session, flush_context):
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(instance, Tenant):
+            session.info.setdefault(SESSION_INFO_KEY, set()).add(instance.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_tenants(session):
+    tenant_ids = session.info.pop(SESSION_INFO_KEY, ())
+    # the store of this process, if it was created
+    if tenant_ids and TenantConfiguration._instance is not None:
+        for tenant_id in tenant_ids:
+            TenantConfiguration._instance.invalidate(tenant_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_tenant_changes(session):
+    session.info.pop(SESSION_INFO_KEY, None)
@@ -7,7 +7,7 @@ This module contains the CRUD database functions for Keep.
 from datetime import datetime, timedelta, timezone
 from typing import TypedDict, Tuple
 
-from sqlalchemy import and_, case, desc, func, literal_column, select, text
+from sqlalchemy import case, desc, func, literal_column, select, text
 from sqlmodel import Session
 
 from keep.api.core.cel_to_sql.properties_metadata import (
@@ -21,7 +21,11 @@ from keep.api.core.cel_to_sql.sql_providers.get_cel_to_sql_provider_for_dialect
 from keep.api.core.db import existed_or_new_session
 from keep.api.core.facets import get_facet_options, get_facets
 from keep.api.models.db.facet import FacetType
-from keep.api.models.db.workflow import Workflow, WorkflowExecution
+from keep.api.models.db.workflow import (
+    Workflow,
+    WorkflowExecution,
+    WorkflowSummary,
+)
 from keep.api.models.facet import FacetDto, FacetOptionDto, FacetOptionsQueryDto
 from keep.api.core.cel_to_sql.ast_nodes import DataType
 
@@ -154,16 +158,35 @@ def build_workflow_executions_query(
     return filtered_query
 
 
+def __build_last_execution_query(tenant_id: str):
+    # the last execution is kept on the workflow summary, no need to rank executions
+    query = (
+        select(
+            WorkflowSummary.workflow_id,
+            WorkflowSummary.last_execution_id.label("execution_id"),
+            WorkflowSummary.last_execution_started.label("started"),
+            WorkflowSummary.last_execution_time.label("execution_time"),
+            WorkflowSummary.last_execution_status.label("status"),
+        )
+        .where(WorkflowSummary.tenant_id == tenant_id)
+        .where(
+            WorkflowSummary.last_execution_started
+            >= datetime.now(tz=timezone.utc) - timedelta(days=30)
+        )
+    )
+
+    return query
+
+
 def __build_base_query(
     tenant_id: str,
-    fetch_last_executions: int = 1,
     select_statements=None,
     latest_executions_subquery_cte=None,
 ):
     if latest_executions_subquery_cte is None:
-        latest_executions_subquery_cte = __build_workflow_executions_query(
-            tenant_id
-        ).cte("latest_executions_subquery")
+        latest_executions_subquery_cte = __build_last_execution_query(tenant_id).cte(
+            "latest_executions_subquery"
+        )
 
     if select_statements is None:
         select_statements = [
@@ -184,10 +207,7 @@ def __build_base_query(
         .select_from(Workflow)
         .outerjoin(
             latest_executions_subquery_cte,
-            and_(
-                Workflow.id == latest_executions_subquery_cte.c.workflow_id,
-                latest_executions_subquery_cte.c.row_num <= fetch_last_executions,
-            ),
+            Workflow.id == latest_executions_subquery_cte.c.workflow_id,
         )
         .where(Workflow.tenant_id == tenant_id)
         .where(Workflow.is_deleted == False)
@@ -204,8 +224,10 @@ def build_workflows_total_count_query(tenant_id: str, cel: str):
 
     if cel:
         cel_to_sql_instance = get_cel_to_sql_provider(properties_metadata)
-        sql_filter_str = cel_to_sql_instance.convert_to_sql_str(cel)
-        query = query.filter(text(sql_filter_str))
+        cel_to_sql_result = cel_to_sql_instance.convert_to_sql_str_v2(
+            cel, parameterized=True
+        )
+        query = query.filter(cel_to_sql_result.as_text_clause())
 
     query = query.distinct()
 
@@ -219,14 +241,12 @@ def build_workflows_query(
     offset: int,
     sort_by: str,
     sort_dir: str,
-    fetch_last_executions: int = 15,
 ):
     limit = limit if limit is not None else 20
     offset = offset if offset is not None else 0
     cel_to_sql_instance = get_cel_to_sql_provider(properties_metadata)
     query = __build_base_query(
         tenant_id=tenant_id,
-        fetch_last_executions=fetch_last_executions,
         select_statements=[
             Workflow,
             literal_column("started").label("started"),
@@ -244,8 +264,10 @@ def build_workflows_query(
     query = query.order_by(text(order_by_exp)).limit(limit).offset(offset)
 
     if cel:
-        sql_filter_str = cel_to_sql_instance.convert_to_sql_str(cel)
-        query = query.filter(text(sql_filter_str))
+        cel_to_sql_result = cel_to_sql_instance.convert_to_sql_str_v2(
+            cel, parameterized=True
+        )
+        query = query.filter(cel_to_sql_result.as_text_clause())
 
     return query
 
@@ -256,6 +278,7 @@ class WorkflowWithLastExecutions(TypedDict):
     workflow_last_run_time: datetime
     workflow_last_run_status: str
     workflow_last_executions: list[WorkflowExecution]
+    workflow_summary: WorkflowSummary | None
 
 
 def get_workflows_with_last_executions_v2(
@@ -285,38 +308,34 @@ def get_workflows_with_last_executions_v2(
             offset=offset,
             sort_by=sort_by,
             sort_dir=sort_dir,
-            fetch_last_executions=1,
         )
 
         query_result = session.exec(workflows_query).all()
         workflow_ids = [workflow.id for workflow, *_ in query_result]
 
-        workflow_executions_query = build_workflow_executions_query(
-            tenant_id=tenant_id,
-            workflow_ids=workflow_ids,
-            limit_per_workflow=fetch_last_executions,
-        )
-
-        workflow_executions_query_result = session.exec(workflow_executions_query).all()
-
+        summaries = {
+            summary.workflow_id: summary
+            for summary in session.exec(
+                select(WorkflowSummary).where(
+                    WorkflowSummary.tenant_id == tenant_id,
+                    WorkflowSummary.workflow_id.in_(workflow_ids),
+                )
+            ).scalars()
+        }
+
+        timeframe = datetime.now(tz=timezone.utc) - timedelta(days=30)
         execution_dict = {}
-        for (
-            workflow_id,
-            execution_id,
-            started,
-            execution_time,
-            status,
-        ) in workflow_executions_query_result:
-            if workflow_id not in execution_dict:
-                execution_dict[workflow_id] = []
-            execution_dict[workflow_id].append(
-                {
-                    "id": execution_id,
-                    "started": started,
-                    "execution_time": execution_time,
-                    "status": status,
-                }
-            )
+        for workflow_id, summary in summaries.items():
+            executions = []
+            for execution in summary.last_executions or []:
+                started = execution["started"] and datetime.fromisoformat(
+                    execution["started"]
+                )
+                if not started or started.replace(tzinfo=timezone.utc) < timeframe:
+                    # newest first, the rest are older
+                    break
+                executions.append({**execution, "started": started})
+            execution_dict[workflow_id] = executions[:fetch_last_executions]
 
         result = []
         for workflow, started, execution_time, status, execution_id in query_result:
@@ -329,6 +348,7 @@ def get_workflows_with_last_executions_v2(
                     "workflow_last_run_time": execution_time,
                     "workflow_last_run_status": status,
                     "workflow_last_executions": execution_dict.get(workflow.id, []),
+                    "workflow_summary": summaries.get(workflow.id),
                 }
             )
 
@@ -369,7 +389,7 @@ def get_workflow_facets_data(
     else:
         facets = static_facets
 
-    latest_executions_subquery_cte = __build_workflow_executions_query(tenant_id).cte(
+    latest_executions_subquery_cte = __build_last_execution_query(tenant_id).cte(
         "latest_executions_subquery"
     )
 
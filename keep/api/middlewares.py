@@ -7,8 +7,8 @@ import jwt
 from fastapi import Request
 from starlette.middleware.base import BaseHTTPMiddleware
 
+from keep.api.core.api_key_cache import get_api_key_cache
 from keep.api.core.config import config
-from keep.api.core.db import get_api_key
 
 logger = logging.getLogger(__name__)
 try:
@@ -34,7 +34,7 @@ def _extract_identity(request: Request, attribute="email") -> str:
         # allow disabling the extraction of the identity from the api key
         # for high performance scenarios
         if KEEP_EXTRACT_IDENTITY:
-            api_key = get_api_key(api_key)
+            api_key = get_api_key_cache().get(api_key)
             if api_key:
                 return api_key.tenant_id
         return "anonymous"
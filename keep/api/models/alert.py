@@ -20,6 +20,10 @@ logger = logging.getLogger(__name__)
 
 _INVALID_PERCENT_ESCAPE = re.compile(r"%(?![0-9A-Fa-f]{2})")
 _URL_SAFE_CHARACTERS = "/:?=&%#"
+# lastReceived as normalized by AlertDto.validate_last_received
+_NORMALIZED_LAST_RECEIVED = re.compile(
+    r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d{3}Z$"
+)
 
 
 def get_fingerprint(fingerprint, values):
@@ -118,6 +122,31 @@ class AlertDto(BaseModel):
     enriched_fields: list = []
     incident: str | None = None
 
+    @classmethod
+    def from_stored_event(cls, event: dict) -> "AlertDto":
+        """
+        Build an alert from an event stored at ingestion (plus its enrichments).
+
+        Stored events were validated when they were ingested, so when every field
+        already holds the value the validators would produce, the model is constructed
+        without running them again. Anything else (events stored by older versions,
+        enrichments that need coercion, dismissals with an expiry...) goes through the
+        regular validation, so the result is always the same as `cls(**event)`.
+        """
+        values = _get_trusted_values(cls, event)
+        if values is None:
+            return cls(**event)
+        # same as cls.construct(**values), without its per-call overhead
+        fields_set = set(values)
+        for name, field in cls.__fields__.items():
+            if name not in fields_set and not field.required:
+                values[name] = field.get_default()
+        alert = cls.__new__(cls)
+        object.__setattr__(alert, "__dict__", values)
+        object.__setattr__(alert, "__fields_set__", fields_set)
+        alert._init_private_attributes()
+        return alert
+
     def __str__(self) -> str:
         # Convert the model instance to a dictionary
         model_dict = self.dict()
@@ -345,12 +374,131 @@ class AlertWithIncidentLinkMetadataDto(AlertDto):
 
     @classmethod
     def from_db_instance(cls, db_alert, db_alert_to_incident):
-        return cls(
-            is_created_by_ai=db_alert_to_incident.is_created_by_ai,
-            **db_alert.event,
+        return cls.from_stored_event(
+            {
+                **db_alert.event,
+                "is_created_by_ai": db_alert_to_incident.is_created_by_ai,
+            }
         )
 
 
+_ALERT_STATUSES = frozenset(status.value for status in AlertStatus)
+_ALERT_SEVERITIES = frozenset(severity.value for severity in AlertSeverity)
+
+
+def _is_optional_str(value) -> bool:
+    return value is None or type(value) is str
+
+
+def _is_optional_bool(value) -> bool:
+    return value is None or type(value) is bool
+
+
+def _is_bool(value) -> bool:
+    return type(value) is bool
+
+
+def _is_int(value) -> bool:
+    return type(value) is int
+
+
+def _is_str_list(value) -> bool:
+    return type(value) is list and all(type(item) is str for item in value)
+
+
+# AlertDto fields and whether validating a value would return it unchanged
+_TRUSTED_VALUE_CHECKS = {
+    "id": lambda value: type(value) is str and bool(value),
+    "name": lambda value: type(value) is str,
+    "status": lambda value: type(value) is str and value in _ALERT_STATUSES,
+    "severity": lambda value: type(value) is str and value in _ALERT_SEVERITIES,
+    "lastReceived": lambda value: (
+        type(value) is str and _NORMALIZED_LAST_RECEIVED.match(value) is not None
+    ),
+    "fingerprint": lambda value: type(value) is str and len(value) <= 255,
+    "firingCounter": _is_int,
+    "unresolvedCounter": _is_int,
+    "pushed": _is_bool,
+    "deleted": _is_bool,
+    "dismissed": _is_bool,
+    "isNoisy": _is_bool,
+    "isFullDuplicate": _is_optional_bool,
+    "isPartialDuplicate": _is_optional_bool,
+    "source": lambda value: value is None or _is_str_list(value),
+    "labels": lambda value: value is None or type(value) is dict,
+    "enriched_fields": lambda value: type(value) is list,
+    "description_format": lambda value: value in (None, "markdown", "html"),
+    **dict.fromkeys(
+        [
+            "firingStartTime",
+            "firingStartTimeSinceLastResolved",
+            "environment",
+            "duplicateReason",
+            "service",
+            "apiKeyRef",
+            "message",
+            "description",
+            "event_id",
+            "dismissUntil",
+            "assignee",
+            "providerId",
+            "providerType",
+            "note",
+            "startedAt",
+            "incident",
+        ],
+        _is_optional_str,
+    ),
+}
+# fields with an always=True validator, they are computed when missing
+_REQUIRED_TRUSTED_FIELDS = frozenset(
+    {"id", "name", "status", "severity", "lastReceived", "fingerprint"}
+)
+# fields set_default_values rewrites (e.g. a falsy id becomes a uuid4), validating
+# them alone doesn't run the root validator, so they are trusted as is or not at all
+_ROOT_VALIDATED_FIELDS = frozenset({"id", "status", "severity", "lastReceived"})
+
+
+def _get_trusted_values(cls, event: dict) -> dict | None:
+    """
+    The values to construct `cls` with from a stored event without validation, or None
+    if the event needs to be validated.
+    """
+    # normalized by the root validator
+    if "assignees" in event or "deletedAt" in event:
+        return None
+    if not _REQUIRED_TRUSTED_FIELDS <= event.keys():
+        return None
+    # whether the dismissal already expired depends on the current time
+    if event.get("dismissed") is True and event.get("dismissUntil") not in (
+        None,
+        "forever",
+    ):
+        return None
+
+    values = dict(event)
+    fields = cls.__fields__
+    for name, value in event.items():
+        check = _TRUSTED_VALUE_CHECKS.get(name)
+        if check is not None and check(value):
+            if type(value) is list:
+                # validation copies lists, don't share them with the stored event
+                values[name] = list(value)
+            continue
+        if name in _ROOT_VALIDATED_FIELDS:
+            return None
+        field = fields.get(name)
+        if field is None:
+            # extra fields aren't validated
+            continue
+        # e.g. urls, or fields added by subclasses
+        value, errors = field.validate(value, values, loc=name, cls=cls)
+        if errors:
+            return None
+        values[name] = value
+    return values
+
+
 class DeleteRequestBody(BaseModel):
     fingerprint: str
     lastReceived: str
@@ -49,6 +49,13 @@ class LastAlert(SQLModel, table=True):
     first_timestamp: datetime = Field(nullable=False, index=True)
     alert_hash: str | None = Field(nullable=True, index=True)
 
+    # Effective (enrichments over event) state of the alert, kept in sync on every
+    # write of the last alert or its enrichments, see get_effective_alert_state
+    status: str | None = Field(nullable=True)
+    severity: str | None = Field(nullable=True)
+    dismissed: bool = Field(default=False)
+    dismiss_until: datetime | None = Field(nullable=True)
+
     __table_args__ = (
         # Original indexes from MySQL
         Index("idx_lastalert_tenant_timestamp", "tenant_id", "first_timestamp"),
@@ -60,10 +67,62 @@ class LastAlert(SQLModel, table=True):
             "alert_id",
             "fingerprint",
         ),
+        Index("idx_lastalert_tenant_status", "tenant_id", "status", "timestamp"),
+        Index("idx_lastalert_tenant_severity", "tenant_id", "severity", "timestamp"),
+        Index(
+            "idx_lastalert_tenant_dismissed",
+            "tenant_id",
+            "dismissed",
+            "dismiss_until",
+        ),
+        # due dismissals across tenants, see DismissalExpiryBl
+        Index("idx_lastalert_dismiss_until", "dismissed", "dismiss_until"),
         {},
     )
 
 
+def get_effective_alert_state(event: dict, enrichments: dict | None = None) -> dict:
+    """
+    Computes the LastAlert state columns of an alert the same way the alert is
+    presented: enriched status/severity take precedence over the event ones, while
+    dismissal only comes from enrichments.
+    """
+    enrichments = enrichments or {}
+    event = event or {}
+
+    status = enrichments.get("status")
+    if status is None:
+        status = event.get("status")
+    severity = enrichments.get("severity")
+    if severity is None:
+        severity = event.get("severity")
+
+    dismissed = enrichments.get("dismissed", False)
+    if isinstance(dismissed, str):
+        dismissed = dismissed.lower() == "true"
+
+    dismiss_until = None
+    dismiss_until_str = enrichments.get("dismissUntil")
+    # "forever" (or no expiry at all) is stored as NULL
+    if dismiss_until_str and dismiss_until_str != "forever":
+        try:
+            dismiss_until = datetime.strptime(
+                dismiss_until_str, "%Y-%m-%dT%H:%M:%S.%fZ"
+            )
+        except (TypeError, ValueError):
+            logger.warning(
+                "Invalid dismissUntil value, ignoring",
+                extra={"dismiss_until": dismiss_until_str},
+            )
+
+    return {
+        "status": str(status) if status is not None else None,
+        "severity": str(severity) if severity is not None else None,
+        "dismissed": bool(dismissed),
+        "dismiss_until": dismiss_until,
+    }
+
+
 class LastAlertToIncident(SQLModel, table=True):
     tenant_id: str = Field(foreign_key="tenant.id", nullable=False, primary_key=True)
     timestamp: datetime = Field(default_factory=datetime.utcnow)
@@ -334,6 +393,22 @@ class AlertAudit(SQLModel, table=True):
     )
 
 
+class AlertHistorySummary(SQLModel, table=True):
+    """
+    Per-fingerprint counters of the alert history pruned by the retention job,
+    so the volume and status breakdown of the compacted history is not lost.
+    """
+
+    tenant_id: str = Field(foreign_key="tenant.id", primary_key=True)
+    fingerprint: str = Field(primary_key=True)
+    compacted_count: int = Field(default=0)
+    # status -> number of compacted alerts with that status
+    status_counts: dict = Field(sa_column=Column(JSON), default_factory=dict)
+    first_timestamp: datetime | None = Field(default=None)
+    last_timestamp: datetime | None = Field(default=None)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+
 class CommentMention(SQLModel, table=True):
     """Many-to-many relationship table for users mentioned in comments."""
     id: UUID = Field(default_factory=uuid4, primary_key=True)
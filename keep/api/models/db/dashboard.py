@@ -26,3 +26,22 @@ class Dashboard(SQLModel, table=True):
 
     class Config:
         arbitrary_types_allowed = True
+
+
+class DashboardRollup(SQLModel, table=True):
+    """
+    Hourly counts of the rows aggregated by the dashboard widgets, so they don't scan
+    the alert and workflowexecution tables. Maintained by DashboardRollupsBl.
+    """
+
+    tenant_id: str = Field(foreign_key="tenant.id", primary_key=True)
+    # "alerts" or "workflow_executions"
+    metric: str = Field(primary_key=True)
+    # start of the hour
+    bucket: datetime = Field(primary_key=True)
+    # distinguishes the rows of a bucket, e.g. the provider of the alerts
+    dimension: str = Field(primary_key=True, default="")
+    provider_id: str | None = Field(default=None)
+    provider_type: str | None = Field(default=None)
+    count: int = Field(default=0)
+    last_timestamp: datetime | None = Field(default=None)
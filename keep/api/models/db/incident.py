@@ -108,6 +108,13 @@ class Incident(SQLModel, table=True):
     is_visible: bool = Field(default=True)
 
     alerts_count: int = Field(default=0)
+    # Resolution state of the linked alerts, kept in sync on every link change and
+    # last alert status change (see update_incidents_resolution_state), and
+    # reconciled periodically by IncidentResolutionBl
+    resolved_alerts_count: int = Field(default=0)
+    total_alerts_count: int = Field(default=0)
+    first_alert_fingerprint: str | None = Field(default=None)
+    last_alert_fingerprint: str | None = Field(default=None)
     affected_services: list = Field(sa_column=Column(JSON), default_factory=list)
     sources: list = Field(sa_column=Column(JSON), default_factory=list)
 
@@ -0,0 +1,198 @@
+"""Effective status, severity and dismissal columns on lastalert
+
+Revision ID: 3b9e7c1d2a40
+Revises: 67ff7efffed4
+Create Date: 2026-06-02 10:15:00.000000
+
+"""
+
+from datetime import datetime
+
+import sqlalchemy as sa
+import sqlmodel
+from alembic import op
+from sqlalchemy import and_, or_
+
+# revision identifiers, used by Alembic.
+revision = "3b9e7c1d2a40"
+down_revision = "67ff7efffed4"
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+lastalert_table = sa.table(
+    "lastalert",
+    sa.column("tenant_id", sa.String),
+    sa.column("fingerprint", sa.String),
+    sa.column("alert_id", sa.String),
+    sa.column("status", sa.String),
+    sa.column("severity", sa.String),
+    sa.column("dismissed", sa.Boolean),
+    sa.column("dismiss_until", sa.DateTime),
+)
+alert_table = sa.table(
+    "alert",
+    sa.column("id", sa.String),
+    sa.column("tenant_id", sa.String),
+    sa.column("event", sa.JSON),
+)
+alertenrichment_table = sa.table(
+    "alertenrichment",
+    sa.column("tenant_id", sa.String),
+    sa.column("alert_fingerprint", sa.String),
+    sa.column("enrichments", sa.JSON),
+)
+
+
+def get_effective_alert_state(event: dict, enrichments: dict | None) -> dict:
+    # a copy of keep.api.models.db.alert.get_effective_alert_state at this revision
+    enrichments = enrichments or {}
+    event = event or {}
+
+    status = enrichments.get("status")
+    if status is None:
+        status = event.get("status")
+    severity = enrichments.get("severity")
+    if severity is None:
+        severity = event.get("severity")
+
+    dismissed = enrichments.get("dismissed", False)
+    if isinstance(dismissed, str):
+        dismissed = dismissed.lower() == "true"
+
+    dismiss_until = None
+    dismiss_until_str = enrichments.get("dismissUntil")
+    # "forever" (or no expiry at all) is stored as NULL
+    if dismiss_until_str and dismiss_until_str != "forever":
+        try:
+            dismiss_until = datetime.strptime(
+                dismiss_until_str, "%Y-%m-%dT%H:%M:%S.%fZ"
+            )
+        except (TypeError, ValueError):
+            pass
+
+    return {
+        "status": str(status) if status is not None else None,
+        "severity": str(severity) if severity is not None else None,
+        "dismissed": bool(dismissed),
+        "dismiss_until": dismiss_until,
+    }
+
+
+def populate_db():
+    connection = op.get_bind()
+    last_key = None
+
+    while True:
+        query = (
+            sa.select(
+                lastalert_table.c.tenant_id,
+                lastalert_table.c.fingerprint,
+                alert_table.c.event,
+                alertenrichment_table.c.enrichments,
+            )
+            .select_from(lastalert_table)
+            .join(
+                alert_table,
+                and_(
+                    alert_table.c.id == lastalert_table.c.alert_id,
+                    alert_table.c.tenant_id == lastalert_table.c.tenant_id,
+                ),
+            )
+            .outerjoin(
+                alertenrichment_table,
+                and_(
+                    alertenrichment_table.c.tenant_id == lastalert_table.c.tenant_id,
+                    alertenrichment_table.c.alert_fingerprint
+                    == lastalert_table.c.fingerprint,
+                ),
+            )
+            .order_by(lastalert_table.c.tenant_id, lastalert_table.c.fingerprint)
+            .limit(BACKFILL_BATCH_SIZE)
+        )
+        if last_key:
+            tenant_id, fingerprint = last_key
+            query = query.where(
+                or_(
+                    lastalert_table.c.tenant_id > tenant_id,
+                    and_(
+                        lastalert_table.c.tenant_id == tenant_id,
+                        lastalert_table.c.fingerprint > fingerprint,
+                    ),
+                )
+            )
+
+        rows = connection.execute(query).all()
+        if not rows:
+            break
+
+        connection.execute(
+            lastalert_table.update()
+            .where(lastalert_table.c.tenant_id == sa.bindparam("_tenant_id"))
+            .where(lastalert_table.c.fingerprint == sa.bindparam("_fingerprint"))
+            .values(
+                status=sa.bindparam("status"),
+                severity=sa.bindparam("severity"),
+                dismissed=sa.bindparam("dismissed"),
+                dismiss_until=sa.bindparam("dismiss_until"),
+            ),
+            [
+                {
+                    "_tenant_id": tenant_id,
+                    "_fingerprint": fingerprint,
+                    **get_effective_alert_state(event, enrichments),
+                }
+                for tenant_id, fingerprint, event, enrichments in rows
+            ],
+        )
+        last_key = (rows[-1][0], rows[-1][1])
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("lastalert", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column("status", sqlmodel.sql.sqltypes.AutoString(), nullable=True)
+        )
+        batch_op.add_column(
+            sa.Column("severity", sqlmodel.sql.sqltypes.AutoString(), nullable=True)
+        )
+        batch_op.add_column(
+            sa.Column(
+                "dismissed",
+                sa.Boolean(),
+                nullable=False,
+                server_default=sa.false(),
+            )
+        )
+        batch_op.add_column(sa.Column("dismiss_until", sa.DateTime(), nullable=True))
+
+    populate_db()
+
+    with op.batch_alter_table("lastalert", schema=None) as batch_op:
+        batch_op.create_index(
+            "idx_lastalert_tenant_status",
+            ["tenant_id", "status", "timestamp"],
+            unique=False,
+        )
+        batch_op.create_index(
+            "idx_lastalert_tenant_severity",
+            ["tenant_id", "severity", "timestamp"],
+            unique=False,
+        )
+        batch_op.create_index(
+            "idx_lastalert_tenant_dismissed",
+            ["tenant_id", "dismissed", "dismiss_until"],
+            unique=False,
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("lastalert", schema=None) as batch_op:
+        batch_op.drop_index("idx_lastalert_tenant_dismissed")
+        batch_op.drop_index("idx_lastalert_tenant_severity")
+        batch_op.drop_index("idx_lastalert_tenant_status")
+        batch_op.drop_column("dismiss_until")
+        batch_op.drop_column("dismissed")
+        batch_op.drop_column("severity")
+        batch_op.drop_column("status")
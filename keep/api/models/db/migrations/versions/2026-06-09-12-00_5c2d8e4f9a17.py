@@ -0,0 +1,39 @@
+"""Alert history summary for compacted alerts
+
+Revision ID: 5c2d8e4f9a17
+Revises: 3b9e7c1d2a40
+Create Date: 2026-06-09 12:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+import sqlmodel
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "5c2d8e4f9a17"
+down_revision = "3b9e7c1d2a40"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "alerthistorysummary",
+        sa.Column("tenant_id", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("fingerprint", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("compacted_count", sa.Integer(), nullable=False),
+        sa.Column("status_counts", sa.JSON(), nullable=True),
+        sa.Column("first_timestamp", sa.DateTime(), nullable=True),
+        sa.Column("last_timestamp", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["tenant_id"],
+            ["tenant.id"],
+        ),
+        sa.PrimaryKeyConstraint("tenant_id", "fingerprint"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("alerthistorysummary")
@@ -0,0 +1,40 @@
+"""Hourly dashboard rollups
+
+Revision ID: 8a4f1c7e2b63
+Revises: 5c2d8e4f9a17
+Create Date: 2026-06-16 09:30:00.000000
+
+"""
+
+import sqlalchemy as sa
+import sqlmodel
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "8a4f1c7e2b63"
+down_revision = "5c2d8e4f9a17"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "dashboardrollup",
+        sa.Column("tenant_id", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("metric", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("bucket", sa.DateTime(), nullable=False),
+        sa.Column("dimension", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("provider_id", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("provider_type", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.Column("last_timestamp", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["tenant_id"],
+            ["tenant.id"],
+        ),
+        sa.PrimaryKeyConstraint("tenant_id", "metric", "bucket", "dimension"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("dashboardrollup")
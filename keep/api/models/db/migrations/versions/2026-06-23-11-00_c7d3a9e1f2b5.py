@@ -0,0 +1,126 @@
+"""Resolution state columns on incident
+
+Revision ID: c7d3a9e1f2b5
+Revises: 8a4f1c7e2b63
+Create Date: 2026-06-23 11:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+import sqlmodel
+from alembic import op
+from sqlalchemy import and_
+
+from keep.api.models.db.helpers import NULL_FOR_DELETED_AT
+
+# revision identifiers, used by Alembic.
+revision = "c7d3a9e1f2b5"
+down_revision = "8a4f1c7e2b63"
+branch_labels = None
+depends_on = None
+
+incident_table = sa.table(
+    "incident",
+    sa.column("id", sa.String),
+    sa.column("resolved_alerts_count", sa.Integer),
+    sa.column("total_alerts_count", sa.Integer),
+    sa.column("first_alert_fingerprint", sa.String),
+    sa.column("last_alert_fingerprint", sa.String),
+)
+lastalert_table = sa.table(
+    "lastalert",
+    sa.column("tenant_id", sa.String),
+    sa.column("fingerprint", sa.String),
+    sa.column("timestamp", sa.DateTime),
+    sa.column("first_timestamp", sa.DateTime),
+    sa.column("status", sa.String),
+)
+lastalerttoincident_table = sa.table(
+    "lastalerttoincident",
+    sa.column("tenant_id", sa.String),
+    sa.column("fingerprint", sa.String),
+    sa.column("incident_id", sa.String),
+    sa.column("deleted_at", sa.DateTime),
+)
+
+
+def populate_db():
+    def linked_alerts(*columns):
+        return (
+            sa.select(*columns)
+            .select_from(lastalert_table)
+            .join(
+                lastalerttoincident_table,
+                and_(
+                    lastalerttoincident_table.c.tenant_id
+                    == lastalert_table.c.tenant_id,
+                    lastalerttoincident_table.c.fingerprint
+                    == lastalert_table.c.fingerprint,
+                ),
+            )
+            .where(
+                lastalerttoincident_table.c.incident_id == incident_table.c.id,
+                lastalerttoincident_table.c.deleted_at == NULL_FOR_DELETED_AT,
+            )
+        )
+
+    op.get_bind().execute(
+        incident_table.update().values(
+            resolved_alerts_count=linked_alerts(sa.func.count())
+            .where(lastalert_table.c.status == "resolved")
+            .scalar_subquery(),
+            total_alerts_count=linked_alerts(sa.func.count()).scalar_subquery(),
+            first_alert_fingerprint=linked_alerts(lastalert_table.c.fingerprint)
+            .order_by(lastalert_table.c.first_timestamp, lastalert_table.c.fingerprint)
+            .limit(1)
+            .scalar_subquery(),
+            last_alert_fingerprint=linked_alerts(lastalert_table.c.fingerprint)
+            .order_by(lastalert_table.c.timestamp, lastalert_table.c.fingerprint)
+            .limit(1)
+            .scalar_subquery(),
+        )
+    )
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("incident", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                "resolved_alerts_count",
+                sa.Integer(),
+                nullable=False,
+                server_default="0",
+            )
+        )
+        batch_op.add_column(
+            sa.Column(
+                "total_alerts_count",
+                sa.Integer(),
+                nullable=False,
+                server_default="0",
+            )
+        )
+        batch_op.add_column(
+            sa.Column(
+                "first_alert_fingerprint",
+                sqlmodel.sql.sqltypes.AutoString(),
+                nullable=True,
+            )
+        )
+        batch_op.add_column(
+            sa.Column(
+                "last_alert_fingerprint",
+                sqlmodel.sql.sqltypes.AutoString(),
+                nullable=True,
+            )
+        )
+
+    populate_db()
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("incident", schema=None) as batch_op:
+        batch_op.drop_column("last_alert_fingerprint")
+        batch_op.drop_column("first_alert_fingerprint")
+        batch_op.drop_column("total_alerts_count")
+        batch_op.drop_column("resolved_alerts_count")
@@ -0,0 +1,58 @@
+"""Workflow summaries for the workflows list
+
+Revision ID: d4e8b2f6a913
+Revises: c7d3a9e1f2b5
+Create Date: 2026-06-30 10:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+import sqlmodel
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "d4e8b2f6a913"
+down_revision = "c7d3a9e1f2b5"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # filled by the first workflows list of every tenant, then kept up to date
+    op.create_table(
+        "workflowsummary",
+        sa.Column("workflow_id", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("tenant_id", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("revision", sa.Integer(), nullable=False),
+        sa.Column("workflow_raw", sa.TEXT(), nullable=True),
+        sa.Column("providers", sa.JSON(), nullable=True),
+        sa.Column("triggers", sa.JSON(), nullable=True),
+        sa.Column("permissions", sa.JSON(), nullable=True),
+        sa.Column("is_alert_rule", sa.Boolean(), nullable=False),
+        sa.Column("last_executions", sa.JSON(), nullable=True),
+        sa.Column(
+            "last_execution_id", sqlmodel.sql.sqltypes.AutoString(), nullable=True
+        ),
+        sa.Column("last_execution_started", sa.DateTime(), nullable=True),
+        sa.Column("last_execution_time", sa.Integer(), nullable=True),
+        sa.Column("last_execution_status", sa.TEXT(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["tenant_id"],
+            ["tenant.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["workflow_id"],
+            ["workflow.id"],
+        ),
+        sa.PrimaryKeyConstraint("workflow_id"),
+    )
+    with op.batch_alter_table("workflowsummary", schema=None) as batch_op:
+        batch_op.create_index(
+            batch_op.f("ix_workflowsummary_tenant_id"), ["tenant_id"], unique=False
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("workflowsummary", schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f("ix_workflowsummary_tenant_id"))
+    op.drop_table("workflowsummary")
@@ -0,0 +1,30 @@
+"""Index due dismissals of last alerts across tenants
+
+Revision ID: e5f9c3a7b1d4
+Revises: d4e8b2f6a913
+Create Date: 2026-07-07 10:00:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e5f9c3a7b1d4"
+down_revision = "d4e8b2f6a913"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # the watcher looks up expired dismissals of all tenants at once
+    with op.batch_alter_table("lastalert", schema=None) as batch_op:
+        batch_op.create_index(
+            "idx_lastalert_dismiss_until",
+            ["dismissed", "dismiss_until"],
+            unique=False,
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("lastalert", schema=None) as batch_op:
+        batch_op.drop_index("idx_lastalert_dismiss_until")
@@ -295,3 +295,17 @@ class TopologyServiceYAML(TopologyServiceCreateRequestDTO, extra="ignore"):
     id: int
     source_provider_id: Optional[str] = None
     is_manual: Optional[bool] = None
+
+
+class TopologyImportResult(BaseModel):
+    """Change counts produced by a diff-based topology import."""
+
+    services_created: int = 0
+    services_updated: int = 0
+    services_deleted: int = 0
+    dependencies_created: int = 0
+    dependencies_updated: int = 0
+    dependencies_deleted: int = 0
+    applications_created: int = 0
+    applications_updated: int = 0
+    applications_deleted: int = 0
@@ -42,6 +42,31 @@ class Workflow(SQLModel, table=True):
         orm_mode = True
 
 
+class WorkflowSummary(SQLModel, table=True):
+    """
+    What the workflows list shows of a workflow, so it's served without parsing the
+    workflow or ranking its executions: the definition fields are computed when the
+    workflow is saved, the executions fields when one finishes.
+    """
+
+    workflow_id: str = Field(primary_key=True, foreign_key="workflow.id")
+    tenant_id: str = Field(foreign_key="tenant.id", index=True)
+    # revision of the workflow the definition fields were computed from, 0 if never
+    revision: int = Field(default=0, nullable=False)
+    workflow_raw: Optional[str] = Field(default=None, sa_column=Column(TEXT))
+    providers: list = Field(sa_column=Column(JSON), default_factory=list)
+    triggers: list = Field(sa_column=Column(JSON), default_factory=list)
+    permissions: list = Field(sa_column=Column(JSON), default_factory=list)
+    is_alert_rule: bool = Field(default=False)
+
+    # latest non-test executions, newest first
+    last_executions: list = Field(sa_column=Column(JSON), default_factory=list)
+    last_execution_id: Optional[str] = None
+    last_execution_started: Optional[datetime] = None
+    last_execution_time: Optional[int] = None
+    last_execution_status: Optional[str] = Field(default=None, sa_column=Column(TEXT))
+
+
 class WorkflowVersion(SQLModel, table=True):
     __table_args__ = (PrimaryKeyConstraint("workflow_id", "revision"),)
 
@@ -53,6 +53,12 @@ class WorkflowDTO(BaseModel):
 
     @validator("workflow_raw", pre=False, always=True)
     def manipulate_raw(cls, raw, values):
+        d = cyaml.safe_load(raw)
+        values["workflow_raw_id"] = d.get("id")
+        return cls.order_workflow_raw(d)
+
+    @staticmethod
+    def order_workflow_raw(d: dict) -> str:
         """We want to control the "sort" of a workflow when it gets to the front:
             1. id
             2. desc
@@ -62,16 +68,14 @@ class WorkflowDTO(BaseModel):
             6. actions
 
         Args:
-            raw (_type_): _description_
+            d (dict): the parsed workflow
 
         Returns:
-            _type_: _description_
+            str: the workflow yaml, sorted
         """
         ordered_raw = OrderedDict()
-        d = cyaml.safe_load(raw)
         # id desc and triggers
         ordered_raw["id"] = d.get("id")
-        values["workflow_raw_id"] = d.get("id")
         ordered_raw["description"] = d.get("description")
         ordered_raw["disabled"] = d.get("disabled")
         ordered_raw["triggers"] = d.get("triggers")
@@ -5,7 +5,9 @@ This module provides a centralized way to configure Redis connections,
 supporting both direct Redis and Redis Sentinel configurations.
 """
 
+import redis
 from arq.connections import RedisSettings
+from redis.sentinel import Sentinel
 
 from keep.api.core.config import config
 
@@ -69,3 +71,23 @@ def get_redis_settings() -> RedisSettings:
             conn_retries=10,
             conn_retry_delay=10,
         )
+
+
+def get_redis_client() -> redis.Redis:
+    """
+    Get a synchronous Redis client for code running outside of the event loop
+    (e.g. event processing in the thread pool), configured like the ARQ pool.
+    """
+    settings = get_redis_settings()
+    connection_kwargs = {
+        "username": settings.username,
+        "password": settings.password,
+        "db": settings.database,
+        "ssl": bool(settings.ssl),
+        "socket_timeout": 5,
+        "socket_connect_timeout": 5,
+    }
+    if settings.sentinel:
+        sentinel = Sentinel(settings.host, sentinel_kwargs={"ssl": bool(settings.ssl)})
+        return sentinel.master_for(settings.sentinel_master, **connection_kwargs)
+    return redis.Redis(host=settings.host, port=settings.port, **connection_kwargs)
@@ -13,7 +13,7 @@ from typing import List, Optional
 import celpy
 from arq import ArqRedis
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pusher import Pusher
 from sqlalchemy_utils import UUIDType
 from sqlmodel import Session
@@ -22,6 +22,9 @@ from keep.api.arq_pool import get_pool
 from keep.api.bl.enrichments_bl import EnrichmentsBl
 from keep.api.consts import KEEP_ARQ_QUEUE_BASIC, fingerprints_for_poll_payload
 from keep.api.core.alerts import (
+    ALERT_EXPORT_COLUMNS,
+    build_alerts_export_query,
+    export_last_alerts,
     get_alert_facets,
     get_alert_facets_data,
     get_alert_potential_facet_fields,
@@ -44,10 +47,11 @@ from keep.api.core.db import (
     get_last_alerts_by_fingerprints,
     get_provider_by_name,
     get_session,
-    is_all_alerts_resolved,
+    is_incident_resolution_required,
 )
 from keep.api.core.dependencies import extract_generic_body, get_pusher_client
 from keep.api.core.elastic import ElasticClient
+from keep.api.core.limiter import admit_ingestion, ingestion_limit
 from keep.api.core.metrics import running_tasks_by_process_gauge, running_tasks_gauge
 from keep.api.models.action_type import ActionType
 from keep.api.models.alert import (
@@ -72,6 +76,11 @@ from keep.api.routes.preset import pull_data_from_providers
 from keep.api.tasks.process_event_task import process_event
 from keep.api.utils.email_utils import EmailTemplates, send_email
 from keep.api.utils.enrichment_helpers import convert_db_alerts_to_dto_alerts
+from keep.api.utils.export_helpers import (
+    ExportFormat,
+    InvalidExportCursor,
+    format_export,
+)
 from keep.api.utils.time_stamp_helpers import get_time_stamp_filter
 from keep.identitymanager.authenticatedentity import AuthenticatedEntity
 from keep.identitymanager.identitymanagerfactory import IdentityManagerFactory
@@ -279,6 +288,45 @@ def get_all_alerts(
     return enriched_alerts_dto
 
 
+@router.get(
+    "/export",
+    description="Stream the last alerts occurrence matching a CEL expression as NDJSON or CSV, newest first. Every record carries the cursor to resume the export after it in `_cursor`.",
+)
+def export_alerts(
+    cel: str = Query(None),
+    format: ExportFormat = ExportFormat.NDJSON,
+    cursor: str = Query(None, description="Resume the export after this record"),
+    limit: Optional[int] = Query(None, ge=1),
+    fields: List[str] = Query(None, description="The CSV columns"),
+    authenticated_entity: AuthenticatedEntity = Depends(
+        IdentityManagerFactory.get_auth_verifier(["read:alert"])
+    ),
+) -> StreamingResponse:
+    tenant_id = authenticated_entity.tenant_id
+    logger.info(
+        "Exporting alerts",
+        extra={"tenant_id": tenant_id, "cel": cel, "format": format.value},
+    )
+    try:
+        sql_query = build_alerts_export_query(tenant_id, cel=cel, cursor=cursor)
+    except CelToSqlException as e:
+        logger.exception(f'Error parsing CEL expression "{cel}". {str(e)}')
+        raise HTTPException(
+            status_code=400, detail=f"Error parsing CEL expression: {cel}"
+        ) from e
+    except InvalidExportCursor as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    return StreamingResponse(
+        format_export(
+            export_last_alerts(tenant_id, sql_query, limit=limit),
+            format,
+            fields or ALERT_EXPORT_COLUMNS,
+        ),
+        media_type=format.media_type,
+    )
+
+
 @router.post("/batch", description="Get alerts by fingerprints")
 def get_alerts_by_fingerprints_batch(
     fingerprints: list[str],
@@ -600,7 +648,9 @@ def create_process_event_task(
     description="Receive a generic alert event",
     response_model=AlertDto | list[AlertDto],
     status_code=202,
+    dependencies=[Depends(admit_ingestion)],
 )
+@ingestion_limit
 async def receive_generic_event(
     event: AlertDto | list[AlertDto] | dict,
     request: Request,
@@ -686,7 +736,9 @@ async def webhook_challenge(request: Request):
     "/event/{provider_type}",
     description="Receive an alert event from a provider",
     status_code=202,
+    dependencies=[Depends(admit_ingestion)],
 )
+@ingestion_limit
 async def receive_event(
     provider_type: str,
     request: Request,
@@ -1025,7 +1077,7 @@ def batch_enrich_alerts(
             for incident in unique_incidents.values():
                 if (
                     incident.resolve_on == ResolveOn.ALL.value
-                    and is_all_alerts_resolved(incident=incident, session=session)
+                    and is_incident_resolution_required(incident, session=session)
                 ):
                     incident.status = IncidentStatus.RESOLVED.value
                     session.add(incident)
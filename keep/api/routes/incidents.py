@@ -13,6 +13,7 @@ from fastapi import (
     Request,
     Response,
 )
+from fastapi.responses import StreamingResponse
 from pusher import Pusher
 from sqlmodel import Session
 
@@ -40,6 +41,9 @@ from keep.api.core.db import (
 )
 from keep.api.core.dependencies import extract_generic_body, get_pusher_client
 from keep.api.core.incidents import (
+    INCIDENT_EXPORT_COLUMNS,
+    build_incidents_export_query,
+    export_incidents,
     get_incident_facets,
     get_incident_facets_data,
     get_incident_potential_facet_fields,
@@ -73,6 +77,11 @@ from keep.api.models.incident import (
 from keep.api.models.workflow import WorkflowExecutionDTO
 from keep.api.tasks.process_incident_task import process_incident
 from keep.api.utils.enrichment_helpers import convert_db_alerts_to_dto_alerts
+from keep.api.utils.export_helpers import (
+    ExportFormat,
+    InvalidExportCursor,
+    format_export,
+)
 from keep.api.utils.pagination import (
     AlertWithIncidentLinkMetadataPaginatedResultsDto,
     IncidentsPaginatedResultsDto,
@@ -346,6 +355,63 @@ def get_incidents_report(
         )
 
 
+@router.get(
+    "/export",
+    description="Stream the incidents matching a CEL expression as NDJSON or CSV, newest first. Every record carries the cursor to resume the export after it in `_cursor`.",
+)
+def export_incidents_route(
+    candidate: bool = False,
+    cel: str = Query(None),
+    format: ExportFormat = ExportFormat.NDJSON,
+    cursor: str = Query(None, description="Resume the export after this record"),
+    limit: Optional[int] = Query(None, ge=1),
+    fields: List[str] = Query(None, description="The CSV columns"),
+    authenticated_entity: AuthenticatedEntity = Depends(
+        IdentityManagerFactory.get_auth_verifier(["read:alert"])
+    ),
+) -> StreamingResponse:
+    tenant_id = authenticated_entity.tenant_id
+    logger.info(
+        "Exporting incidents",
+        extra={"tenant_id": tenant_id, "cel": cel, "format": format.value},
+    )
+
+    # get all preset ids that the user has access to
+    identity_manager = IdentityManagerFactory.get_identity_manager(
+        authenticated_entity.tenant_id
+    )
+    # Note: if no limitations (allowed_preset_ids is []), then all presets are allowed
+    allowed_incident_ids = identity_manager.get_user_permission_on_resource_type(
+        resource_type="incident",
+        authenticated_entity=authenticated_entity,
+    )
+
+    try:
+        sql_query = build_incidents_export_query(
+            tenant_id,
+            cel=cel,
+            cursor=cursor,
+            is_candidate=candidate,
+            allowed_incident_ids=allowed_incident_ids,
+        )
+    except CelToSqlException as e:
+        logger.exception(f'Error parsing CEL expression "{cel}". {str(e)}')
+        raise HTTPException(
+            status_code=400, detail=f"Error parsing CEL expression: {cel}"
+        ) from e
+    except InvalidExportCursor as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    return StreamingResponse(
+        format_export(
+            export_incidents(sql_query, limit=limit),
+            format,
+            fields or INCIDENT_EXPORT_COLUMNS,
+        ),
+        media_type=format.media_type,
+    )
+
+
 @router.get(
     "/{incident_id}",
     description="Get incident by id",
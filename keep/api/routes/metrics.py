@@ -119,7 +119,7 @@ def get_metrics(
         extra_labels = ""
         try:
             last_alert = last_alerts_for_incidents[str(incident.id)][0]
-            last_alert_dto = AlertDto(**last_alert.event)
+            last_alert_dto = AlertDto.from_stored_event(last_alert.event)
         except IndexError:
             last_alert_dto = None
 
@@ -511,9 +511,13 @@ async def import_topology_yaml(
         tenant_id = authenticated_entity.tenant_id
         topology_yaml = await file.read()
         topology_data: dict = cyaml.safe_load(topology_yaml)
-        TopologiesService.import_to_db(topology_data, session, tenant_id)
+        result = TopologiesService.import_to_db(topology_data, session, tenant_id)
         return JSONResponse(
-            status_code=200, content={"message": "Topology imported successfully"}
+            status_code=200,
+            content={
+                "message": "Topology imported successfully",
+                "changes": result.dict(),
+            },
         )
 
     except cyaml.YAMLError:
@@ -241,6 +241,41 @@ def query_workflows(
         workflow_last_run_status = _workflow["workflow_last_run_status"]
         last_executions = _workflow["workflow_last_executions"]
         last_execution_started = _workflow["workflow_last_run_started"]
+        summary = _workflow["workflow_summary"]
+
+        if summary is not None and summary.revision == workflow.revision:
+            # computed when the workflow was saved
+            providers_dto = workflowstore.get_providers_dto(
+                summary.providers, installed_providers_by_type
+            )
+            workflow_dto = WorkflowDTO.construct(
+                id=workflow.id,
+                name=workflow.name,
+                description=workflow.description
+                or "[This workflow has no description]",
+                created_by=workflow.created_by,
+                creation_time=workflow.creation_time,
+                last_execution_time=workflow_last_run_time,
+                last_execution_status=workflow_last_run_status,
+                interval=workflow.interval,
+                providers=providers_dto,
+                triggers=summary.triggers,
+                workflow_raw=summary.workflow_raw,
+                revision=workflow.revision,
+                last_updated=workflow.last_updated,
+                last_executions=last_executions,
+                last_execution_started=last_execution_started,
+                disabled=workflow.is_disabled,
+                provisioned=workflow.provisioned,
+                alertRule=summary.is_alert_rule,
+                canRun=Workflow.check_run_permissions(
+                    summary.permissions,
+                    authenticated_entity.email,
+                    authenticated_entity.role,
+                ),
+            )
+            workflows_dto.append(workflow_dto)
+            continue
 
         try:
             providers_dto, triggers = workflowstore.get_workflow_meta_data(
@@ -849,6 +884,7 @@ async def update_workflow_by_id(
         updated_by=authenticated_entity.email,
         is_disabled=workflow_raw_data.get("disabled", False),
     )
+    WorkflowStore().update_workflow_summary(updated_workflow)
     logger.info(f"Updated workflow {workflow_id}", extra={"tenant_id": tenant_id})
     return WorkflowCreateOrUpdateDTO(
         workflow_id=workflow_id, revision=updated_workflow.revision, status="updated"
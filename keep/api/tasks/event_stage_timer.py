@@ -0,0 +1,126 @@
+import functools
+import logging
+import os
+import random
+import time
+from contextlib import contextmanager
+
+from opentelemetry import trace
+
+from keep.api.core.config import config
+from keep.api.core.metrics import (
+    KEEP_EVENTS_STAGE_METRICS_TENANT_LABEL,
+    events_stage_duration_histogram,
+)
+
+# events slower than this (in seconds) get their per-stage breakdown logged, 0 disables
+KEEP_SLOW_EVENT_THRESHOLD_SECONDS = config(
+    "KEEP_SLOW_EVENT_THRESHOLD_SECONDS", default=10, cast=float
+)
+# fraction of the slow events that are logged
+KEEP_SLOW_EVENT_SAMPLE_RATE = config(
+    "KEEP_SLOW_EVENT_SAMPLE_RATE", default=1.0, cast=float
+)
+# number of fingerprints included in a slow event log
+SLOW_EVENT_MAX_FINGERPRINTS = 10
+PROVIDERS_DIRECTORY = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "providers"
+)
+
+logger = logging.getLogger(__name__)
+
+
+@functools.lru_cache(maxsize=1024)
+def get_provider_type_label(provider_type: str | None) -> str:
+    """
+    provider_type comes from the request path, only known provider types are used as a
+    metric label so the number of series stays bounded.
+    """
+    if not provider_type:
+        return "none"
+    if os.path.isdir(os.path.join(PROVIDERS_DIRECTORY, f"{provider_type}_provider")):
+        return provider_type
+    return "other"
+
+
+class EventStageTimer:
+    """
+    Times the stages of processing an event (a batch of alerts).
+
+    Every stage is recorded in the `keep_events_stage_duration_seconds` histogram and as
+    an OpenTelemetry span, child of a `process_event` span. When the whole event takes
+    longer than KEEP_SLOW_EVENT_THRESHOLD_SECONDS, `finish` logs the per-stage breakdown.
+    """
+
+    def __init__(
+        self,
+        tracer: trace.Tracer,
+        tenant_id: str,
+        provider_type: str | None,
+        provider_id: str | None = None,
+    ):
+        self.tracer = tracer
+        self.tenant_id = tenant_id
+        self.provider_type = provider_type
+        self.provider_id = provider_id
+        self.timings: dict[str, float] = {}
+        self.counts: dict[str, int] = {}
+        self.fingerprints: list[str] = []
+        self._labels = {"provider_type": get_provider_type_label(provider_type)}
+        if KEEP_EVENTS_STAGE_METRICS_TENANT_LABEL:
+            self._labels["tenant_id"] = tenant_id
+        self._start = time.perf_counter()
+        self._span = tracer.start_span(
+            "process_event",
+            attributes={
+                "tenant_id": tenant_id,
+                "provider_type": provider_type or "",
+            },
+        )
+        self._context = trace.set_span_in_context(self._span)
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            with self.tracer.start_as_current_span(
+                f"process_event_{name}", context=self._context
+            ):
+                yield
+        finally:
+            duration = time.perf_counter() - start
+            self.timings[name] = self.timings.get(name, 0) + duration
+            events_stage_duration_histogram.labels(stage=name, **self._labels).observe(
+                duration
+            )
+
+    def finish(self):
+        total = time.perf_counter() - self._start
+        events_stage_duration_histogram.labels(stage="total", **self._labels).observe(
+            total
+        )
+        for name, count in self.counts.items():
+            self._span.set_attribute(f"num_of_{name}", count)
+        self._span.end()
+
+        if (
+            KEEP_SLOW_EVENT_THRESHOLD_SECONDS > 0
+            and total >= KEEP_SLOW_EVENT_THRESHOLD_SECONDS
+            and random.random() < KEEP_SLOW_EVENT_SAMPLE_RATE
+        ):
+            logger.warning(
+                "Slow event processing",
+                extra={
+                    "tenant_id": self.tenant_id,
+                    "provider_type": self.provider_type,
+                    "provider_id": self.provider_id,
+                    "fingerprints": self.fingerprints[:SLOW_EVENT_MAX_FINGERPRINTS],
+                    "counts": self.counts,
+                    "stages": {
+                        name: round(duration, 4)
+                        for name, duration in self.timings.items()
+                    },
+                    "processing_time": round(total, 4),
+                },
+            )
+        return total
@@ -1,39 +1,240 @@
+"""
+Coalescing of the push notifications sent to the UI.
+
+Every notification (poll-alerts, poll-presets, incident-change) is sent at most once
+per tenant per PUSHER_POLLING_INTERVAL. With the redis backend the interval token is
+shared by all the API replicas and workers, so the number of notifications per
+interval doesn't grow with the number of processes. Preset names touched during an
+interval are accumulated and sent together with the next poll-presets notification,
+or by a flush once the interval expires if no later event of the tenant sends them.
+"""
+
+import json
+import logging
 import os
+import threading
 import time
-from typing import Dict, Tuple
+from typing import Dict, Iterable, Set, Tuple
+
+from keep.api.consts import REDIS
 
 # Get polling interval from env
 POLLING_INTERVAL = int(os.getenv("PUSHER_POLLING_INTERVAL", "15"))
+# "redis" shares the notification tokens between processes, "memory" is per process
+NOTIFICATION_CACHE_BACKEND = os.getenv(
+    "KEEP_NOTIFICATION_CACHE_BACKEND", "redis" if REDIS else "memory"
+)
+# pending preset names are dropped if nothing notifies them for a few intervals
+PENDING_PRESETS_TTL = POLLING_INTERVAL * 4
+REDIS_KEY_PREFIX = "keep:notifications"
+
+logger = logging.getLogger(__name__)
+
+
+class InMemoryNotificationBackend:
+    """Per-process backend, used without redis and as the local fake in tests."""
+
+    def __init__(self):
+        self.tokens: Dict[str, float] = {}
+        self.sets: Dict[str, Tuple[Set[str], float]] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, key: str, interval: int) -> bool:
+        current_time = time.time()
+        with self._lock:
+            expires_at = self.tokens.get(key)
+            if expires_at is not None and current_time < expires_at:
+                return False
+            self.tokens[key] = current_time + interval
+            return True
+
+    def add_to_set(self, key: str, members: Iterable[str], ttl: int):
+        with self._lock:
+            current, _ = self._get_set(key)
+            self.sets[key] = (current | set(members), time.time() + ttl)
+
+    def get_set(self, key: str) -> Set[str]:
+        with self._lock:
+            return set(self._get_set(key)[0])
+
+    def pop_set(self, key: str) -> Set[str]:
+        with self._lock:
+            members, _ = self._get_set(key)
+            self.sets.pop(key, None)
+            return members
+
+    def _get_set(self, key: str) -> Tuple[Set[str], float]:
+        members, expires_at = self.sets.get(key, (set(), 0))
+        if members and time.time() >= expires_at:
+            self.sets.pop(key, None)
+            return set(), 0
+        return members, expires_at
+
+
+class RedisNotificationBackend:
+    """Backend shared by every process through redis."""
+
+    def __init__(self, client=None):
+        if client is None:
+            from keep.api.redis_settings import get_redis_client
+
+            client = get_redis_client()
+        self.client = client
+
+    def acquire(self, key: str, interval: int) -> bool:
+        return bool(self.client.set(key, "1", ex=interval, nx=True))
+
+    def add_to_set(self, key: str, members: Iterable[str], ttl: int):
+        members = list(members)
+        if not members:
+            return
+        pipeline = self.client.pipeline()
+        pipeline.sadd(key, *members)
+        pipeline.expire(key, ttl)
+        pipeline.execute()
+
+    def get_set(self, key: str) -> Set[str]:
+        return {_decode(member) for member in self.client.smembers(key)}
+
+    def pop_set(self, key: str) -> Set[str]:
+        pipeline = self.client.pipeline(transaction=True)
+        pipeline.smembers(key)
+        pipeline.delete(key)
+        members, _ = pipeline.execute()
+        return {_decode(member) for member in members}
+
+
+def _decode(value) -> str:
+    return value.decode() if isinstance(value, bytes) else value
 
 
 class NotificationCache:
     _instance = None
     __initialized = False
 
-    def __new__(cls):
+    def __new__(cls, *args, **kwargs):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
         return cls._instance
 
-    def __init__(self):
+    def __init__(self, backend=None):
         if not self.__initialized:
-            self.cache: Dict[Tuple[str, str], float] = {}
+            self.local_backend = InMemoryNotificationBackend()
+            self.backend = backend or self._create_backend()
+            # tenant id -> timer sending its pending presets once the interval expires
+            self.flush_timers: Dict[str, threading.Timer] = {}
+            self._flush_lock = threading.Lock()
             self.__initialized = True
 
+    def _create_backend(self):
+        if NOTIFICATION_CACHE_BACKEND == "redis":
+            try:
+                return RedisNotificationBackend()
+            except Exception:
+                logger.exception(
+                    "Failed to create the redis notification backend, using memory"
+                )
+        return self.local_backend
+
+    def _call(self, method: str, *args):
+        try:
+            return getattr(self.backend, method)(*args)
+        except Exception:
+            if self.backend is self.local_backend:
+                raise
+            # notifications are best effort, don't fail event processing on redis errors
+            logger.warning(
+                "Notification backend failed, using the local backend",
+                exc_info=True,
+            )
+            return getattr(self.local_backend, method)(*args)
+
     def should_notify(self, tenant_id: str, event_type: str) -> bool:
-        cache_key = (tenant_id, event_type)
-        current_time = time.time()
+        return self._call(
+            "acquire", f"{REDIS_KEY_PREFIX}:{tenant_id}:{event_type}", POLLING_INTERVAL
+        )
 
-        if cache_key not in self.cache:
-            self.cache[cache_key] = current_time
-            return True
+    def get_pending_presets(self, tenant_id: str) -> Set[str]:
+        """Preset names already waiting for the next poll-presets notification."""
+        return self._call("get_set", f"{REDIS_KEY_PREFIX}:{tenant_id}:presets")
 
-        last_time = self.cache[cache_key]
-        if current_time - last_time >= POLLING_INTERVAL:
-            self.cache[cache_key] = current_time
-            return True
+    def coalesce_presets(self, tenant_id: str, preset_names: Iterable[str]) -> Set[str]:
+        """
+        Adds the touched preset names to the pending ones.
+
+        Returns the preset names to send if this call acquired the poll-presets token for
+        the interval, and an empty set otherwise (they are sent by a later call).
+        """
+        key = f"{REDIS_KEY_PREFIX}:{tenant_id}:presets"
+        preset_names = set(preset_names)
+        if preset_names:
+            self._call("add_to_set", key, preset_names, PENDING_PRESETS_TTL)
+        elif not self._call("get_set", key):
+            return set()
+        if not self.should_notify(tenant_id, "poll-presets"):
+            return set()
+        return self._call("pop_set", key) | preset_names
+
+    def notify_presets(
+        self, pusher_client, tenant_id: str, preset_names: Iterable[str]
+    ):
+        """
+        Sends the poll-presets notification with every preset touched in the interval.
+
+        Preset names touched while another call holds the interval token stay pending,
+        and are sent once it expires even if no later event of the tenant sends them.
+        """
+        preset_names = set(preset_names)
+        presets_to_notify = self.coalesce_presets(tenant_id, preset_names)
+        if presets_to_notify:
+            self._send_presets(pusher_client, tenant_id, presets_to_notify)
+        elif preset_names:
+            self._schedule_presets_flush(pusher_client, tenant_id)
+
+    def cancel_flushes(self):
+        with self._flush_lock:
+            for timer in self.flush_timers.values():
+                timer.cancel()
+            self.flush_timers.clear()
+
+    def _send_presets(self, pusher_client, tenant_id: str, preset_names: Set[str]):
+        try:
+            pusher_client.trigger(
+                f"private-{tenant_id}",
+                "poll-presets",
+                json.dumps(sorted(preset_names), default=str),
+            )
+        except Exception:
+            logger.exception(
+                "Failed to send presets via pusher", extra={"tenant_id": tenant_id}
+            )
+
+    def _schedule_presets_flush(self, pusher_client, tenant_id: str):
+        with self._flush_lock:
+            if tenant_id in self.flush_timers:
+                return
+            # the token held now expires within an interval
+            timer = threading.Timer(
+                POLLING_INTERVAL, self._flush_presets, args=(pusher_client, tenant_id)
+            )
+            timer.daemon = True
+            self.flush_timers[tenant_id] = timer
+        timer.start()
 
-        return False
+    def _flush_presets(self, pusher_client, tenant_id: str):
+        with self._flush_lock:
+            self.flush_timers.pop(tenant_id, None)
+        try:
+            presets_to_notify = self.coalesce_presets(tenant_id, [])
+            if presets_to_notify:
+                self._send_presets(pusher_client, tenant_id, presets_to_notify)
+            elif self.get_pending_presets(tenant_id):
+                # another process claimed the next interval before they were sent
+                self._schedule_presets_flush(pusher_client, tenant_id)
+        except Exception:
+            logger.exception(
+                "Failed to flush the pending presets", extra={"tenant_id": tenant_id}
+            )
 
 
 # Get singleton instance
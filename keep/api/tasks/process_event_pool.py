@@ -0,0 +1,87 @@
+"""
+Executors running `process_event` for the arq workers.
+
+In "thread" mode the events are processed by a thread pool, which is cheap but holds
+the GIL for the CPU bound parts (alert validation, deduplication hashing, CEL and
+template rendering), so a worker uses a single core. In "process" mode they are
+processed by a pool of worker processes:
+
+- the processes are spawned and warmed up once (logging, database engine, providers
+  registry), their per-process caches survive between events
+- the jobs are sent as plain picklable arguments, the arq context stays in the worker
+- a process is replaced after KEEP_EVENT_PROCESS_MAX_JOBS events to bound its memory
+"""
+
+import logging
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from keep.api.core.config import config
+
+# "thread" or "process"
+KEEP_EVENT_PROCESSING_MODE = config("KEEP_EVENT_PROCESSING_MODE", default="thread")
+KEEP_EVENT_WORKERS = config("KEEP_EVENT_WORKERS", default=5, cast=int)
+# events processed by a worker process before it is replaced, 0 never replaces it
+KEEP_EVENT_PROCESS_MAX_JOBS = config(
+    "KEEP_EVENT_PROCESS_MAX_JOBS", default=1000, cast=int
+)
+
+# the arq context keys process_event uses, the others (redis, pools) aren't picklable
+JOB_CONTEXT_KEYS = ("job_id", "job_try")
+
+logger = logging.getLogger(__name__)
+
+
+def create_event_executor(
+    mode: str = KEEP_EVENT_PROCESSING_MODE,
+    max_workers: int = KEEP_EVENT_WORKERS,
+    max_jobs: int = KEEP_EVENT_PROCESS_MAX_JOBS,
+) -> Executor:
+    if mode == "process":
+        logger.info(
+            "Creating event processing process pool",
+            extra={"max_workers": max_workers, "max_jobs": max_jobs},
+        )
+        return ProcessPoolExecutor(
+            max_workers=max_workers,
+            # forked processes would share the parent's connections and locks
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_event_process,
+            max_tasks_per_child=max_jobs or None,
+        )
+    if mode != "thread":
+        raise ValueError(f"Unknown event processing mode: {mode}")
+    return ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="process_event_worker"
+    )
+
+
+def init_event_process():
+    """Warms up a spawned worker process before it processes its first event."""
+    import keep.api.logging
+
+    keep.api.logging.setup_logging()
+
+    # importing the task creates the database engine and loads the business logic
+    from keep.api.core.alert_hash_cache import get_alert_hash_cache
+    from keep.api.core.db import engine
+    from keep.api.tasks import process_event_task  # noqa: F401
+    from keep.providers.providers_factory import ProvidersFactory
+
+    with engine.connect():
+        pass
+    get_alert_hash_cache()
+    ProvidersFactory.get_all_providers()
+    ProvidersFactory.get_provider_class("keep")
+
+
+def get_job_context(ctx: dict) -> dict:
+    """The picklable part of the arq context."""
+    return {key: ctx[key] for key in JOB_CONTEXT_KEYS if key in ctx}
+
+
+def run_process_event(job_context: dict, kwargs: dict):
+    """Entry point of the events processed in a worker process."""
+    from keep.api.tasks.process_event_task import process_event
+
+    return process_event(ctx=job_context, **kwargs)
@@ -1,7 +1,6 @@
 # builtins
 import copy
 import datetime
-import json
 import logging
 import os
 import sys
@@ -46,6 +45,7 @@ from keep.api.models.alert import AlertDto, AlertStatus
 from keep.api.models.db.alert import Alert, AlertAudit, AlertRaw
 from keep.api.models.db.incident import IncidentStatus
 from keep.api.models.incident import IncidentDto
+from keep.api.tasks.event_stage_timer import EventStageTimer
 from keep.api.tasks.notification_cache import get_notification_cache
 from keep.api.utils.alert_utils import sanitize_alert
 from keep.api.utils.enrichment_helpers import (
@@ -364,7 +364,7 @@ def __handle_formatted_events(
     session: Session,
     raw_events: list[dict],
     formatted_events: list[AlertDto],
-    tracer: trace.Tracer,
+    stage_timer: EventStageTimer,
     provider_id: str | None = None,
     notify_client: bool = True,
     timestamp_forced: datetime.datetime | None = None,
@@ -392,10 +392,12 @@ def __handle_formatted_events(
             "job_id": job_id,
         },
     )
+    stage_timer.fingerprints = [event.fingerprint for event in formatted_events]
+    stage_timer.counts["alerts"] = len(formatted_events)
 
     # first, check for maintenance windows
     if KEEP_MAINTENANCE_WINDOWS_ENABLED:
-        with tracer.start_as_current_span("process_event_maintenance_windows_check"):
+        with stage_timer.stage("maintenance_windows_check"):
             maintenance_windows_bl = MaintenanceWindowsBl(
                 tenant_id=tenant_id, session=session
             )
@@ -408,6 +410,9 @@ def __handle_formatted_events(
                     )
                     is False
                 ]
+                stage_timer.counts["in_maintenance"] = stage_timer.counts[
+                    "alerts"
+                ] - len(formatted_events)
             else:
                 logger.debug(
                     "No maintenance windows configured for this tenant",
@@ -421,7 +426,7 @@ def __handle_formatted_events(
                 )
                 return
 
-    with tracer.start_as_current_span("process_event_deduplication"):
+    with stage_timer.stage("deduplication"):
         # second, filter out any deduplicated events
         alert_deduplicator = AlertDeduplicator(tenant_id)
         deduplication_rules = alert_deduplicator.get_deduplication_rules(
@@ -443,8 +448,9 @@ def __handle_formatted_events(
         formatted_events = list(
             filter(lambda event: not event.isFullDuplicate, formatted_events)
         )
+        stage_timer.counts["deduplicated"] = len(deduplicated_events)
 
-    with tracer.start_as_current_span("process_event_save_to_db"):
+    with stage_timer.stage("save_to_db"):
         # save to db
         enriched_formatted_events = __save_to_db(
             tenant_id,
@@ -460,7 +466,7 @@ def __handle_formatted_events(
     # let's save all fields to the DB so that we can use them in the future such in deduplication fields suggestions
     # todo: also use it on correlation rules suggestions
     if KEEP_ALERT_FIELDS_ENABLED:
-        with tracer.start_as_current_span("process_event_bulk_upsert_alert_fields"):
+        with stage_timer.stage("bulk_upsert_alert_fields"):
             for enriched_formatted_event in enriched_formatted_events:
                 logger.debug(
                     "Bulk upserting alert fields",
@@ -494,7 +500,7 @@ def __handle_formatted_events(
                 )
 
     # after the alert enriched and mapped, lets send it to the elasticsearch
-    with tracer.start_as_current_span("process_event_push_to_elasticsearch"):
+    with stage_timer.stage("push_to_elasticsearch"):
         elastic_client = ElasticClient(tenant_id=tenant_id)
         if elastic_client.enabled:
             for alert in enriched_formatted_events:
@@ -535,7 +541,7 @@ def __handle_formatted_events(
             )
         )
 
-    with tracer.start_as_current_span("process_event_push_to_workflows"):
+    with stage_timer.stage("push_to_workflows"):
         try:
             # Now run any workflow that should run based on this alert
             # TODO: this should publish event
@@ -556,7 +562,7 @@ def __handle_formatted_events(
             )
 
     incidents = []
-    with tracer.start_as_current_span("process_event_run_rules_engine"):
+    with stage_timer.stage("run_rules_engine"):
         # Now we need to run the rules engine
         if KEEP_CORRELATION_ENABLED:
             try:
@@ -565,6 +571,7 @@ def __handle_formatted_events(
                 incidents: List[IncidentDto] = rules_engine.run_rules(
                     enriched_formatted_events, session=session
                 )
+                stage_timer.counts["incidents"] = len(incidents)
             except Exception:
                 logger.exception(
                     "Failed to run rules engine",
@@ -579,7 +586,7 @@ def __handle_formatted_events(
     if MAINTENANCE_WINDOW_ALERT_STRATEGY == "recover_previous_status":
         enriched_formatted_events.extend(ignored_events)
 
-    with tracer.start_as_current_span("process_event_notify_client"):
+    with stage_timer.stage("notify_client"):
         pusher_client = get_pusher_client() if notify_client else None
         if not pusher_client:
             return
@@ -622,29 +629,33 @@ def __handle_formatted_events(
         # send with pusher
 
         try:
-            presets = get_all_presets_dtos(tenant_id)
+            # presets already waiting for the next poll-presets don't need to be matched again
+            pending_presets = pusher_cache.get_pending_presets(tenant_id)
+            presets = [
+                preset_dto
+                for preset_dto in get_all_presets_dtos(tenant_id)
+                if preset_dto.name.lower() not in pending_presets
+            ]
             rules_engine = RulesEngine(tenant_id=tenant_id)
+            alerts_activation = (
+                rules_engine.get_alerts_activation(enriched_formatted_events)
+                if presets
+                else []
+            )
             presets_do_update = []
             for preset_dto in presets:
                 # filter the alerts based on the search query
                 filtered_alerts = rules_engine.filter_alerts(
-                    enriched_formatted_events, preset_dto.cel_query
+                    enriched_formatted_events,
+                    preset_dto.cel_query,
+                    alerts_activation,
                 )
                 # if not related alerts, no need to update
                 if not filtered_alerts:
                     continue
-                presets_do_update.append(preset_dto)
-            if pusher_cache.should_notify(tenant_id, "poll-presets"):
-                try:
-                    pusher_client.trigger(
-                        f"private-{tenant_id}",
-                        "poll-presets",
-                        json.dumps(
-                            [p.name.lower() for p in presets_do_update], default=str
-                        ),
-                    )
-                except Exception:
-                    logger.exception("Failed to send presets via pusher")
+                presets_do_update.append(preset_dto.name.lower())
+            # sent once per interval with every preset touched since the last one
+            pusher_cache.notify_presets(pusher_client, tenant_id, presets_do_update)
         except Exception:
             logger.exception(
                 "Failed to send presets via pusher",
@@ -691,23 +702,24 @@ def process_event(
     logger.info("Processing event", extra=extra_dict)
 
     tracer = trace.get_tracer(__name__)
+    stage_timer = EventStageTimer(tracer, tenant_id, provider_type, provider_id)
 
     raw_event = copy.deepcopy(event)
     events_in_counter.inc()
     try:
-        with tracer.start_as_current_span("process_event_get_db_session"):
+        with stage_timer.stage("get_db_session"):
             # Create a session to be used across the processing task
             session = get_session_sync()
 
         # Pre alert formatting extraction rules
-        with tracer.start_as_current_span("process_event_pre_alert_formatting"):
+        with stage_timer.stage("pre_alert_formatting"):
             enrichments_bl = EnrichmentsBl(tenant_id, session)
             try:
                 event = enrichments_bl.run_extraction_rules(event, pre=True)
             except Exception:
                 logger.exception("Failed to run pre-formatting extraction rules")
 
-        with tracer.start_as_current_span("process_event_provider_formatting"):
+        with stage_timer.stage("provider_formatting"):
             if (
                 provider_type is not None
                 and isinstance(event, dict)
@@ -776,7 +788,7 @@ def process_event(
                 event = [event]
                 raw_event = [raw_event]
 
-            with tracer.start_as_current_span("process_event_internal_preparation"):
+            with stage_timer.stage("internal_preparation"):
                 __internal_prepartion(event, fingerprint, api_key_name)
 
             formatted_events = __handle_formatted_events(
@@ -785,7 +797,7 @@ def process_event(
                 session,
                 raw_event,
                 event,
-                tracer,
+                stage_timer,
                 provider_id,
                 notify_client,
                 timestamp_forced,
@@ -827,6 +839,7 @@ def process_event(
         if bool(ctx):
             raise Retry(defer=ctx["job_try"] * TIMES_TO_RETRY_JOB)
     finally:
+        stage_timer.finish()
         session.close()
 
 
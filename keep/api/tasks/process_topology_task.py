@@ -1,18 +1,25 @@
-import copy
 import logging
 
-from sqlalchemy import and_
+from sqlalchemy import update
+from sqlmodel import Session, select
 
 from keep.api.core.db import get_session_sync
 from keep.api.core.dependencies import get_pusher_client
 from keep.api.models.db.topology import (
     TopologyApplicationDtoIn,
+    TopologyImportResult,
     TopologyService,
     TopologyServiceDependency,
     TopologyServiceDtoIn,
     TopologyServiceInDto,
 )
-from keep.topologies.topologies_service import TopologiesService
+from keep.topologies.topologies_service import (
+    TopologiesService,
+    delete_topology_services,
+    get_changed_service_fields,
+    sync_dependencies,
+)
+from keep.topologies.topology_matcher_index import invalidate_topology_index
 
 logger = logging.getLogger(__name__)
 
@@ -37,60 +44,30 @@ def process_topology(
     session = get_session_sync()
 
     try:
-        logger.info(
-            "Deleting existing topology data",
-            extra=extra,
-        )
-
-        # delete dependencies
-        session.query(TopologyServiceDependency).filter(
-            TopologyServiceDependency.service.has(
-                and_(
-                    TopologyService.source_provider_id == provider_id,
-                    TopologyService.tenant_id == tenant_id,
-                )
-            )
-        ).delete(synchronize_session=False)
-
-        # delete services
-        session.query(TopologyService).filter(
-            TopologyService.source_provider_id == provider_id,
-            TopologyService.tenant_id == tenant_id,
-        ).delete()
-
-        session.commit()
-        logger.info(
-            "Deleted existing topology data",
-            extra=extra,
+        result, service_to_keep_service_id_map = merge_provider_topology(
+            tenant_id=tenant_id,
+            topology_data=topology_data,
+            provider_id=provider_id,
+            session=session,
         )
     except Exception:
+        session.rollback()
         logger.exception(
-            "Failed to delete existing topology data",
+            "Failed to merge topology data",
             extra=extra,
         )
         raise
 
     logger.info(
-        "Creating new topology data",
-        extra={"provider_id": provider_id, "tenant_id": tenant_id},
+        "Merged topology data",
+        extra={**extra, **result.dict()},
     )
-    service_to_keep_service_id_map = {}
-    # First create the services so we have ids
-    for service in topology_data:
-        service_copy = copy.deepcopy(service.dict())
-        service_copy.pop("dependencies")
-        db_service = TopologyService(**service_copy, tenant_id=tenant_id)
-        session.add(db_service)
-        session.flush()
-        service_to_keep_service_id_map[service.service] = db_service.id
 
     application_to_services = {}
     application_to_name = {}
 
-    # Then create the dependencies
+    # Group all services by application (this is for processing application related data in the next step)
     for service in topology_data:
-
-        # Group all services by application (this is for processing application related data in the next step)
         if service.application_relations is not None:
             service_id = service_to_keep_service_id_map.get(service.service)
             for application_id in service.application_relations:
@@ -104,25 +81,6 @@ def process_topology(
                 else:
                     application_to_services[application_id].append(service_id)
 
-        for dependency in service.dependencies:
-            service_id = service_to_keep_service_id_map.get(service.service)
-            depends_on_service_id = service_to_keep_service_id_map.get(dependency)
-            if not service_id or not depends_on_service_id:
-                logger.debug(
-                    "Found a dangling service, skipping",
-                    extra={"service": service.service, "dependency": dependency},
-                )
-                continue
-            session.add(
-                TopologyServiceDependency(
-                    service_id=service_id,
-                    depends_on_service_id=depends_on_service_id,
-                    protocol=service.dependencies.get(dependency, "unknown"),
-                )
-            )
-
-    session.commit()
-
     # Now create or update the application
     for application_id in application_to_services:
         TopologiesService.create_or_update_application(
@@ -158,10 +116,115 @@ def process_topology(
         logger.exception("Failed to push topology update to the client")
 
     logger.info(
-        "Created new topology data",
+        "Processed topology data",
         extra=extra,
     )
 
 
+def merge_provider_topology(
+    tenant_id: str,
+    topology_data: list[TopologyServiceInDto],
+    provider_id: str,
+    session: Session,
+) -> tuple[TopologyImportResult, dict[str, int]]:
+    """
+    Merges a provider's topology pull into the stored topology.
+
+    Services are keyed by (tenant, provider, service) and dependencies by edge, so only
+    the inserts, updates and deletes are applied, in a single transaction. Topology-based
+    mapping never observes an empty graph while a pull is being processed.
+
+    Returns the change counts and a map of service name to keep service id.
+    """
+    result = TopologyImportResult()
+
+    existing_services: dict[str, TopologyService] = {}
+    duplicate_service_ids = []
+    for db_service in session.exec(
+        select(TopologyService).where(
+            TopologyService.tenant_id == tenant_id,
+            TopologyService.source_provider_id == provider_id,
+        )
+    ).all():
+        if db_service.service in existing_services:
+            duplicate_service_ids.append(db_service.id)
+        else:
+            existing_services[db_service.service] = db_service
+
+    # Later entries for the same service win, as they did when rows were re-inserted
+    incoming_services: dict[str, TopologyServiceInDto] = {
+        service.service: service for service in topology_data
+    }
+
+    services_to_delete = duplicate_service_ids + [
+        db_service.id
+        for name, db_service in existing_services.items()
+        if name not in incoming_services
+    ]
+    services_to_update = []
+    services_to_insert: list[TopologyService] = []
+    for name, service in incoming_services.items():
+        incoming = service.dict(exclude={"dependencies", "application_relations"})
+        incoming["source_provider_id"] = provider_id
+        db_service = existing_services.get(name)
+        if db_service is None:
+            services_to_insert.append(TopologyService(**incoming, tenant_id=tenant_id))
+            continue
+        changes = get_changed_service_fields(db_service, incoming)
+        if changes:
+            services_to_update.append({"id": db_service.id, **changes})
+
+    if services_to_delete:
+        result.dependencies_deleted += delete_topology_services(
+            session, services_to_delete
+        )
+    if services_to_update:
+        session.execute(update(TopologyService), services_to_update)
+    if services_to_insert:
+        session.add_all(services_to_insert)
+    session.flush()
+
+    result.services_created = len(services_to_insert)
+    result.services_updated = len(services_to_update)
+    result.services_deleted = len(services_to_delete)
+
+    service_to_keep_service_id_map = {
+        name: db_service.id
+        for name, db_service in existing_services.items()
+        if name in incoming_services
+    }
+    for db_service in services_to_insert:
+        service_to_keep_service_id_map[db_service.service] = db_service.id
+
+    incoming_edges = {}
+    for service in incoming_services.values():
+        service_id = service_to_keep_service_id_map.get(service.service)
+        for dependency, protocol in service.dependencies.items():
+            depends_on_service_id = service_to_keep_service_id_map.get(dependency)
+            if not service_id or not depends_on_service_id:
+                logger.debug(
+                    "Found a dangling service, skipping",
+                    extra={"service": service.service, "dependency": dependency},
+                )
+                continue
+            incoming_edges[(service_id, depends_on_service_id)] = protocol or "unknown"
+
+    existing_dependencies = session.exec(
+        select(TopologyServiceDependency).where(
+            TopologyServiceDependency.service_id.in_(
+                select(TopologyService.id).where(
+                    TopologyService.tenant_id == tenant_id,
+                    TopologyService.source_provider_id == provider_id,
+                )
+            )
+        )
+    ).all()
+    sync_dependencies(session, existing_dependencies, incoming_edges, result)
+
+    session.commit()
+    invalidate_topology_index(tenant_id)
+    return result, service_to_keep_service_id_map
+
+
 async def async_process_topology(*args, **kwargs):
     return process_topology(*args, **kwargs)
@@ -3,9 +3,19 @@ import datetime
 import logging
 from filelock import FileLock, Timeout
 import redis
+from keep.api.bl.alert_retention_bl import AlertRetentionBl
+from keep.api.bl.dashboard_rollups_bl import DashboardRollupsBl
+from keep.api.bl.incident_resolution_bl import IncidentResolutionBl
 from keep.api.bl.maintenance_windows_bl import MaintenanceWindowsBl
 from keep.api.bl.dismissal_expiry_bl import DismissalExpiryBl
-from keep.api.consts import REDIS, WATCHER_LAPSED_TIME
+from keep.api.consts import (
+    KEEP_ALERT_RETENTION_INTERVAL,
+    KEEP_DASHBOARD_ROLLUP_INTERVAL,
+    KEEP_DASHBOARD_ROLLUPS_ENABLED,
+    KEEP_INCIDENT_RESOLUTION_RECONCILE_INTERVAL,
+    REDIS,
+    WATCHER_LAPSED_TIME,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +42,37 @@ async def async_process_watcher(*args):
                 DismissalExpiryBl.check_dismissal_expiry,
                 logger
             )
+
+            # Run alert retention, at most once per KEEP_ALERT_RETENTION_INTERVAL across workers
+            is_retention_due = await redis_instance.set(
+                "lock:watcher:retention", "1", ex=KEEP_ALERT_RETENTION_INTERVAL, nx=True
+            )
+            if is_retention_due:
+                await loop.run_in_executor(
+                    ctx.get("pool"), AlertRetentionBl.apply_retention, logger
+                )
+
+            # Update the dashboard rollups, at most once per KEEP_DASHBOARD_ROLLUP_INTERVAL
+            if KEEP_DASHBOARD_ROLLUPS_ENABLED and await redis_instance.set(
+                "lock:watcher:dashboard_rollups",
+                "1",
+                ex=KEEP_DASHBOARD_ROLLUP_INTERVAL,
+                nx=True,
+            ):
+                await loop.run_in_executor(
+                    ctx.get("pool"), DashboardRollupsBl.update_rollups, logger
+                )
+
+            # Reconcile the incident resolution state, at most once per interval
+            if KEEP_INCIDENT_RESOLUTION_RECONCILE_INTERVAL and await redis_instance.set(
+                "lock:watcher:incident_resolution",
+                "1",
+                ex=KEEP_INCIDENT_RESOLUTION_RECONCILE_INTERVAL,
+                nx=True,
+            ):
+                await loop.run_in_executor(
+                    ctx.get("pool"), IncidentResolutionBl.reconcile, logger
+                )
             
         except Exception as e:
             logger.error("Error in watcher process: %s", e, exc_info=True)
@@ -41,6 +82,9 @@ async def async_process_watcher(*args):
             logger.info("Watcher process completed and lock released.")
         return resp
     else:
+        last_retention_time = None
+        last_rollup_time = None
+        last_reconcile_time = None
         while True:
             init_time = datetime.datetime.now()
             try:
@@ -57,6 +101,39 @@ async def async_process_watcher(*args):
                         DismissalExpiryBl.check_dismissal_expiry,
                         logger
                     )
+
+                    # Run alert retention
+                    if (
+                        last_retention_time is None
+                        or (init_time - last_retention_time).total_seconds()
+                        >= KEEP_ALERT_RETENTION_INTERVAL
+                    ):
+                        last_retention_time = init_time
+                        await loop.run_in_executor(
+                            None, AlertRetentionBl.apply_retention, logger
+                        )
+
+                    # Update the dashboard rollups
+                    if KEEP_DASHBOARD_ROLLUPS_ENABLED and (
+                        last_rollup_time is None
+                        or (init_time - last_rollup_time).total_seconds()
+                        >= KEEP_DASHBOARD_ROLLUP_INTERVAL
+                    ):
+                        last_rollup_time = init_time
+                        await loop.run_in_executor(
+                            None, DashboardRollupsBl.update_rollups, logger
+                        )
+
+                    # Reconcile the incident resolution state
+                    if KEEP_INCIDENT_RESOLUTION_RECONCILE_INTERVAL and (
+                        last_reconcile_time is None
+                        or (init_time - last_reconcile_time).total_seconds()
+                        >= KEEP_INCIDENT_RESOLUTION_RECONCILE_INTERVAL
+                    ):
+                        last_reconcile_time = init_time
+                        await loop.run_in_executor(
+                            None, IncidentResolutionBl.reconcile, logger
+                        )
                     
                     logger.info(f"Sleeping for {WATCHER_LAPSED_TIME} seconds before next run.")
                     complete_time = datetime.datetime.now()
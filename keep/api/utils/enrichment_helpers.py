@@ -231,7 +231,7 @@ def convert_db_alerts_to_dto_alerts(
                             alert, alert_to_incident
                         )
                     else:
-                        alert_dto = AlertDto(**alert.event)
+                        alert_dto = AlertDto.from_stored_event(alert.event)
 
                     if enrichments:
                         parse_and_enrich_deleted_and_assignees(alert_dto, enrichments)
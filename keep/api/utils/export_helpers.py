@@ -0,0 +1,112 @@
+"""
+Helpers to stream exports of alerts and incidents as NDJSON or CSV.
+
+Exports are read in a stable keyset order through a server-side cursor, batch by
+batch, so memory does not grow with the number of exported records. Every record
+carries the cursor of its position in the `_cursor` field (the last CSV column):
+an interrupted export resumes from the last record received.
+"""
+
+import base64
+import binascii
+import csv
+import datetime
+import enum
+import io
+import json
+from typing import Any, Callable, Iterable, Iterator
+
+from keep.api.core.config import config
+
+EXPORT_BATCH_SIZE = config("KEEP_EXPORT_BATCH_SIZE", default=1000, cast=int)
+EXPORT_CURSOR_FIELD = "_cursor"
+
+
+class ExportFormat(str, enum.Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+    @property
+    def media_type(self) -> str:
+        if self == ExportFormat.CSV:
+            return "text/csv"
+        return "application/x-ndjson"
+
+
+class InvalidExportCursor(ValueError):
+    pass
+
+
+def _json_default(value: Any):
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    return str(value)
+
+
+def encode_export_cursor(*values) -> str:
+    payload = json.dumps(list(values), default=_json_default)
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_export_cursor(cursor: str, *parsers: Callable[[Any], Any]) -> list:
+    """
+    Decodes an export cursor into its values, each parsed by the parser at its
+    position (e.g. `datetime.datetime.fromisoformat`).
+
+    Raises:
+        InvalidExportCursor: if the cursor is malformed
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if not isinstance(values, list) or len(values) != len(parsers):
+            raise ValueError("unexpected cursor values")
+        return [parse(value) for parse, value in zip(parsers, values)]
+    except (ValueError, TypeError, binascii.Error) as e:
+        raise InvalidExportCursor(f"Invalid export cursor: {cursor}") from e
+
+
+def _csv_value(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=_json_default)
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return str(value.value)
+    return str(value)
+
+
+def format_export(
+    batches: Iterable[list[dict]], export_format: ExportFormat, columns: list[str]
+) -> Iterator[str]:
+    """
+    Formats batches of exported records, one chunk per batch.
+
+    Args:
+        batches: the exported records, in batches
+        export_format: NDJSON (records as they are) or CSV (the given columns only)
+        columns: the CSV columns, the cursor column is added last
+    """
+    if export_format == ExportFormat.NDJSON:
+        for batch in batches:
+            yield "".join(
+                json.dumps(record, default=_json_default) + "\n" for record in batch
+            )
+        return
+
+    columns = [column for column in columns if column != EXPORT_CURSOR_FIELD]
+    columns.append(EXPORT_CURSOR_FIELD)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield buffer.getvalue()
+    for batch in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(
+            [_csv_value(record.get(column)) for column in columns] for record in batch
+        )
+        yield buffer.getvalue()
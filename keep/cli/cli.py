@@ -1,3 +1,4 @@
+import csv
 import json
 import logging
 import logging.config
@@ -15,7 +16,8 @@ from prettytable import PrettyTable
 
 from keep.api.core.posthog import posthog_client
 from keep.functions import cyaml
-from keep.providers.providers_factory import ProviderEncoder, ProvidersFactory
+from keep.providers.providers_factory import PROVIDERS_CACHE_FILE, ProvidersFactory
+from keep.providers.providers_manifest import write_providers_manifest
 
 load_dotenv(find_dotenv())
 
@@ -1049,10 +1051,9 @@ def provider(info: Info):
 def build_cache():
     logger.info("Building providers cache")
     providers_cache = ProvidersFactory.get_all_providers(ignore_cache_file=True)
-    with open("providers_cache.json", "w") as f:
-        json.dump(providers_cache, f, cls=ProviderEncoder)
+    write_providers_manifest(PROVIDERS_CACHE_FILE, providers_cache)
     logger.info(
-        "Providers cache built successfully", extra={"file": "providers_cache.json"}
+        "Providers cache built successfully", extra={"file": PROVIDERS_CACHE_FILE}
     )
 
 
@@ -1395,6 +1396,139 @@ def list_alerts(info: Info, filter: typing.List[str], export: bool):
     print(table)
 
 
+def _last_exported_cursor(path: str, export_format: str) -> tuple[str | None, int]:
+    """
+    Reads the cursor of the last complete record of an export file, and the offset
+    the file ends at after that record (an interrupted export may end with a partial
+    record). Reads the file line by line, whatever its size.
+    """
+    cursor, end = None, 0
+    with open(path, "rb") as f:
+        if export_format == "ndjson":
+            offset = 0
+            for line in f:
+                offset += len(line)
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("partial record")
+                    cursor = json.loads(line).get("_cursor", cursor)
+                    end = offset
+                except ValueError:
+                    break
+            return cursor, end
+
+        # a CSV record ends with the line closing its quoted fields
+        offset, quotes, record = 0, 0, b""
+        for line in f:
+            offset += len(line)
+            quotes += line.count(b'"')
+            record += line
+            if quotes % 2 or not line.endswith(b"\n"):
+                continue
+            if end:  # the header has no cursor
+                cursor = next(csv.reader([record.decode()]))[-1]
+            end, quotes, record = offset, 0, b""
+        return cursor, end
+
+
+@alert.command(name="export")
+@click.option(
+    "--cel", "-c", type=str, help="Export the alerts matching a CEL expression."
+)
+@click.option(
+    "--format",
+    "export_format",
+    type=click.Choice(["ndjson", "csv"]),
+    default="ndjson",
+    show_default=True,
+    help="The export format.",
+)
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(dir_okay=False),
+    help="The file to export to, stdout if not set.",
+)
+@click.option("--cursor", type=str, help="Resume the export after this cursor.")
+@click.option(
+    "--resume",
+    is_flag=True,
+    help="Resume the export after the last complete record of the output file.",
+)
+@click.option("--limit", type=int, help="The maximum number of exported records.")
+@click.option(
+    "--field",
+    "fields",
+    type=str,
+    multiple=True,
+    help="A CSV column, can be repeated. E.g., --field fingerprint --field name",
+)
+@click.option("--incidents", is_flag=True, help="Export incidents instead of alerts.")
+@pass_info
+def export_alerts(
+    info: Info,
+    cel: str,
+    export_format: str,
+    output: str,
+    cursor: str,
+    resume: bool,
+    limit: int,
+    fields: typing.List[str],
+    incidents: bool,
+):
+    """Export alerts (or incidents) as NDJSON or CSV, streamed."""
+    mode = "wb"
+    if resume:
+        if not output:
+            raise click.BadOptionUsage("resume", "--resume requires --output")
+        if os.path.exists(output):
+            last_cursor, end = _last_exported_cursor(output, export_format)
+            cursor = last_cursor or cursor
+            with open(output, "r+b") as f:
+                # drop a partial record left by an interrupted export
+                f.truncate(end)
+            mode = "ab" if end else "wb"
+
+    params = {"format": export_format}
+    if cel:
+        params["cel"] = cel
+    if cursor:
+        params["cursor"] = cursor
+    if limit:
+        params["limit"] = limit
+    if fields:
+        params["fields"] = list(fields)
+
+    resp = make_keep_request(
+        "GET",
+        info.keep_api_url + ("/incidents/export" if incidents else "/alerts/export"),
+        headers={"x-api-key": info.api_key},
+        params=params,
+        stream=True,
+    )
+    if not resp.ok:
+        raise Exception(f"Error exporting: {resp.text}")
+
+    out = open(output, mode) if output else sys.stdout.buffer
+    try:
+        # the CSV header is already in the file when resuming
+        skip_header = export_format == "csv" and mode == "ab"
+        for chunk in resp.iter_content(chunk_size=65536):
+            if skip_header:
+                header_end = chunk.find(b"\n")
+                if header_end == -1:
+                    continue
+                chunk = chunk[header_end + 1 :]
+                skip_header = False
+            out.write(chunk)
+    finally:
+        resp.close()
+        if output:
+            out.close()
+    if output:
+        click.echo(f"Exported to {output}", err=True)
+
+
 @alert.command()
 @click.option(
     "--fingerprint", required=True, help="The fingerprint of the alert to enrich."
@@ -1,4 +1,3 @@
-import datetime
 import logging
 from typing import Optional
 
@@ -11,8 +10,8 @@ from fastapi.security import (
 )
 from starlette.datastructures import FormData
 
+from keep.api.core.api_key_cache import get_api_key_cache, get_api_key_last_used_writer
 from keep.api.core.config import config
-from keep.api.core.db import get_api_key, update_key_last_used
 from keep.api.core.dependencies import extract_generic_body
 from keep.identitymanager.authenticatedentity import AuthenticatedEntity
 from keep.identitymanager.rbac import Admin as AdminRole
@@ -82,10 +81,6 @@ class AuthVerifierBase:
         self.allow_mesh_alert_ingestion = (
             config("KEEP_ALLOW_MESH_ALERT_INGESTION", default="false") == "true"
         )
-        # hold a cache of the last time an API key was used
-        # the key is the f{tenant_id}:{reference_id} and the value is the last time it was updated
-        self.update_key_interval = config("KEEP_UPDATE_KEY_INTERVAL", default=60)
-        self.key_last_used_updates = {}
         # check if read only instance
         self.read_only = config("KEEP_READ_ONLY", default="false") == "true"
         self.read_only_bypass_keys = config("KEEP_READ_ONLY_BYPASS_KEY", default="")
@@ -352,39 +347,15 @@ class AuthVerifierBase:
             HTTPException: If the API key is invalid.
         """
         self.logger.debug("Verifying API key")
-        tenant_api_key = get_api_key(api_key)
+        tenant_api_key = get_api_key_cache().get(api_key)
         if not tenant_api_key:
             self.logger.warning("Invalid API Key")
             raise HTTPException(status_code=401, detail="Invalid API Key")
 
-        try:
-            self.logger.debug("Updating API Key last used")
-            # if the key was updated in the last update_key_interval seconds, skip the update
-            if (
-                f"{tenant_api_key.tenant_id}:{tenant_api_key.reference_id}"
-                in self.key_last_used_updates
-            ):
-                # if the key was updated in the last update_key_interval seconds, skip the update
-                if self.key_last_used_updates[
-                    f"{tenant_api_key.tenant_id}:{tenant_api_key.reference_id}"
-                ] > (
-                    datetime.datetime.now()
-                    - datetime.timedelta(seconds=self.update_key_interval)
-                ):
-                    self.logger.debug(
-                        f"API Key last used updated in the last {self.update_key_interval} seconds"
-                    )
-            # else, update the key
-            else:
-                update_key_last_used(
-                    tenant_api_key.tenant_id, reference_id=tenant_api_key.reference_id
-                )
-                self.key_last_used_updates[
-                    f"{tenant_api_key.tenant_id}:{tenant_api_key.reference_id}"
-                ] = datetime.datetime.now()
-            self.logger.debug("Successfully updated API Key last used")
-        except Exception:
-            self.logger.exception("Failed to update API Key last used")
+        # coalesced, written at most once per KEEP_UPDATE_KEY_INTERVAL
+        get_api_key_last_used_writer().record(
+            tenant_api_key.tenant_id, tenant_api_key.reference_id
+        )
 
         request.state.tenant_id = tenant_api_key.tenant_id
         self.logger.debug(f"API key verified for tenant: {tenant_api_key.tenant_id}")
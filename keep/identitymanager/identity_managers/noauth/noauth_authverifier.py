@@ -4,7 +4,7 @@ from typing import Optional
 from fastapi import Request
 from fastapi.security import HTTPAuthorizationCredentials
 
-from keep.api.core.db import get_api_key
+from keep.api.core.api_key_cache import get_api_key_cache
 from keep.api.core.dependencies import SINGLE_TENANT_EMAIL, SINGLE_TENANT_UUID
 from keep.identitymanager.authenticatedentity import AuthenticatedEntity
 from keep.identitymanager.authverifierbase import AuthVerifierBase
@@ -48,7 +48,7 @@ class NoAuthVerifier(AuthVerifierBase):
         authorization: Optional[HTTPAuthorizationCredentials],
     ) -> AuthenticatedEntity:
 
-        tenant_api_key = get_api_key(api_key)
+        tenant_api_key = get_api_key_cache().get(api_key)
         # this is ok, since we are in noauth mode
         if not tenant_api_key:
             return AuthenticatedEntity(
@@ -18,7 +18,6 @@ from operator import attrgetter
 from typing import Literal, Optional
 
 import opentelemetry.trace as trace
-import requests
 from dateutil.parser import parse
 
 from keep.api.bl.enrichments_bl import EnrichmentsBl
@@ -35,6 +34,10 @@ from keep.api.models.db.topology import TopologyServiceInDto
 from keep.api.models.incident import IncidentDto
 from keep.api.utils.enrichment_helpers import parse_and_enrich_deleted_and_assignees
 from keep.contextmanager.contextmanager import ContextManager
+from keep.providers.base.provider_http import (
+    ProviderHTTPSession,
+    get_provider_http_session,
+)
 from keep.providers.models.provider_config import ProviderConfig, ProviderScope
 from keep.providers.models.provider_method import ProviderMethod
 
@@ -146,6 +149,24 @@ class BaseProvider(metaclass=abc.ABCMeta):
         )
         return name_with_spaces.replace(" ", ".")
 
+    def get_http_session(self, base_url: str | None = None) -> ProviderHTTPSession:
+        """
+        Get the pooled HTTP session of this provider, use it instead of `requests.get`,
+        `requests.post`, etc. so connections are reused between calls.
+
+        Args:
+            base_url (str, optional): Relative URLs are resolved against it.
+
+        Returns:
+            ProviderHTTPSession: A `requests.Session` with default timeouts and retries.
+        """
+        return get_provider_http_session(
+            getattr(self.context_manager, "tenant_id", None),
+            self.provider_id,
+            self.provider_type,
+            base_url,
+        )
+
     @abc.abstractmethod
     def dispose(self):
         """
@@ -823,7 +844,7 @@ class BaseProvider(metaclass=abc.ABCMeta):
             "Accept": "application/json",
             "X-API-KEY": self.context_manager.api_key,
         }
-        response = requests.post(
+        response = self.get_http_session().post(
             url,
             json=alert_model.dict(),
             headers=headers,
@@ -0,0 +1,222 @@
+"""
+Pooled HTTP sessions for providers.
+
+`BaseProvider.get_http_session` returns a `ProviderHTTPSession`: a `requests.Session`
+that keeps connections alive between calls and applies the same policy to every
+provider - bounded connection pools, default timeouts, retries of idempotent requests
+with jittered backoff (honoring `Retry-After`) and a per-host concurrency cap.
+
+Sessions are kept per (tenant, provider id, base URL), up to
+KEEP_PROVIDER_HTTP_MAX_SESSIONS of them, so workflow runs that instantiate the same
+provider again reuse its connections.
+"""
+
+import http.cookiejar
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from urllib.parse import urljoin, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+from keep.api.core.config import config
+from keep.api.core.metrics import (
+    provider_http_connections_total,
+    provider_http_in_flight,
+    provider_http_request_duration,
+    provider_http_requests_total,
+)
+
+# connections kept alive per host, per session
+KEEP_PROVIDER_HTTP_POOL_MAXSIZE = config(
+    "KEEP_PROVIDER_HTTP_POOL_MAXSIZE", default=10, cast=int
+)
+# used when the caller doesn't pass a timeout
+KEEP_PROVIDER_HTTP_CONNECT_TIMEOUT = config(
+    "KEEP_PROVIDER_HTTP_CONNECT_TIMEOUT", default=10, cast=float
+)
+KEEP_PROVIDER_HTTP_READ_TIMEOUT = config(
+    "KEEP_PROVIDER_HTTP_READ_TIMEOUT", default=120, cast=float
+)
+# retries of idempotent requests on connection errors and 429/502/503/504
+KEEP_PROVIDER_HTTP_RETRIES = config("KEEP_PROVIDER_HTTP_RETRIES", default=3, cast=int)
+KEEP_PROVIDER_HTTP_BACKOFF_FACTOR = config(
+    "KEEP_PROVIDER_HTTP_BACKOFF_FACTOR", default=0.5, cast=float
+)
+# longest Retry-After (in seconds) that is honored, longer ones fail the request
+KEEP_PROVIDER_HTTP_RETRY_AFTER_MAX = config(
+    "KEEP_PROVIDER_HTTP_RETRY_AFTER_MAX", default=60, cast=int
+)
+# concurrent requests per host across all the sessions of the process, 0 disables
+KEEP_PROVIDER_HTTP_MAX_CONCURRENCY_PER_HOST = config(
+    "KEEP_PROVIDER_HTTP_MAX_CONCURRENCY_PER_HOST", default=20, cast=int
+)
+# number of sessions kept, the least recently used ones are dropped
+KEEP_PROVIDER_HTTP_MAX_SESSIONS = config(
+    "KEEP_PROVIDER_HTTP_MAX_SESSIONS", default=256, cast=int
+)
+
+RETRY_STATUS_CODES = (429, 502, 503, 504)
+
+
+class HostConcurrencyLimitExceeded(requests.exceptions.Timeout):
+    """No request slot for the host was freed within the connect timeout."""
+
+
+class HostConcurrencyLimiter:
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._semaphores: dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def _get_semaphore(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            semaphore = self._semaphores.get(host)
+            if semaphore is None:
+                semaphore = self._semaphores[host] = threading.BoundedSemaphore(
+                    self.limit
+                )
+            return semaphore
+
+    def acquire(self, host: str, timeout: float | None):
+        if self.limit <= 0:
+            return None
+        semaphore = self._get_semaphore(host)
+        if not semaphore.acquire(timeout=timeout):
+            raise HostConcurrencyLimitExceeded(
+                f"More than {self.limit} concurrent requests to {host}"
+            )
+        return semaphore
+
+
+host_concurrency_limiter = HostConcurrencyLimiter(
+    KEEP_PROVIDER_HTTP_MAX_CONCURRENCY_PER_HOST
+)
+
+
+def _counting_pool_class(pool_class, provider_type: str):
+    class CountingConnectionPool(pool_class):
+        def _new_conn(self):
+            provider_http_connections_total.labels(provider_type=provider_type).inc()
+            return super()._new_conn()
+
+    return CountingConnectionPool
+
+
+class ProviderHTTPAdapter(HTTPAdapter):
+    """Counts the connections opened, so reuse shows in the metrics."""
+
+    def __init__(self, provider_type: str, **kwargs):
+        self.provider_type = provider_type
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _counting_pool_class(HTTPConnectionPool, self.provider_type),
+            "https": _counting_pool_class(HTTPSConnectionPool, self.provider_type),
+        }
+
+
+def _get_timeout(timeout) -> float | None:
+    """The connect part of a requests timeout."""
+    if isinstance(timeout, tuple):
+        return timeout[0]
+    return timeout
+
+
+class ProviderHTTPSession(requests.Session):
+    def __init__(self, provider_type: str, base_url: str | None = None):
+        super().__init__()
+        self.provider_type = provider_type
+        self.base_url = base_url
+        # sessions are shared between runs, don't keep cookies from one to the next
+        self.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+        retry = Retry(
+            total=KEEP_PROVIDER_HTTP_RETRIES,
+            status_forcelist=RETRY_STATUS_CODES,
+            backoff_factor=KEEP_PROVIDER_HTTP_BACKOFF_FACTOR,
+            backoff_jitter=KEEP_PROVIDER_HTTP_BACKOFF_FACTOR,
+            respect_retry_after_header=True,
+            retry_after_max=KEEP_PROVIDER_HTTP_RETRY_AFTER_MAX,
+            # providers check the status of the last response themselves
+            raise_on_status=False,
+        )
+        adapter = ProviderHTTPAdapter(
+            provider_type,
+            pool_connections=KEEP_PROVIDER_HTTP_POOL_MAXSIZE,
+            pool_maxsize=KEEP_PROVIDER_HTTP_POOL_MAXSIZE,
+            max_retries=retry,
+        )
+        self.mount("http://", adapter)
+        self.mount("https://", adapter)
+        # evicted sessions may still be in use by a run, their connections are closed
+        # once nothing references them anymore
+        weakref.finalize(self, adapter.close)
+
+    def request(self, method, url, *args, **kwargs):
+        if self.base_url and not urlsplit(str(url)).scheme:
+            url = urljoin(self.base_url, str(url))
+        timeout = kwargs.setdefault(
+            "timeout",
+            (KEEP_PROVIDER_HTTP_CONNECT_TIMEOUT, KEEP_PROVIDER_HTTP_READ_TIMEOUT),
+        )
+        semaphore = host_concurrency_limiter.acquire(
+            urlsplit(str(url)).netloc, _get_timeout(timeout)
+        )
+        status = "error"
+        start = time.perf_counter()
+        provider_http_in_flight.labels(provider_type=self.provider_type).inc()
+        try:
+            response = super().request(method, url, *args, **kwargs)
+            status = f"{response.status_code // 100}xx"
+            return response
+        finally:
+            provider_http_in_flight.labels(provider_type=self.provider_type).dec()
+            provider_http_request_duration.labels(
+                provider_type=self.provider_type
+            ).observe(time.perf_counter() - start)
+            provider_http_requests_total.labels(
+                provider_type=self.provider_type, method=method.upper(), status=status
+            ).inc()
+            if semaphore is not None:
+                semaphore.release()
+
+
+_sessions: "OrderedDict[tuple, ProviderHTTPSession]" = OrderedDict()
+_sessions_lock = threading.Lock()
+
+
+def get_provider_http_session(
+    tenant_id: str | None,
+    provider_id: str,
+    provider_type: str,
+    base_url: str | None = None,
+) -> ProviderHTTPSession:
+    """
+    Returns the pooled session of a provider instance and base URL.
+
+    The session holds no credentials, they are passed with every request as before.
+    """
+    key = (tenant_id, provider_id, provider_type, base_url)
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is not None:
+            _sessions.move_to_end(key)
+            return session
+        session = _sessions[key] = ProviderHTTPSession(provider_type, base_url)
+        while len(_sessions) > KEEP_PROVIDER_HTTP_MAX_SESSIONS:
+            _sessions.popitem(last=False)
+    return session
+
+
+def close_provider_http_sessions(tenant_id: str | None = None, provider_id=None):
+    """Closes the sessions of a provider (e.g. after it was deleted), or all of them."""
+    with _sessions_lock:
+        for key in list(_sessions):
+            if provider_id is None or key[:2] == (tenant_id, provider_id):
+                _sessions.pop(key).close()
@@ -353,7 +353,7 @@ class DatadogProvider(BaseTopologyProvider, ProviderHealthMixin):
             domain = self.authentication_config.oauth_token.get(
                 "domain", "datadoghq.com"
             )
-            response = requests.post(
+            response = self.get_http_session().post(
                 f"https://api.{domain}/oauth2/v1/token",
                 data={
                     "grant_type": "refresh_token",
@@ -444,7 +444,7 @@ class DatadogProvider(BaseTopologyProvider, ProviderHealthMixin):
             )
         endpoint = f"api/v2/incidents/{incident_id}/timeline"
         url = f"{self.configuration.host}/{endpoint}"
-        response = requests.post(
+        response = self.get_http_session().post(
             url,
             headers=headers,
             json={
@@ -654,7 +654,7 @@ class DatadogProvider(BaseTopologyProvider, ProviderHealthMixin):
             )
         endpoint = f"api/unstable/ui/trace/{trace_id}"
         url = f"{self.configuration.host}/{endpoint}"
-        response = requests.get(url, headers=headers)
+        response = self.get_http_session().get(url, headers=headers)
         if response.ok:
             self.logger.info("Trace retrieved", extra={"trace_id": trace_id})
             trace_data = response.json()
@@ -726,7 +726,7 @@ class DatadogProvider(BaseTopologyProvider, ProviderHealthMixin):
         }
         endpoint = "/api/v2/spans/events/search"
         url = f"{self.configuration.host}/{endpoint}"
-        response = requests.post(url, headers=headers, json=data)
+        response = self.get_http_session().post(url, headers=headers, json=data)
         if response.ok:
             self.logger.info("Traces retrieved", extra={"query": query})
             traces = response.json()
@@ -160,9 +160,11 @@ class GrafanaProvider(BaseTopologyProvider, ProviderHealthMixin):
             f"{self.authentication_config.host}/api/access-control/user/permissions"
         )
         try:
-            response = requests.get(
-                permissions_api, headers=headers, timeout=5, verify=False
-            ).json()
+            response = (
+                self.get_http_session()
+                .get(permissions_api, headers=headers, timeout=5, verify=False)
+                .json()
+            )
         except requests.exceptions.ConnectionError:
             self.logger.exception("Failed to connect to Grafana")
             validated_scopes = {
@@ -262,7 +264,7 @@ class GrafanaProvider(BaseTopologyProvider, ProviderHealthMixin):
         if query:
             target.update(query)
 
-        response = requests.post(
+        response = self.get_http_session().post(
             f"{self.authentication_config.host}/api/ds/query",
             headers={"Authorization": f"Bearer {self.authentication_config.token}"},
             json={"queries": [target], "from": start, "to": end},
@@ -284,7 +286,7 @@ class GrafanaProvider(BaseTopologyProvider, ProviderHealthMixin):
     def get_alerts_configuration(self, alert_id: str | None = None):
         api = f"{self.authentication_config.host}/api/v1/provisioning/alert-rules"
         headers = {"Authorization": f"Bearer {self.authentication_config.token}"}
-        response = requests.get(api, verify=False, headers=headers)
+        response = self.get_http_session().get(api, verify=False, headers=headers)
         if not response.ok:
             self.logger.warning(
                 "Could not get alerts", extra={"response": response.json()}
@@ -301,7 +303,9 @@ class GrafanaProvider(BaseTopologyProvider, ProviderHealthMixin):
         self.logger.info("Deploying alert")
         api = f"{self.authentication_config.host}/api/v1/provisioning/alert-rules"
         headers = {"Authorization": f"Bearer {self.authentication_config.token}"}
-        response = requests.post(api, verify=False, json=alert, headers=headers)
+        response = self.get_http_session().post(
+            api, verify=False, json=alert, headers=headers
+        )
 
         if not response.ok:
             response_json = response.json()
@@ -516,7 +520,9 @@ class GrafanaProvider(BaseTopologyProvider, ProviderHealthMixin):
             headers = {"Authorization": f"Bearer {self.authentication_config.token}"}
             health_url = f"{self.authentication_config.host}/api/health"
 
-            resp = requests.get(health_url, verify=False, headers=headers, timeout=5)
+            resp = self.get_http_session().get(
+                health_url, verify=False, headers=headers, timeout=5
+            )
 
             if resp.ok:
                 health_data = resp.json()
@@ -547,7 +553,7 @@ class GrafanaProvider(BaseTopologyProvider, ProviderHealthMixin):
         )
         try:
             self.logger.info("Getting contact points")
-            all_contact_points = requests.get(
+            all_contact_points = self.get_http_session().get(
                 contacts_api, verify=False, headers=headers
             )
             all_contact_points.raise_for_status()
@@ -579,7 +585,7 @@ class GrafanaProvider(BaseTopologyProvider, ProviderHealthMixin):
                 webhook["settings"]["url"] = keep_api_url
                 webhook["settings"]["authorization_scheme"] = "digest"
                 webhook["settings"]["authorization_credentials"] = api_key
-                requests.put(
+                self.get_http_session().put(
                     f'{contacts_api}/{webhook["uid"]}',
                     verify=False,
                     json=webhook,
@@ -598,7 +604,7 @@ class GrafanaProvider(BaseTopologyProvider, ProviderHealthMixin):
                         "authorization_credentials": api_key,
                     },
                 }
-                response = requests.post(
+                response = self.get_http_session().post(
                     contacts_api,
                     verify=False,
                     json=webhook,
@@ -613,7 +619,7 @@ class GrafanaProvider(BaseTopologyProvider, ProviderHealthMixin):
             if webhook_exists:
                 webhook = webhook_exists[0]
                 webhook["settings"]["url"] = f"{keep_api_url}&api_key={api_key}"
-                requests.put(
+                self.get_http_session().put(
                     f'{contacts_api}/{webhook["uid"]}',
                     verify=False,
                     json=webhook,
@@ -630,7 +636,7 @@ class GrafanaProvider(BaseTopologyProvider, ProviderHealthMixin):
                         "url": f"{keep_api_url}?api_key={api_key}",
                     },
                 }
-                response = requests.post(
+                response = self.get_http_session().post(
                     contacts_api,
                     verify=False,
                     json=webhook,
@@ -645,9 +651,11 @@ class GrafanaProvider(BaseTopologyProvider, ProviderHealthMixin):
             policies_api = (
                 f"{self.authentication_config.host}/api/v1/provisioning/policies"
             )
-            all_policies = requests.get(
-                policies_api, verify=False, headers=headers
-            ).json()
+            all_policies = (
+                self.get_http_session()
+                .get(policies_api, verify=False, headers=headers)
+                .json()
+            )
             policy_exists = any(
                 [
                     p
@@ -680,7 +688,7 @@ class GrafanaProvider(BaseTopologyProvider, ProviderHealthMixin):
                         "continue": True,
                     }
                 )
-                requests.put(
+                self.get_http_session().put(
                     policies_api,
                     verify=False,
                     json=all_policies,
@@ -726,7 +734,7 @@ class GrafanaProvider(BaseTopologyProvider, ProviderHealthMixin):
                     f"Fetching alerts page {page + 1}", extra={"params": params}
                 )
 
-                response = requests.get(
+                response = self.get_http_session().get(
                     alerts_api, params=params, verify=False, headers=headers, timeout=30
                 )
                 response.raise_for_status()
@@ -758,7 +766,9 @@ class GrafanaProvider(BaseTopologyProvider, ProviderHealthMixin):
             notification_api = (
                 f"{self.authentication_config.host}/api/alert-notifications"
             )
-            response = requests.get(notification_api, verify=False, headers=headers)
+            response = self.get_http_session().get(
+                notification_api, verify=False, headers=headers
+            )
             # If we get a 404, legacy alerting is disabled
             # If we get a 200, legacy alerting is enabled
             # If we get a 401/403, we don't have permissions
@@ -776,7 +786,7 @@ class GrafanaProvider(BaseTopologyProvider, ProviderHealthMixin):
             dashboard_api = (
                 f"{self.authentication_config.host}/api/dashboards/uid/{dashboard_uid}"
             )
-            dashboard_response = requests.get(
+            dashboard_response = self.get_http_session().get(
                 dashboard_api, verify=False, headers=headers, timeout=30
             )
             dashboard_response.raise_for_status()
@@ -804,7 +814,7 @@ class GrafanaProvider(BaseTopologyProvider, ProviderHealthMixin):
                 update_dashboard_api = (
                     f"{self.authentication_config.host}/api/dashboards/db"
                 )
-                update_response = requests.post(
+                update_response = self.get_http_session().post(
                     update_dashboard_api,
                     verify=False,
                     json={"dashboard": dashboard, "overwrite": True},
@@ -856,9 +866,11 @@ class GrafanaProvider(BaseTopologyProvider, ProviderHealthMixin):
 
             # Check if notification channel exists
             self.logger.info("Checking for existing notification channels")
-            existing_channels = requests.get(
-                notification_api, verify=False, headers=headers
-            ).json()
+            existing_channels = (
+                self.get_http_session()
+                .get(notification_api, verify=False, headers=headers)
+                .json()
+            )
             self.logger.debug(f"Found {len(existing_channels)} existing channels")
 
             channel_exists = any(
@@ -869,7 +881,7 @@ class GrafanaProvider(BaseTopologyProvider, ProviderHealthMixin):
 
             if not channel_exists:
                 self.logger.info(f"Creating new notification channel '{webhook_name}'")
-                response = requests.post(
+                response = self.get_http_session().post(
                     notification_api, verify=False, json=notification, headers=headers
                 )
                 if not response.ok:
@@ -996,7 +1008,7 @@ class GrafanaProvider(BaseTopologyProvider, ProviderHealthMixin):
         try:
             self.logger.info("Fetching list of datasources")
             datasources_url = f"{self.authentication_config.host}/api/datasources"
-            datasources_resp = requests.get(
+            datasources_resp = self.get_http_session().get(
                 datasources_url, headers=headers, timeout=5, verify=False
             )
 
@@ -1056,7 +1068,9 @@ class GrafanaProvider(BaseTopologyProvider, ProviderHealthMixin):
 
                 # Query the alerts endpoint
                 self.logger.info(f"Querying {ds.get('name')} alerts at: {alert_url}")
-                resp = requests.get(alert_url, headers=headers, timeout=8, verify=False)
+                resp = self.get_http_session().get(
+                    alert_url, headers=headers, timeout=8, verify=False
+                )
 
                 if resp.status_code == 200:
                     data = resp.json()
@@ -1219,7 +1233,7 @@ class GrafanaProvider(BaseTopologyProvider, ProviderHealthMixin):
             api_endpoint = f"{self.authentication_config.host}/api/v1/rules/history?from={week_ago}&to={now}&limit=0"
             self.logger.info(f"Querying Grafana history API endpoint: {api_endpoint}")
 
-            response = requests.get(
+            response = self.get_http_session().get(
                 api_endpoint, verify=False, headers=headers, timeout=5
             )
             self.logger.info(
@@ -1308,7 +1322,7 @@ class GrafanaProvider(BaseTopologyProvider, ProviderHealthMixin):
                     )
                     self.logger.info(f"Fetching alert rules from: {rules_endpoint}")
 
-                    rules_response = requests.get(
+                    rules_response = self.get_http_session().get(
                         rules_endpoint, verify=False, headers=headers, timeout=5
                     )
 
@@ -1329,7 +1343,7 @@ class GrafanaProvider(BaseTopologyProvider, ProviderHealthMixin):
                             rule_history_url = f"{self.authentication_config.host}/api/v1/rules/history?from={week_ago}&to={now}&limit=100&ruleUID={rule_uid}"
 
                             try:
-                                rule_resp = requests.get(
+                                rule_resp = self.get_http_session().get(
                                     rule_history_url,
                                     verify=False,
                                     headers=headers,
@@ -1456,7 +1470,7 @@ class GrafanaProvider(BaseTopologyProvider, ProviderHealthMixin):
             alertmanager_url = f"{self.authentication_config.host}/api/alertmanager/grafana/api/v2/alerts"
             self.logger.info(f"Querying Alertmanager at: {alertmanager_url}")
 
-            am_resp = requests.get(
+            am_resp = self.get_http_session().get(
                 alertmanager_url, verify=False, headers=headers, timeout=5
             )
 
@@ -1649,7 +1663,7 @@ class GrafanaProvider(BaseTopologyProvider, ProviderHealthMixin):
             "to": "now",
         }
         try:
-            response = requests.post(
+            response = self.get_http_session().post(
                 f"{self.authentication_config.host}/api/ds/query",
                 verify=False,
                 headers=headers,
@@ -130,7 +130,7 @@ class JiraProvider(BaseProvider):
         )
 
         # first, validate user/api token are correct:
-        resp = requests.get(
+        resp = self.get_http_session().get(
             f"{self.jira_host}/rest/api/3/myself",
             headers={"Accept": "application/json"},
             auth=auth,
@@ -150,7 +150,7 @@ class JiraProvider(BaseProvider):
                 [scope.name for scope in JiraProvider.PROVIDER_SCOPES]
             )
         }
-        resp = requests.get(
+        resp = self.get_http_session().get(
             f"{self.jira_host}/rest/api/3/mypermissions",
             headers=headers,
             auth=auth,
@@ -238,7 +238,7 @@ class JiraProvider(BaseProvider):
                 query_params={"projectKeys": project_key},
             )
 
-            response = requests.get(url=url, auth=self.__get_auth(), verify=False)
+            response = self.get_http_session().get(url=url, auth=self.__get_auth(), verify=False)
 
             response.raise_for_status()
 
@@ -289,7 +289,7 @@ class JiraProvider(BaseProvider):
 
             url = self.__get_url(paths=["issue", issue_id, "transitions"])
 
-            response = requests.get(url=url, auth=self.__get_auth(), verify=False)
+            response = self.get_http_session().get(url=url, auth=self.__get_auth(), verify=False)
             response.raise_for_status()
 
             transitions = response.json().get("transitions", [])
@@ -352,7 +352,7 @@ class JiraProvider(BaseProvider):
 
             request_body = {"transition": {"id": transition_id}}
 
-            response = requests.post(
+            response = self.get_http_session().post(
                 url=url, json=request_body, auth=self.__get_auth(), verify=False
             )
 
@@ -429,7 +429,7 @@ class JiraProvider(BaseProvider):
 
             request_body = {"fields": fields}
 
-            response = requests.post(
+            response = self.get_http_session().post(
                 url=url, json=request_body, auth=self.__get_auth(), verify=False
             )
             try:
@@ -484,7 +484,7 @@ class JiraProvider(BaseProvider):
 
             request_body = {"update": update}
 
-            response = requests.put(
+            response = self.get_http_session().put(
                 url=url, json=request_body, auth=self.__get_auth(), verify=False
             )
 
@@ -507,7 +507,7 @@ class JiraProvider(BaseProvider):
             raise ProviderException(f"Failed to update an issue: {e}")
 
     def _extract_project_key_from_board_name(self, board_name: str):
-        boards_response = requests.get(
+        boards_response = self.get_http_session().get(
             f"{self.jira_host}/rest/agile/1.0/board",
             auth=self.__get_auth(),
             headers={"Accept": "application/json"},
@@ -531,7 +531,7 @@ class JiraProvider(BaseProvider):
             raise Exception("Could not fetch boards: " + boards_response.text)
 
     def _extract_issue_key_from_issue_id(self, issue_id: str):
-        issue_key = requests.get(
+        issue_key = self.get_http_session().get(
             f"{self.jira_host}/rest/api/2/issue/{issue_id}",
             auth=self.__get_auth(),
             headers={"Accept": "application/json"},
@@ -660,7 +660,7 @@ class JiraProvider(BaseProvider):
         """
         if not ticket_id:
             request_url = f"{self.jira_host}/rest/agile/1.0/board/{board_id}/issue"
-            response = requests.get(request_url, auth=self.__get_auth(), verify=False)
+            response = self.get_http_session().get(request_url, auth=self.__get_auth(), verify=False)
             if not response.ok:
                 raise ProviderException(
                     f"{self.__class__.__name__} failed to fetch data from Jira: {response.text}"
@@ -669,7 +669,7 @@ class JiraProvider(BaseProvider):
             return {"number_of_issues": issues["total"]}
         else:
             request_url = self.__get_url(paths=["issue", ticket_id])
-            response = requests.get(request_url, auth=self.__get_auth(), verify=False)
+            response = self.get_http_session().get(request_url, auth=self.__get_auth(), verify=False)
             if not response.ok:
                 raise ProviderException(
                     f"{self.__class__.__name__} failed to fetch data from Jira: {response.text}"
@@ -126,7 +126,7 @@ class JiraonpremProvider(BaseProvider):
 
         # first, validate user/api token are correct:
         # Note: Jira On Prem does not support api/3
-        resp = requests.get(
+        resp = self.get_http_session().get(
             f"{self.jira_host}/rest/api/2/myself",
             headers=headers,
             verify=self.authentication_config.verify,
@@ -146,7 +146,7 @@ class JiraonpremProvider(BaseProvider):
                 [scope.name for scope in JiraonpremProvider.PROVIDER_SCOPES]
             )
         }
-        resp = requests.get(
+        resp = self.get_http_session().get(
             f"{self.jira_host}/rest/api/2/mypermissions",
             headers=headers,
             params=params,
@@ -188,7 +188,7 @@ class JiraonpremProvider(BaseProvider):
 
         # otherwise, try to use https:
         try:
-            requests.get(
+            self.get_http_session().get(
                 f"https://{self.authentication_config.host}",
                 verify=self.authentication_config.verify,
                 timeout=10,
@@ -252,7 +252,7 @@ class JiraonpremProvider(BaseProvider):
                 query_params={"projectKeys": project_key},
             )
             headers = self.__get_auth_header()
-            response = requests.get(
+            response = self.get_http_session().get(
                 url=url,
                 headers=headers,
                 verify=self.authentication_config.verify,
@@ -336,7 +336,7 @@ class JiraonpremProvider(BaseProvider):
 
             request_body = {"fields": fields}
 
-            response = requests.post(
+            response = self.get_http_session().post(
                 url=url,
                 json=request_body,
                 headers=self.__get_auth_header(),
@@ -401,7 +401,7 @@ class JiraonpremProvider(BaseProvider):
 
             request_body = {"update": update}
 
-            response = requests.put(
+            response = self.get_http_session().put(
                 url=url,
                 json=request_body,
                 headers=self.__get_auth_header(),
@@ -436,7 +436,7 @@ class JiraonpremProvider(BaseProvider):
         }
         headers.update(self.__get_auth_header())
 
-        boards_response = requests.get(
+        boards_response = self.get_http_session().get(
             f"{self.jira_host}/rest/agile/1.0/board",
             headers=headers,
             verify=self.authentication_config.verify,
@@ -449,7 +449,7 @@ class JiraonpremProvider(BaseProvider):
                     # Jira On Prem does not have the "location" in its response so we need to figure it out
                     board_id = board["id"]
                     # get the filter
-                    board_configuration = requests.get(
+                    board_configuration = self.get_http_session().get(
                         f"{self.jira_host}/rest/agile/1.0/board/{board_id}/configuration",
                         headers=headers,
                         verify=self.authentication_config.verify,
@@ -462,7 +462,7 @@ class JiraonpremProvider(BaseProvider):
                     # get the filter id
                     filter_id = board_configuration.json()["filter"]["id"]
                     # get the filter
-                    filter_response = requests.get(
+                    filter_response = self.get_http_session().get(
                         f"{self.jira_host}/rest/api/2/filter/{filter_id}",
                         headers=headers,
                         verify=self.authentication_config.verify,
@@ -498,7 +498,7 @@ class JiraonpremProvider(BaseProvider):
         }
         headers.update(self.__get_auth_header())
 
-        issue_key = requests.get(
+        issue_key = self.get_http_session().get(
             f"{self.jira_host}/rest/api/2/issue/{issue_id}",
             headers=headers,
             verify=self.authentication_config.verify,
@@ -603,7 +603,7 @@ class JiraonpremProvider(BaseProvider):
             request_url = (
                 f"https://{self.jira_host}/rest/agile/1.0/board/{board_id}/issue"
             )
-            response = requests.get(
+            response = self.get_http_session().get(
                 request_url,
                 headers=self.__get_auth_header(),
                 verify=self.authentication_config.verify,
@@ -617,7 +617,7 @@ class JiraonpremProvider(BaseProvider):
             return {"number_of_issues": issues["total"]}
         else:
             request_url = self.__get_url(paths=["issue", ticket_id])
-            response = requests.get(
+            response = self.get_http_session().get(
                 request_url,
                 headers=self.__get_auth_header(),
                 verify=self.authentication_config.verify,
@@ -4,7 +4,6 @@ import typing
 import json5
 import opsgenie_sdk
 import pydantic
-import requests
 from opsgenie_sdk.rest import ApiException
 
 from keep.contextmanager.contextmanager import ContextManager
@@ -91,7 +90,7 @@ class OpsgenieProvider(BaseProvider, ProviderHealthMixin):
             url = "https://api.opsgenie.com/v2/"
 
             # Get the list of integrations
-            response = requests.get(
+            response = self.get_http_session().get(
                 url + "integrations/",
                 headers={"Authorization": api_key},
             )
@@ -111,7 +110,7 @@ class OpsgenieProvider(BaseProvider, ProviderHealthMixin):
                 }
 
             # Get the integration details and check if it has write access
-            response = requests.get(
+            response = self.get_http_session().get(
                 url + "integrations/" + api_key_id,
                 headers={"Authorization": api_key},
             )
@@ -32,6 +32,11 @@ from keep.providers.base.base_provider import (
 )
 from keep.providers.models.provider_config import ProviderConfig, ProviderScope
 from keep.providers.models.provider_method import ProviderMethodDTO, ProviderMethodParam
+from keep.providers.providers_manifest import (
+    KEEP_PROVIDERS_MANIFEST_AUTO_BUILD,
+    build_providers_manifest,
+    load_providers_manifest,
+)
 from keep.secretmanager.secretmanagerfactory import SecretManagerFactory
 
 PROVIDERS_CACHE_FILE = os.environ.get("PROVIDERS_CACHE_FILE", "providers_cache.json")
@@ -263,21 +268,18 @@ class ProvidersFactory:
             logger.debug("Using cached providers")
             return ProvidersFactory._loaded_providers_cache
 
-        if os.path.exists(PROVIDERS_CACHE_FILE) and not ignore_cache_file:
-            logger.info(
-                "Loading providers from cache file",
-                extra={"file": PROVIDERS_CACHE_FILE},
-            )
-            with open(PROVIDERS_CACHE_FILE, "r") as f:
-                providers_cache = json.load(f)
-                ProvidersFactory._loaded_providers_cache = [
-                    Provider(**provider) for provider in providers_cache
-                ]
-            logger.info(
-                "Providers loaded from cache file",
-                extra={"file": PROVIDERS_CACHE_FILE},
-            )
-            return ProvidersFactory._loaded_providers_cache
+        if not ignore_cache_file:
+            # the manifest lists the providers without importing their modules
+            providers = load_providers_manifest(PROVIDERS_CACHE_FILE)
+            if providers is None and KEEP_PROVIDERS_MANIFEST_AUTO_BUILD:
+                providers = build_providers_manifest(PROVIDERS_CACHE_FILE)
+            if providers is not None:
+                logger.info(
+                    "Providers loaded from manifest",
+                    extra={"file": PROVIDERS_CACHE_FILE},
+                )
+                ProvidersFactory._loaded_providers_cache = providers
+                return providers
 
         logger.info("Loading providers")
         providers = []
@@ -0,0 +1,145 @@
+"""
+Providers manifest: the metadata of every provider (config schema, methods, scopes,
+tags...) stored as JSON, so listing providers doesn't import the ~150 provider
+packages and their SDKs. Provider modules are only imported by
+`ProvidersFactory.get_provider_class` for the types actually used.
+
+The manifest is built at image build time (`python -m keep.providers.providers_manifest`
+or `keep provider build_cache`) or, on first use, in a subprocess so the building
+process never keeps the provider modules loaded.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+
+from filelock import FileLock, Timeout
+
+from keep.api.core.config import config
+from keep.api.models.provider import Provider
+
+PROVIDERS_MANIFEST_VERSION = 1
+PROVIDERS_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+# build the manifest in a subprocess when it's missing or stale
+KEEP_PROVIDERS_MANIFEST_AUTO_BUILD = (
+    config("KEEP_PROVIDERS_MANIFEST_AUTO_BUILD", default="true") == "true"
+)
+MANIFEST_BUILD_TIMEOUT = 300
+
+logger = logging.getLogger(__name__)
+
+
+def get_providers_fingerprint() -> str:
+    """
+    Identifies the provider code the manifest was built from, without importing it:
+    the content of every module under keep/providers, so changes to a provider's helper
+    modules or to the base provider are detected too (hashing them takes ~10ms).
+    """
+    digest = hashlib.sha256()
+    for directory, subdirectories, files in os.walk(PROVIDERS_DIRECTORY):
+        subdirectories[:] = sorted(
+            subdirectory
+            for subdirectory in subdirectories
+            if subdirectory != "__pycache__"
+        )
+        for file in sorted(files):
+            if not file.endswith(".py"):
+                continue
+            path = os.path.join(directory, file)
+            try:
+                with open(path, "rb") as f:
+                    content = f.read()
+            except OSError:
+                continue
+            digest.update(os.path.relpath(path, PROVIDERS_DIRECTORY).encode())
+            digest.update(hashlib.sha256(content).digest())
+    return digest.hexdigest()
+
+
+def load_providers_manifest(path: str) -> list[Provider] | None:
+    """
+    Returns the providers of the manifest at `path`, or None if it's missing or was
+    built from different provider code.
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        logger.warning("Invalid providers manifest, ignoring", extra={"file": path})
+        return None
+
+    # caches written by older versions are a plain list of providers
+    if isinstance(manifest, list):
+        return [Provider(**provider) for provider in manifest]
+
+    if (
+        manifest.get("version") != PROVIDERS_MANIFEST_VERSION
+        or manifest.get("fingerprint") != get_providers_fingerprint()
+    ):
+        logger.info("Providers manifest is stale", extra={"file": path})
+        return None
+    return [Provider(**provider) for provider in manifest["providers"]]
+
+
+def write_providers_manifest(path: str, providers: list[Provider]):
+    # to prevent circular imports
+    from keep.providers.providers_factory import ProviderEncoder
+
+    manifest = {
+        "version": PROVIDERS_MANIFEST_VERSION,
+        "fingerprint": get_providers_fingerprint(),
+        "providers": sorted(providers, key=lambda provider: provider.type),
+    }
+    directory = os.path.dirname(os.path.abspath(path))
+    # write atomically, other processes may be reading it
+    with tempfile.NamedTemporaryFile(
+        "w", dir=directory, prefix=".providers_manifest", delete=False
+    ) as f:
+        json.dump(manifest, f, cls=ProviderEncoder)
+    os.replace(f.name, path)
+
+
+def build_providers_manifest(path: str) -> list[Provider] | None:
+    """
+    Builds the manifest in a subprocess and loads it.
+
+    Returns None if it couldn't be built (e.g. read-only filesystem), the caller then
+    falls back to importing the providers in process.
+    """
+    try:
+        with FileLock(f"{path}.lock", timeout=MANIFEST_BUILD_TIMEOUT):
+            # another process may have built it while we were waiting for the lock
+            providers = load_providers_manifest(path)
+            if providers is not None:
+                return providers
+            logger.info("Building providers manifest", extra={"file": path})
+            subprocess.run(
+                [
+                    sys.executable,
+                    "-m",
+                    "keep.providers.providers_manifest",
+                    os.path.abspath(path),
+                ],
+                check=True,
+                timeout=MANIFEST_BUILD_TIMEOUT,
+            )
+    except (OSError, Timeout, subprocess.SubprocessError):
+        logger.exception("Failed to build providers manifest", extra={"file": path})
+        return None
+    return load_providers_manifest(path)
+
+
+if __name__ == "__main__":
+    # to prevent circular imports
+    from keep.providers.providers_factory import PROVIDERS_CACHE_FILE, ProvidersFactory
+
+    manifest_path = sys.argv[1] if len(sys.argv) > 1 else PROVIDERS_CACHE_FILE
+    write_providers_manifest(
+        manifest_path, ProvidersFactory.get_all_providers(ignore_cache_file=True)
+    )
@@ -27,6 +27,7 @@ from keep.contextmanager.contextmanager import ContextManager
 from keep.event_subscriber.event_subscriber import EventSubscriber
 from keep.functions import cyaml
 from keep.providers.base.base_provider import BaseProvider
+from keep.providers.base.provider_http import close_provider_http_sessions
 from keep.providers.providers_factory import ProvidersFactory
 from keep.secretmanager.secretmanagerfactory import SecretManagerFactory
 
@@ -367,6 +368,7 @@ class ProvidersService:
 
             session.delete(provider_model)
             session.commit()
+            close_provider_http_sessions(tenant_id, provider_id)
 
     @staticmethod
     def validate_provider_scopes(
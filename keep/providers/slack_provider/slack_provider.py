@@ -126,7 +126,7 @@ class SlackProvider(BaseProvider):
             "name": emoji,
             "timestamp": timestamp,
         }
-        response = requests.post(
+        response = self.get_http_session().post(
             f"{SlackProvider.SLACK_API}/reactions.add",
             data=payload,
         )
@@ -213,13 +213,13 @@ class SlackProvider(BaseProvider):
             # https://stackoverflow.com/questions/42993602/slack-chat-postmessage-attachment-gives-no-text
             if payload.get("attachments", None):
                 payload["attachments"] = attachments
-                response = requests.post(
+                response = self.get_http_session().post(
                     self.authentication_config.webhook_url,
                     data={"payload": json.dumps(payload)},
                     headers={"Content-Type": "application/x-www-form-urlencoded"},
                 )
             else:
-                response = requests.post(
+                response = self.get_http_session().post(
                     self.authentication_config.webhook_url,
                     json=payload,
                 )
@@ -268,7 +268,7 @@ class SlackProvider(BaseProvider):
                     )
                     payload["token"] = self.authentication_config.access_token
 
-            response = requests.post(
+            response = self.get_http_session().post(
                 f"{SlackProvider.SLACK_API}/{method}", json=payload,
                 headers={
                         "Content-Type": "application/json",
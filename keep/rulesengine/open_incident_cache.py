@@ -0,0 +1,103 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from keep.api.core.config import config
+
+
+@dataclass
+class OpenIncidentEntry:
+    incident_id: UUID
+    # max timestamp of the alerts attached to the incident, as seen by this process
+    last_alert_timestamp: Optional[datetime]
+    cached_at: float
+
+
+class OpenIncidentCache:
+    """
+    Short-lived, per-process cache of the open incident for each
+    (tenant, rule, rule_fingerprint) used by the rules engine for correlation.
+
+    Entries are only hints: the rules engine always reloads the incident row by
+    primary key and falls back to the full lookup whenever the row was closed or
+    the cached alert timestamp says the incident may have expired, so a stale entry
+    (e.g. an incident resolved or merged by another worker) never changes the outcome.
+    """
+
+    @staticmethod
+    def get_instance() -> "OpenIncidentCache":
+        if not hasattr(OpenIncidentCache, "_instance"):
+            OpenIncidentCache._instance = OpenIncidentCache()
+        return OpenIncidentCache._instance
+
+    def __init__(self):
+        self.ttl = config("KEEP_RULES_ENGINE_INCIDENT_CACHE_TTL", default=30, cast=int)
+        self.max_size = config(
+            "KEEP_RULES_ENGINE_INCIDENT_CACHE_SIZE", default=10000, cast=int
+        )
+        self._entries: OrderedDict[tuple, OpenIncidentEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def get(
+        self, tenant_id: str, rule_id: UUID, rule_fingerprint: str
+    ) -> Optional[OpenIncidentEntry]:
+        if not self.enabled:
+            return None
+        key = (tenant_id, str(rule_id), rule_fingerprint)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry.cached_at > self.ttl:
+                self._entries.pop(key, None)
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(
+        self,
+        tenant_id: str,
+        rule_id: UUID,
+        rule_fingerprint: str,
+        incident_id: UUID,
+        last_alert_timestamp: Optional[datetime],
+    ):
+        if not self.enabled:
+            return
+        key = (tenant_id, str(rule_id), rule_fingerprint)
+        with self._lock:
+            current = self._entries.get(key)
+            if (
+                current is not None
+                and current.incident_id == incident_id
+                and current.last_alert_timestamp
+                and (
+                    last_alert_timestamp is None
+                    or current.last_alert_timestamp > last_alert_timestamp
+                )
+            ):
+                last_alert_timestamp = current.last_alert_timestamp
+            self._entries[key] = OpenIncidentEntry(
+                incident_id=incident_id,
+                last_alert_timestamp=last_alert_timestamp,
+                cached_at=time.monotonic(),
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, tenant_id: str, rule_id: UUID, rule_fingerprint: str):
+        with self._lock:
+            self._entries.pop((tenant_id, str(rule_id), rule_fingerprint), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
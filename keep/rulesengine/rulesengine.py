@@ -1,4 +1,5 @@
 import copy
+import datetime
 import json
 import logging
 import re
@@ -14,21 +15,24 @@ from sqlmodel import Session
 
 from keep.api.bl.incidents_bl import IncidentBl
 from keep.api.core.db import (
-    assign_alert_to_incident,
+    add_alerts_to_incident,
     create_incident_for_grouping_rule,
     enrich_incidents_with_alerts,
     get_alerts_by_fingerprint,
     get_incident_for_grouping_rule,
+    get_last_alerts_max_timestamp,
 )
 from keep.api.core.db import get_rules as get_rules_db
 from keep.api.core.db import is_all_alerts_in_status
 from keep.api.core.dependencies import get_pusher_client
 from keep.api.models.alert import AlertDto, AlertSeverity, AlertStatus
 from keep.api.models.db.alert import Incident
+from keep.api.models.db.incident import IncidentStatus
 from keep.api.models.db.rule import Rule
 from keep.api.models.incident import IncidentDto
 from keep.api.utils.cel_utils import preprocess_cel_expression
 from keep.api.utils.enrichment_helpers import convert_db_alerts_to_dto_alerts
+from keep.rulesengine.open_incident_cache import OpenIncidentCache
 
 # Shahar: this is performance enhancment https://github.com/cloud-custodian/cel-python/issues/68
 
@@ -85,6 +89,9 @@ class RulesEngine:
         incidents_dto = {}
         for rule in rules:
             self.logger.info(f"Evaluating rule {rule.name}")
+            # Matches are grouped by rule fingerprint so every incident is resolved,
+            # attached to and committed once per batch instead of once per event
+            matches_by_rule_fingerprint: dict[str, list[tuple[AlertDto, list]]] = {}
             for event in events:
                 self.logger.info(
                     f"Checking if rule {rule.name} apply to event {event.id}"
@@ -116,105 +123,28 @@ class RulesEngine:
                     rule_fingerprints = self._calc_rule_fingerprint(event, rule)
 
                     for rule_fingerprint in rule_fingerprints:
-                        # #If the alert recover its previous status, we need to check if there are any alerts with the same fingerprint that were resolved
-                        creation_allowed = True
-                        if hasattr(event, "previous_status") and (event.previous_status == AlertStatus.MAINTENANCE.value):
-                            alerts_solved = get_alerts_by_fingerprint(self.tenant_id, event.fingerprint, status=AlertStatus.RESOLVED.value)
-                            if alerts_solved and any(event.lastReceived < solved_alert.event["lastReceived"] for solved_alert in alerts_solved):
-                                creation_allowed = False
-                        incident, send_created_event = self._get_or_create_incident(
-                            rule=rule,
-                            rule_fingerprint=",".join(rule_fingerprint),
-                            session=session,
-                            event=event,
-                            creation_allowed=creation_allowed
-                        )
-                        if incident:
-                            incident = assign_alert_to_incident(
-                                fingerprint=event.fingerprint,
-                                incident=incident,
-                                tenant_id=self.tenant_id,
-                                session=session,
-                            )
-
-                            if not incident.is_visible:
-
-                                self.logger.info(
-                                    f"No existing incidents for rule {rule.name}. Checking incident creation conditions"
-                                )
-
-                                rule_groups = self._extract_subrules(
-                                    rule.definition_cel
-                                )
-                                firing_count = sum(
-                                    [
-                                        alert.event.get("unresolvedCounter", 1)
-                                        for alert in incident.alerts
-                                    ]
-                                )
-                                alerts_count = max(incident.alerts_count, firing_count)
-                                if alerts_count >= rule.threshold:
-                                    if not rule.require_approve:
-                                        if rule.create_on == "any" or (
-                                            rule.create_on == "all"
-                                            and len(rule_groups) == len(matched_rules)
-                                        ):
-                                            self.logger.info(
-                                                "Single event is enough, so creating incident"
-                                            )
-                                            incident.is_visible = True
-                                        elif rule.create_on == "all":
-                                            incident = self._process_event_for_history_based_rule(
-                                                incident, rule, session
-                                            )
-
-                                send_created_event = incident.is_visible
-
-                            # If we try to access incident.id inside except block, it will try to refresh
-                            # instance and raises PendingRollback error
-                            incident_id = incident.id
-
-                            # Incident instance might change till this moment (set visible for example),
-                            # so we need to commit changes
-                            # Otherwise sqlalchemy might try to do this in unpredictable moment
-                            for attempt in range(3):
-                                try:
-                                    # Explicitly add incident, but it most likely already there, since it was loaded in
-                                    # same session
-                                    session.add(incident)
-                                    session.commit()
-                                    break
-                                except StaleDataError as ex:
-                                    if "expected to update" in ex.args[0]:
-                                        self.logger.warning(
-                                            f"Race condition met while updating incident `{incident_id}`, retry #{attempt}"
-                                        )
-                                        session.rollback()
-                                        continue
-                                    else:
-                                        raise
-
-                            incident = IncidentBl(
-                                self.tenant_id, session
-                            ).resolve_incident_if_require(incident, handle_workflow_event=False)
-
-                            incident_dto = IncidentDto.from_db_incident(incident)
-                            if send_created_event:
-                                RulesEngine.send_workflow_event(
-                                    self.tenant_id, session, incident_dto, "created"
-                                )
-                            elif incident.is_visible:
-                                RulesEngine.send_workflow_event(
-                                    self.tenant_id, session, incident_dto, "updated"
-                                )
-
-                            incidents_dto[incident.id] = incident_dto
-
+                        matches_by_rule_fingerprint.setdefault(
+                            ",".join(rule_fingerprint), []
+                        ).append((event, matched_rules))
                 else:
                     self.logger.info(
                         f"Rule {rule.name} on event {event.id} is not relevant"
                     )
 
+            for rule_fingerprint, matches in matches_by_rule_fingerprint.items():
+                try:
+                    incident_dto = self._correlate_matches(
+                        rule, rule_fingerprint, matches, session
+                    )
+                except Exception:
+                    # the cached incident may not reflect what was committed
+                    OpenIncidentCache.get_instance().invalidate(
+                        self.tenant_id, rule.id, rule_fingerprint
+                    )
+                    raise
+                if incident_dto:
+                    incidents_dto[incident_dto.id] = incident_dto
+
         self.logger.info("Rules ran successfully")
         # if we don't have any updated groups, we don't need to create any alerts
         if not incidents_dto:
@@ -224,6 +154,194 @@ class RulesEngine:
 
         return list(incidents_dto.values())
 
+    def _is_creation_allowed(self, event: AlertDto) -> bool:
+        # If the alert recover its previous status, we need to check if there are any alerts with the same fingerprint that were resolved
+        if hasattr(event, "previous_status") and (
+            event.previous_status == AlertStatus.MAINTENANCE.value
+        ):
+            alerts_solved = get_alerts_by_fingerprint(
+                self.tenant_id, event.fingerprint, status=AlertStatus.RESOLVED.value
+            )
+            if alerts_solved and any(
+                event.lastReceived < solved_alert.event["lastReceived"]
+                for solved_alert in alerts_solved
+            ):
+                return False
+        return True
+
+    def _correlate_matches(
+        self,
+        rule: Rule,
+        rule_fingerprint: str,
+        matches: list[tuple[AlertDto, list]],
+        session: Session,
+    ) -> Optional[IncidentDto]:
+        """
+        Attach all the events matched by (rule, rule_fingerprint) in this batch to
+        their incident: the incident is looked up (or created) once, all fingerprints
+        are attached in one bulk call and the incident is committed, resolved and
+        reported to workflows once.
+        """
+        incident = None
+        send_created_event = False
+        attached_matches = []
+        for event, matched_rules in matches:
+            if incident is None:
+                # Starting new incident ONLY if alert is firing, so events preceding
+                # the first firing one are not attached (as if processed one by one)
+                incident, send_created_event = self._get_or_create_incident(
+                    rule=rule,
+                    rule_fingerprint=rule_fingerprint,
+                    session=session,
+                    event=event,
+                    creation_allowed=self._is_creation_allowed(event),
+                )
+                if not incident:
+                    continue
+            attached_matches.append((event, matched_rules))
+
+        if not incident:
+            return None
+
+        fingerprints = list(
+            dict.fromkeys(event.fingerprint for event, _ in attached_matches)
+        )
+        incident = add_alerts_to_incident(
+            self.tenant_id, incident, fingerprints, session=session
+        )
+
+        if rule.incident_name_template and len(attached_matches) > 1:
+            # merge the values of all the events attached in this batch into the name
+            enrich_incidents_with_alerts(self.tenant_id, [incident], session)
+            self._update_incident_name(incident, rule, attached_matches[-1][0])
+
+        if not incident.is_visible:
+
+            self.logger.info(
+                f"No existing incidents for rule {rule.name}. Checking incident creation conditions"
+            )
+
+            enrich_incidents_with_alerts(self.tenant_id, [incident], session)
+            rule_groups = self._extract_subrules(rule.definition_cel)
+            firing_count = sum(
+                [alert.event.get("unresolvedCounter", 1) for alert in incident.alerts]
+            )
+            alerts_count = max(incident.alerts_count, firing_count)
+            if alerts_count >= rule.threshold:
+                if not rule.require_approve:
+                    if rule.create_on == "any" or (
+                        rule.create_on == "all"
+                        and any(
+                            len(rule_groups) == len(matched_rules)
+                            for _, matched_rules in attached_matches
+                        )
+                    ):
+                        self.logger.info("Single event is enough, so creating incident")
+                        incident.is_visible = True
+                    elif rule.create_on == "all":
+                        incident = self._process_event_for_history_based_rule(
+                            incident, rule, session
+                        )
+
+            send_created_event = incident.is_visible
+
+        # If we try to access incident.id inside except block, it will try to refresh
+        # instance and raises PendingRollback error
+        incident_id = incident.id
+
+        # Incident instance might change till this moment (set visible for example),
+        # so we need to commit changes
+        # Otherwise sqlalchemy might try to do this in unpredictable moment
+        for attempt in range(3):
+            try:
+                # Explicitly add incident, but it most likely already there, since it was loaded in
+                # same session
+                session.add(incident)
+                session.commit()
+                break
+            except StaleDataError as ex:
+                if "expected to update" in ex.args[0]:
+                    self.logger.warning(
+                        f"Race condition met while updating incident `{incident_id}`, retry #{attempt}"
+                    )
+                    session.rollback()
+                    continue
+                else:
+                    raise
+
+        incident = IncidentBl(self.tenant_id, session).resolve_incident_if_require(
+            incident, handle_workflow_event=False
+        )
+
+        cache = OpenIncidentCache.get_instance()
+        if incident.status in IncidentStatus.get_closed(return_values=True):
+            cache.invalidate(self.tenant_id, rule.id, rule_fingerprint)
+        else:
+            cache.set(
+                self.tenant_id,
+                rule.id,
+                rule_fingerprint,
+                incident.id,
+                get_last_alerts_max_timestamp(self.tenant_id, fingerprints, session),
+            )
+
+        incident_dto = IncidentDto.from_db_incident(incident)
+        if send_created_event:
+            RulesEngine.send_workflow_event(
+                self.tenant_id, session, incident_dto, "created"
+            )
+        elif incident.is_visible:
+            RulesEngine.send_workflow_event(
+                self.tenant_id, session, incident_dto, "updated"
+            )
+
+        return incident_dto
+
+    def _get_incident_for_grouping_rule(
+        self, rule: Rule, rule_fingerprint: str, session: Session
+    ) -> tuple[Optional[Incident], Optional[bool]]:
+        """
+        get_incident_for_grouping_rule, served from the open incident cache when possible.
+
+        A cache hit is only trusted when the reloaded incident is still open and the
+        cached alert timestamp proves it is within the rule timeframe (other workers
+        can only add newer alerts); otherwise the full lookup decides.
+        """
+        cache = OpenIncidentCache.get_instance()
+        entry = cache.get(self.tenant_id, rule.id, rule_fingerprint)
+        if entry is not None and session is not None:
+            incident = session.get(
+                Incident, entry.incident_id, populate_existing=True
+            )
+            if (
+                incident is not None
+                and incident.status not in IncidentStatus.get_closed(return_values=True)
+                and entry.last_alert_timestamp is not None
+                and entry.last_alert_timestamp
+                >= datetime.datetime.utcnow()
+                - datetime.timedelta(seconds=rule.timeframe)
+            ):
+                if rule.incident_name_template and incident.alerts_count > 0:
+                    enrich_incidents_with_alerts(self.tenant_id, [incident], session)
+                return incident, False
+            cache.invalidate(self.tenant_id, rule.id, rule_fingerprint)
+
+        incident, expired = get_incident_for_grouping_rule(
+            self.tenant_id,
+            rule,
+            rule_fingerprint,
+            session=session,
+        )
+        if incident and not expired and incident.alerts:
+            cache.set(
+                self.tenant_id,
+                rule.id,
+                rule_fingerprint,
+                incident.id,
+                max(alert.timestamp for alert in incident.alerts),
+            )
+        return incident, expired
+
     def get_value_from_event(self, event: AlertDto, var: str) -> str:
         """
         Extract value from event based on template variable
@@ -250,11 +368,8 @@ class RulesEngine:
         self, rule: Rule, rule_fingerprint, session, event, creation_allowed=True
     ) -> (Optional[Incident], bool):
 
-        existed_incident, expired = get_incident_for_grouping_rule(
-            self.tenant_id,
-            rule,
-            rule_fingerprint,
-            session=session,
+        existed_incident, expired = self._get_incident_for_grouping_rule(
+            rule, rule_fingerprint, session
         )
 
         if existed_incident and not expired and rule.incident_prefix:
@@ -269,55 +384,7 @@ class RulesEngine:
             return existed_incident, False
         # if incident name template, merge
         elif existed_incident and not expired:
-            incident_name = copy.copy(rule.incident_name_template)
-            current_name = existed_incident.user_generated_name
-            self.logger.info(
-                "Updating the incident name based on the new event",
-                extra={
-                    "incident_id": existed_incident.id,
-                    "incident_name": current_name,
-                },
-            )
-            alerts = existed_incident.alerts
-            variables = self.get_vaiables(rule.incident_name_template)
-            values = set()
-            for var in variables:
-                var_to_replace = ""
-                alerts_dtos = convert_db_alerts_to_dto_alerts(alerts)
-                for alert in alerts_dtos:
-                    value = self.get_value_from_event(alert, var)
-                    # don't add twice the same value
-                    if value not in values:
-                        var_to_replace += value + ","
-                        values.add(value)
-                this_event_val = self.get_value_from_event(event, var)
-                if this_event_val not in values:
-                    var_to_replace += this_event_val
-                pattern = r"\{\{\s*" + re.escape(var) + r"\s*\}\}"
-                # it happens when the last value is already in the incident name so its skipped
-                if var_to_replace.endswith(","):
-                    var_to_replace = var_to_replace[:-1]
-                # update the incident name template
-                # note that it will be commited later, when the incident is commited
-                incident_name = re.sub(pattern, var_to_replace, incident_name)
-            # Re-apply the incident prefix after template regeneration.
-            # The template generates a plain name without the prefix, which
-            # would otherwise overwrite the prefixed name set during creation
-            # or the earlier prefix check.
-            # See: https://github.com/keephq/keep/issues/5450
-            if rule.incident_prefix and rule.incident_prefix not in incident_name:
-                incident_name = f"{rule.incident_prefix}-{existed_incident.running_number} - {incident_name}"
-            # we are done
-            if existed_incident.user_generated_name != incident_name:
-                existed_incident.user_generated_name = incident_name
-                self.logger.info(
-                    "Incident name updated",
-                    extra={
-                        "incident_id": existed_incident.id,
-                        "old_incident_name": current_name,
-                        "new_incident_name": existed_incident.user_generated_name,
-                    },
-                )
+            self._update_incident_name(existed_incident, rule, event)
             return existed_incident, False
 
         # else, this is the first time
@@ -358,6 +425,57 @@ class RulesEngine:
             return incident, True
         return None, False
 
+    def _update_incident_name(self, existed_incident: Incident, rule: Rule, event):
+        incident_name = copy.copy(rule.incident_name_template)
+        current_name = existed_incident.user_generated_name
+        self.logger.info(
+            "Updating the incident name based on the new event",
+            extra={
+                "incident_id": existed_incident.id,
+                "incident_name": current_name,
+            },
+        )
+        alerts = existed_incident.alerts
+        variables = self.get_vaiables(rule.incident_name_template)
+        values = set()
+        for var in variables:
+            var_to_replace = ""
+            alerts_dtos = convert_db_alerts_to_dto_alerts(alerts)
+            for alert in alerts_dtos:
+                value = self.get_value_from_event(alert, var)
+                # don't add twice the same value
+                if value not in values:
+                    var_to_replace += value + ","
+                    values.add(value)
+            this_event_val = self.get_value_from_event(event, var)
+            if this_event_val not in values:
+                var_to_replace += this_event_val
+            pattern = r"\{\{\s*" + re.escape(var) + r"\s*\}\}"
+            # it happens when the last value is already in the incident name so its skipped
+            if var_to_replace.endswith(","):
+                var_to_replace = var_to_replace[:-1]
+            # update the incident name template
+            # note that it will be commited later, when the incident is commited
+            incident_name = re.sub(pattern, var_to_replace, incident_name)
+        # Re-apply the incident prefix after template regeneration.
+        # The template generates a plain name without the prefix, which
+        # would otherwise overwrite the prefixed name set during creation
+        # or the earlier prefix check.
+        # See: https://github.com/keephq/keep/issues/5450
+        if rule.incident_prefix and rule.incident_prefix not in incident_name:
+            incident_name = f"{rule.incident_prefix}-{existed_incident.running_number} - {incident_name}"
+        # we are done
+        if existed_incident.user_generated_name != incident_name:
+            existed_incident.user_generated_name = incident_name
+            self.logger.info(
+                "Incident name updated",
+                extra={
+                    "incident_id": existed_incident.id,
+                    "old_incident_name": current_name,
+                    "new_incident_name": existed_incident.user_generated_name,
+                },
+            )
+
     def _process_event_for_history_based_rule(
         self, incident: Incident, rule: Rule, session: Session
     ) -> Incident:
@@ -378,7 +496,7 @@ class RulesEngine:
 
         for alert in incident.alerts:
             matched_sub_rules = matched_sub_rules.union(
-                self._check_if_rule_apply(rule, AlertDto(**alert.event))
+                self._check_if_rule_apply(rule, AlertDto.from_stored_event(alert.event))
             )
             if all_sub_rules == matched_sub_rules:
                 is_all_conditions_met = True
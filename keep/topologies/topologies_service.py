@@ -4,7 +4,7 @@ from typing import List, Optional
 from uuid import UUID
 
 from pydantic import ValidationError
-from sqlalchemy import and_, or_, exists
+from sqlalchemy import and_, delete, exists, or_, update
 from sqlalchemy.orm import joinedload, selectinload
 from sqlmodel import Session, select
 
@@ -23,7 +23,9 @@ from keep.api.models.db.topology import (
     TopologyServiceDependencyUpdateRequestDto,
     TopologyServiceDependencyDto,
     TopologyServiceYAML,
+    TopologyImportResult,
 )
+from keep.topologies.topology_matcher_index import invalidate_topology_index
 
 logger = logging.getLogger(__name__)
 
@@ -99,6 +101,134 @@ def get_service_application_ids_dict(
     return result
 
 
+# Columns owned by the topology source; these are compared when diffing an import
+TOPOLOGY_SERVICE_SYNC_FIELDS = (
+    "source_provider_id",
+    "repository",
+    "tags",
+    "service",
+    "display_name",
+    "environment",
+    "description",
+    "team",
+    "email",
+    "slack",
+    "ip_address",
+    "mac_address",
+    "category",
+    "manufacturer",
+    "namespace",
+    "is_manual",
+)
+
+# Max number of ids passed to a single IN clause when bulk deleting
+BULK_DELETE_CHUNK_SIZE = 1000
+
+
+def get_changed_service_fields(db_service: TopologyService, incoming: dict) -> dict:
+    """Returns the subset of incoming service fields that differ from the stored row."""
+    changes = {}
+    for field in TOPOLOGY_SERVICE_SYNC_FIELDS:
+        if field not in incoming:
+            continue
+        value = incoming[field]
+        if value is None:
+            # None falls back to the column default on insert, so do the same on update
+            value = TopologyService.__fields__[field].default
+        if getattr(db_service, field) != value:
+            changes[field] = value
+    return changes
+
+
+def bulk_delete_by_ids(session: Session, model, ids: List) -> int:
+    """Deletes rows of `model` by primary key in bounded chunks, without committing."""
+    ids = list(ids)
+    deleted = 0
+    for i in range(0, len(ids), BULK_DELETE_CHUNK_SIZE):
+        chunk = ids[i : i + BULK_DELETE_CHUNK_SIZE]
+        deleted += session.execute(
+            delete(model).where(model.id.in_(chunk))
+        ).rowcount
+    return deleted
+
+
+def delete_topology_services(session: Session, service_ids: List[int]) -> int:
+    """
+    Deletes services together with their dependencies and application links, without
+    committing. Returns the number of deleted dependencies.
+    """
+    service_ids = list(service_ids)
+    dependencies_deleted = 0
+    for i in range(0, len(service_ids), BULK_DELETE_CHUNK_SIZE):
+        chunk = service_ids[i : i + BULK_DELETE_CHUNK_SIZE]
+        dependencies_deleted += session.execute(
+            delete(TopologyServiceDependency).where(
+                or_(
+                    TopologyServiceDependency.service_id.in_(chunk),
+                    TopologyServiceDependency.depends_on_service_id.in_(chunk),
+                )
+            )
+        ).rowcount
+        session.execute(
+            delete(TopologyServiceApplication).where(
+                TopologyServiceApplication.service_id.in_(chunk)
+            )
+        )
+    bulk_delete_by_ids(session, TopologyService, service_ids)
+    return dependencies_deleted
+
+
+def sync_dependencies(
+    session: Session,
+    existing_dependencies: List[TopologyServiceDependency],
+    incoming_edges: dict[tuple[int, int], Optional[str]],
+    result: TopologyImportResult,
+) -> None:
+    """
+    Applies the difference between the stored dependencies and the incoming edges
+    (keyed by (service_id, depends_on_service_id) and mapped to protocol), without committing.
+    """
+    existing_by_edge = {}
+    duplicate_ids = []
+    for dependency in existing_dependencies:
+        edge = (dependency.service_id, dependency.depends_on_service_id)
+        if edge in existing_by_edge:
+            duplicate_ids.append(dependency.id)
+        else:
+            existing_by_edge[edge] = dependency
+
+    to_update = [
+        {"id": existing_by_edge[edge].id, "protocol": protocol}
+        for edge, protocol in incoming_edges.items()
+        if edge in existing_by_edge and existing_by_edge[edge].protocol != protocol
+    ]
+    to_delete = duplicate_ids + [
+        dependency.id
+        for edge, dependency in existing_by_edge.items()
+        if edge not in incoming_edges
+    ]
+    to_insert = [
+        TopologyServiceDependency(
+            service_id=service_id,
+            depends_on_service_id=depends_on_service_id,
+            protocol=protocol,
+        )
+        for (service_id, depends_on_service_id), protocol in incoming_edges.items()
+        if (service_id, depends_on_service_id) not in existing_by_edge
+    ]
+
+    if to_delete:
+        bulk_delete_by_ids(session, TopologyServiceDependency, to_delete)
+    if to_update:
+        session.execute(update(TopologyServiceDependency), to_update)
+    if to_insert:
+        session.add_all(to_insert)
+
+    result.dependencies_created += len(to_insert)
+    result.dependencies_updated += len(to_update)
+    result.dependencies_deleted += len(to_delete)
+
+
 def validate_non_manual_exists(
     service_ids: list[int], session: Session, tenant_id: str
 ) -> bool:
@@ -248,6 +378,7 @@ class TopologiesService:
 
         session.add_all(new_links)
         session.commit()
+        invalidate_topology_index(tenant_id)
 
         session.expire(new_application, ["services"])
 
@@ -307,6 +438,7 @@ class TopologiesService:
 
             session.add_all(new_links)
             session.commit()
+            invalidate_topology_index(tenant_id)
 
         except Exception as e:
             session.rollback()
@@ -377,6 +509,7 @@ class TopologiesService:
         session.add_all(new_links)
 
         session.commit()
+        invalidate_topology_index(tenant_id)
         session.refresh(application_db)
         return TopologyApplicationDtoOut.from_orm(application_db)
 
@@ -426,6 +559,7 @@ class TopologiesService:
             )
         session.delete(application)
         session.commit()
+        invalidate_topology_index(tenant_id)
         return None
 
     @staticmethod
@@ -457,6 +591,7 @@ class TopologiesService:
             )
             session.add(db_service)
             session.commit()
+            invalidate_topology_index(tenant_id)
             session.refresh(db_service)
             return db_service
         except Exception as e:
@@ -480,6 +615,7 @@ class TopologiesService:
                 session.add(db_service)
 
             session.commit()
+            invalidate_topology_index(tenant_id)
 
         except Exception as e:
             session.rollback()
@@ -512,6 +648,7 @@ class TopologiesService:
                     ):
                         db_service.__setattr__(attr, service_dict[attr])
                 session.commit()
+                invalidate_topology_index(tenant_id)
                 session.refresh(db_service)
                 return db_service
         except Exception as e:
@@ -562,6 +699,7 @@ class TopologiesService:
                 raise ServiceNotFoundException("No services found for the given IDs.")
 
             session.commit()
+            invalidate_topology_index(tenant_id)
         except Exception as e:
             session.rollback()
             logger.error(f"Error while deleting services: {e}")
@@ -734,6 +872,7 @@ class TopologiesService:
             ).delete(synchronize_session=False)
     
             session.commit()
+            invalidate_topology_index(tenant_id)
         except Exception as e:
             session.rollback()
             logger.error(f"Error during cleanup before import: {e}")
@@ -741,48 +880,221 @@ class TopologiesService:
         
 
     @staticmethod
-    def import_to_db(topology_data: dict, session: Session, tenant_id: str):
-        all_services: list[TopologyServiceYAML] = []
-        all_applications: list[TopologyApplicationDtoIn] = []
-        all_dependencies: list[TopologyServiceDependencyCreateRequestDto] = []
+    def import_to_db(
+        topology_data: dict, session: Session, tenant_id: str
+    ) -> TopologyImportResult:
+        """
+        Merges an exported topology into the tenant's topology.
+
+        Services are matched by id, dependencies by (service_id, depends_on_service_id) and
+        applications by id (or by name when the application has no id). Only the resulting
+        inserts, updates and deletes are applied, in a single transaction.
+        """
+        result = TopologyImportResult()
         try:
-            # Clean existing data for the tenant before import
-            TopologiesService.clean_before_import(tenant_id=tenant_id, session=session)
-
-            for service in topology_data["services"]:
-                all_services.append(TopologyServiceYAML(**service))
+            all_services = [
+                TopologyServiceYAML(**service) for service in topology_data["services"]
+            ]
 
+            all_applications: list[TopologyApplicationDtoIn] = []
             for application in topology_data["applications"]:
                 application["services"] = [
                     {"id": _id} for _id in application["services"]
                 ]
                 all_applications.append(TopologyApplicationDtoIn(**application))
 
-            for dependency in topology_data["dependencies"]:
-                all_dependencies.append(
-                    TopologyServiceDependencyCreateRequestDto(**dependency)
+            all_dependencies = [
+                TopologyServiceDependencyCreateRequestDto(**dependency)
+                for dependency in topology_data["dependencies"]
+            ]
+
+            # Services
+            existing_services = {
+                service.id: service
+                for service in session.exec(
+                    select(TopologyService).where(
+                        TopologyService.tenant_id == tenant_id
+                    )
+                ).all()
+            }
+            incoming_services = {service.id: service.dict() for service in all_services}
+
+            services_to_delete = [
+                service_id
+                for service_id in existing_services
+                if service_id not in incoming_services
+            ]
+            services_to_update = []
+            for service_id, incoming in incoming_services.items():
+                db_service = existing_services.get(service_id)
+                if db_service is None:
+                    session.add(TopologyService(**incoming, tenant_id=tenant_id))
+                    result.services_created += 1
+                    continue
+                changes = get_changed_service_fields(db_service, incoming)
+                if changes:
+                    services_to_update.append({"id": service_id, **changes})
+
+            if services_to_delete:
+                result.dependencies_deleted += delete_topology_services(
+                    session, services_to_delete
                 )
-
-            TopologiesService.create_services(
-                services=all_services,
-                tenant_id=tenant_id,
-                session=session,
+            if services_to_update:
+                session.execute(update(TopologyService), services_to_update)
+            session.flush()
+            result.services_deleted = len(services_to_delete)
+            result.services_updated = len(services_to_update)
+
+            # Dependencies
+            tenant_service_ids = select(TopologyService.id).where(
+                TopologyService.tenant_id == tenant_id
             )
-
-            TopologiesService.create_applications_by_tenant_id(
-                tenant_id=tenant_id,
-                applications=all_applications,
-                session=session,
+            existing_dependencies = session.exec(
+                select(TopologyServiceDependency).where(
+                    TopologyServiceDependency.service_id.in_(tenant_service_ids)
+                )
+            ).all()
+            sync_dependencies(
+                session,
+                existing_dependencies,
+                {
+                    (dependency.service_id, dependency.depends_on_service_id): (
+                        dependency.protocol
+                    )
+                    for dependency in all_dependencies
+                },
+                result,
             )
 
-            TopologiesService.create_dependencies(
-                dependencies=all_dependencies,
+            # Applications
+            TopologiesService._sync_imported_applications(
                 tenant_id=tenant_id,
+                applications=all_applications,
+                known_service_ids=set(incoming_services),
                 session=session,
-                enforce_manual=False,
+                result=result,
             )
 
+            session.commit()
+            invalidate_topology_index(tenant_id)
         except Exception as e:
             logger.error(f"Error while importing topology: {e}")
             session.rollback()
             raise e
+
+        logger.info(
+            "Imported topology",
+            extra={"tenant_id": tenant_id, **result.dict()},
+        )
+        return result
+
+    @staticmethod
+    def _sync_imported_applications(
+        tenant_id: str,
+        applications: List[TopologyApplicationDtoIn],
+        known_service_ids: set[int],
+        session: Session,
+        result: TopologyImportResult,
+    ) -> None:
+        existing_applications = session.exec(
+            select(TopologyApplication).where(TopologyApplication.tenant_id == tenant_id)
+        ).all()
+        existing_by_id = {application.id: application for application in existing_applications}
+        existing_by_name = {}
+        for application in existing_applications:
+            existing_by_name.setdefault(application.name, application)
+
+        existing_links: dict[UUID, set[int]] = {}
+        if existing_by_id:
+            for service_id, application_id in session.exec(
+                select(
+                    TopologyServiceApplication.service_id,
+                    TopologyServiceApplication.application_id,
+                ).where(
+                    TopologyServiceApplication.application_id.in_(list(existing_by_id))
+                )
+            ).all():
+                existing_links.setdefault(application_id, set()).add(service_id)
+
+        matched_ids = set()
+        new_links = []
+        for application in applications:
+            service_ids = {service.id for service in application.services}
+            if not service_ids:
+                raise InvalidApplicationDataException(
+                    "Each application must have at least one service"
+                )
+            if not service_ids.issubset(known_service_ids):
+                raise ServiceNotFoundException("One or more services not found")
+
+            if application.id:
+                db_application = existing_by_id.get(application.id)
+            else:
+                db_application = existing_by_name.get(application.name)
+            if db_application is not None and db_application.id in matched_ids:
+                db_application = None
+
+            if db_application is None:
+                db_application = TopologyApplication(
+                    tenant_id=tenant_id,
+                    name=application.name,
+                    description=application.description,
+                    repository=application.repository,
+                )
+                if application.id:
+                    db_application.id = application.id
+                session.add(db_application)
+                matched_ids.add(db_application.id)
+                new_links.extend(
+                    TopologyServiceApplication(
+                        service_id=service_id, application_id=db_application.id
+                    )
+                    for service_id in service_ids
+                )
+                result.applications_created += 1
+                continue
+
+            matched_ids.add(db_application.id)
+            changed = False
+            for attr in ("name", "description", "repository"):
+                if getattr(db_application, attr) != getattr(application, attr):
+                    setattr(db_application, attr, getattr(application, attr))
+                    changed = True
+
+            current_service_ids = existing_links.get(db_application.id, set())
+            stale_service_ids = current_service_ids - service_ids
+            if stale_service_ids:
+                session.execute(
+                    delete(TopologyServiceApplication)
+                    .where(TopologyServiceApplication.application_id == db_application.id)
+                    .where(TopologyServiceApplication.service_id.in_(stale_service_ids))
+                )
+                changed = True
+            added_service_ids = service_ids - current_service_ids
+            if added_service_ids:
+                new_links.extend(
+                    TopologyServiceApplication(
+                        service_id=service_id, application_id=db_application.id
+                    )
+                    for service_id in added_service_ids
+                )
+                changed = True
+            if changed:
+                result.applications_updated += 1
+
+        applications_to_delete = [
+            application_id
+            for application_id in existing_by_id
+            if application_id not in matched_ids
+        ]
+        if applications_to_delete:
+            session.execute(
+                delete(TopologyServiceApplication).where(
+                    TopologyServiceApplication.application_id.in_(applications_to_delete)
+                )
+            )
+            bulk_delete_by_ids(session, TopologyApplication, applications_to_delete)
+            result.applications_deleted = len(applications_to_delete)
+
+        session.flush()
+        session.add_all(new_links)
@@ -0,0 +1,225 @@
+import copy
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from sqlalchemy.orm import selectinload
+from sqlmodel import select
+
+from keep.api.core.config import config
+from keep.api.core.db import get_session_sync, get_topology_data_by_dynamic_matcher
+from keep.api.models.db.topology import TopologyService
+
+
+def build_topology_enrichments(topology_service: TopologyService) -> dict:
+    """Builds the enrichment payload a topology mapping rule applies for a service."""
+    enrichments = topology_service.dict(exclude_none=True)
+    # repository could be taken from application too
+    if not topology_service.repository and topology_service.applications:
+        for application in topology_service.applications:
+            if application.repository:
+                enrichments["repository"] = application.repository
+    # Remove redundant fields
+    enrichments.pop("tenant_id", None)
+    enrichments.pop("id", None)
+    return enrichments
+
+
+class _TenantTopologyIndex:
+    def __init__(
+        self,
+        services: Optional[list[TopologyService]],
+        case_insensitive: bool = False,
+    ):
+        self.loaded_at = time.monotonic()
+        # None when the tenant topology is too large to index
+        self.indexed = services is not None
+        # compares strings as the database does, MySQL collations ignore the case
+        self.case_insensitive = case_insensitive
+        # (attribute values, enrichment payload), ordered by service id
+        self.entries = [
+            (
+                {
+                    attribute: self._key(value)
+                    for attribute, value in service.dict().items()
+                    # None matches NULL, as `attribute == None` is `IS NULL` in sql
+                    if value is None or isinstance(value, (str, int, float, bool))
+                },
+                build_topology_enrichments(service),
+            )
+            for service in services or []
+        ]
+        # attribute -> value -> entry positions, built lazily per matched attribute
+        self.by_attribute: dict[str, dict] = {}
+        self.lock = threading.Lock()
+
+    def _key(self, value):
+        if self.case_insensitive and isinstance(value, str):
+            return value.lower()
+        return value
+
+    def _attribute_index(self, attribute: str) -> dict:
+        index = self.by_attribute.get(attribute)
+        if index is None:
+            with self.lock:
+                index = self.by_attribute.get(attribute)
+                if index is None:
+                    index = {}
+                    for position, (values, _) in enumerate(self.entries):
+                        if attribute in values:
+                            index.setdefault(values[attribute], []).append(position)
+                    self.by_attribute[attribute] = index
+        return index
+
+    def lookup(self, matchers_value: dict) -> Optional[dict]:
+        candidates = None
+        for attribute, value in matchers_value.items():
+            positions = self._attribute_index(attribute).get(self._key(value), [])
+            if candidates is None:
+                candidates = positions
+            else:
+                positions = set(positions)
+                candidates = [p for p in candidates if p in positions]
+            if not candidates:
+                return None
+        if not candidates:
+            return None
+        return copy.deepcopy(self.entries[candidates[0]][1])
+
+
+class TopologyMatcherIndex:
+    """
+    Per-tenant in-memory index from topology service attributes to the precomputed
+    enrichment payload, so topology mapping rules do not hit the database per alert.
+
+    The index for a tenant is rebuilt after `invalidate` (called whenever topology data
+    changes in this process) or once it is older than KEEP_TOPOLOGY_INDEX_TTL seconds
+    (to pick up changes made by other processes). Tenants with more than
+    KEEP_TOPOLOGY_INDEX_MAX_SERVICES services are not indexed and fall back to the
+    database, and at most KEEP_TOPOLOGY_INDEX_MAX_TENANTS tenants are kept in memory.
+
+    Lookups compare values as the database `==` does: None matches NULL attributes and,
+    on MySQL, strings are compared case-insensitively. Other collation rules (accents,
+    trailing spaces) and type coercions (e.g. "1" == 1) are not reproduced.
+    """
+
+    @staticmethod
+    def get_instance() -> "TopologyMatcherIndex":
+        if not hasattr(TopologyMatcherIndex, "_instance"):
+            TopologyMatcherIndex._instance = TopologyMatcherIndex()
+        return TopologyMatcherIndex._instance
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self.enabled = config("KEEP_TOPOLOGY_INDEX_ENABLED", default="true", cast=bool)
+        self.ttl = config("KEEP_TOPOLOGY_INDEX_TTL", default=60, cast=int)
+        self.max_services = config(
+            "KEEP_TOPOLOGY_INDEX_MAX_SERVICES", default=50000, cast=int
+        )
+        self.max_tenants = config(
+            "KEEP_TOPOLOGY_INDEX_MAX_TENANTS", default=100, cast=int
+        )
+        self._indexes: OrderedDict[str, _TenantTopologyIndex] = OrderedDict()
+        self._lock = threading.Lock()
+        self._tenant_locks: dict[str, threading.Lock] = {}
+        # bumped on invalidation so a load racing with a topology change is discarded
+        self._generations: dict[str, int] = {}
+
+    def invalidate(self, tenant_id: str):
+        with self._lock:
+            self._indexes.pop(tenant_id, None)
+            self._generations[tenant_id] = self._generations.get(tenant_id, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            for tenant_id in self._indexes:
+                self._generations[tenant_id] = self._generations.get(tenant_id, 0) + 1
+            self._indexes.clear()
+
+    def get_enrichments(self, tenant_id: str, matchers_value: dict) -> Optional[dict]:
+        """
+        Returns the enrichment payload of the first topology service whose attributes
+        equal all of `matchers_value`, or None if no service matches.
+        """
+        if self.enabled:
+            index = self._get_tenant_index(tenant_id)
+            try:
+                if index.indexed:
+                    return index.lookup(matchers_value)
+            except TypeError:
+                # unhashable matcher value, let the database compare it
+                pass
+
+        topology_service = get_topology_data_by_dynamic_matcher(
+            tenant_id, matchers_value
+        )
+        if not topology_service:
+            return None
+        return build_topology_enrichments(topology_service)
+
+    def _get_tenant_index(self, tenant_id: str) -> _TenantTopologyIndex:
+        index = self._get_fresh(tenant_id)
+        if index is not None:
+            return index
+
+        with self._lock:
+            tenant_lock = self._tenant_locks.setdefault(tenant_id, threading.Lock())
+
+        # single-flight: concurrent misses for the same tenant share one load
+        with tenant_lock:
+            index = self._get_fresh(tenant_id)
+            if index is not None:
+                return index
+            with self._lock:
+                generation = self._generations.get(tenant_id, 0)
+            index = self._load(tenant_id)
+            with self._lock:
+                if self._generations.get(tenant_id, 0) != generation:
+                    # topology changed while loading, serve this lookup but don't keep it
+                    return index
+                self._indexes[tenant_id] = index
+                self._indexes.move_to_end(tenant_id)
+                while len(self._indexes) > self.max_tenants:
+                    self._indexes.popitem(last=False)
+            return index
+
+    def _get_fresh(self, tenant_id: str) -> Optional[_TenantTopologyIndex]:
+        with self._lock:
+            index = self._indexes.get(tenant_id)
+            if index is None:
+                return None
+            if time.monotonic() - index.loaded_at > self.ttl:
+                self._indexes.pop(tenant_id, None)
+                return None
+            self._indexes.move_to_end(tenant_id)
+            return index
+
+    def _load(self, tenant_id: str) -> _TenantTopologyIndex:
+        with get_session_sync() as session:
+            services = session.exec(
+                select(TopologyService)
+                .where(TopologyService.tenant_id == tenant_id)
+                .order_by(TopologyService.id)
+                .limit(self.max_services + 1)
+                .options(selectinload(TopologyService.applications))
+            ).all()
+            if len(services) > self.max_services:
+                self.logger.info(
+                    "Topology too large to index, using database lookups",
+                    extra={"tenant_id": tenant_id, "max_services": self.max_services},
+                )
+                return _TenantTopologyIndex(None)
+            index = _TenantTopologyIndex(
+                services, case_insensitive=session.bind.dialect.name == "mysql"
+            )
+        self.logger.debug(
+            "Built topology matcher index",
+            extra={"tenant_id": tenant_id, "services": len(index.entries)},
+        )
+        return index
+
+
+def invalidate_topology_index(tenant_id: str):
+    TopologyMatcherIndex.get_instance().invalidate(tenant_id)
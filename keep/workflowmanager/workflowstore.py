@@ -9,6 +9,7 @@ import celpy
 import requests
 import validators
 from fastapi import HTTPException
+from sqlalchemy.exc import NoResultFound
 
 from keep.api.core.db import (
     add_or_update_workflow,
@@ -20,16 +21,18 @@ from keep.api.core.db import (
     get_workflow_by_id,
     get_workflow_execution,
     get_workflow_execution_with_logs,
+    get_workflows_with_stale_summary,
+    has_workflows_with_stale_summary,
+    update_workflow_summary,
 )
 from keep.api.core.workflows import get_workflows_with_last_executions_v2
 from keep.api.models.db.workflow import Workflow as WorkflowModel
 from keep.api.models.query import QueryDto
-from keep.api.models.workflow import PreparsedWorkflowDTO, ProviderDTO
+from keep.api.models.workflow import PreparsedWorkflowDTO, ProviderDTO, WorkflowDTO
 from keep.functions import cyaml
 from keep.parser.parser import Parser
 from keep.providers.providers_factory import ProvidersFactory
 from keep.workflowmanager.workflow import Workflow
-from sqlalchemy.exc import NoResultFound
 
 
 class WorkflowStore:
@@ -101,6 +104,7 @@ class WorkflowStore:
         self.logger.info(
             f"Workflow {workflow_db.id}, {workflow_db.revision} created successfully"
         )
+        self.update_workflow_summary(workflow_db)
         return workflow_db
 
     def delete_workflow(self, tenant_id, workflow_id):
@@ -205,6 +209,7 @@ class WorkflowStore:
         sort_dir: str = None,
         session=None,
     ):
+        self.ensure_workflow_summaries(tenant_id)
         # list all tenant's workflows
         return get_workflows_with_last_executions_v2(
             tenant_id=tenant_id,
@@ -352,6 +357,8 @@ class WorkflowStore:
             list[Workflow]: A list of provisioned Workflow objects.
         """
         logger = logging.getLogger(__name__)
+        # summarizes the provisioned workflows, as create_workflow does
+        workflow_store = WorkflowStore()
         provisioned_workflows = []
 
         provisioned_workflows_dir = os.environ.get("KEEP_WORKFLOWS_DIRECTORY")
@@ -431,7 +438,7 @@ class WorkflowStore:
                     f"Provisioning workflow {pre_parsed_workflow.id} from env var"
                 )
 
-                add_or_update_workflow(
+                workflow_db = add_or_update_workflow(
                     id=pre_parsed_workflow.id,
                     name=pre_parsed_workflow.name,
                     tenant_id=tenant_id,
@@ -444,6 +451,7 @@ class WorkflowStore:
                     provisioned=True,
                     provisioned_file=None,
                 )
+                workflow_store.update_workflow_summary(workflow_db)
                 provisioned_workflows.append(workflow_yaml)
                 logger.info("Workflow provisioned successfully")
             except Exception as e:
@@ -490,7 +498,7 @@ class WorkflowStore:
                             pre_parsed_workflow = WorkflowStore.pre_parse_workflow_yaml(
                                 workflow_yaml
                             )
-                        add_or_update_workflow(
+                        workflow_db = add_or_update_workflow(
                             id=pre_parsed_workflow.id,
                             name=pre_parsed_workflow.name,
                             tenant_id=tenant_id,
@@ -503,6 +511,7 @@ class WorkflowStore:
                             provisioned=True,
                             provisioned_file=workflow_path,
                         )
+                        workflow_store.update_workflow_summary(workflow_db)
                         provisioned_workflows.append(workflow_yaml)
                         logger.info(f"Workflow from {file} provisioned successfully")
                     except Exception as e:
@@ -693,6 +702,17 @@ class WorkflowStore:
             providers = []
 
         # Step 2: Process providers and add them to DTO
+        providers_dto = self.get_providers_dto(providers, installed_providers_by_type)
+
+        # Step 3: Extract triggers from workflow
+        triggers = self.parser.get_triggers_from_workflow_dict(workflow_yaml_dict)
+
+        return providers_dto, triggers
+
+    def get_providers_dto(
+        self, providers: list[dict], installed_providers_by_type: dict
+    ) -> list[ProviderDTO]:
+        providers_dto = []
         for provider in providers:
             try:
                 provider_data = installed_providers_by_type[provider.get("type")][
@@ -709,31 +729,86 @@ class WorkflowStore:
                     providers_dto.append(provider_dto)
             except KeyError:
                 # Handle case where the provider is not installed
-                try:
-                    conf = ProvidersFactory.get_provider_required_config(
+                config_required = provider.get("config_required")
+                if config_required is None:
+                    config_required = self._is_provider_config_required(
                         provider.get("type")
                     )
-                except ModuleNotFoundError:
-                    self.logger.warning(
-                        f"Non-existing provider in workflow: {provider.get('type')}"
-                    )
-                    conf = None
 
                 # Handle providers based on whether they require config
                 provider_dto = ProviderDTO(
                     name=provider.get("name"),
                     type=provider.get("type"),
                     id=None,
-                    installed=(
-                        conf is None
-                    ),  # Consider it installed if no config is required
+                    # Consider it installed if no config is required
+                    installed=not config_required,
                 )
                 providers_dto.append(provider_dto)
+        return providers_dto
 
-        # Step 3: Extract triggers from workflow
-        triggers = self.parser.get_triggers_from_workflow_dict(workflow_yaml_dict)
+    def _is_provider_config_required(self, provider_type: str) -> bool:
+        try:
+            conf = ProvidersFactory.get_provider_required_config(provider_type)
+        except ModuleNotFoundError:
+            self.logger.warning(f"Non-existing provider in workflow: {provider_type}")
+            conf = None
+        return conf is not None
 
-        return providers_dto, triggers
+    def build_workflow_summary(self, workflow: WorkflowModel) -> dict:
+        """
+        The fields of the workflow summary computed from the workflow definition,
+        what the workflows list would otherwise compute on every request.
+        """
+        workflow_yaml = cyaml.safe_load(workflow.workflow_raw)
+        workflow_yaml_dict = workflow_yaml.get("workflow") or workflow_yaml
+        try:
+            providers = self.parser.get_providers_from_workflow_dict(workflow_yaml_dict)
+        except Exception as e:
+            self.logger.error(
+                f"Failed to get providerts from workflow: {e}, workflow: {workflow}"
+            )
+            providers = []
+        return {
+            "revision": workflow.revision,
+            "workflow_raw": WorkflowDTO.order_workflow_raw(workflow_yaml),
+            # installed providers are resolved when listing, they change on their own
+            "providers": [
+                {
+                    "type": provider.get("type"),
+                    "name": provider.get("name"),
+                    "config_required": self._is_provider_config_required(
+                        provider.get("type")
+                    ),
+                }
+                for provider in providers
+            ],
+            "triggers": self.parser.get_triggers_from_workflow_dict(workflow_yaml_dict),
+            "permissions": workflow_yaml.get("permissions", []),
+            "is_alert_rule": WorkflowStore.is_alert_rule_workflow(workflow_yaml),
+        }
+
+    def update_workflow_summary(self, workflow: WorkflowModel | None):
+        if workflow is None:
+            return
+        try:
+            update_workflow_summary(
+                workflow.tenant_id, workflow.id, self.build_workflow_summary(workflow)
+            )
+        except Exception:
+            # the workflows list computes it again while the summary is stale
+            self.logger.warning(
+                "Failed to update the workflow summary",
+                exc_info=True,
+                extra={"tenant_id": workflow.tenant_id, "workflow_id": workflow.id},
+            )
+
+    def ensure_workflow_summaries(self, tenant_id: str):
+        """Summarizes the workflows saved before summaries existed or while failing."""
+        # every save summarizes the workflow, so only load them when some are stale
+        if not has_workflows_with_stale_summary(tenant_id):
+            return
+        for workflow in get_workflows_with_stale_summary(tenant_id):
+            self.update_workflow_summary(workflow)
 
     @staticmethod
     def is_alert_rule_workflow(workflow_raw: dict):
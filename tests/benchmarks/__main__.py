@@ -0,0 +1,143 @@
+import argparse
+import logging
+import os
+import sys
+import tempfile
+
+# the benchmarks run without any external service, this must be set before keep
+# creates its database engine
+os.environ.setdefault(
+    "DATABASE_CONNECTION_STRING",
+    f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='keep-benchmark-'), 'keep.db')}",
+)
+os.environ.setdefault("ELASTIC_ENABLED", "false")
+os.environ.setdefault("REDIS", "false")
+os.environ.setdefault("SECRET_MANAGER_TYPE", "file")
+os.environ.setdefault("SECRET_MANAGER_DIRECTORY", tempfile.mkdtemp())
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m tests.benchmarks",
+        description="Ingestion and rules-engine benchmarks",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run the benchmarks")
+    run_parser.add_argument("--alerts", type=int, default=1000)
+    run_parser.add_argument("--rules", type=int, default=10)
+    run_parser.add_argument("--workflows", type=int, default=10)
+    run_parser.add_argument("--mapping-rows", type=int, default=100)
+    run_parser.add_argument("--extraction-rules", type=int, default=5)
+    run_parser.add_argument("--presets", type=int, default=10)
+    run_parser.add_argument("--batch-size", type=int, default=100)
+    run_parser.add_argument(
+        "--sample-size",
+        type=int,
+        default=500,
+        help="Number of alerts used by the per-alert stages",
+    )
+    run_parser.add_argument("--seed", type=int, default=42)
+    run_parser.add_argument(
+        "--output", help="Write the JSON results to this file (default: stdout)"
+    )
+    run_parser.add_argument(
+        "--log-level",
+        default="WARNING",
+        help="Logging is part of the measured hot path, keep it the same across runs",
+    )
+
+    startup_parser = subparsers.add_parser(
+        "startup", help="Measure cold start time and memory in fresh interpreters"
+    )
+    startup_parser.add_argument("--repeat", type=int, default=3)
+    startup_parser.add_argument(
+        "--manifest",
+        help="Providers manifest to build and use (default: a temporary file)",
+    )
+    startup_parser.add_argument(
+        "--output", help="Write the JSON results to this file (default: stdout)"
+    )
+
+    pool_parser = subparsers.add_parser(
+        "event-pool",
+        help="Compare the event processing throughput of the thread and process pools",
+    )
+    pool_parser.add_argument("--alerts", type=int, default=2000)
+    pool_parser.add_argument("--rules", type=int, default=10)
+    pool_parser.add_argument("--workflows", type=int, default=10)
+    pool_parser.add_argument("--batch-size", type=int, default=20)
+    pool_parser.add_argument("--workers", type=int, default=4)
+    pool_parser.add_argument(
+        "--modes",
+        nargs="+",
+        default=["thread", "process"],
+        choices=["thread", "process"],
+    )
+    pool_parser.add_argument("--seed", type=int, default=42)
+    pool_parser.add_argument(
+        "--output", help="Write the JSON results to this file (default: stdout)"
+    )
+    pool_parser.add_argument("--log-level", default="WARNING")
+
+    cel_parser = subparsers.add_parser(
+        "cel-to-sql", help="Measure the CEL to SQL translation, cached and not"
+    )
+    cel_parser.add_argument("--expressions", type=int, default=50)
+    cel_parser.add_argument("--repeat", type=int, default=20)
+    cel_parser.add_argument(
+        "--dialect", default="postgresql", choices=["sqlite", "mysql", "postgresql"]
+    )
+    cel_parser.add_argument(
+        "--output", help="Write the JSON results to this file (default: stdout)"
+    )
+
+    compare_parser = subparsers.add_parser(
+        "compare", help="Compare two results files, fails on regressions"
+    )
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Maximum allowed relative slowdown per stage (0.2 = 20%%)",
+    )
+    compare_parser.add_argument(
+        "--metric",
+        default="p50_ms",
+        choices=["mean_ms", "p50_ms", "p95_ms", "max_ms", "total_s"],
+    )
+    compare_parser.add_argument(
+        "--min-ms",
+        type=float,
+        default=1.0,
+        help="Ignore stages faster than this, they are dominated by noise",
+    )
+
+    args = parser.parse_args()
+
+    # imported here so the environment above is in place first
+    from tests.benchmarks import runner
+
+    if args.command == "run":
+        logging.basicConfig(level=args.log_level, force=True)
+        return runner.run(args)
+    if args.command == "startup":
+        from tests.benchmarks import startup
+
+        return startup.run(args)
+    if args.command == "event-pool":
+        from tests.benchmarks import event_pool
+
+        logging.basicConfig(level=args.log_level, force=True)
+        return event_pool.run(args)
+    if args.command == "cel-to-sql":
+        from tests.benchmarks import cel_to_sql
+
+        return cel_to_sql.run(args)
+    return runner.compare(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
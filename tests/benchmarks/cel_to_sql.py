@@ -0,0 +1,85 @@
+"""
+CEL to SQL translation benchmarks:
+
+    python -m tests.benchmarks cel-to-sql --expressions 50 --repeat 20 --output cel.json
+
+Translates preset-like CEL expressions with the alerts properties metadata, a provider
+per translation as the alerts, incidents and facets queries do, and reports:
+
+- "cel_to_sql.parse": parsing an expression to its AST
+- "cel_to_sql.translate": parsing, mapping and building the sql of an expression that
+  is not cached
+- "cel_to_sql.translate_cached": the same translation served by the caches
+
+The results use the same "stages" format as `run`, so they can be compared with
+`python -m tests.benchmarks compare`.
+"""
+
+import datetime
+import json
+import platform
+
+from keep.api.core.cel_to_sql.cel_ast_converter import CelToAstConverter
+from keep.api.core.cel_to_sql.sql_providers.get_cel_to_sql_provider_for_dialect import (
+    get_cel_to_sql_provider_for_dialect,
+)
+from keep.api.core.cel_to_sql.translation_cache import clear_translation_caches
+from tests.benchmarks.generators import generate_presets
+from tests.benchmarks.runner import RESULTS_VERSION, StageTimings, _git_revision
+
+
+def generate_expressions(num_expressions: int) -> list[str]:
+    """Distinct expressions, every one of them is translated once per repeat."""
+    return [
+        f'{preset["cel"]} && name.contains("benchmark-{i}")'
+        f' && source in ["source-{i}", "source-{i + 1}"]'
+        for i, preset in enumerate(generate_presets(num_expressions))
+    ]
+
+
+def run_cel_to_sql_benchmarks(
+    num_expressions: int, repeat: int, dialect_name: str
+) -> dict:
+    from keep.api.core.alerts import properties_metadata
+
+    timings = StageTimings()
+    expressions = generate_expressions(num_expressions)
+
+    for _ in range(repeat):
+        for cel in expressions:
+            with timings.measure("cel_to_sql.parse"):
+                CelToAstConverter.convert_to_ast(cel)
+
+        clear_translation_caches()
+        for stage in ["cel_to_sql.translate", "cel_to_sql.translate_cached"]:
+            for cel in expressions:
+                with timings.measure(stage):
+                    get_cel_to_sql_provider_for_dialect(
+                        dialect_name, properties_metadata
+                    ).convert_to_sql_str_v2(cel, parameterized=True)
+    clear_translation_caches()
+
+    return {
+        "version": RESULTS_VERSION,
+        "metadata": {
+            "created_at": datetime.datetime.now(tz=datetime.timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "git_revision": _git_revision(),
+            "dialect": dialect_name,
+            "expressions": num_expressions,
+            "repeat": repeat,
+        },
+        "stages": timings.summary(),
+    }
+
+
+def run(args) -> int:
+    results = run_cel_to_sql_benchmarks(args.expressions, args.repeat, args.dialect)
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+    return 0
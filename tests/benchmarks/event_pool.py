@@ -0,0 +1,134 @@
+"""
+Event processing throughput of the arq worker pools, thread mode against process mode:
+
+    python -m tests.benchmarks event-pool --alerts 5000 --workers 4 --output pool.json
+
+Every batch is submitted to the pool at once, as a worker with KEEP_EVENT_WORKERS
+concurrent jobs does, and processed by `run_process_event`. The results report the
+events per second of every mode under "throughput_eps" and the batch latencies (from
+submission to result) as "event_pool.<mode>" stages.
+
+SQLite serializes the writers of every process, set DATABASE_CONNECTION_STRING to a
+PostgreSQL or MySQL database to measure the CPU bound parts.
+"""
+
+import datetime
+import json
+import platform
+import random
+import time
+from concurrent.futures import as_completed
+
+from sqlmodel import Session, SQLModel
+
+from keep.api.core.dependencies import SINGLE_TENANT_UUID
+from keep.api.models.alert import AlertDto
+from keep.api.tasks.process_event_pool import create_event_executor, run_process_event
+from tests.benchmarks.generators import generate_alerts
+from tests.benchmarks.runner import (
+    RESULTS_VERSION,
+    BenchmarkScale,
+    StageTimings,
+    _git_revision,
+    seed_database,
+)
+
+
+def run_event_pool_benchmarks(
+    scale: BenchmarkScale,
+    session: Session,
+    workers: int,
+    modes: list[str],
+    tenant_id: str = SINGLE_TENANT_UUID,
+) -> dict:
+    seed_database(session, scale, tenant_id)
+    rng = random.Random(scale.seed)
+    timings = StageTimings()
+    throughput = {}
+
+    for mode in modes:
+        # every mode processes new fingerprints, so none of them is deduplicated away
+        raw_alerts = generate_alerts(scale.alerts, rng)
+        for raw_alert in raw_alerts:
+            raw_alert["fingerprint"] = f"{mode}-{raw_alert['fingerprint']}"
+        batches = [
+            [
+                AlertDto(**raw_alert)
+                for raw_alert in raw_alerts[i : i + scale.batch_size]
+            ]
+            for i in range(0, len(raw_alerts), scale.batch_size)
+        ]
+
+        executor = create_event_executor(mode, workers)
+        try:
+            # the worker processes are spawned and warmed up before the measurement
+            list(executor.map(int, range(workers)))
+            start = time.perf_counter()
+            submitted = {}
+            for batch in batches:
+                future = executor.submit(
+                    run_process_event,
+                    {},
+                    dict(
+                        tenant_id=tenant_id,
+                        provider_type=None,
+                        provider_id=None,
+                        fingerprint=None,
+                        api_key_name=None,
+                        trace_id="benchmark",
+                        event=batch,
+                        notify_client=False,
+                    ),
+                )
+                submitted[future] = time.perf_counter()
+            for future in as_completed(submitted):
+                future.result()
+                timings.add(
+                    f"event_pool.{mode}", time.perf_counter() - submitted[future]
+                )
+            duration = time.perf_counter() - start
+        finally:
+            executor.shutdown(wait=True)
+        throughput[mode] = round(scale.alerts / duration, 2)
+
+    return {
+        "version": RESULTS_VERSION,
+        "metadata": {
+            "created_at": datetime.datetime.now(tz=datetime.timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": session.bind.dialect.name,
+            "git_revision": _git_revision(),
+            "workers": workers,
+            "alerts": scale.alerts,
+            "batch_size": scale.batch_size,
+        },
+        "stages": timings.summary(),
+        "throughput_eps": throughput,
+    }
+
+
+def run(args) -> int:
+    from keep.api.core.db import engine
+
+    SQLModel.metadata.create_all(engine)
+    scale = BenchmarkScale(
+        alerts=args.alerts,
+        rules=args.rules,
+        workflows=args.workflows,
+        mapping_rows=0,
+        extraction_rules=0,
+        presets=0,
+        batch_size=args.batch_size,
+        seed=args.seed,
+    )
+    with Session(engine) as session:
+        results = run_event_pool_benchmarks(scale, session, args.workers, args.modes)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+    return 0
@@ -0,0 +1,142 @@
+"""
+Synthetic data generators for the benchmark suite.
+
+Every generator is deterministic for a given `random.Random` so two runs at the same
+scale and seed process exactly the same alerts against the same rules.
+"""
+
+import csv
+import datetime
+import io
+import random
+
+SEVERITIES = ["critical", "high", "warning", "info", "low"]
+STATUSES = ["firing", "firing", "firing", "resolved", "acknowledged"]
+ENVIRONMENTS = ["production", "staging", "development"]
+NUM_SOURCES = 20
+NUM_SERVICES = 50
+
+WORKFLOW_TEMPLATE = """workflow:
+  id: {workflow_id}
+  name: {workflow_id}
+  description: benchmark workflow
+  triggers:
+    - type: alert
+      cel: {cel}
+  actions:
+    - name: print
+      provider:
+        type: console
+        with:
+          message: "{{{{ alert.name }}}}"
+"""
+
+
+def generate_alerts(
+    num_alerts: int,
+    rng: random.Random,
+    num_fingerprints: int | None = None,
+    start: datetime.datetime | None = None,
+) -> list[dict]:
+    """
+    Generates `num_alerts` raw alert events.
+
+    `num_fingerprints` controls how many distinct alerts there are, the rest are
+    re-fires of existing fingerprints (defaults to half the alerts).
+    """
+    num_fingerprints = num_fingerprints or max(1, num_alerts // 2)
+    start = start or datetime.datetime.now(tz=datetime.timezone.utc)
+    alerts = []
+    for i in range(num_alerts):
+        fingerprint_index = rng.randrange(num_fingerprints)
+        service = f"service-{fingerprint_index % NUM_SERVICES}"
+        alerts.append(
+            {
+                "id": f"benchmark-{i}",
+                "name": f"{service}-alert-{fingerprint_index}",
+                "fingerprint": f"benchmark-fingerprint-{fingerprint_index}",
+                "status": rng.choice(STATUSES),
+                "severity": rng.choice(SEVERITIES),
+                "source": [f"source-{fingerprint_index % NUM_SOURCES}"],
+                "service": service,
+                "environment": rng.choice(ENVIRONMENTS),
+                "description": f"Synthetic alert {i} for {service}",
+                "lastReceived": (
+                    start - datetime.timedelta(seconds=num_alerts - i)
+                ).isoformat(),
+                "labels": {
+                    "region": f"region-{fingerprint_index % 5}",
+                    "pod": f"pod-{fingerprint_index}",
+                },
+            }
+        )
+    return alerts
+
+
+def generate_rule_cel(index: int) -> str:
+    return (
+        f'(source == "source-{index % NUM_SOURCES}" && severity == "critical")'
+        f' || service == "service-{index % NUM_SERVICES}"'
+    )
+
+
+def generate_rules(num_rules: int) -> list[dict]:
+    """Generates correlation rules, as keyword arguments of `create_rule`."""
+    return [
+        {
+            "name": f"benchmark-rule-{i}",
+            "definition": {"sql": "N/A", "params": {}},
+            "definition_cel": generate_rule_cel(i),
+            "timeframe": 600,
+            "timeunit": "seconds",
+            "grouping_criteria": ["labels.region"] if i % 2 else [],
+            "created_by": "benchmark@keephq.dev",
+        }
+        for i in range(num_rules)
+    ]
+
+
+def generate_workflows(num_workflows: int) -> list[tuple[str, str]]:
+    """Generates (workflow_id, workflow_raw) pairs with alert triggers."""
+    workflows = []
+    for i in range(num_workflows):
+        workflow_id = f"benchmark-workflow-{i}"
+        cel = (
+            f"source == 'source-{i % NUM_SOURCES}'"
+            f" && severity == '{SEVERITIES[i % len(SEVERITIES)]}'"
+        )
+        workflows.append(
+            (workflow_id, WORKFLOW_TEMPLATE.format(workflow_id=workflow_id, cel=cel))
+        )
+    return workflows
+
+
+def generate_mapping_csv(num_rows: int) -> str:
+    """Generates a mapping CSV enriching alerts by service."""
+    output = io.StringIO()
+    writer = csv.DictWriter(output, fieldnames=["service", "owner", "team", "runbook"])
+    writer.writeheader()
+    for i in range(num_rows):
+        writer.writerow(
+            {
+                "service": f"service-{i}",
+                "owner": f"owner-{i % 7}@keephq.dev",
+                "team": f"team-{i % 4}",
+                "runbook": f"https://runbooks.keephq.dev/service-{i}",
+            }
+        )
+    return output.getvalue()
+
+
+def generate_presets(num_presets: int) -> list[dict]:
+    """Generates presets, as (name, cel) options of a `Preset`."""
+    return [
+        {
+            "name": f"benchmark-preset-{i}",
+            "cel": (
+                f'severity == "{SEVERITIES[i % len(SEVERITIES)]}"'
+                f' && environment == "{ENVIRONMENTS[i % len(ENVIRONMENTS)]}"'
+            ),
+        }
+        for i in range(num_presets)
+    ]
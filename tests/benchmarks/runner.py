@@ -0,0 +1,445 @@
+"""
+Ingestion and rules-engine benchmarks.
+
+Runs the hot paths of alert ingestion against a SQLite database with stub clients
+(no Redis, Elasticsearch or Pusher) and reports per-stage timings as JSON:
+
+    python -m tests.benchmarks run --alerts 10000 --rules 100 --output current.json
+    python -m tests.benchmarks compare baseline.json current.json --threshold 0.2
+
+`compare` exits with a non-zero code when any stage regressed past the threshold.
+"""
+
+import csv
+import dataclasses
+import datetime
+import io
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import types
+from collections import defaultdict
+from contextlib import contextmanager
+from unittest.mock import patch
+
+from fastapi.encoders import jsonable_encoder
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from sqlmodel import Session, select
+
+from keep.api.alert_deduplicator.alert_deduplicator import AlertDeduplicator
+from keep.api.bl.enrichments_bl import EnrichmentsBl
+from keep.api.core.alerts import query_last_alerts
+from keep.api.core.db import (
+    create_rule,
+    get_last_alert_hashes_by_fingerprints,
+    get_last_alerts_by_fingerprints,
+)
+from keep.api.core.dependencies import SINGLE_TENANT_UUID
+from keep.api.core.json_response import KeepJSONResponse
+from keep.api.models.alert import AlertDto
+from keep.api.models.db.alert import Alert
+from keep.api.models.db.extraction import ExtractionRule
+from keep.api.models.db.mapping import MappingRule
+from keep.api.models.db.preset import Preset
+from keep.api.models.db.tenant import Tenant
+from keep.api.models.db.workflow import Workflow
+from keep.api.models.query import QueryDto
+from keep.api.tasks import process_event_task
+from keep.api.tasks.notification_cache import (
+    InMemoryNotificationBackend,
+    NotificationCache,
+)
+from keep.api.utils.enrichment_helpers import convert_db_alerts_to_dto_alerts
+from keep.rulesengine.rulesengine import RulesEngine
+from keep.workflowmanager.workflowmanager import WorkflowManager
+from tests.benchmarks.generators import (
+    generate_alerts,
+    generate_mapping_csv,
+    generate_presets,
+    generate_rules,
+    generate_workflows,
+)
+
+RESULTS_VERSION = 1
+# spans emitted by process_event, reported as "process_event.<span name>"
+PROCESS_EVENT_SPAN_PREFIX = "process_event_"
+
+
+@dataclasses.dataclass
+class BenchmarkScale:
+    alerts: int = 1000
+    rules: int = 10
+    workflows: int = 10
+    mapping_rows: int = 100
+    extraction_rules: int = 5
+    presets: int = 10
+    batch_size: int = 100
+    # stages that run once per alert are sampled, so large scales stay bounded
+    sample_size: int = 500
+    seed: int = 42
+
+
+class StageTimings:
+    def __init__(self):
+        self.durations: dict[str, list[float]] = defaultdict(list)
+
+    @contextmanager
+    def measure(self, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.durations[stage].append(time.perf_counter() - start)
+
+    def add(self, stage: str, duration: float):
+        self.durations[stage].append(duration)
+
+    def summary(self) -> dict[str, dict]:
+        summary = {}
+        for stage, durations in sorted(self.durations.items()):
+            ordered = sorted(durations)
+            summary[stage] = {
+                "count": len(ordered),
+                "total_s": round(sum(ordered), 6),
+                "mean_ms": round(statistics.fmean(ordered) * 1000, 4),
+                "p50_ms": round(_percentile(ordered, 50) * 1000, 4),
+                "p95_ms": round(_percentile(ordered, 95) * 1000, 4),
+                "max_ms": round(ordered[-1] * 1000, 4),
+            }
+        return summary
+
+
+def _percentile(ordered: list[float], percentile: float) -> float:
+    index = min(len(ordered) - 1, round(percentile / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+class PusherStub:
+    def __init__(self):
+        self.triggers = 0
+
+    def trigger(self, channel, event_name, data):
+        self.triggers += 1
+
+
+def seed_database(session: Session, scale: BenchmarkScale, tenant_id: str):
+    if not session.get(Tenant, tenant_id):
+        session.add(Tenant(id=tenant_id, name="benchmark"))
+        session.commit()
+
+    for rule in generate_rules(scale.rules):
+        create_rule(tenant_id=tenant_id, **rule)
+
+    for workflow_id, workflow_raw in generate_workflows(scale.workflows):
+        session.add(
+            Workflow(
+                id=workflow_id,
+                name=workflow_id,
+                tenant_id=tenant_id,
+                description="benchmark workflow",
+                created_by="benchmark@keephq.dev",
+                interval=0,
+                workflow_raw=workflow_raw,
+            )
+        )
+
+    if scale.mapping_rows:
+        rows = list(
+            csv.DictReader(io.StringIO(generate_mapping_csv(scale.mapping_rows)))
+        )
+        session.add(
+            MappingRule(
+                tenant_id=tenant_id,
+                name="benchmark-mapping",
+                description="benchmark mapping rule",
+                file_name="benchmark.csv",
+                created_by="benchmark@keephq.dev",
+                condition="",
+                type="csv",
+                matchers=[["service"]],
+                rows=rows,
+            )
+        )
+
+    for i in range(scale.extraction_rules):
+        session.add(
+            ExtractionRule(
+                tenant_id=tenant_id,
+                name=f"benchmark-extraction-{i}",
+                description="benchmark extraction rule",
+                created_by="benchmark@keephq.dev",
+                priority=i,
+                attribute="name",
+                regex=r"^(?P<component>service-\d+)-alert-(?P<instance>\d+)$",
+                condition=f'environment == "{["production", "staging"][i % 2]}"',
+            )
+        )
+
+    for preset in generate_presets(scale.presets):
+        session.add(
+            Preset(
+                tenant_id=tenant_id,
+                created_by="benchmark@keephq.dev",
+                name=preset["name"],
+                options=[{"label": "CEL", "value": preset["cel"]}],
+            )
+        )
+    session.commit()
+
+
+def _format_alerts(raw_alerts: list[dict]) -> list[AlertDto]:
+    alerts = []
+    for raw_alert in raw_alerts:
+        alert = AlertDto(**raw_alert)
+        alert.providerId = "benchmark"
+        alert.providerType = "keep"
+        alerts.append(alert)
+    return alerts
+
+
+def run_benchmarks(
+    scale: BenchmarkScale, session: Session, tenant_id: str = SINGLE_TENANT_UUID
+) -> dict:
+    """
+    Seeds the database at the given scale and times every stage.
+
+    Returns the results document written by `run`.
+    """
+    rng = random.Random(scale.seed)
+    timings = StageTimings()
+
+    with timings.measure("seed"):
+        seed_database(session, scale, tenant_id)
+    raw_alerts = generate_alerts(scale.alerts, rng)
+    sample = raw_alerts[: scale.sample_size]
+
+    # extraction and mapping rules, per alert
+    enrichments_bl = EnrichmentsBl(tenant_id, session)
+    for raw_alert in sample:
+        with timings.measure("extraction_rules.pre"):
+            enrichments_bl.run_extraction_rules(dict(raw_alert), pre=True)
+    for alert in _format_alerts(sample):
+        with timings.measure("extraction_rules"):
+            enrichments_bl.run_extraction_rules(alert)
+        with timings.measure("mapping_rules"):
+            enrichments_bl.run_mapping_rules(alert)
+
+    # deduplication, per alert, with the rules and last hashes loaded once
+    deduplicator = AlertDeduplicator(tenant_id)
+    with timings.measure("deduplication.load_rules"):
+        deduplication_rules = deduplicator.get_deduplication_rules(
+            tenant_id=tenant_id, provider_id="benchmark", provider_type="keep"
+        )
+    sample_alerts = _format_alerts(sample)
+    with timings.measure("deduplication.load_hashes"):
+        last_hashes = get_last_alert_hashes_by_fingerprints(
+            tenant_id, [alert.fingerprint for alert in sample_alerts]
+        )
+    for alert in sample_alerts:
+        with timings.measure("deduplication"):
+            deduplicator.apply_deduplication(alert, deduplication_rules, last_hashes)
+
+    # full ingestion, per batch, broken down by the spans process_event emits
+    exporter = InMemorySpanExporter()
+    tracer_provider = TracerProvider()
+    tracer_provider.add_span_processor(SimpleSpanProcessor(exporter))
+    pusher = PusherStub()
+    # a notification cache of its own, so tokens spent earlier in the process don't
+    # coalesce away the benchmark's notifications
+    with patch.object(NotificationCache, "_instance", None), patch.object(
+        process_event_task,
+        "trace",
+        types.SimpleNamespace(get_tracer=tracer_provider.get_tracer),
+    ), patch.object(process_event_task, "get_pusher_client", return_value=pusher):
+        notification_cache = NotificationCache(backend=InMemoryNotificationBackend())
+        for start in range(0, len(raw_alerts), scale.batch_size):
+            # same as the generic /alerts/event endpoint, which receives AlertDtos
+            with timings.measure("alert_dto"):
+                batch = [
+                    AlertDto(**raw_alert)
+                    for raw_alert in raw_alerts[start : start + scale.batch_size]
+                ]
+            with timings.measure("process_event"):
+                process_event_task.process_event(
+                    ctx={},
+                    tenant_id=tenant_id,
+                    provider_type=None,
+                    provider_id=None,
+                    fingerprint=None,
+                    api_key_name=None,
+                    trace_id="benchmark",
+                    event=batch,
+                )
+        notification_cache.cancel_flushes()
+    for span in exporter.get_finished_spans():
+        if span.name.startswith(PROCESS_EVENT_SPAN_PREFIX):
+            stage = span.name[len(PROCESS_EVENT_SPAN_PREFIX) :]
+            timings.add(
+                f"process_event.{stage}", (span.end_time - span.start_time) / 1e9
+            )
+    workflow_manager = WorkflowManager.get_instance()
+    workflow_manager.scheduler.workflows_to_run.clear()
+
+    # workflows and rules engine in isolation, on the stored alerts
+    fingerprints = list(dict.fromkeys(alert["fingerprint"] for alert in sample))
+    last_alerts = get_last_alerts_by_fingerprints(
+        tenant_id, fingerprints, session=session
+    )
+    stored_alerts = convert_db_alerts_to_dto_alerts(
+        session.exec(
+            select(Alert).where(
+                Alert.id.in_([last_alert.alert_id for last_alert in last_alerts])
+            )
+        ).all()
+    )
+    for start in range(0, len(stored_alerts), scale.batch_size):
+        batch = stored_alerts[start : start + scale.batch_size]
+        with timings.measure("workflows.insert_events"):
+            workflow_manager.insert_events(tenant_id, batch)
+        workflow_manager.scheduler.workflows_to_run.clear()
+        with timings.measure("rules_engine.run_rules"):
+            RulesEngine(tenant_id=tenant_id).run_rules(batch, session=session)
+
+    # alerts feed queries, one per preset plus the unfiltered feed
+    for cel in [""] + [preset["cel"] for preset in generate_presets(scale.presets)]:
+        with timings.measure("query_last_alerts"):
+            query_last_alerts(tenant_id, QueryDto(cel=cel, limit=100, offset=0))
+
+    # building and serializing a page of every stored alert, what alert listings pay
+    # on top of the query (run with --alerts 10000 for a 10k rows page)
+    events = [
+        alert.event
+        for alert in session.exec(select(Alert).where(Alert.tenant_id == tenant_id))
+    ]
+    with timings.measure("alerts_page.validated"):
+        [AlertDto(**event) for event in events]
+    with timings.measure("alerts_page.from_stored_event"):
+        page = [AlertDto.from_stored_event(event) for event in events]
+    with timings.measure("alerts_page.render"):
+        KeepJSONResponse(jsonable_encoder(page))
+
+    return {
+        "version": RESULTS_VERSION,
+        "metadata": {
+            "created_at": datetime.datetime.now(tz=datetime.timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": session.bind.dialect.name,
+            "git_revision": _git_revision(),
+            "scale": dataclasses.asdict(scale),
+            "pusher_triggers": pusher.triggers,
+        },
+        "stages": timings.summary(),
+    }
+
+
+def _git_revision() -> str | None:
+    try:
+        return (
+            subprocess.check_output(
+                ["git", "rev-parse", "HEAD"], stderr=subprocess.DEVNULL
+            )
+            .decode()
+            .strip()
+        )
+    except Exception:
+        return None
+
+
+def compare_results(
+    baseline: dict,
+    current: dict,
+    threshold: float = 0.2,
+    metric: str = "p50_ms",
+    min_ms: float = 1.0,
+) -> tuple[list[dict], list[dict]]:
+    """
+    Compares two results documents stage by stage.
+
+    A stage regresses when `metric` grew by more than `threshold` (relative) and the
+    current value is above `min_ms`, so sub-millisecond noise never fails a run.
+
+    Returns (rows, regressions).
+    """
+    rows = []
+    regressions = []
+    for stage, baseline_stats in sorted(baseline["stages"].items()):
+        current_stats = current["stages"].get(stage)
+        if current_stats is None:
+            rows.append({"stage": stage, "baseline": baseline_stats[metric]})
+            continue
+        before, after = baseline_stats[metric], current_stats[metric]
+        change = (after - before) / before if before else 0.0
+        row = {"stage": stage, "baseline": before, "current": after, "change": change}
+        rows.append(row)
+        if change > threshold and after > min_ms:
+            regressions.append(row)
+    return rows, regressions
+
+
+def _format_row(row: dict) -> str:
+    if "current" not in row:
+        return f"{row['stage']:<55} {row['baseline']:>12.3f} {'missing':>12}"
+    return (
+        f"{row['stage']:<55} {row['baseline']:>12.3f} {row['current']:>12.3f}"
+        f" {row['change']:>+9.1%}"
+    )
+
+
+def run(args) -> int:
+    from sqlmodel import SQLModel
+
+    from keep.api.core.db import engine
+
+    SQLModel.metadata.create_all(engine)
+    scale = BenchmarkScale(
+        alerts=args.alerts,
+        rules=args.rules,
+        workflows=args.workflows,
+        mapping_rows=args.mapping_rows,
+        extraction_rules=args.extraction_rules,
+        presets=args.presets,
+        batch_size=args.batch_size,
+        sample_size=args.sample_size,
+        seed=args.seed,
+    )
+    with Session(engine) as session:
+        results = run_benchmarks(scale, session)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+    return 0
+
+
+def compare(args) -> int:
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+
+    rows, regressions = compare_results(
+        baseline, current, args.threshold, args.metric, args.min_ms
+    )
+    print(f"{'stage':<55} {'baseline':>12} {'current':>12} {'change':>9}")
+    for row in rows:
+        print(_format_row(row))
+    if regressions:
+        print(
+            f"\n{len(regressions)} stage(s) regressed more than {args.threshold:.0%}"
+            f" ({args.metric}):",
+            file=sys.stderr,
+        )
+        for row in regressions:
+            print(_format_row(row), file=sys.stderr)
+        return 1
+    return 0
@@ -0,0 +1,104 @@
+"""
+Cold start benchmarks.
+
+Every probe runs in a fresh interpreter, so module imports are measured as a new API
+replica, worker or CLI invocation pays them:
+
+    python -m tests.benchmarks startup --repeat 3 --output startup.json
+
+The results use the same "stages" format as `run`, so they can be compared with
+`python -m tests.benchmarks compare`. Peak memory (max RSS) is reported per probe
+under "memory_mb".
+"""
+
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+
+from tests.benchmarks.runner import RESULTS_VERSION, StageTimings, _git_revision
+
+PROBE_TEMPLATE = """
+import json, resource, sys, time
+start = time.perf_counter()
+{code}
+print(json.dumps({{
+    "seconds": time.perf_counter() - start,
+    "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "modules": len(sys.modules),
+}}))
+"""
+
+PROBES = {
+    "providers.from_manifest": (
+        "from keep.providers.providers_factory import ProvidersFactory\n"
+        "ProvidersFactory.get_all_providers()"
+    ),
+    "providers.from_imports": (
+        "from keep.providers.providers_factory import ProvidersFactory\n"
+        "ProvidersFactory.get_all_providers(ignore_cache_file=True)"
+    ),
+    "import.api": "import keep.api.api",
+    "import.cli": "import keep.cli.cli",
+}
+
+
+def run_probe(code: str, env: dict) -> dict:
+    output = subprocess.check_output(
+        [sys.executable, "-c", PROBE_TEMPLATE.format(code=code)],
+        env=env,
+        stderr=subprocess.DEVNULL,
+    )
+    # keep may print to stdout while importing, the measurement is the last line
+    return json.loads(output.decode().strip().splitlines()[-1])
+
+
+def run_startup_benchmarks(repeat: int = 3, manifest_path: str | None = None) -> dict:
+    from keep.providers.providers_manifest import build_providers_manifest
+
+    manifest_path = manifest_path or os.path.join(
+        tempfile.mkdtemp(prefix="keep-benchmark-"), "providers_cache.json"
+    )
+    # built up front, the manifest probe measures a warm manifest as in the images
+    if build_providers_manifest(manifest_path) is None:
+        raise RuntimeError(f"Failed to build the providers manifest at {manifest_path}")
+    env = {
+        **os.environ,
+        "PROVIDERS_CACHE_FILE": manifest_path,
+        "KEEP_PROVIDERS_MANIFEST_AUTO_BUILD": "false",
+    }
+
+    timings = StageTimings()
+    memory = {}
+    for _ in range(repeat):
+        for name, code in PROBES.items():
+            result = run_probe(code, env)
+            timings.add(name, result["seconds"])
+            memory[name] = max(memory.get(name, 0), round(result["max_rss_mb"], 1))
+
+    return {
+        "version": RESULTS_VERSION,
+        "metadata": {
+            "created_at": datetime.datetime.now(tz=datetime.timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "git_revision": _git_revision(),
+            "repeat": repeat,
+        },
+        "stages": timings.summary(),
+        "memory_mb": memory,
+    }
+
+
+def run(args) -> int:
+    results = run_startup_benchmarks(args.repeat, args.manifest)
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+    return 0
@@ -0,0 +1,91 @@
+import os
+
+import pytest
+
+from tests.benchmarks.cel_to_sql import run_cel_to_sql_benchmarks
+from tests.benchmarks.runner import BenchmarkScale, compare_results, run_benchmarks
+
+
+@pytest.fixture(autouse=True)
+def set_elastic_env():
+    os.environ["ELASTIC_ENABLED"] = "false"
+
+
+def test_run_benchmarks_small_scale(db_session):
+    scale = BenchmarkScale(
+        alerts=20,
+        rules=2,
+        workflows=2,
+        mapping_rows=5,
+        extraction_rules=1,
+        presets=2,
+        batch_size=10,
+        sample_size=5,
+    )
+    results = run_benchmarks(scale, db_session)
+
+    stages = results["stages"]
+    for stage in [
+        "extraction_rules",
+        "mapping_rules",
+        "deduplication",
+        "process_event",
+        "process_event.save_to_db",
+        "process_event.run_rules_engine",
+        "workflows.insert_events",
+        "rules_engine.run_rules",
+        "query_last_alerts",
+    ]:
+        assert stage in stages
+    assert stages["process_event"]["count"] == 2
+    assert stages["deduplication"]["count"] == 5
+    assert stages["query_last_alerts"]["count"] == 3
+    assert results["metadata"]["scale"]["alerts"] == 20
+    # the stub pusher received the poll notifications
+    assert results["metadata"]["pusher_triggers"] > 0
+
+
+def test_run_cel_to_sql_benchmarks():
+    results = run_cel_to_sql_benchmarks(
+        num_expressions=5, repeat=2, dialect_name="sqlite"
+    )
+
+    stages = results["stages"]
+    for stage in [
+        "cel_to_sql.parse",
+        "cel_to_sql.translate",
+        "cel_to_sql.translate_cached",
+    ]:
+        assert stages[stage]["count"] == 10
+    assert (
+        stages["cel_to_sql.translate_cached"]["p50_ms"]
+        < stages["cel_to_sql.translate"]["p50_ms"]
+    )
+
+
+def _results(**stages):
+    return {
+        "stages": {
+            stage: {"p50_ms": value, "mean_ms": value}
+            for stage, value in stages.items()
+        }
+    }
+
+
+def test_compare_results_detects_regressions():
+    baseline = _results(process_event=100.0, deduplication=0.1, mapping_rules=10.0)
+    current = _results(process_event=130.0, deduplication=0.5, query_last_alerts=5.0)
+
+    rows, regressions = compare_results(baseline, current, threshold=0.2)
+
+    # deduplication is 5x slower but below the noise floor
+    assert [row["stage"] for row in regressions] == ["process_event"]
+    assert {row["stage"] for row in rows} == {
+        "process_event",
+        "deduplication",
+        "mapping_rules",
+    }
+    assert "current" not in next(row for row in rows if row["stage"] == "mapping_rules")
+
+    _, regressions = compare_results(baseline, current, threshold=0.5)
+    assert regressions == []
@@ -1,5 +1,7 @@
 import json
 import os
+import re
+
 import pytest
 
 from keep.api.core.cel_to_sql.ast_nodes import DataType
@@ -10,6 +12,7 @@ from keep.api.core.cel_to_sql.properties_metadata import (
 from keep.api.core.cel_to_sql.sql_providers.get_cel_to_sql_provider_for_dialect import (
     get_cel_to_sql_provider_for_dialect,
 )
+from keep.api.core.db import engine
 
 fake_field_configurations = [
     FieldMappingConfiguration(
@@ -97,3 +100,22 @@ def test_cel_to_sql(testcase_key):
     instance = get_cel_to_sql_provider_for_dialect(dialect_name, properties_metadata)
     actual_sql_filter = instance.convert_to_sql_str(input_cel)
     assert actual_sql_filter == expected_sql
+
+
+@pytest.mark.parametrize("testcase_key", list(testcases_dict.keys()))
+def test_cel_to_sql_parameterized(testcase_key):
+    dialect_name, input_cel, expected_sql = testcases_dict[testcase_key]
+
+    instance = get_cel_to_sql_provider_for_dialect(dialect_name, properties_metadata)
+    result = instance.convert_to_sql_str_v2(input_cel, parameterized=True)
+
+    # every bound parameter is used once
+    assert sorted(re.findall(r":(cel_param_\d+)", result.sql)) == sorted(result.params)
+    clause = result.as_text_clause()
+
+    if dialect_name == "sqlite":
+        # the literals render back to the inlined sql
+        rendered = str(
+            clause.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True})
+        )
+        assert rendered == expected_sql
@@ -0,0 +1,139 @@
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy import column, literal_column, select, table
+
+from keep.api.core.cel_to_sql.properties_metadata import (
+    FieldMappingConfiguration,
+    PropertiesMetadata,
+    remap_fields_configurations,
+)
+from keep.api.core.cel_to_sql.sql_providers.base import CelToSqlException
+from keep.api.core.cel_to_sql.sql_providers.get_cel_to_sql_provider_for_dialect import (
+    get_cel_to_sql_provider_for_dialect,
+)
+from keep.api.core.cel_to_sql.translation_cache import (
+    TranslationCache,
+    cel_ast_cache,
+    cel_sql_cache,
+    clear_translation_caches,
+)
+from keep.api.core.db import engine
+
+field_configurations = [
+    FieldMappingConfiguration(map_from_pattern="name", map_to="name"),
+    FieldMappingConfiguration(
+        map_from_pattern="alert.*", map_to=["JSON(alert_event).*"]
+    ),
+]
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    clear_translation_caches()
+    yield
+    clear_translation_caches()
+
+
+def _sample(cache, result):
+    return (
+        REGISTRY.get_sample_value(
+            "keep_cel_to_sql_cache_lookups_total", {"cache": cache, "result": result}
+        )
+        or 0
+    )
+
+
+def test_translations_are_cached_per_metadata_and_dialect():
+    properties_metadata = PropertiesMetadata(field_configurations)
+    cel = "name == 'api' && alert.region.startsWith('eu')"
+    hits, misses = _sample("sql", "hit"), _sample("sql", "miss")
+
+    provider = get_cel_to_sql_provider_for_dialect("sqlite", properties_metadata)
+    result = provider.convert_to_sql_str_v2(cel, parameterized=True)
+    # a provider per query, as the query builders create them
+    same_provider = get_cel_to_sql_provider_for_dialect("sqlite", properties_metadata)
+    assert same_provider.convert_to_sql_str_v2(cel, parameterized=True) is result
+    assert _sample("sql", "hit") - hits == 1
+    assert _sample("sql", "miss") - misses == 1
+
+    # equal mappings share the translations, other mappings and dialects don't
+    assert (
+        PropertiesMetadata(field_configurations).version == properties_metadata.version
+    )
+    remapped_metadata = PropertiesMetadata(
+        remap_fields_configurations({"alert_event": "event"}, field_configurations)
+    )
+    assert remapped_metadata.version != properties_metadata.version
+    remapped = get_cel_to_sql_provider_for_dialect(
+        "sqlite", remapped_metadata
+    ).convert_to_sql_str_v2(cel, parameterized=True)
+    assert "event" in remapped.sql and "alert_event" not in remapped.sql
+    get_cel_to_sql_provider_for_dialect(
+        "postgresql", properties_metadata
+    ).convert_to_sql_str_v2(cel, parameterized=True)
+    provider.convert_to_sql_str_v2(cel)
+
+    assert len(cel_sql_cache) == 4
+    # the expression was parsed once
+    assert len(cel_ast_cache) == 1
+
+
+def test_failed_translations_are_not_cached():
+    provider = get_cel_to_sql_provider_for_dialect(
+        "sqlite", PropertiesMetadata(field_configurations)
+    )
+
+    for _ in range(2):
+        with pytest.raises(CelToSqlException):
+            provider.convert_to_sql_str_v2("name == ")
+    assert len(cel_sql_cache) == 0
+
+
+def test_parameterized_sql_is_shared_by_literals():
+    provider = get_cel_to_sql_provider_for_dialect(
+        "sqlite", PropertiesMetadata(field_configurations)
+    )
+
+    critical = provider.convert_to_sql_str_v2(
+        "name == 'critical' || name.contains('a:b')", parameterized=True
+    )
+    warning = provider.convert_to_sql_str_v2(
+        "name == 'warning' || name.contains(\"it's\")", parameterized=True
+    )
+
+    assert critical.sql == warning.sql
+    assert "critical" not in critical.sql
+    assert critical.params == {"cel_param_0": "critical", "cel_param_1": "%a:b%"}
+
+    # the parameters of several results don't collide in the same statement
+    entities = table("entity", column("name"))
+    query = (
+        select(literal_column("name"))
+        .select_from(entities)
+        .where(critical.as_text_clause())
+        .union_all(
+            select(literal_column("name"))
+            .select_from(entities)
+            .where(warning.as_text_clause())
+        )
+    )
+    compiled = query.compile(dialect=engine.dialect)
+    assert sorted(compiled.params.values()) == sorted(
+        [*critical.params.values(), *warning.params.values()]
+    )
+
+
+def test_translation_cache_evicts_least_recently_used():
+    cache = TranslationCache("test", max_size=2)
+
+    cache.get_or_create("a", lambda: 1)
+    cache.get_or_create("b", lambda: 2)
+    assert cache.get_or_create("a", lambda: 3) == 1
+    cache.get_or_create("c", lambda: 4)
+
+    assert list(cache.entries) == ["a", "c"]
+    assert cache.get_or_create("b", lambda: 5) == 5
+
+    disabled = TranslationCache("test", max_size=0)
+    assert disabled.get_or_create("a", lambda: 1) == 1
+    assert len(disabled) == 0
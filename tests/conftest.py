@@ -22,8 +22,10 @@ from playwright.sync_api import Page
 
 # This import is required to create the tables
 from keep.api.bl.maintenance_windows_bl import MaintenanceWindowsBl
+from keep.api.core.api_key_cache import get_api_key_cache
 from keep.api.core.dependencies import SINGLE_TENANT_UUID
 from keep.api.core.elastic import ElasticClient
+from keep.api.core.incident_changes import get_incident_change_dispatcher
 from keep.api.models.alert import AlertStatus
 from keep.api.models.db.alert import *
 from keep.api.models.db.maintenance_window import MaintenanceWindowRule
@@ -90,6 +92,18 @@ def mocked_context(ctx_store) -> None:
         yield context
 
 
+@pytest.fixture(autouse=True)
+def clear_api_key_cache():
+    # the tests create the same API keys, with other roles, in fresh databases
+    get_api_key_cache().clear()
+
+
+@pytest.fixture(autouse=True)
+def incident_changes_inline(monkeypatch):
+    # the tests check the side effects of the incident changes right after them
+    monkeypatch.setattr(get_incident_change_dispatcher(), "window", 0)
+
+
 @pytest.fixture
 def context_manager():
     os.environ["STORAGE_MANAGER_DIRECTORY"] = "/tmp/storage-manager"
@@ -626,6 +640,8 @@ def setup_alerts(elastic_client, db_session, request):
             last_alert = existed_last_alerts_dict[alert.fingerprint]
             last_alert.alert_id = alert.id
             last_alert.timestamp = alert.timestamp
+            for key, value in get_effective_alert_state(alert.event).items():
+                setattr(last_alert, key, value)
             last_alerts.append(last_alert)
         else:
             last_alerts.append(
@@ -635,6 +651,7 @@ def setup_alerts(elastic_client, db_session, request):
                     timestamp=alert.timestamp,
                     first_timestamp=alert.timestamp,
                     alert_id=alert.id,
+                    **get_effective_alert_state(alert.event),
                 )
             )
     db_session.add_all(last_alerts)
@@ -692,6 +709,8 @@ def setup_stress_alerts_no_elastic(db_session):
                 last_alert = existed_last_alerts_dict[alert.fingerprint]
                 last_alert.alert_id = alert.id
                 last_alert.timestamp = alert.timestamp
+                for key, value in get_effective_alert_state(alert.event).items():
+                    setattr(last_alert, key, value)
                 last_alerts.append(last_alert)
             else:
                 last_alerts.append(
@@ -701,6 +720,7 @@ def setup_stress_alerts_no_elastic(db_session):
                         timestamp=alert.timestamp,
                         first_timestamp=alert.timestamp,
                         alert_id=alert.id,
+                        **get_effective_alert_state(alert.event),
                     )
                 )
         db_session.add_all(last_alerts)
@@ -56,7 +56,7 @@ class TestFramesToRows:
 def test_query_builds_payload_and_returns_rows():
     provider = _build_provider()
     payload = {"results": {"A": {"frames": [SQL_FRAME]}}}
-    with patch("requests.post", return_value=_response(payload)) as post:
+    with patch("requests.Session.post", return_value=_response(payload)) as post:
         rows = provider._query(
             datasource_uid="ds-uid", raw_sql="SELECT 1", start="now-6h", end="now"
         )
@@ -71,7 +71,8 @@ def test_query_builds_payload_and_returns_rows():
 def test_explicit_query_dict_overrides_defaults():
     provider = _build_provider()
     with patch(
-        "requests.post", return_value=_response({"results": {"A": {"frames": []}}})
+        "requests.Session.post",
+        return_value=_response({"results": {"A": {"frames": []}}}),
     ) as post:
         provider._query(
             datasource_uid="ds-uid",
@@ -92,7 +93,9 @@ def test_missing_datasource_uid_raises():
 
 def test_http_error_raises():
     provider = _build_provider()
-    with patch("requests.post", return_value=_response({}, ok=False, status_code=403)):
+    with patch(
+        "requests.Session.post", return_value=_response({}, ok=False, status_code=403)
+    ):
         with pytest.raises(ProviderException, match="403"):
             provider._query(datasource_uid="ds-uid", expr="up")
 
@@ -100,6 +103,6 @@ def test_http_error_raises():
 def test_datasource_error_raises():
     provider = _build_provider()
     payload = {"results": {"A": {"error": "table not found"}}}
-    with patch("requests.post", return_value=_response(payload)):
+    with patch("requests.Session.post", return_value=_response(payload)):
         with pytest.raises(ProviderException, match="table not found"):
             provider._query(datasource_uid="ds-uid", raw_sql="SELECT 1")
@@ -1,8 +1,11 @@
 import hashlib
+import json
 from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
 
 import freezegun
 import pytest
+from pydantic import ValidationError
 
 from keep.api.models.alert import AlertDto, AlertSeverity, AlertStatus
 from tests.fixtures.client import client, test_app  # noqa
@@ -307,3 +310,93 @@ def test_alert_dto_environment_explicit_value():
         environment="production",
     )
     assert alert.environment == "production"
+
+
+def _stored_event(**overrides):
+    # what process_event stores: the validated AlertDto as a dict
+    event = AlertDto(
+        id="1234",
+        name="Pod lacks memory",
+        status="firing",
+        severity="critical",
+        lastReceived="2024-01-01T10:00:00.000Z",
+        source=["prometheus"],
+        labels={"pod": "api"},
+        url="https://grafana.example.com/d/1?var=a b",
+        fingerprint="fp",
+        custom_field={"nested": [1, 2]},
+    ).dict()
+    event.update(overrides)
+    return event
+
+
+@pytest.mark.parametrize(
+    "overrides",
+    [
+        {},
+        # enrichments
+        {"status": "resolved", "note": "fixed", "ticket_url": "https://jira"},
+        {"severity": "warning", "assignee": "john@keephq.dev"},
+        {"dismissed": True, "dismissUntil": "forever"},
+        {"dismissed": True, "dismissUntil": "2000-01-01T00:00:00.000Z"},
+        {"dismissed": "true"},
+        {"deleted": ["2024-01-01T10:00:00.000Z"]},
+        {"assignees": {"2024-01-01T10:00:00.000Z": "john@keephq.dev"}},
+        {"deletedAt": ["2024-01-01T10:00:00.000Z"]},
+        {"url": "grafana.example.com/d/1"},
+        {"imageUrl": "https://images.example.com/1.png"},
+        {"severity": 4},
+        {"severity": "unknown"},
+        {"status": "not-a-status"},
+        {"firingCounter": "3"},
+        {"source": "prometheus"},
+        {"source": ["prometheus", 5]},
+        {"name": 12},
+        {"environment": None, "service": 7},
+        {"description_format": "markdown"},
+        {"lastReceived": "2024-01-01T10:00:00+02:00"},
+        {"lastReceived": "1704103200"},
+        {"fingerprint": "f" * 300},
+        {"fingerprint": None},
+        {"id": None},
+        {"id": ""},
+        {"severity": None},
+        {"status": None},
+    ],
+)
+def test_from_stored_event_is_equivalent_to_validation(overrides):
+    event = _stored_event(**overrides)
+
+    try:
+        expected = AlertDto(**dict(event))
+    except ValidationError:
+        with pytest.raises(ValidationError):
+            AlertDto.from_stored_event(dict(event))
+        return
+    alert = AlertDto.from_stored_event(dict(event))
+
+    assert type(alert) is AlertDto
+    if not overrides.get("id", "1234"):
+        # a random id is generated
+        assert alert.id and alert.id != expected.id
+        expected.id = alert.id
+    assert alert.dict() == expected.dict()
+    assert alert.__fields_set__ == expected.__fields_set__
+    assert json.loads(alert.json()) == json.loads(expected.json())
+
+
+def test_from_stored_event_skips_validation_for_stored_events():
+    event = _stored_event()
+    with patch.object(AlertDto, "__init__", side_effect=AssertionError) as init:
+        alert = AlertDto.from_stored_event(event)
+    init.assert_not_called()
+    assert alert.severity == AlertSeverity.CRITICAL.value
+    assert alert.status == AlertStatus.FIRING.value
+    # lists aren't shared with the stored event
+    alert.source.append("grafana")
+    assert event["source"] == ["prometheus"]
+
+
+def test_from_stored_event_invalid_event_raises():
+    with pytest.raises(ValueError):
+        AlertDto.from_stored_event(_stored_event(lastReceived="not a date"))
@@ -0,0 +1,136 @@
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from keep.api.core import alert_hash_cache as alert_hash_cache_module
+from keep.api.core.alert_hash_cache import AlertHashCache, InMemoryAlertHashBackend
+from keep.api.core.db import get_last_alert_hashes_by_fingerprints
+from keep.api.core.dependencies import SINGLE_TENANT_UUID
+from keep.api.models.alert import AlertStatus
+from keep.api.models.db.alert import Alert, AlertDeduplicationRule, LastAlert
+
+T0 = datetime(2025, 1, 1, 12, 0, 0)
+T1 = T0 + timedelta(minutes=1)
+T2 = T0 + timedelta(minutes=2)
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = AlertHashCache(InMemoryAlertHashBackend(max_size=100, ttl=3600))
+    monkeypatch.setattr(alert_hash_cache_module, "_alert_hash_cache", cache)
+    return cache
+
+
+def test_entries_are_written_after_invalidation(cache):
+    # without a marker (e.g. it expired or was evicted) nothing is cached
+    cache.set("tenant", "fp", "hash-1", T1)
+    assert cache.get_many("tenant", ["fp"]) == {}
+
+    cache.invalidate("tenant", "fp", T1)
+    assert cache.get_many("tenant", ["fp"]) == {}
+    cache.set("tenant", "fp", "hash-1", T1)
+    assert cache.get_many("tenant", ["fp", "other"]) == {"fp": "hash-1"}
+    assert cache.get_many("other-tenant", ["fp"]) == {}
+
+
+def test_late_older_writer_does_not_overwrite_newer(cache):
+    cache.invalidate("tenant", "fp", T1)
+    cache.invalidate("tenant", "fp", T2)
+    cache.set("tenant", "fp", "hash-2", T2)
+    cache.set("tenant", "fp", "hash-1", T1)
+    assert cache.get_many("tenant", ["fp"]) == {"fp": "hash-2"}
+
+
+def test_pending_newer_writer_hides_the_entry(cache):
+    cache.invalidate("tenant", "fp", T1)
+    cache.set("tenant", "fp", "hash-1", T1)
+    # a newer alert is being committed, its hash isn't known yet
+    cache.invalidate("tenant", "fp", T2)
+    assert cache.get_many("tenant", ["fp"]) == {}
+    # an older writer invalidating late keeps the newer timestamp
+    cache.invalidate("tenant", "fp", T0)
+    cache.set("tenant", "fp", "hash-0", T0)
+    assert cache.get_many("tenant", ["fp"]) == {}
+
+
+def test_lru_eviction():
+    cache = AlertHashCache(InMemoryAlertHashBackend(max_size=2, ttl=3600))
+    for fingerprint in ("fp-1", "fp-2"):
+        cache.invalidate("tenant", fingerprint, T1)
+        cache.set("tenant", fingerprint, f"hash-{fingerprint}", T1)
+    cache.get_many("tenant", ["fp-1"])
+    cache.invalidate("tenant", "fp-3", T1)
+
+    assert cache.get_many("tenant", ["fp-1", "fp-2", "fp-3"]) == {"fp-1": "hash-fp-1"}
+
+
+def test_disabled_cache_is_a_miss():
+    cache = AlertHashCache(None)
+    cache.invalidate("tenant", "fp", T1)
+    cache.set("tenant", "fp", "hash-1", T1)
+    assert cache.get_many("tenant", ["fp"]) == {}
+
+
+@pytest.fixture
+def deduplication_rule(db_session):
+    rule = AlertDeduplicationRule(
+        name="Test Rule",
+        fingerprint_fields=["fingerprint"],
+        full_deduplication=True,
+        ignore_fields=["id", "lastReceived"],
+        is_provisioned=True,
+        tenant_id=SINGLE_TENANT_UUID,
+        description="test",
+        provider_id="test",
+        provider_type="keep",
+        last_updated_by="test",
+        created_by="test",
+    )
+    db_session.add(rule)
+    db_session.commit()
+    return rule
+
+
+def test_full_duplicate_is_found_without_the_db(
+    db_session, create_alert, cache, deduplication_rule
+):
+    create_alert("fp-1", AlertStatus.FIRING, T1, {"source": ["keep"]})
+    last_alert = db_session.query(LastAlert).one()
+    assert cache.get_many(SINGLE_TENANT_UUID, ["fp-1"]) == {
+        "fp-1": last_alert.alert_hash
+    }
+
+    with patch("keep.api.core.db.Session", side_effect=AssertionError):
+        assert get_last_alert_hashes_by_fingerprints(SINGLE_TENANT_UUID, ["fp-1"]) == {
+            "fp-1": last_alert.alert_hash
+        }
+
+    # same alert again, dropped as a full duplicate
+    create_alert(
+        "fp-1", AlertStatus.FIRING, T1 + timedelta(seconds=1), {"source": ["keep"]}
+    )
+    assert db_session.query(Alert).count() == 1
+
+    # a different alert replaces the cached hash
+    create_alert("fp-1", AlertStatus.RESOLVED, T2, {"source": ["keep"]})
+    assert db_session.query(Alert).count() == 2
+    db_session.expire_all()
+    last_alert = db_session.query(LastAlert).one()
+    assert cache.get_many(SINGLE_TENANT_UUID, ["fp-1"]) == {
+        "fp-1": last_alert.alert_hash
+    }
+
+
+def test_uncached_fingerprints_are_read_from_the_db(db_session, create_alert, cache):
+    create_alert("fp-1", AlertStatus.FIRING, T1, {"source": ["keep"]})
+    create_alert("fp-2", AlertStatus.FIRING, T1, {"source": ["keep"]})
+    cache.backend.entries.clear()
+
+    hashes = get_last_alert_hashes_by_fingerprints(
+        SINGLE_TENANT_UUID, ["fp-1", "fp-2", "fp-3"]
+    )
+
+    assert set(hashes) == {"fp-1", "fp-2"}
+    # db reads don't populate the cache, they could race with a writer
+    assert cache.get_many(SINGLE_TENANT_UUID, ["fp-1", "fp-2"]) == {}
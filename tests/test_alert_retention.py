@@ -0,0 +1,113 @@
+import datetime
+import logging
+
+from keep.api.bl.alert_retention_bl import AlertRetentionBl
+from keep.api.core.db import set_last_alert, write_tenant_config
+from keep.api.core.dependencies import SINGLE_TENANT_UUID
+from keep.api.models.action_type import ActionType
+from keep.api.models.db.alert import (
+    Alert,
+    AlertAudit,
+    AlertHistorySummary,
+    AlertRaw,
+    LastAlert,
+)
+
+
+def _add_alert(db_session, fingerprint, timestamp, status):
+    alert = Alert(
+        tenant_id=SINGLE_TENANT_UUID,
+        provider_type="test",
+        provider_id="test",
+        event={"fingerprint": fingerprint, "status": status},
+        fingerprint=fingerprint,
+        timestamp=timestamp,
+    )
+    db_session.add(alert)
+    db_session.commit()
+    return alert
+
+
+def test_alert_retention_compacts_history(db_session):
+    now = datetime.datetime.utcnow()
+    old = now - datetime.timedelta(days=40)
+
+    # three old alerts for the same fingerprint, the newest of which is still the last alert
+    _add_alert(db_session, "fp-retention", old, "firing")
+    _add_alert(
+        db_session, "fp-retention", old + datetime.timedelta(hours=1), "resolved"
+    )
+    last = _add_alert(
+        db_session, "fp-retention", old + datetime.timedelta(hours=2), "firing"
+    )
+    set_last_alert(SINGLE_TENANT_UUID, last, session=db_session)
+    recent = _add_alert(db_session, "fp-recent", now, "firing")
+    set_last_alert(SINGLE_TENANT_UUID, recent, session=db_session)
+
+    db_session.add_all(
+        [
+            AlertAudit(
+                tenant_id=SINGLE_TENANT_UUID,
+                fingerprint="fp-retention",
+                user_id="system",
+                action=ActionType.TIGGERED.value,
+                description="old",
+                timestamp=old,
+            ),
+            AlertAudit(
+                tenant_id=SINGLE_TENANT_UUID,
+                fingerprint="fp-retention",
+                user_id="user",
+                action=ActionType.COMMENT.value,
+                description="old comment",
+                timestamp=old,
+            ),
+            AlertRaw(
+                tenant_id=SINGLE_TENANT_UUID,
+                raw_alert={"old": True},
+                timestamp=old,
+            ),
+            AlertRaw(
+                tenant_id=SINGLE_TENANT_UUID,
+                raw_alert={"old": False},
+                timestamp=now,
+            ),
+        ]
+    )
+    db_session.commit()
+
+    # retention is disabled by default
+    assert AlertRetentionBl.get_retention_policies(default_days=0) == {}
+    write_tenant_config(SINGLE_TENANT_UUID, {"alert_retention_days": 30})
+    assert AlertRetentionBl.get_retention_policies(default_days=0) == {
+        SINGLE_TENANT_UUID: 30
+    }
+
+    AlertRetentionBl.apply_retention(logging.getLogger(__name__), session=db_session)
+
+    db_session.expire_all()
+    alerts = db_session.query(Alert).all()
+    assert sorted(alert.id for alert in alerts) == sorted([last.id, recent.id])
+    assert {
+        last_alert.alert_id for last_alert in db_session.query(LastAlert).all()
+    } == {last.id, recent.id}
+
+    summary = db_session.get(AlertHistorySummary, (SINGLE_TENANT_UUID, "fp-retention"))
+    assert summary.compacted_count == 2
+    assert summary.status_counts == {"firing": 1, "resolved": 1}
+    assert summary.first_timestamp == old
+    assert summary.last_timestamp == old + datetime.timedelta(hours=1)
+    assert (
+        db_session.get(AlertHistorySummary, (SINGLE_TENANT_UUID, "fp-recent")) is None
+    )
+
+    audits = db_session.query(AlertAudit).all()
+    assert [audit.action for audit in audits] == [ActionType.COMMENT.value]
+    raw_alerts = db_session.query(AlertRaw).all()
+    assert [raw_alert.raw_alert for raw_alert in raw_alerts] == [{"old": False}]
+
+    # running again is a no-op
+    AlertRetentionBl.apply_retention(logging.getLogger(__name__), session=db_session)
+    db_session.expire_all()
+    summary = db_session.get(AlertHistorySummary, (SINGLE_TENANT_UUID, "fp-retention"))
+    assert summary.compacted_count == 2
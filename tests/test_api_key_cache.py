@@ -0,0 +1,186 @@
+import datetime
+from unittest.mock import patch
+
+import pytest
+
+from keep.api.core import api_key_cache as api_key_cache_module
+from keep.api.core.api_key_cache import (
+    ApiKeyLastUsedWriter,
+    CachedApiKey,
+    get_api_key_cache,
+)
+from keep.api.core.db import get_api_key, update_keys_last_used
+from keep.api.core.dependencies import SINGLE_TENANT_UUID
+from keep.api.models.db.tenant import TenantApiKey
+from keep.api.utils.tenant_utils import update_api_key_internal
+from tests.fixtures.client import client, setup_api_key, test_app  # noqa
+
+
+@pytest.fixture
+def db_lookups():
+    with patch.object(
+        api_key_cache_module, "get_api_key", wraps=get_api_key
+    ) as lookups:
+        yield lookups
+
+
+def test_valid_and_invalid_keys_are_cached(db_session, db_lookups):
+    setup_api_key(db_session, "cached_api_key", role="noc")
+    cache = get_api_key_cache()
+
+    for _ in range(3):
+        assert cache.get("cached_api_key") == CachedApiKey(
+            tenant_id=SINGLE_TENANT_UUID,
+            reference_id="test_api_key",
+            created_by="admin@keephq",
+            role="noc",
+        )
+        assert cache.get("unknown_api_key") is None
+
+    assert db_lookups.call_count == 2
+
+
+def test_committed_changes_invalidate_the_key(db_session):
+    cache = get_api_key_cache()
+    assert cache.get("new_api_key") is None
+
+    # created after being cached as invalid
+    setup_api_key(db_session, "new_api_key")
+    assert cache.get("new_api_key").role == "admin"
+
+    tenant_api_key = db_session.query(TenantApiKey).one()
+    tenant_api_key.is_deleted = True
+    db_session.commit()
+    assert cache.get("new_api_key") is None
+
+
+def test_rotated_key_is_invalidated(db_session):
+    setup_api_key(db_session, "rotated_api_key")
+    cache = get_api_key_cache()
+    assert cache.get("rotated_api_key") is not None
+
+    new_api_key = update_api_key_internal(
+        db_session, SINGLE_TENANT_UUID, "test_api_key"
+    )
+
+    assert cache.get("rotated_api_key") is None
+    assert cache.get(new_api_key).reference_id == "test_api_key"
+
+
+@pytest.mark.parametrize("test_app", ["SINGLE_TENANT"], indirect=True)
+def test_request_verifies_the_key_once(db_session, client, test_app, db_lookups):
+    setup_api_key(db_session, "request_api_key")
+
+    for _ in range(5):
+        response = client.get("/providers", headers={"x-api-key": "request_api_key"})
+        assert response.status_code == 200
+
+    # shared by the logging middleware and the auth verifier
+    assert db_lookups.call_count == 1
+
+
+def test_last_used_updates_are_coalesced(db_session):
+    setup_api_key(db_session, "first_api_key")
+    db_session.add(
+        TenantApiKey(
+            tenant_id=SINGLE_TENANT_UUID,
+            reference_id="second_key",
+            key_hash="second_key_hash",
+            created_by="admin@keephq",
+            role="admin",
+        )
+    )
+    db_session.commit()
+    writer = ApiKeyLastUsedWriter(interval=3600)
+
+    with patch.object(
+        api_key_cache_module,
+        "update_keys_last_used",
+        wraps=api_key_cache_module.update_keys_last_used,
+    ) as update:
+        # the first use is written right away, the next ones wait for the interval
+        writer.record(SINGLE_TENANT_UUID, "test_api_key")
+        writer.record(SINGLE_TENANT_UUID, "test_api_key")
+        writer.record(SINGLE_TENANT_UUID, "second_key")
+        assert update.call_count == 1
+
+        writer.flush()
+        assert update.call_count == 2
+        assert set(update.call_args.args[0]) == {
+            (SINGLE_TENANT_UUID, "test_api_key"),
+            (SINGLE_TENANT_UUID, "second_key"),
+        }
+
+    db_session.expire_all()
+    for tenant_api_key in db_session.query(TenantApiKey).all():
+        assert tenant_api_key.last_used is not None
+        assert datetime.datetime.fromisoformat(
+            str(tenant_api_key.last_used)
+        ) > datetime.datetime.utcnow() - datetime.timedelta(minutes=1)
+
+
+def test_failed_last_used_updates_are_retried(db_session):
+    writer = ApiKeyLastUsedWriter(interval=3600)
+
+    with patch.object(
+        api_key_cache_module,
+        "update_keys_last_used",
+        side_effect=[Exception("db is down"), None],
+    ) as update:
+        writer.record(SINGLE_TENANT_UUID, "test_api_key")
+        failed_batch = update.call_args.args[0]
+        assert set(writer.pending) == {(SINGLE_TENANT_UUID, "test_api_key")}
+
+        writer.record(SINGLE_TENANT_UUID, "second_key")
+        writer.flush()
+        assert update.call_count == 2
+        retried_batch = update.call_args.args[0]
+        assert set(retried_batch) == {
+            (SINGLE_TENANT_UUID, "test_api_key"),
+            (SINGLE_TENANT_UUID, "second_key"),
+        }
+        assert retried_batch[(SINGLE_TENANT_UUID, "test_api_key")] == (
+            failed_batch[(SINGLE_TENANT_UUID, "test_api_key")]
+        )
+        assert writer.pending == {}
+
+
+def test_flush_at_exit_does_not_log(db_session):
+    writer = ApiKeyLastUsedWriter(interval=3600)
+    writer.pending[(SINGLE_TENANT_UUID, "test_api_key")] = datetime.datetime.utcnow()
+
+    with patch.object(
+        api_key_cache_module,
+        "update_keys_last_used",
+        side_effect=Exception("db is gone"),
+    ), patch.object(api_key_cache_module, "logger") as logger:
+        writer.flush_at_exit()
+
+    logger.exception.assert_not_called()
+
+
+def test_keys_keep_their_own_last_use(db_session):
+    setup_api_key(db_session, "first_api_key")
+    db_session.add(
+        TenantApiKey(
+            tenant_id=SINGLE_TENANT_UUID,
+            reference_id="second_key",
+            key_hash="second_key_hash",
+            created_by="admin@keephq",
+            role="admin",
+        )
+    )
+    db_session.commit()
+    last_used = {
+        (SINGLE_TENANT_UUID, "test_api_key"): datetime.datetime(2024, 1, 1, 10),
+        (SINGLE_TENANT_UUID, "second_key"): datetime.datetime(2024, 1, 2, 10),
+    }
+
+    update_keys_last_used(last_used)
+
+    db_session.expire_all()
+    for tenant_api_key in db_session.query(TenantApiKey).all():
+        assert (
+            datetime.datetime.fromisoformat(str(tenant_api_key.last_used))
+            == last_used[(tenant_api_key.tenant_id, tenant_api_key.reference_id)]
+        )
@@ -0,0 +1,164 @@
+import datetime
+import logging
+
+import pytest
+
+from keep.api.bl.dashboard_rollups_bl import DashboardRollupsBl
+from keep.api.core import db
+from keep.api.core.db import (
+    get_combined_workflow_execution_distribution,
+    get_provider_distribution,
+)
+from keep.api.core.dependencies import SINGLE_TENANT_UUID
+from keep.api.models.db.alert import Alert
+from keep.api.models.db.dashboard import DashboardRollup
+from keep.api.models.db.workflow import WorkflowExecution
+from keep.api.models.time_stamp import TimeStampFilter
+
+logger = logging.getLogger(__name__)
+
+
+@pytest.fixture
+def history(db_session):
+    now = datetime.datetime.utcnow()
+    start = now - datetime.timedelta(hours=12)
+    alerts = []
+    for i in range(60):
+        timestamp = start + datetime.timedelta(minutes=11 * i)
+        provider = ("grafana", "grafana") if i % 3 else ("datadog-1", "datadog")
+        alerts.append(
+            Alert(
+                tenant_id=SINGLE_TENANT_UUID,
+                provider_id=provider[0],
+                provider_type=provider[1],
+                event={"fingerprint": f"fp-{i % 7}"},
+                fingerprint=f"fp-{i % 7}",
+                timestamp=timestamp,
+            )
+        )
+    executions = [
+        WorkflowExecution(
+            id=f"rollup-execution-{i}",
+            workflow_id="test-id-1",
+            tenant_id=SINGLE_TENANT_UUID,
+            triggered_by="keep-test",
+            status="success",
+            execution_number=1000 + i,
+            started=start + datetime.timedelta(minutes=17 * i),
+            results={},
+        )
+        for i in range(30)
+    ]
+    db_session.add_all(alerts + executions)
+    db_session.commit()
+    return now
+
+
+def _ranges(now):
+    return [
+        # unaligned edges on both sides
+        (now - datetime.timedelta(hours=10, minutes=17), now),
+        (
+            now - datetime.timedelta(hours=11, minutes=45),
+            now - datetime.timedelta(hours=2, minutes=3),
+        ),
+        # hour aligned
+        (
+            db.floor_hour(now - datetime.timedelta(hours=9)),
+            db.floor_hour(now - datetime.timedelta(hours=1)),
+        ),
+        # within a single hour
+        (
+            now - datetime.timedelta(hours=5, minutes=40),
+            now - datetime.timedelta(hours=5, minutes=10),
+        ),
+    ]
+
+
+def test_rollups_match_raw_aggregation(db_session, history):
+    DashboardRollupsBl.update_rollups(logger, db_session, now=history)
+
+    assert db_session.query(DashboardRollup).count() > 0
+    for metric in db.DASHBOARD_ROLLUP_METRICS:
+        for lower, upper in _ranges(history):
+            assert (
+                DashboardRollupsBl.verify(SINGLE_TENANT_UUID, metric, lower, upper)
+                == {}
+            )
+
+
+def test_update_rollups_is_incremental(db_session, history):
+    DashboardRollupsBl.update_rollups(
+        logger, db_session, now=history - datetime.timedelta(hours=6)
+    )
+    _, covered_until = db.get_dashboard_rollup_coverage(db_session, "alerts")
+    DashboardRollupsBl.update_rollups(logger, db_session, now=history)
+    covered_from, new_covered_until = db.get_dashboard_rollup_coverage(
+        db_session, "alerts"
+    )
+
+    assert new_covered_until > covered_until
+    assert covered_from < covered_until
+    for lower, upper in _ranges(history):
+        assert (
+            DashboardRollupsBl.verify(SINGLE_TENANT_UUID, "alerts", lower, upper) == {}
+        )
+
+
+def test_distributions_are_served_from_rollups(db_session, history, monkeypatch):
+    timestamp_filter = TimeStampFilter(
+        lower_timestamp=history - datetime.timedelta(hours=12),
+        upper_timestamp=history,
+    )
+    raw = (
+        get_provider_distribution(SINGLE_TENANT_UUID),
+        get_provider_distribution(
+            SINGLE_TENANT_UUID, aggregate_all=True, timestamp_filter=timestamp_filter
+        ),
+        get_combined_workflow_execution_distribution(
+            SINGLE_TENANT_UUID, timestamp_filter=timestamp_filter
+        ),
+    )
+    assert sum(hour["number"] for hour in raw[1]) == 60
+
+    DashboardRollupsBl.update_rollups(logger, db_session, now=history)
+    monkeypatch.setattr(db, "KEEP_DASHBOARD_ROLLUPS_ENABLED", True)
+    served = (
+        get_provider_distribution(SINGLE_TENANT_UUID),
+        get_provider_distribution(
+            SINGLE_TENANT_UUID, aggregate_all=True, timestamp_filter=timestamp_filter
+        ),
+        get_combined_workflow_execution_distribution(
+            SINGLE_TENANT_UUID, timestamp_filter=timestamp_filter
+        ),
+    )
+    assert served == raw
+
+    # whole rolled up hours are not read from the alert table anymore
+    first_whole_hour = db.floor_hour(
+        timestamp_filter.lower_timestamp
+    ) + datetime.timedelta(hours=1)
+    db_session.query(Alert).filter(
+        Alert.timestamp >= first_whole_hour,
+        Alert.timestamp < db.floor_hour(history - datetime.timedelta(hours=2)),
+    ).delete()
+    db_session.commit()
+    assert (
+        get_provider_distribution(
+            SINGLE_TENANT_UUID, aggregate_all=True, timestamp_filter=timestamp_filter
+        )
+        == raw[1]
+    )
+
+
+def test_refresh_tenant_after_deletions(db_session, history):
+    DashboardRollupsBl.update_rollups(logger, db_session, now=history)
+    cutoff = history - datetime.timedelta(hours=8)
+    db_session.query(Alert).filter(Alert.timestamp < cutoff).delete()
+    db_session.commit()
+    lower = history - datetime.timedelta(hours=12)
+
+    assert DashboardRollupsBl.verify(SINGLE_TENANT_UUID, "alerts", lower, history)
+
+    DashboardRollupsBl.refresh_tenant(db_session, SINGLE_TENANT_UUID, "alerts", cutoff)
+    assert DashboardRollupsBl.verify(SINGLE_TENANT_UUID, "alerts", lower, history) == {}
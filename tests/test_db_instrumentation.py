@@ -0,0 +1,125 @@
+import logging
+
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from keep.api.core import db_instrumentation
+from keep.api.core.db_instrumentation import (
+    InstrumentedQueuePool,
+    get_statement_fingerprint,
+    instrument_engine,
+    normalize_statement,
+)
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_normalize_statement():
+    assert (
+        normalize_statement(
+            "SELECT alert.id FROM alert /* controller='api' */\n"
+            "WHERE alert.tenant_id = 'keep' AND alert.fingerprint IN (?, ?, ?) "
+            "AND alert.timestamp > :timestamp_1 LIMIT 10"
+        )
+        == "SELECT alert.id FROM alert WHERE alert.tenant_id = ? "
+        "AND alert.fingerprint IN (?) AND alert.timestamp > ? LIMIT ?"
+    )
+    # the same statement with other values or list lengths has the same fingerprint
+    assert get_statement_fingerprint(
+        "SELECT * FROM alert WHERE id IN (%s, %s) AND name = 'a'"
+    ) == get_statement_fingerprint(
+        "SELECT * FROM alert WHERE id IN (%s) AND name = 'b'"
+    )
+    assert get_statement_fingerprint("select 1")[0] == "SELECT"
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path}/instrumentation.db",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.1,
+    )
+    instrument_engine(engine)
+    yield engine
+    engine.dispose()
+
+
+def test_query_duration_is_recorded(engine):
+    operation, fingerprint, _ = get_statement_fingerprint("SELECT 1 + 2")
+    before = _sample(
+        "keep_db_query_duration_seconds_count",
+        operation=operation,
+        statement=fingerprint,
+    )
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1 + 2"))
+        connection.execute(text("SELECT 1 + 2"))
+
+    assert (
+        _sample(
+            "keep_db_query_duration_seconds_count",
+            operation=operation,
+            statement=fingerprint,
+        )
+        == before + 2
+    )
+
+
+def test_slow_query_log_redacts_parameters(engine, monkeypatch, caplog):
+    monkeypatch.setattr(db_instrumentation, "KEEP_DB_SLOW_QUERY_THRESHOLD", 1e-9)
+    with caplog.at_level(logging.WARNING, logger=db_instrumentation.__name__):
+        with engine.connect() as connection:
+            connection.execute(
+                text("SELECT :secret AS value"), {"secret": "hunter2"}
+            ).all()
+
+    record = next(r for r in caplog.records if r.getMessage() == "Slow database query")
+    # sqlite binds positional parameters
+    assert record.parameters == ["str"]
+    assert "hunter2" not in str(record.__dict__)
+    assert record.caller.startswith(
+        f"{__name__}.test_slow_query_log_redacts_parameters"
+    )
+
+
+def test_slow_query_log_is_sampled(engine, monkeypatch, caplog):
+    monkeypatch.setattr(db_instrumentation, "KEEP_DB_SLOW_QUERY_THRESHOLD", 1e-9)
+    monkeypatch.setattr(db_instrumentation, "KEEP_DB_SLOW_QUERY_SAMPLE_RATE", 0)
+    _, fingerprint, _ = get_statement_fingerprint("SELECT 2 + 3")
+    before = _sample(
+        "keep_db_slow_queries_total", operation="SELECT", statement=fingerprint
+    )
+    with caplog.at_level(logging.WARNING, logger=db_instrumentation.__name__):
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 2 + 3"))
+
+    assert not [r for r in caplog.records if r.getMessage() == "Slow database query"]
+    # slow queries are still counted
+    assert (
+        _sample("keep_db_slow_queries_total", operation="SELECT", statement=fingerprint)
+        == before + 1
+    )
+
+
+def test_pool_metrics(engine):
+    waits_before = _sample("keep_db_pool_checkout_wait_seconds_count")
+    timeouts_before = _sample("keep_db_pool_checkout_timeouts_total")
+
+    with engine.connect():
+        assert _sample("keep_db_pool_connections", state="in_use") == 1
+        assert _sample("keep_db_pool_connections", state="idle") == 0
+        # the pool is exhausted
+        with pytest.raises(PoolTimeoutError):
+            engine.connect()
+
+    assert _sample("keep_db_pool_connections", state="in_use") == 0
+    assert _sample("keep_db_pool_connections", state="idle") == 1
+    assert _sample("keep_db_pool_checkout_wait_seconds_count") == waits_before + 2
+    assert _sample("keep_db_pool_checkout_timeouts_total") == timeouts_before + 1
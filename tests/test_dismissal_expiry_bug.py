@@ -12,6 +12,7 @@ from datetime import timezone, timedelta
 from freezegun import freeze_time
 
 from keep.api.bl.enrichments_bl import EnrichmentsBl
+from keep.api.core.db import refresh_last_alerts_state
 from keep.api.core.dependencies import SINGLE_TENANT_UUID
 from keep.api.models.action_type import ActionType
 from keep.api.models.alert import AlertDto, AlertStatus
@@ -820,7 +821,31 @@ def test_dismissal_expiry_boolean_comparison_fix(db_session):
         )
         created_enrichments.append(enrichment)
         db_session.add(enrichment)
+        # the expiry is looked up over the last alerts state
+        alert = Alert(
+            tenant_id=tenant_id,
+            provider_type="test",
+            provider_id="test",
+            event=_create_valid_event({"fingerprint": test_case["fingerprint"]}),
+            fingerprint=test_case["fingerprint"],
+            timestamp=current_time,
+        )
+        db_session.add(alert)
+        db_session.flush()
+        db_session.add(
+            LastAlert(
+                tenant_id=tenant_id,
+                fingerprint=alert.fingerprint,
+                timestamp=alert.timestamp,
+                first_timestamp=alert.timestamp,
+                alert_id=alert.id,
+            )
+        )
     
+    db_session.flush()
+    refresh_last_alerts_state(
+        db_session, tenant_id, [test_case["fingerprint"] for test_case in test_cases]
+    )
     db_session.commit()
     
     # Test that get_alerts_with_expired_dismissals finds all variations
@@ -1336,3 +1361,113 @@ def test_dismissal_expiry_bug_cel_filter_FIXED_with_watcher(db_session):
             )
             assert results[0].dismissed == False
             assert results[0].dismissUntil is None
+
+
+def test_dismissal_expiry_in_batches(db_session):
+    """
+    Test that expired dismissals are picked over the last alerts expiry, the longest
+    expired first, and restored batch by batch.
+    """
+    from keep.api.bl.dismissal_expiry_bl import DismissalExpiryBl
+    from keep.api.models.db.alert import AlertAudit, AlertEnrichment
+    import logging
+
+    tenant_id = SINGLE_TENANT_UUID
+    now = datetime.datetime(2025, 1, 15, 10, 0, 0, tzinfo=timezone.utc)
+
+    with freeze_time(now):
+        for index in range(6):
+            alert = Alert(
+                tenant_id=tenant_id,
+                provider_type="test",
+                provider_id="test",
+                event=_create_valid_event({"fingerprint": f"batch-{index}"}),
+                fingerprint=f"batch-{index}",
+                timestamp=now,
+            )
+            db_session.add(alert)
+            db_session.commit()
+            db_session.add(
+                LastAlert(
+                    tenant_id=tenant_id,
+                    fingerprint=alert.fingerprint,
+                    timestamp=alert.timestamp,
+                    first_timestamp=alert.timestamp,
+                    alert_id=alert.id,
+                )
+            )
+            db_session.commit()
+
+        enrichment_bl = EnrichmentsBl(tenant_id, db_session)
+        # batch-0..3 expired (batch-3 first), batch-4 in the future, batch-5 forever
+        for index, dismiss_until in enumerate(
+            [
+                (now - timedelta(minutes=10)).strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+                (now - timedelta(minutes=20)).strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+                (now - timedelta(minutes=30)).strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+                (now - timedelta(minutes=40)).strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+                (now + timedelta(minutes=10)).strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+                "forever",
+            ]
+        ):
+            enrichment_bl.enrich_entity(
+                fingerprint=f"batch-{index}",
+                enrichments={
+                    "dismissed": True,
+                    "dismissUntil": dismiss_until,
+                    "status": "suppressed",
+                    "disposable_note": "Maintenance window",
+                    "note": "keep me",
+                },
+                action_callee="workflow",
+                action_description="Alert dismissed by maintenance workflow",
+                action_type=ActionType.GENERIC_ENRICH,
+            )
+
+        expired = DismissalExpiryBl.get_alerts_with_expired_dismissals(
+            db_session, limit=2
+        )
+        assert [enrichment.alert_fingerprint for enrichment in expired] == [
+            "batch-3",
+            "batch-2",
+        ]
+
+        DismissalExpiryBl.check_dismissal_expiry(
+            logging.getLogger(__name__), db_session, batch_size=3
+        )
+
+    db_session.expire_all()
+    last_alerts = {
+        last_alert.fingerprint: last_alert
+        for last_alert in db_session.query(LastAlert).filter(
+            LastAlert.fingerprint.like("batch-%")
+        )
+    }
+    enrichments = {
+        enrichment.alert_fingerprint: enrichment.enrichments
+        for enrichment in db_session.query(AlertEnrichment).filter(
+            AlertEnrichment.alert_fingerprint.like("batch-%")
+        )
+    }
+    for index in range(4):
+        fingerprint = f"batch-{index}"
+        assert last_alerts[fingerprint].dismissed is False
+        assert last_alerts[fingerprint].dismiss_until is None
+        assert last_alerts[fingerprint].status == "firing"
+        assert enrichments[fingerprint] == {
+            "dismissed": False,
+            "dismissUntil": None,
+            "note": "keep me",
+        }
+    assert last_alerts["batch-4"].dismissed is True
+    assert last_alerts["batch-5"].dismissed is True
+    assert enrichments["batch-5"]["dismissUntil"] == "forever"
+
+    audits = (
+        db_session.query(AlertAudit)
+        .filter(AlertAudit.action == ActionType.DISMISSAL_EXPIRED.value)
+        .all()
+    )
+    assert sorted(audit.fingerprint for audit in audits) == [
+        f"batch-{index}" for index in range(4)
+    ]
@@ -17,6 +17,7 @@ from keep.api.models.db.extraction import ExtractionRule
 from keep.api.models.db.mapping import MappingRule
 from keep.api.models.db.topology import TopologyService
 from keep.api.models.db.workflow import Workflow
+from keep.topologies.topology_matcher_index import TopologyMatcherIndex
 from keep.workflowmanager.workflowmanager import WorkflowManager
 from tests.fixtures.client import client, setup_api_key, test_app
 from tests.fixtures.workflow_manager import (
@@ -634,8 +635,8 @@ def test_topology_mapping_rule_enrichment(mock_session, mock_alert_dto):
     mock_alert_dto.service = "test-service"
 
     # Mock the get_topology_data_by_dynamic_matcher to return the mock topology service
-    with patch(
-        "keep.api.bl.enrichments_bl.get_topology_data_by_dynamic_matcher",
+    with patch.object(TopologyMatcherIndex.get_instance(), "enabled", False), patch(
+        "keep.topologies.topology_matcher_index.get_topology_data_by_dynamic_matcher",
         return_value=mock_topology_service,
     ):
         # Mock the enrichment database function so no actual DB actions occur
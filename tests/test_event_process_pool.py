@@ -0,0 +1,63 @@
+import asyncio
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import Mock, patch
+
+import pytest
+from arq import Retry
+
+from keep.api import arq_worker
+from keep.api.tasks.process_event_pool import create_event_executor, get_job_context
+
+
+def test_job_context_is_picklable():
+    ctx = {
+        "job_id": "job-1",
+        "job_try": 2,
+        "redis": Mock(),
+        "pool": create_event_executor("thread", 1),
+    }
+    job_context = get_job_context(ctx)
+
+    assert pickle.loads(pickle.dumps(job_context)) == {"job_id": "job-1", "job_try": 2}
+    ctx["pool"].shutdown()
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        create_event_executor("fiber", 1)
+
+
+def test_worker_processes_are_recycled(tmp_path, monkeypatch):
+    # the spawned processes create their own engine from the environment
+    monkeypatch.setenv("DATABASE_CONNECTION_STRING", f"sqlite:///{tmp_path}/keep.db")
+    executor = create_event_executor("process", max_workers=1, max_jobs=2)
+    try:
+        pids = [executor.submit(os.getpid).result(timeout=120) for _ in range(4)]
+    finally:
+        executor.shutdown(wait=True)
+
+    assert os.getpid() not in pids
+    assert pids[0] == pids[1]
+    assert pids[2] == pids[3]
+    assert pids[1] != pids[2]
+
+
+def test_broken_process_pool_is_replaced():
+    broken_pool = Mock(spec=ProcessPoolExecutor)
+    broken_pool.submit.side_effect = BrokenProcessPool()
+    new_pool = Mock(spec=ProcessPoolExecutor)
+    ctx = {"job_id": "job-1", "job_try": 1, "pool": Mock(), "event_pool": broken_pool}
+
+    with patch.object(arq_worker, "create_event_executor", return_value=new_pool):
+        with pytest.raises(Retry):
+            asyncio.run(
+                arq_worker.process_event_in_worker(
+                    ctx, "tenant", "keep", "keep", None, None, "trace", {}
+                )
+            )
+
+    assert ctx["event_pool"] is new_pool
+    broken_pool.shutdown.assert_called_once_with(wait=False)
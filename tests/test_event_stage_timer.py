@@ -0,0 +1,76 @@
+import datetime
+import logging
+from unittest.mock import patch
+
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from prometheus_client import REGISTRY
+
+from keep.api.core.dependencies import SINGLE_TENANT_UUID
+from keep.api.models.alert import AlertStatus
+from keep.api.tasks.event_stage_timer import EventStageTimer, get_provider_type_label
+
+
+def _stage_count(stage, provider_type="none"):
+    return (
+        REGISTRY.get_sample_value(
+            "keep_events_stage_duration_seconds_count",
+            {"stage": stage, "provider_type": provider_type},
+        )
+        or 0
+    )
+
+
+def test_provider_type_label_is_bounded():
+    assert get_provider_type_label(None) == "none"
+    assert get_provider_type_label("prometheus") == "prometheus"
+    assert get_provider_type_label("not-a-real-provider") == "other"
+
+
+def test_stage_spans_are_children_of_process_event():
+    exporter = InMemorySpanExporter()
+    tracer_provider = TracerProvider()
+    tracer_provider.add_span_processor(SimpleSpanProcessor(exporter))
+
+    stage_timer = EventStageTimer(
+        tracer_provider.get_tracer(__name__), SINGLE_TENANT_UUID, "prometheus"
+    )
+    with stage_timer.stage("deduplication"):
+        pass
+    with stage_timer.stage("save_to_db"):
+        pass
+    stage_timer.counts["alerts"] = 3
+    stage_timer.finish()
+
+    spans = {span.name: span for span in exporter.get_finished_spans()}
+    root = spans["process_event"]
+    assert root.attributes["num_of_alerts"] == 3
+    for name in ["process_event_deduplication", "process_event_save_to_db"]:
+        assert spans[name].parent.span_id == root.context.span_id
+    assert set(stage_timer.timings) == {"deduplication", "save_to_db"}
+
+
+def test_process_event_records_stages_and_logs_slow_events(
+    db_session, create_alert, caplog
+):
+    save_to_db_before = _stage_count("save_to_db")
+    total_before = _stage_count("total")
+
+    with patch(
+        "keep.api.tasks.event_stage_timer.KEEP_SLOW_EVENT_THRESHOLD_SECONDS", 0.000001
+    ), caplog.at_level(logging.WARNING, logger="keep.api.tasks.event_stage_timer"):
+        create_alert(
+            "fp-stage-timer", AlertStatus.FIRING, datetime.datetime.utcnow(), {}
+        )
+
+    assert _stage_count("save_to_db") == save_to_db_before + 1
+    assert _stage_count("total") == total_before + 1
+
+    slow_logs = [
+        record for record in caplog.records if record.message == "Slow event processing"
+    ]
+    assert len(slow_logs) == 1
+    assert slow_logs[0].fingerprints == ["fp-stage-timer"]
+    assert slow_logs[0].counts["alerts"] == 1
+    assert "save_to_db" in slow_logs[0].stages
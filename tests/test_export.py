@@ -0,0 +1,191 @@
+import csv
+import io
+import json
+import os
+import tracemalloc
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import insert
+
+from keep.api.core.alerts import build_alerts_export_query, export_last_alerts
+from keep.api.core.db import create_incident_from_dict
+from keep.api.core.dependencies import SINGLE_TENANT_UUID
+from keep.api.core.incidents import build_incidents_export_query, export_incidents
+from keep.api.models.db.alert import Alert, LastAlert
+from keep.api.utils.export_helpers import (
+    EXPORT_CURSOR_FIELD,
+    ExportFormat,
+    format_export,
+)
+from tests.fixtures.client import client, test_app  # noqa: F401
+
+# rows exported within the memory budget, raise it to check larger exports
+EXPORT_ROWS = int(os.environ.get("KEEP_EXPORT_TEST_ROWS", 20000))
+EXPORT_MEMORY_BUDGET = 32 * 1024 * 1024
+
+
+def _export_alerts(cel=None, cursor=None, limit=None, batch_size=100):
+    query = build_alerts_export_query(SINGLE_TENANT_UUID, cel=cel, cursor=cursor)
+    return [
+        record
+        for batch in export_last_alerts(
+            SINGLE_TENANT_UUID, query, limit=limit, batch_size=batch_size
+        )
+        for record in batch
+    ]
+
+
+def test_export_alerts_in_keyset_order(db_session, setup_stress_alerts_no_elastic):
+    setup_stress_alerts_no_elastic(250)
+
+    records = _export_alerts()
+
+    assert len(records) == len({record["fingerprint"] for record in records}) == 250
+    received = [record["lastReceived"] for record in records]
+    assert received == sorted(received, reverse=True)
+
+    critical = _export_alerts(cel="severity == 'critical'")
+    assert {record["fingerprint"] for record in critical} == {
+        record["fingerprint"] for record in records if record["severity"] == "critical"
+    }
+
+
+def test_export_alerts_resumes_from_cursor(db_session, setup_stress_alerts_no_elastic):
+    setup_stress_alerts_no_elastic(250)
+    everything = [record["fingerprint"] for record in _export_alerts()]
+
+    first = _export_alerts(limit=90, batch_size=40)
+    assert len(first) == 90
+    rest = _export_alerts(cursor=first[-1][EXPORT_CURSOR_FIELD], batch_size=40)
+
+    assert [record["fingerprint"] for record in first + rest] == everything
+
+
+def test_export_incidents_resumes_from_cursor(db_session):
+    start = datetime.utcnow()
+    for index in range(5):
+        incident = create_incident_from_dict(
+            SINGLE_TENANT_UUID,
+            {"user_generated_name": f"incident-{index}", "user_summary": "test"},
+        )
+        # two share a creation time, the id breaks the tie
+        incident.creation_time = start + timedelta(seconds=min(index, 3))
+        db_session.merge(incident)
+    db_session.commit()
+
+    def export(cursor=None, limit=None):
+        query = build_incidents_export_query(SINGLE_TENANT_UUID, cursor=cursor)
+        return [
+            record
+            for batch in export_incidents(query, limit=limit, batch_size=2)
+            for record in batch
+        ]
+
+    everything = export()
+    assert len(everything) == 5
+    first = export(limit=2)
+    rest = export(cursor=first[-1][EXPORT_CURSOR_FIELD])
+    assert [record["id"] for record in first + rest] == [
+        record["id"] for record in everything
+    ]
+
+
+@pytest.mark.parametrize("test_app", ["NO_AUTH"], indirect=True)
+def test_export_alerts_route(
+    db_session, client, test_app, setup_stress_alerts_no_elastic
+):
+    setup_stress_alerts_no_elastic(30)
+
+    response = client.get(
+        "/alerts/export",
+        headers={"x-api-key": "some-key"},
+        params={"format": "csv", "fields": ["fingerprint", "severity"]},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert rows[0] == ["fingerprint", "severity", EXPORT_CURSOR_FIELD]
+    assert len(rows) == 31
+
+    response = client.get(
+        "/alerts/export",
+        headers={"x-api-key": "some-key"},
+        params={"cursor": rows[10][-1]},
+    )
+    assert response.status_code == 200
+    lines = response.text.splitlines()
+    assert [json.loads(line)["fingerprint"] for line in lines] == [
+        row[0] for row in rows[11:]
+    ]
+
+    response = client.get(
+        "/alerts/export",
+        headers={"x-api-key": "some-key"},
+        params={"cursor": "not-a-cursor"},
+    )
+    assert response.status_code == 400
+
+
+def test_export_alerts_memory_is_bounded(db_session):
+    start = datetime.utcnow()
+    for offset in range(0, EXPORT_ROWS, 5000):
+        alerts, last_alerts = [], []
+        for index in range(offset, min(offset + 5000, EXPORT_ROWS)):
+            alert_id = uuid4()
+            timestamp = start - timedelta(seconds=index)
+            fingerprint = f"export-{index}"
+            alerts.append(
+                {
+                    "id": alert_id,
+                    "tenant_id": SINGLE_TENANT_UUID,
+                    "timestamp": timestamp,
+                    "provider_type": "test",
+                    "provider_id": "test",
+                    "fingerprint": fingerprint,
+                    "event": {
+                        "id": str(alert_id),
+                        "name": fingerprint,
+                        "status": "firing",
+                        "severity": "critical",
+                        "lastReceived": timestamp.isoformat(),
+                        "fingerprint": fingerprint,
+                    },
+                }
+            )
+            last_alerts.append(
+                {
+                    "tenant_id": SINGLE_TENANT_UUID,
+                    "fingerprint": fingerprint,
+                    "alert_id": alert_id,
+                    "timestamp": timestamp,
+                    "first_timestamp": timestamp,
+                    "status": "firing",
+                    "severity": "critical",
+                    "dismissed": False,
+                }
+            )
+        db_session.execute(insert(Alert), alerts)
+        db_session.execute(insert(LastAlert), last_alerts)
+    db_session.commit()
+
+    query = build_alerts_export_query(SINGLE_TENANT_UUID)
+    exported, size = 0, 0
+    tracemalloc.start()
+    try:
+        for chunk in format_export(
+            export_last_alerts(SINGLE_TENANT_UUID, query, batch_size=500),
+            ExportFormat.NDJSON,
+            [],
+        ):
+            exported += chunk.count("\n")
+            size += len(chunk)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert exported == EXPORT_ROWS
+    # the whole export would not fit, only a batch at a time does
+    assert size > EXPORT_MEMORY_BUDGET or EXPORT_ROWS < 100000
+    assert peak < EXPORT_MEMORY_BUDGET
@@ -0,0 +1,176 @@
+import asyncio
+import threading
+from unittest.mock import patch
+from uuid import uuid4
+
+from keep.api.bl.incidents_bl import IncidentBl
+from keep.api.core.db import create_incident_from_dict
+from keep.api.core.dependencies import SINGLE_TENANT_UUID
+from keep.api.core.incident_changes import (
+    IncidentChange,
+    IncidentChangeDispatcher,
+    get_incident_change_dispatcher,
+)
+from tests.conftest import PusherMock, WorkflowManagerMock
+
+
+class RecordingHandler:
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.changes = []
+        self.stages = []
+        self.done = threading.Event()
+
+    def __call__(self, change: IncidentChange):
+        change.run_stage("first", self.stages.append, "first")
+        change.run_stage("second", self._second)
+        self.changes.append((change.incident_id, set(change.fingerprints)))
+        self.done.set()
+
+    def _second(self):
+        self.stages.append("second")
+        if self.failures:
+            self.failures -= 1
+            raise Exception("second stage failed")
+
+
+def _change(incident_id, *fingerprints):
+    return IncidentChange(
+        tenant_id=SINGLE_TENANT_UUID,
+        incident_id=incident_id,
+        fingerprints=set(fingerprints),
+    )
+
+
+def test_changes_are_coalesced_per_incident():
+    handler = RecordingHandler()
+    dispatcher = IncidentChangeDispatcher(handler, window=60)
+    first, second = uuid4(), uuid4()
+
+    dispatcher.submit(_change(first, "a"))
+    dispatcher.submit(_change(first, "b"))
+    dispatcher.submit(_change(second, "c"))
+    dispatcher.submit(_change(first, "a", "d"))
+    assert handler.changes == []
+
+    dispatcher.flush()
+
+    assert sorted(handler.changes, key=lambda change: len(change[1])) == [
+        (second, {"c"}),
+        (first, {"a", "b", "d"}),
+    ]
+
+
+def test_changes_are_processed_after_the_window():
+    handler = RecordingHandler()
+    dispatcher = IncidentChangeDispatcher(handler, window=0.05)
+
+    dispatcher.submit(_change(uuid4(), "a"))
+
+    assert handler.done.wait(10)
+    assert handler.stages == ["first", "second"]
+    assert dispatcher.pending == {}
+
+
+def test_failed_stage_is_retried_from_where_it_failed():
+    handler = RecordingHandler(failures=1)
+    dispatcher = IncidentChangeDispatcher(handler, window=0.01, max_attempts=3)
+
+    dispatcher.submit(_change(uuid4(), "a"))
+
+    assert handler.done.wait(10)
+    assert handler.stages == ["first", "second", "second"]
+
+
+def test_change_is_dropped_after_max_attempts():
+    handler = RecordingHandler(failures=5)
+    dispatcher = IncidentChangeDispatcher(handler, window=60, max_attempts=2)
+    change = _change(uuid4(), "a")
+
+    dispatcher.process(change)
+    assert change.attempts == 1
+    assert len(dispatcher.pending) == 1
+
+    dispatcher.process(dispatcher.pending.popitem()[1])
+    assert change.attempts == 2
+    assert dispatcher.pending == {}
+    assert handler.changes == []
+
+
+def test_incident_side_effects_run_once_per_window(
+    db_session, setup_stress_alerts_no_elastic, monkeypatch
+):
+    alerts = setup_stress_alerts_no_elastic(6)
+    incident = create_incident_from_dict(
+        SINGLE_TENANT_UUID, {"user_generated_name": "test", "user_summary": "test"}
+    )
+    dispatcher = get_incident_change_dispatcher()
+    monkeypatch.setattr(dispatcher, "window", 60)
+    pusher = PusherMock()
+    workflow_manager = WorkflowManagerMock()
+
+    with patch("keep.api.bl.incidents_bl.WorkflowManager", workflow_manager):
+        incident_bl = IncidentBl(SINGLE_TENANT_UUID, db_session, pusher_client=pusher)
+        for alert in alerts[:3]:
+            asyncio.run(
+                incident_bl.add_alerts_to_incident(incident.id, [alert.fingerprint])
+            )
+        incident_bl.delete_alerts_from_incident(incident.id, [alerts[0].fingerprint])
+        assert workflow_manager.events == []
+
+        dispatcher.flush()
+
+    assert len(workflow_manager.events) == 1
+    _, incident_dto, action = workflow_manager.events[0]
+    assert action == "updated"
+    assert incident_dto.alerts_count == 2
+    assert len(pusher.triggers) == 1
+
+
+class FailingPusherMock(PusherMock):
+    def __init__(self, failures):
+        super().__init__()
+        self.failures = failures
+
+    def trigger(self, channel, event_name, data):
+        if self.failures:
+            self.failures -= 1
+            raise Exception("pusher is down")
+        super().trigger(channel, event_name, data)
+
+
+class FailingWorkflowManagerMock(WorkflowManagerMock):
+    def __init__(self, failures):
+        super().__init__()
+        self.failures = failures
+
+    def insert_incident(self, tenant_id, incident_dto, action):
+        if self.failures:
+            self.failures -= 1
+            raise Exception("workflows are down")
+        super().insert_incident(tenant_id, incident_dto, action)
+
+
+def test_failed_incident_side_effects_are_retried(db_session):
+    incident = create_incident_from_dict(
+        SINGLE_TENANT_UUID, {"user_generated_name": "test", "user_summary": "test"}
+    )
+    dispatcher = IncidentChangeDispatcher(
+        IncidentBl.process_incident_change, window=60, max_attempts=3
+    )
+    pusher = FailingPusherMock(failures=1)
+    workflow_manager = FailingWorkflowManagerMock(failures=1)
+    change = _change(incident.id, "a")
+    change.pusher_client = pusher
+
+    with patch("keep.api.bl.incidents_bl.WorkflowManager", workflow_manager):
+        # the pusher fails, then the workflow event, then everything went through
+        for attempt in range(3):
+            dispatcher.process(change)
+            assert change.attempts == attempt + 1
+            if attempt < 2:
+                change = dispatcher.pending.pop((SINGLE_TENANT_UUID, incident.id))
+
+    assert dispatcher.pending == {}
+    assert len(pusher.triggers) == 1
+    assert len(workflow_manager.events) == 1
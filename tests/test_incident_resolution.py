@@ -0,0 +1,193 @@
+import logging
+from datetime import datetime, timedelta
+
+import pytest
+from sqlmodel import select, update
+
+from keep.api.bl.incident_resolution_bl import IncidentResolutionBl
+from keep.api.core.db import (
+    add_alerts_to_incident,
+    create_incident_from_dict,
+    enrich_entity,
+    is_all_alerts_resolved,
+    is_first_incident_alert_resolved,
+    is_incident_resolution_required,
+    is_last_incident_alert_resolved,
+    remove_alerts_to_incident_by_incident_id,
+)
+from keep.api.core.dependencies import SINGLE_TENANT_UUID
+from keep.api.models.action_type import ActionType
+from keep.api.models.alert import AlertStatus
+from keep.api.models.db.incident import Incident, IncidentStatus
+from keep.api.models.db.rule import ResolveOn
+
+FINGERPRINTS = ["fp1", "fp2", "fp3"]
+
+
+@pytest.fixture
+def incident_with_alerts(db_session, create_alert):
+    start = datetime.utcnow() - timedelta(hours=1)
+    for index, fingerprint in enumerate(FINGERPRINTS):
+        create_alert(fingerprint, AlertStatus.FIRING, start + timedelta(seconds=index))
+    incident = create_incident_from_dict(
+        SINGLE_TENANT_UUID, {"user_generated_name": "test", "user_summary": "test"}
+    )
+    add_alerts_to_incident(SINGLE_TENANT_UUID, incident, FINGERPRINTS)
+    return db_session.get(Incident, incident.id), start + timedelta(
+        seconds=len(FINGERPRINTS)
+    )
+
+
+def assert_equivalent_to_queries(db_session, incident: Incident):
+    """The maintained state gives the same answer as the queries over the alerts."""
+    db_session.refresh(incident)
+    expected = {
+        ResolveOn.ALL.value: is_all_alerts_resolved(
+            incident=incident, session=db_session
+        ),
+        ResolveOn.FIRST.value: is_first_incident_alert_resolved(
+            incident, session=db_session
+        ),
+        ResolveOn.LAST.value: is_last_incident_alert_resolved(
+            incident, session=db_session
+        ),
+    }
+    for resolve_on, resolved in expected.items():
+        incident.resolve_on = resolve_on
+        assert (
+            is_incident_resolution_required(incident, session=db_session) == resolved
+        ), resolve_on
+    incident.resolve_on = ResolveOn.NEVER.value
+    assert not is_incident_resolution_required(incident, session=db_session)
+    return expected
+
+
+@pytest.mark.parametrize(
+    "order",
+    [
+        ["fp1", "fp2", "fp3"],
+        ["fp3", "fp2", "fp1"],
+        ["fp2", "fp3", "fp1"],
+    ],
+)
+def test_resolution_state_equivalent_to_queries(
+    db_session, create_alert, incident_with_alerts, order
+):
+    incident, now = incident_with_alerts
+    assert assert_equivalent_to_queries(db_session, incident) == {
+        ResolveOn.ALL.value: False,
+        ResolveOn.FIRST.value: False,
+        ResolveOn.LAST.value: False,
+    }
+
+    for fingerprint in order:
+        now += timedelta(seconds=1)
+        create_alert(fingerprint, AlertStatus.RESOLVED, now)
+        assert_equivalent_to_queries(db_session, incident)
+
+    assert assert_equivalent_to_queries(db_session, incident) == {
+        ResolveOn.ALL.value: True,
+        ResolveOn.FIRST.value: True,
+        ResolveOn.LAST.value: True,
+    }
+
+    # firing again
+    now += timedelta(seconds=1)
+    create_alert(order[0], AlertStatus.FIRING, now)
+    assert_equivalent_to_queries(db_session, incident)
+
+
+def test_resolution_state_follows_enrichments(db_session, incident_with_alerts):
+    incident, _ = incident_with_alerts
+    for fingerprint in FINGERPRINTS:
+        enrich_entity(
+            SINGLE_TENANT_UUID,
+            fingerprint,
+            {"status": AlertStatus.RESOLVED.value},
+            action_type=ActionType.GENERIC_ENRICH,
+            action_callee="test",
+            action_description="test",
+        )
+        assert_equivalent_to_queries(db_session, incident)
+
+    db_session.refresh(incident)
+    assert incident.resolved_alerts_count == incident.total_alerts_count == 3
+
+
+def test_resolution_state_follows_links(db_session, create_alert, incident_with_alerts):
+    incident, now = incident_with_alerts
+    create_alert("fp1", AlertStatus.RESOLVED, now)
+    create_alert("fp4", AlertStatus.FIRING, now + timedelta(seconds=1))
+
+    add_alerts_to_incident(SINGLE_TENANT_UUID, incident, ["fp4"], session=db_session)
+    db_session.refresh(incident)
+    assert (incident.resolved_alerts_count, incident.total_alerts_count) == (1, 4)
+    assert incident.first_alert_fingerprint == "fp1"
+    assert incident.last_alert_fingerprint == "fp2"
+
+    remove_alerts_to_incident_by_incident_id(
+        SINGLE_TENANT_UUID, incident.id, ["fp2", "fp3", "fp4"]
+    )
+    db_session.refresh(incident)
+    assert (incident.resolved_alerts_count, incident.total_alerts_count) == (1, 1)
+    assert incident.first_alert_fingerprint == incident.last_alert_fingerprint == "fp1"
+    incident.resolve_on = ResolveOn.ALL.value
+    assert is_incident_resolution_required(incident, session=db_session)
+    assert is_all_alerts_resolved(incident=incident, session=db_session)
+
+
+def test_reconcile_repairs_drifted_incidents(db_session, incident_with_alerts):
+    incident, _ = incident_with_alerts
+    db_session.exec(
+        update(Incident)
+        .where(Incident.id == incident.id)
+        .values(
+            resolved_alerts_count=3,
+            total_alerts_count=3,
+            first_alert_fingerprint=None,
+        )
+    )
+    db_session.commit()
+    incident.resolve_on = ResolveOn.ALL.value
+    assert is_incident_resolution_required(incident, session=db_session)
+
+    logger = logging.getLogger(__name__)
+    assert IncidentResolutionBl.reconcile(logger, session=db_session) == 1
+    assert IncidentResolutionBl.reconcile(logger, session=db_session) == 0
+
+    resolved_count, total_count, first_alert_fingerprint = db_session.exec(
+        select(
+            Incident.resolved_alerts_count,
+            Incident.total_alerts_count,
+            Incident.first_alert_fingerprint,
+        ).where(Incident.id == incident.id)
+    ).one()
+    assert (resolved_count, total_count, first_alert_fingerprint) == (0, 3, "fp1")
+    assert not is_incident_resolution_required(incident, session=db_session)
+
+
+def test_reconcile_resolves_repaired_incidents(
+    db_session, create_alert, incident_with_alerts
+):
+    incident, now = incident_with_alerts
+    incident.resolve_on = ResolveOn.NEVER.value
+    db_session.add(incident)
+    db_session.commit()
+    for fingerprint in FINGERPRINTS:
+        create_alert(fingerprint, AlertStatus.RESOLVED, now)
+    # the status changes were missed, the incident looks firing
+    db_session.exec(
+        update(Incident)
+        .where(Incident.id == incident.id)
+        .values(resolved_alerts_count=0, resolve_on=ResolveOn.ALL.value)
+    )
+    db_session.commit()
+    db_session.refresh(incident)
+    assert not is_incident_resolution_required(incident, session=db_session)
+
+    logger = logging.getLogger(__name__)
+    assert IncidentResolutionBl.reconcile(logger, session=db_session) == 1
+
+    db_session.refresh(incident)
+    assert incident.resolved_alerts_count == 3
+    assert incident.status == IncidentStatus.RESOLVED.value
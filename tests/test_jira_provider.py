@@ -42,8 +42,8 @@ class TestJiraProvider:
     def jiraonprem_provider(self, context_manager, jiraonprem_config):
         return JiraonpremProvider(context_manager, "test_jiraonprem", jiraonprem_config)
 
-    @patch("requests.post")
-    @patch("requests.get")
+    @patch("requests.Session.post")
+    @patch("requests.Session.get")
     def test_create_issue_with_custom_fields_jira_cloud(
         self, mock_get, mock_post, jira_provider
     ):
@@ -84,8 +84,8 @@ class TestJiraProvider:
         # Verify the result
         assert result["issue"]["key"] == "TEST-123"
 
-    @patch("requests.post")
-    @patch("requests.get")
+    @patch("requests.Session.post")
+    @patch("requests.Session.get")
     def test_create_issue_with_custom_fields_jira_onprem(
         self, mock_get, mock_post, jiraonprem_provider
     ):
@@ -126,8 +126,8 @@ class TestJiraProvider:
         # Verify the result
         assert result["issue"]["key"] == "TEST-123"
 
-    @patch("requests.post")
-    @patch("requests.get")
+    @patch("requests.Session.post")
+    @patch("requests.Session.get")
     def test_jiraonprem_ssl_verification_disabled_by_default(
         self, mock_get, mock_post, jiraonprem_provider
     ):
@@ -144,8 +144,8 @@ class TestJiraProvider:
 
         assert mock_post.call_args[1]["verify"] is False
 
-    @patch("requests.post")
-    @patch("requests.get")
+    @patch("requests.Session.post")
+    @patch("requests.Session.get")
     def test_jiraonprem_ssl_verification_enabled_via_config(
         self, mock_get, mock_post, context_manager
     ):
@@ -171,8 +171,8 @@ class TestJiraProvider:
 
         assert mock_post.call_args[1]["verify"] is True
 
-    @patch("requests.put")
-    @patch("requests.get")
+    @patch("requests.Session.put")
+    @patch("requests.Session.get")
     def test_update_issue_with_custom_fields_jira_cloud(
         self, mock_get, mock_put, jira_provider
     ):
@@ -211,8 +211,8 @@ class TestJiraProvider:
         assert result["issue"]["id"] == issue_id
         assert result["issue"]["key"] == "TEST-123"
 
-    @patch("requests.put")
-    @patch("requests.get")
+    @patch("requests.Session.put")
+    @patch("requests.Session.get")
     def test_update_issue_with_custom_fields_jira_onprem(
         self, mock_get, mock_put, jiraonprem_provider
     ):
@@ -251,8 +251,8 @@ class TestJiraProvider:
         assert result["issue"]["id"] == issue_id
         assert result["issue"]["key"] == "TEST-123"
 
-    @patch("requests.put")
-    @patch("requests.get")
+    @patch("requests.Session.put")
+    @patch("requests.Session.get")
     def test_notify_with_issue_id_and_custom_fields(
         self, mock_get, mock_put, jira_provider
     ):
@@ -288,8 +288,8 @@ class TestJiraProvider:
         assert result["issue"]["id"] == issue_id
         assert result["ticket_url"] == f"{jira_provider.jira_host}/browse/TEST-123"
 
-    @patch("requests.post")
-    @patch("requests.get")
+    @patch("requests.Session.post")
+    @patch("requests.Session.get")
     def test_notify_without_issue_id_and_custom_fields(
         self, mock_get, mock_post, jira_provider
     ):
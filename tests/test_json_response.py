@@ -0,0 +1,31 @@
+import json
+
+import pytest
+from fastapi.responses import JSONResponse
+
+from keep.api.core import json_response
+from keep.api.core.json_response import KeepJSONResponse
+
+CONTENT = {
+    "alerts": [{"name": "CPU high", "labels": {"pod": "api"}, "severity": "critical"}],
+    "count": 1,
+    "facets": {1: "int keys", "ünicode": "ok"},
+    "limit": None,
+}
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_render_is_equivalent_to_json_response(use_orjson, monkeypatch):
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(json_response, "orjson", None)
+
+    assert json.loads(KeepJSONResponse(CONTENT).body) == json.loads(
+        JSONResponse(CONTENT).body
+    )
+
+
+def test_render_falls_back_for_big_integers():
+    content = {"value": 2**70}
+    assert KeepJSONResponse(content).body == JSONResponse(content).body
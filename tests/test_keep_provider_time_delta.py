@@ -11,7 +11,7 @@ from datetime import timezone, timedelta
 from freezegun import freeze_time
 
 from keep.api.core.dependencies import SINGLE_TENANT_UUID
-from keep.api.models.db.alert import Alert, LastAlert
+from keep.api.models.db.alert import Alert, LastAlert, get_effective_alert_state
 from keep.api.models.alert import AlertStatus
 from keep.api.utils.enrichment_helpers import convert_db_alerts_to_dto_alerts
 from keep.providers.keep_provider.keep_provider import KeepProvider
@@ -109,6 +109,7 @@ def test_keep_provider_time_delta_filtering_bug(db_session):
             timestamp=alert.timestamp,
             first_timestamp=alert.timestamp,
             alert_id=alert.id,
+            **get_effective_alert_state(alert.event),
         )
         last_alerts.append(last_alert)
     
@@ -195,6 +196,7 @@ def test_keep_provider_time_delta_filtering_version_1(db_session):
             timestamp=alert.timestamp,
             first_timestamp=alert.timestamp,
             alert_id=alert.id,
+            **get_effective_alert_state(alert.event),
         )
         last_alerts.append(last_alert)
     
@@ -0,0 +1,103 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi import HTTPException
+
+from keep.api.core import limiter as limiter_module
+from keep.api.core.api_key_cache import hash_api_key
+from keep.api.core.dependencies import SINGLE_TENANT_UUID
+from keep.api.core.limiter import IngestionAdmission, get_rate_limit_key, limiter
+from keep.api.models.db.tenant import TenantApiKey
+from tests.fixtures.client import client, setup_api_key, test_app  # noqa
+
+
+@pytest.fixture
+def ingestion_limit(monkeypatch):
+    monkeypatch.setattr(limiter, "enabled", True)
+    monkeypatch.setattr(limiter_module, "KEEP_LIMIT_INGESTION", "2/minute")
+    # the test app re-imports the routes, keep the limits of the last import only
+    monkeypatch.setattr(
+        limiter,
+        "_dynamic_route_limits",
+        {name: limits[-1:] for name, limits in limiter._dynamic_route_limits.items()},
+    )
+    limiter.reset()
+    yield
+    limiter.reset()
+
+
+def test_rate_limit_key(db_session):
+    setup_api_key(db_session, "limited_api_key")
+
+    def key(headers):
+        return get_rate_limit_key(
+            SimpleNamespace(headers=headers, client=SimpleNamespace(host="10.0.0.1"))
+        )
+
+    assert (
+        key({"x-api-key": "limited_api_key"})
+        == f"tenant:{SINGLE_TENANT_UUID}:key:test_api_key"
+    )
+    assert key({"Authorization": "Bearer a"}) != key({"Authorization": "Bearer b"})
+    assert key({"x-api-key": "unknown_api_key"}) == "10.0.0.1"
+    assert key({}) == "10.0.0.1"
+
+
+@pytest.mark.parametrize("test_app", ["SINGLE_TENANT"], indirect=True)
+def test_ingestion_budget_per_api_key(db_session, client, test_app, ingestion_limit):
+    setup_api_key(db_session, "noisy_api_key")
+    db_session.add(
+        TenantApiKey(
+            tenant_id=SINGLE_TENANT_UUID,
+            reference_id="quiet_key",
+            key_hash=hash_api_key("quiet_api_key"),
+            created_by="admin@keephq",
+            role="admin",
+        )
+    )
+    db_session.commit()
+
+    def send(api_key):
+        return client.post(
+            "/alerts/event",
+            headers={"x-api-key": api_key},
+            json={"name": "alert", "status": "firing"},
+        )
+
+    assert send("noisy_api_key").status_code == 202
+    assert send("noisy_api_key").status_code == 202
+    response = send("noisy_api_key")
+    assert response.status_code == 429
+    assert 1 <= int(response.headers["Retry-After"]) <= 60
+    # the budget of another key isn't spent
+    assert send("quiet_api_key").status_code == 202
+    # the read endpoints have their own budget
+    response = client.get("/providers", headers={"x-api-key": "noisy_api_key"})
+    assert response.status_code == 200
+
+
+def test_ingestion_is_shed_over_the_backlog():
+    admission = IngestionAdmission(max_backlog=2, retry_after=7)
+    request = SimpleNamespace(state=SimpleNamespace(background_tasks={1}))
+    asyncio.run(admission(request))
+
+    request.state.background_tasks.add(2)
+    with pytest.raises(HTTPException) as e:
+        asyncio.run(admission(request))
+    assert e.value.status_code == 503
+    assert e.value.headers == {"Retry-After": "7"}
+
+
+def test_queue_length_is_read_once_per_interval(monkeypatch):
+    monkeypatch.setattr(limiter_module, "REDIS", True)
+    admission = IngestionAdmission(max_backlog=10, retry_after=1, check_interval=60)
+    admission._redis = AsyncMock()
+    admission._redis.zcard.return_value = 3
+    request = SimpleNamespace(state=SimpleNamespace())
+
+    for _ in range(5):
+        asyncio.run(admission(request))
+
+    admission._redis.zcard.assert_awaited_once()
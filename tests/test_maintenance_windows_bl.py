@@ -2,7 +2,6 @@ from datetime import datetime, timedelta
 import importlib
 import time
 from unittest.mock import MagicMock, patch
-from uuid import uuid4
 
 import pytest
 import keep.api.consts
@@ -10,11 +9,14 @@ from keep.api.bl.maintenance_windows_bl import MaintenanceWindowsBl
 from keep.api.core.db import get_alerts_by_status, get_workflow_executions, get_workflow_executions_count
 from keep.api.core.dependencies import SINGLE_TENANT_UUID
 from keep.api.models.alert import AlertDto, AlertStatus
-from keep.api.models.db.alert import Alert
+from keep.api.models.action_type import ActionType
+from keep.api.models.db.alert import Alert, AlertAudit, LastAlert
 from keep.api.models.db.maintenance_window import MaintenanceRuleCreate, MaintenanceWindowRule
+from keep.api.models.db.tenant import Tenant
 from keep.api.models.db.workflow import Workflow
 from keep.api.routes.maintenance import update_maintenance_rule
 from keep.functions import cyaml
+from sqlmodel import select
 from keep.workflowmanager.workflowstore import WorkflowStore
 from tests.fixtures.workflow_manager import (
     workflow_manager,
@@ -69,20 +71,6 @@ def active_maintenance_window_rule_with_suppression_on():
     )
 
 
-@pytest.fixture
-def expired_maintenance_window_rule_with_suppression_on():
-    return MaintenanceWindowRule(
-        id=1,
-        name="Expired maintenance_window",
-        tenant_id="test-tenant",
-        cel_query='source == "test-source"',
-        start_time=datetime.utcnow() - timedelta(hours=5),
-        end_time=datetime.utcnow() - timedelta(hours=1),
-        enabled=False,
-        suppress=True,
-    )
-
-
 @pytest.fixture
 def expired_maintenance_window_rule():
     return MaintenanceWindowRule(
@@ -107,24 +95,6 @@ def alert_dto():
         lastReceived="2021-08-01T00:00:00Z",
     )
 
-@pytest.fixture
-def alert_maint():
-    return Alert(
-        id=uuid4(),
-        tenant_id="test-tenant",
-        fingerprint="test-fingerprint",
-        provider_id="test-provider",
-        provider_type="test-provider-type",
-        event={
-            "name": "Test Alert",
-            "status": AlertStatus.MAINTENANCE.value,
-            "previous_status": AlertStatus.FIRING.value,
-            "source": ["test-source"],
-        },
-        alert_hash="test-alert-hash",
-    )
-
-
 def test_alert_in_active_maintenance_window(
     mock_session, active_maintenance_window_rule, alert_dto
 ):
@@ -318,8 +288,41 @@ def test_strategy_restore_update_status(
     # AND the current status should be set to MAINTENANCE
     assert alert_dto.status == AlertStatus.MAINTENANCE.value
 
+def _add_alert_in_maintenance(db_session, fingerprint, timestamp, source="test-source"):
+    alert = Alert(
+        tenant_id=SINGLE_TENANT_UUID,
+        fingerprint=fingerprint,
+        provider_id="test-provider",
+        provider_type="test-provider-type",
+        timestamp=timestamp,
+        event={
+            "id": fingerprint,
+            "name": "Test Alert",
+            "status": AlertStatus.MAINTENANCE.value,
+            "previous_status": AlertStatus.FIRING.value,
+            "source": [source],
+            "fingerprint": fingerprint,
+            "lastReceived": timestamp.isoformat(),
+        },
+    )
+    db_session.add(alert)
+    db_session.flush()
+    db_session.merge(
+        LastAlert(
+            tenant_id=SINGLE_TENANT_UUID,
+            fingerprint=fingerprint,
+            alert_id=alert.id,
+            timestamp=timestamp,
+            first_timestamp=timestamp,
+            status=AlertStatus.MAINTENANCE.value,
+        )
+    )
+    db_session.commit()
+    return alert
+
+
 def test_strategy_clean_status(
-    mock_session, alert_maint, monkeypatch, expired_maintenance_window_rule_with_suppression_on
+    db_session, monkeypatch, create_window_maintenance_active
 ):
     """
     Feature: Strategy - recover previous status
@@ -330,39 +333,37 @@ def test_strategy_clean_status(
     importlib.reload(keep.api.consts)
     importlib.reload(keep.api.bl.maintenance_windows_bl)
     # AND there is a maintenance window expired.
-    retrieve_windows_session = MagicMock()
-    retrieve_windows_session.exec.return_value.all.return_value = [
-        expired_maintenance_window_rule_with_suppression_on
-    ]
+    window = create_window_maintenance_active(
+        cel='source == "test-source"',
+        start=datetime.utcnow() - timedelta(hours=5),
+        end=datetime.utcnow() - timedelta(hours=1),
+    )
     # AND there is an alert which was received inside a maintenance window
-    retrieve_alerts_session = MagicMock()
-    retrieve_alerts_session.exec.return_value.all.return_value = [alert_maint]
-
-    recover_status_session = MagicMock()
-    recover_status_session.exec = MagicMock()
-    recover_status_session.commit = MagicMock()
-
-    # AND there is a last alert with the same FP
-    mock_last_alert = MagicMock()
-    mock_last_alert.alert_id = alert_maint.id
-    mock_last_alert.event = {"alert_id": alert_maint.id}
+    alert = _add_alert_in_maintenance(
+        db_session, "test-fingerprint", datetime.utcnow() - timedelta(hours=2)
+    )
 
     # WHEN recover its previous status
-    mock_session.__enter__.side_effect = [retrieve_windows_session, retrieve_alerts_session, recover_status_session, MagicMock(),  MagicMock()]
-    with patch("keep.api.core.db.existed_or_new_session", return_value=mock_session), \
-            patch("keep.api.bl.maintenance_windows_bl.get_last_alert_by_fingerprint", return_value=mock_last_alert), \
-                patch("keep.api.core.db.get_alert_by_event_id", return_value=alert_maint):
-        
-        MaintenanceWindowsBl.recover_strategy(logger=MagicMock(), session=mock_session)
+    MaintenanceWindowsBl.recover_strategy(logger=MagicMock(), session=db_session)
 
     # THEN the new status will be the previous status, and the previous status will be the old status
-    _, new_status, new_previous_status, _ = list(recover_status_session.exec.call_args[0][0]._values.values())[0].value.values()
-    assert new_status == AlertStatus.FIRING.value
-    assert new_previous_status == AlertStatus.MAINTENANCE.value
+    db_session.refresh(alert)
+    assert alert.event["status"] == AlertStatus.FIRING.value
+    assert alert.event["previous_status"] == AlertStatus.MAINTENANCE.value
+    # AND the last alert state follows
+    last_alert = db_session.get(LastAlert, (SINGLE_TENANT_UUID, "test-fingerprint"))
+    db_session.refresh(last_alert)
+    assert last_alert.status == AlertStatus.FIRING.value
+    # AND the recovery is audited
+    audits = db_session.exec(
+        select(AlertAudit).where(AlertAudit.fingerprint == "test-fingerprint")
+    ).all()
+    assert [audit.action for audit in audits] == [ActionType.MAINTENANCE_EXPIRED.value]
+    assert str(window.id) not in alert.event.get("maintenance_windows_trace", [])
 
 
 def test_strategy_alert_block_by_window(
-    mock_session, active_maintenance_window_rule_with_suppression_on, alert_maint, monkeypatch
+    db_session, monkeypatch, create_window_maintenance_active
 ):
     """
     Feature: Strategy - recover previous status
@@ -373,30 +374,113 @@ def test_strategy_alert_block_by_window(
     importlib.reload(keep.api.consts)
     importlib.reload(keep.api.bl.maintenance_windows_bl)
     # AND there is a maintenance window active
-    retrieve_windows_session = MagicMock()
-    retrieve_windows_session.exec.return_value.all.return_value = [active_maintenance_window_rule_with_suppression_on]
+    window = create_window_maintenance_active(
+        cel='source == "test-source"',
+        start=datetime.utcnow() - timedelta(hours=1),
+        end=datetime.utcnow() + timedelta(days=1),
+    )
     # AND there is an alert which was received inside a maintenance window
-    retrieve_alerts_session = MagicMock()
-    retrieve_alerts_session.exec.return_value.all.return_value = [alert_maint]
-
-    recover_status_session = MagicMock()
-    recover_status_session.exec = MagicMock()
-    recover_status_session.commit = MagicMock()
+    alert = _add_alert_in_maintenance(
+        db_session, "test-fingerprint", datetime.utcnow() - timedelta(minutes=5)
+    )
 
     loggerMag = MagicMock()
-    # WHEN the conditions match to recover the initial alert status
-    mock_session.__enter__.side_effect = [retrieve_windows_session, retrieve_alerts_session, recover_status_session, MagicMock()]
-    with patch("keep.api.core.db.existed_or_new_session", return_value=mock_session):
-        MaintenanceWindowsBl.recover_strategy(logger=loggerMag, session=mock_session)
-
-    # THEN the update status method will not be called
-    assert not recover_status_session.exec.called
+    # WHEN the recovery runs
+    MaintenanceWindowsBl.recover_strategy(logger=loggerMag, session=db_session)
+
+    # THEN the status is not updated
+    db_session.refresh(alert)
+    assert alert.event["status"] == AlertStatus.MAINTENANCE.value
+    # AND the window is traced on the alert
+    assert alert.event["maintenance_windows_trace"] == [str(window.id)]
     # AND logger alert will rise an info about the alert blocked by maintenance window
     loggerMag.info.assert_any_call(
-            "Alert %s is blocked due to the maintenance window: %s.", alert_maint.id,
-            active_maintenance_window_rule_with_suppression_on.id
+        "%d alerts are blocked due to the maintenance window: %s.", 1, window.id
+    )
+
+
+def test_strategy_recovers_in_batches(
+    db_session, monkeypatch, create_window_maintenance_active
+):
+    """
+    Feature: Strategy - recover previous status
+    Scenario: The alerts of a tenant are reviewed in batches, the CEL of every window is
+             compiled once and the recovered alerts are processed a batch at a time.
+    """
+    monkeypatch.setenv("MAINTENANCE_WINDOW_STRATEGY", "recover_previous_status")
+    importlib.reload(keep.api.consts)
+    importlib.reload(keep.api.bl.maintenance_windows_bl)
+    bl = keep.api.bl.maintenance_windows_bl.MaintenanceWindowsBl
+    # GIVEN a window still active for the "blocked" source only
+    create_window_maintenance_active(
+        cel='source == "blocked"',
+        start=datetime.utcnow() - timedelta(hours=5),
+        end=datetime.utcnow() + timedelta(hours=1),
+    )
+    # AND 7 alerts in maintenance, 2 of them still in the active window
+    start = datetime.utcnow() - timedelta(hours=2)
+    for index in range(7):
+        _add_alert_in_maintenance(
+            db_session,
+            f"batch-{index}",
+            start + timedelta(seconds=index),
+            source="blocked" if index in (1, 4) else "test-source",
         )
 
+    workflow_manager = MagicMock()
+    compile_cel = MagicMock(wraps=bl.compile_cel)
+    with patch.object(bl, "compile_cel", compile_cel), patch(
+        "keep.api.bl.maintenance_windows_bl.WorkflowManager.get_instance",
+        return_value=workflow_manager,
+    ):
+        # WHEN the tenant alerts are recovered 3 at a time
+        windows = keep.api.bl.maintenance_windows_bl.get_maintenance_windows_started(
+            db_session
+        )
+        recovered = bl.recover_tenant_alerts(
+            MagicMock(), db_session, SINGLE_TENANT_UUID, windows, batch_size=3
+        )
+
+    # THEN all the alerts out of the window are recovered
+    assert recovered == 5
+    in_maintenance = get_alerts_by_status(AlertStatus.MAINTENANCE, db_session)
+    assert sorted(alert.fingerprint for alert in in_maintenance) == [
+        "batch-1",
+        "batch-4",
+    ]
+    # AND the window was compiled once
+    assert compile_cel.call_count == 1
+    # AND the workflows received the recovered alerts a batch at a time
+    batches = [
+        sorted(alert.fingerprint for alert in call.args[1])
+        for call in workflow_manager.insert_events.call_args_list
+    ]
+    assert batches == [["batch-0", "batch-2"], ["batch-3", "batch-5"], ["batch-6"]]
+    assert all(
+        alert.status == AlertStatus.FIRING.value
+        for call in workflow_manager.insert_events.call_args_list
+        for alert in call.args[1]
+    )
+
+
+def test_strategy_reviews_only_tenants_with_alerts_in_maintenance(db_session):
+    bl = keep.api.bl.maintenance_windows_bl.MaintenanceWindowsBl
+    # GIVEN a tenant without alerts in maintenance
+    db_session.add(Tenant(id="idle-tenant", name="idle-tenant"))
+    db_session.commit()
+    # AND an alert in maintenance
+    _add_alert_in_maintenance(
+        db_session, "maintenance-1", datetime.utcnow() - timedelta(hours=1)
+    )
+
+    # WHEN the strategy runs
+    with patch.object(bl, "recover_tenant_alerts", return_value=0) as recover:
+        bl.recover_strategy(logger=MagicMock(), session=db_session)
+
+    # THEN only the tenant with alerts in maintenance is reviewed
+    assert [call.args[2] for call in recover.call_args_list] == [SINGLE_TENANT_UUID]
+
+
 def test_strategy_alert_expired_by_current_time(
     create_alert, db_session, monkeypatch, create_window_maintenance_active
 ):
@@ -0,0 +1,149 @@
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+import redis
+
+from keep.api.core.dependencies import SINGLE_TENANT_UUID
+from keep.api.models.alert import AlertDto
+from keep.api.models.db.preset import Preset
+from keep.api.tasks import notification_cache
+from keep.api.tasks.notification_cache import (
+    InMemoryNotificationBackend,
+    NotificationCache,
+    RedisNotificationBackend,
+)
+from keep.api.tasks.process_event_task import process_event
+from tests.conftest import PusherMock
+
+
+@pytest.fixture
+def notification_backend():
+    backend = InMemoryNotificationBackend()
+    NotificationCache._instance = None
+    cache = NotificationCache(backend=backend)
+    yield backend
+    cache.cancel_flushes()
+    NotificationCache._instance = None
+
+
+def test_should_notify_once_per_interval(notification_backend):
+    cache = NotificationCache()
+
+    assert cache.should_notify("tenant-a", "poll-alerts") is True
+    assert cache.should_notify("tenant-a", "poll-alerts") is False
+    # other tenants and channels have their own token
+    assert cache.should_notify("tenant-b", "poll-alerts") is True
+    assert cache.should_notify("tenant-a", "incident-change") is True
+
+    # the interval elapsed
+    notification_backend.tokens.clear()
+    assert cache.should_notify("tenant-a", "poll-alerts") is True
+
+
+def test_coalesce_presets_batches_names_within_interval(notification_backend):
+    cache = NotificationCache()
+
+    # nothing touched, the token isn't spent
+    assert cache.coalesce_presets("tenant-a", []) == set()
+    assert cache.coalesce_presets("tenant-a", ["feed"]) == {"feed"}
+    assert cache.coalesce_presets("tenant-a", ["critical"]) == set()
+    assert cache.coalesce_presets("tenant-a", ["noisy", "critical"]) == set()
+    assert cache.get_pending_presets("tenant-a") == {"critical", "noisy"}
+
+    notification_backend.tokens.clear()
+    assert cache.coalesce_presets("tenant-a", []) == {"critical", "noisy"}
+    assert cache.get_pending_presets("tenant-a") == set()
+
+
+def test_pending_presets_are_flushed_without_a_later_event(
+    notification_backend, monkeypatch
+):
+    monkeypatch.setattr(notification_cache, "POLLING_INTERVAL", 0.1)
+    cache = NotificationCache()
+    pusher = PusherMock()
+
+    cache.notify_presets(pusher, "tenant-a", ["feed"])
+    # within the interval, pending until the token expires
+    cache.notify_presets(pusher, "tenant-a", ["critical"])
+    cache.notify_presets(pusher, "tenant-a", ["noisy"])
+    assert len(pusher.triggers) == 1
+
+    deadline = time.monotonic() + 5
+    while len(pusher.triggers) < 2 and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert pusher.triggers == [
+        ("private-tenant-a", "poll-presets", '["feed"]'),
+        ("private-tenant-a", "poll-presets", '["critical", "noisy"]'),
+    ]
+    assert cache.get_pending_presets("tenant-a") == set()
+    assert cache.flush_timers == {}
+
+
+def test_redis_errors_fall_back_to_local_backend():
+    client = Mock()
+    client.set.side_effect = redis.ConnectionError("redis is down")
+    NotificationCache._instance = None
+    try:
+        cache = NotificationCache(backend=RedisNotificationBackend(client=client))
+        assert cache.should_notify("tenant-a", "poll-alerts") is True
+        assert cache.should_notify("tenant-a", "poll-alerts") is False
+    finally:
+        NotificationCache._instance = None
+
+
+def test_process_event_coalesces_preset_notifications(db_session, notification_backend):
+    for name, cel in [
+        ("critical", 'severity == "critical"'),
+        ("info", 'severity == "info"'),
+    ]:
+        db_session.add(
+            Preset(
+                tenant_id=SINGLE_TENANT_UUID,
+                created_by="test@keephq.dev",
+                name=name,
+                options=[{"label": "CEL", "value": cel}],
+            )
+        )
+    db_session.commit()
+
+    pusher = PusherMock()
+    with patch(
+        "keep.api.tasks.process_event_task.get_pusher_client", return_value=pusher
+    ):
+        for i, severity in enumerate(["critical", "info", "info"]):
+            process_event(
+                ctx={},
+                tenant_id=SINGLE_TENANT_UUID,
+                provider_type=None,
+                provider_id=None,
+                fingerprint=None,
+                api_key_name=None,
+                trace_id="test",
+                event=[AlertDto(id=f"alert-{i}", name=f"alert-{i}", severity=severity)],
+            )
+
+        poll_presets = [t for t in pusher.triggers if t[1] == "poll-presets"]
+        assert len(poll_presets) == 1
+        # "feed" is the static preset matching every alert
+        assert poll_presets[0][2] == '["critical", "feed"]'
+        assert len([t for t in pusher.triggers if t[1] == "poll-alerts"]) == 1
+        assert notification_backend.get_set(
+            f"keep:notifications:{SINGLE_TENANT_UUID}:presets"
+        ) == {"feed", "info"}
+
+        # next interval, the pending preset is sent with the next batch
+        notification_backend.tokens.clear()
+        process_event(
+            ctx={},
+            tenant_id=SINGLE_TENANT_UUID,
+            provider_type=None,
+            provider_id=None,
+            fingerprint=None,
+            api_key_name=None,
+            trace_id="test",
+            event=[AlertDto(id="alert-3", name="alert-3", severity="critical")],
+        )
+        poll_presets = [t for t in pusher.triggers if t[1] == "poll-presets"]
+        assert len(poll_presets) == 2
+        assert poll_presets[1][2] == '["critical", "feed", "info"]'
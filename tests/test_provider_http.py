@@ -0,0 +1,200 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+from prometheus_client import REGISTRY
+
+from keep.contextmanager.contextmanager import ContextManager
+from keep.providers.base import provider_http
+from keep.providers.base.provider_http import (
+    HostConcurrencyLimiter,
+    HostConcurrencyLimitExceeded,
+    ProviderHTTPSession,
+    close_provider_http_sessions,
+    get_provider_http_session,
+)
+from keep.providers.http_provider.http_provider import HttpProvider
+from keep.providers.models.provider_config import ProviderConfig
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    # keep-alive, so connection reuse can be observed
+    protocol_version = "HTTP/1.1"
+
+    def _respond(self):
+        server = self.server
+        server.hits.append((self.command, self.path))
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        if server.failures > 0:
+            server.failures -= 1
+            status, body = 503, b"unavailable"
+        else:
+            status, body = 200, b'{"ok": true}'
+        self.send_response(status)
+        if status == 503:
+            self.send_header("Retry-After", "0")
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = do_PUT = do_DELETE = _respond
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.hits = []
+    server.failures = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(provider_http, "KEEP_PROVIDER_HTTP_BACKOFF_FACTOR", 0)
+    yield
+    close_provider_http_sessions()
+
+
+def _base_url(server) -> str:
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def _connections(provider_type: str) -> float:
+    return (
+        REGISTRY.get_sample_value(
+            "keep_provider_http_connections_total", {"provider_type": provider_type}
+        )
+        or 0
+    )
+
+
+def test_connections_are_reused(stub_server):
+    session = ProviderHTTPSession("stub.reuse", _base_url(stub_server))
+    for _ in range(5):
+        assert session.get("/alerts").json() == {"ok": True}
+
+    assert len(stub_server.hits) == 5
+    assert _connections("stub.reuse") == 1
+    assert (
+        REGISTRY.get_sample_value(
+            "keep_provider_http_requests_total",
+            {"provider_type": "stub.reuse", "method": "GET", "status": "2xx"},
+        )
+        == 5
+    )
+
+
+def test_idempotent_requests_are_retried(stub_server):
+    stub_server.failures = 2
+    session = ProviderHTTPSession("stub.retry", _base_url(stub_server))
+
+    response = session.get("/alerts")
+
+    assert response.status_code == 200
+    assert len(stub_server.hits) == 3
+
+
+def test_post_is_not_retried(stub_server):
+    stub_server.failures = 1
+    session = ProviderHTTPSession("stub.retry", _base_url(stub_server))
+
+    response = session.post("/alerts", json={"name": "alert"})
+
+    # the provider sees the failure, as with a bare requests.post
+    assert response.status_code == 503
+    assert len(stub_server.hits) == 1
+
+
+def test_default_timeout_is_applied(stub_server, monkeypatch):
+    sent = {}
+
+    def send(request, **kwargs):
+        sent.update(kwargs)
+        raise requests.exceptions.ConnectionError("stop")
+
+    session = ProviderHTTPSession("stub.timeout", _base_url(stub_server))
+    monkeypatch.setattr(session.get_adapter(_base_url(stub_server)), "send", send)
+
+    with pytest.raises(requests.exceptions.ConnectionError):
+        session.get("/alerts")
+    assert sent["timeout"] == (
+        provider_http.KEEP_PROVIDER_HTTP_CONNECT_TIMEOUT,
+        provider_http.KEEP_PROVIDER_HTTP_READ_TIMEOUT,
+    )
+
+    with pytest.raises(requests.exceptions.ConnectionError):
+        session.get("/alerts", timeout=3)
+    assert sent["timeout"] == 3
+
+
+def test_host_concurrency_limit():
+    limiter = HostConcurrencyLimiter(limit=1)
+    semaphore = limiter.acquire("grafana.example.com", timeout=0.1)
+
+    with pytest.raises(HostConcurrencyLimitExceeded):
+        limiter.acquire("grafana.example.com", timeout=0.1)
+    # other hosts are not affected
+    limiter.acquire("jira.example.com", timeout=0.1).release()
+
+    semaphore.release()
+    limiter.acquire("grafana.example.com", timeout=0.1).release()
+
+
+def test_sessions_are_kept_per_provider_and_base_url():
+    session = get_provider_http_session("tenant", "grafana-1", "grafana")
+    assert get_provider_http_session("tenant", "grafana-1", "grafana") is session
+    assert get_provider_http_session("tenant", "grafana-2", "grafana") is not session
+    assert (
+        get_provider_http_session(
+            "tenant", "grafana-1", "grafana", "https://grafana.example.com"
+        )
+        is not session
+    )
+
+    close_provider_http_sessions("tenant", "grafana-1")
+    assert get_provider_http_session("tenant", "grafana-1", "grafana") is not session
+
+
+def test_evicted_sessions_stay_usable(stub_server, monkeypatch):
+    monkeypatch.setattr(provider_http, "KEEP_PROVIDER_HTTP_MAX_SESSIONS", 1)
+    session = get_provider_http_session("tenant", "http-1", "http")
+    assert session.get(f"{_base_url(stub_server)}/alerts").status_code == 200
+    connections = _connections("http")
+
+    # evicts the session while a run still uses it
+    get_provider_http_session("tenant", "http-2", "http")
+    assert get_provider_http_session("tenant", "http-1", "http") is not session
+
+    assert session.get(f"{_base_url(stub_server)}/alerts").status_code == 200
+    # its connection was kept alive
+    assert _connections("http") == connections
+
+
+def test_provider_instances_share_the_session(stub_server):
+    def build_provider():
+        return HttpProvider(
+            ContextManager(tenant_id="tenant"),
+            "http-stub",
+            ProviderConfig(description="stub", authentication={}),
+        )
+
+    connections = _connections("http")
+    for _ in range(3):
+        result = build_provider()._query(
+            url=f"{_base_url(stub_server)}/alerts", method="GET"
+        )
+        assert result["status_code"] == 200
+
+    assert build_provider().get_http_session() is build_provider().get_http_session()
+    assert _connections("http") == connections + 1
@@ -0,0 +1,129 @@
+import json
+import os
+from unittest.mock import patch
+
+from keep.api.models.provider import Provider
+from keep.providers import providers_factory, providers_manifest
+from keep.providers.providers_factory import ProviderEncoder, ProvidersFactory
+from keep.providers.providers_manifest import (
+    PROVIDERS_MANIFEST_VERSION,
+    load_providers_manifest,
+    write_providers_manifest,
+)
+
+
+def _providers():
+    return [
+        Provider(
+            type="slack",
+            display_name="Slack",
+            can_notify=True,
+            can_query=False,
+            tags=["messaging"],
+        ),
+        Provider(
+            type="grafana",
+            display_name="Grafana",
+            can_notify=False,
+            can_query=True,
+            tags=["alert"],
+        ),
+    ]
+
+
+def test_manifest_roundtrip(tmp_path):
+    path = str(tmp_path / "providers_cache.json")
+    write_providers_manifest(path, _providers())
+
+    with open(path) as f:
+        manifest = json.load(f)
+    assert manifest["version"] == PROVIDERS_MANIFEST_VERSION
+    assert [provider["type"] for provider in manifest["providers"]] == [
+        "grafana",
+        "slack",
+    ]
+
+    providers = load_providers_manifest(path)
+    assert [provider.type for provider in providers] == ["grafana", "slack"]
+    assert providers[1].tags == ["messaging"]
+    # no temporary files are left next to the manifest
+    assert os.listdir(tmp_path) == ["providers_cache.json"]
+
+
+def test_stale_manifest_is_ignored(tmp_path):
+    path = str(tmp_path / "providers_cache.json")
+    write_providers_manifest(path, _providers())
+
+    with patch.object(
+        providers_manifest, "get_providers_fingerprint", return_value="changed"
+    ):
+        assert load_providers_manifest(path) is None
+
+
+def test_fingerprint_covers_every_provider_module(tmp_path, monkeypatch):
+    monkeypatch.setattr(providers_manifest, "PROVIDERS_DIRECTORY", str(tmp_path))
+    for module in [
+        "__init__.py",
+        "base/base_provider.py",
+        "x_provider/__init__.py",
+        "x_provider/x_provider.py",
+        "x_provider/helpers.py",
+    ]:
+        (tmp_path / module).parent.mkdir(exist_ok=True)
+        (tmp_path / module).write_text("# v1")
+    fingerprint = providers_manifest.get_providers_fingerprint()
+
+    # compiled files don't change it
+    (tmp_path / "x_provider" / "__pycache__").mkdir()
+    (tmp_path / "x_provider" / "__pycache__" / "helpers.cpython-311.pyc").write_text("")
+    assert providers_manifest.get_providers_fingerprint() == fingerprint
+
+    for module in ["x_provider/helpers.py", "base/base_provider.py", "__init__.py"]:
+        (tmp_path / module).write_text("# v2")
+        changed = providers_manifest.get_providers_fingerprint()
+        assert changed != fingerprint, module
+        fingerprint = changed
+
+
+def test_missing_or_invalid_manifest(tmp_path):
+    path = tmp_path / "providers_cache.json"
+    assert load_providers_manifest(str(path)) is None
+
+    path.write_text("{not json")
+    assert load_providers_manifest(str(path)) is None
+
+
+def test_legacy_cache_file_is_loaded(tmp_path):
+    path = tmp_path / "providers_cache.json"
+    path.write_text(json.dumps(_providers(), cls=ProviderEncoder))
+
+    providers = load_providers_manifest(str(path))
+    assert [provider.type for provider in providers] == ["slack", "grafana"]
+
+
+def test_get_all_providers_uses_manifest(tmp_path, monkeypatch):
+    path = str(tmp_path / "providers_cache.json")
+    write_providers_manifest(path, _providers())
+    monkeypatch.setattr(providers_factory, "PROVIDERS_CACHE_FILE", path)
+    monkeypatch.setattr(ProvidersFactory, "_loaded_providers_cache", None)
+
+    with patch.object(providers_factory, "build_providers_manifest") as build:
+        providers = ProvidersFactory.get_all_providers()
+
+    build.assert_not_called()
+    assert [provider.type for provider in providers] == ["grafana", "slack"]
+
+
+def test_get_all_providers_builds_missing_manifest(tmp_path, monkeypatch):
+    path = str(tmp_path / "providers_cache.json")
+    monkeypatch.setattr(providers_factory, "PROVIDERS_CACHE_FILE", path)
+    monkeypatch.setattr(providers_factory, "KEEP_PROVIDERS_MANIFEST_AUTO_BUILD", True)
+    monkeypatch.setattr(ProvidersFactory, "_loaded_providers_cache", None)
+
+    with patch.object(
+        providers_factory, "build_providers_manifest", return_value=_providers()
+    ) as build:
+        providers = ProvidersFactory.get_all_providers()
+
+    build.assert_called_once_with(path)
+    assert [provider.type for provider in providers] == ["slack", "grafana"]
@@ -2,14 +2,17 @@ import datetime
 import os
 import uuid
 from time import sleep
+from unittest.mock import patch
 
 import pytest
 from sqlalchemy import desc, text
 
+from keep.api.core.db import add_alerts_to_incident
 from keep.api.core.db import create_rule as create_rule_db
 from keep.api.core.db import (
     enrich_incidents_with_alerts,
     get_incident_alerts_by_incident_id,
+    get_incident_for_grouping_rule,
     get_last_incidents,
 )
 from keep.api.core.db import get_rules as get_rules_db
@@ -2458,3 +2461,76 @@ def test_rule_alerts_threshold_same_fingerprint(db_session, create_alert):
         [last_alert],
     )
     assert last_alert_dto[0].unresolvedCounter == 2
+
+
+def test_rule_batch_correlation_attaches_once(db_session):
+    rules_engine = RulesEngine(tenant_id=SINGLE_TENANT_UUID)
+    create_rule_db(
+        tenant_id=SINGLE_TENANT_UUID,
+        name="test-rule",
+        definition={
+            "sql": "N/A",  # we don't use it anymore
+            "params": {},
+        },
+        timeframe=600,
+        timeunit="seconds",
+        definition_cel='(source == "grafana")',
+        created_by="test@keephq.dev",
+    )
+
+    def insert_alerts(count, offset=0):
+        alerts = []
+        for i in range(offset, offset + count):
+            alert_dto = AlertDto(
+                id=f"grafana-{i}",
+                source=["grafana"],
+                name=f"grafana-test-alert-{i}",
+                status=AlertStatus.FIRING,
+                severity=AlertSeverity.CRITICAL,
+                lastReceived=datetime.datetime.now().isoformat(),
+                fingerprint=f"fp-{i}",
+            )
+            alert = Alert(
+                tenant_id=SINGLE_TENANT_UUID,
+                provider_type="test",
+                provider_id="test",
+                event=alert_dto.dict(),
+                fingerprint=alert_dto.fingerprint,
+            )
+            db_session.add(alert)
+            db_session.commit()
+            set_last_alert(SINGLE_TENANT_UUID, alert, db_session)
+            alert_dto.event_id = alert.id
+            alerts.append(alert_dto)
+        return alerts
+
+    with patch(
+        "keep.rulesengine.rulesengine.add_alerts_to_incident",
+        wraps=add_alerts_to_incident,
+    ) as mock_add_alerts, patch(
+        "keep.rulesengine.rulesengine.get_incident_for_grouping_rule",
+        wraps=get_incident_for_grouping_rule,
+    ) as mock_get_incident:
+        results = rules_engine.run_rules(insert_alerts(20), session=db_session)
+        assert len(results) == 1
+        assert results[0].alerts_count == 20
+        # One lookup and one bulk attachment for the whole batch
+        assert mock_get_incident.call_count == 1
+        assert mock_add_alerts.call_count == 1
+        assert len(mock_add_alerts.call_args.args[2]) == 20
+
+        # The next batch is correlated to the cached open incident
+        next_results = rules_engine.run_rules(
+            insert_alerts(5, offset=20), session=db_session
+        )
+        assert mock_get_incident.call_count == 1
+        assert next_results[0].id == results[0].id
+        assert next_results[0].alerts_count == 25
+
+    # A cached incident that was closed in the meantime is not reused
+    incident = db_session.get(Incident, results[0].id)
+    incident.status = IncidentStatus.RESOLVED.value
+    db_session.add(incident)
+    db_session.commit()
+    new_results = rules_engine.run_rules(insert_alerts(1, offset=25), session=db_session)
+    assert new_results[0].id != results[0].id
@@ -8,9 +8,16 @@ import pytest
 
 from keep.api.bl.enrichments_bl import EnrichmentsBl
 from keep.api.bl.incidents_bl import IncidentBl
+from keep.api.core.db import (
+    batch_enrich,
+    get_alerts_by_status,
+    is_all_alerts_in_status,
+    is_all_alerts_resolved,
+)
 from keep.api.core.dependencies import SINGLE_TENANT_UUID
 from keep.api.models.action_type import ActionType
 from keep.api.models.alert import AlertDto, AlertStatus
+from keep.api.models.db.alert import LastAlert
 from keep.api.models.db.mapping import MappingRule
 from keep.api.models.db.preset import PresetSearchQuery as SearchQuery
 from keep.api.models.db.rule import CreateIncidentOn, ResolveOn, Rule
@@ -1717,6 +1724,84 @@ def test_search_alert_incident_not_visible(
     assert len(result_query["results"]) == n_alerts
     assert result_query["count"] == n_alerts
 
+
+def test_search_by_last_alert_state_columns(create_alert, db_session):
+    now = datetime.datetime.utcnow()
+    create_alert("state-1", AlertStatus.FIRING, now, {"severity": "critical"})
+    create_alert("state-2", AlertStatus.FIRING, now, {"severity": "low"})
+
+    last_alerts = {
+        last_alert.fingerprint: last_alert
+        for last_alert in db_session.query(LastAlert).all()
+    }
+    assert last_alerts["state-1"].status == "firing"
+    assert last_alerts["state-1"].severity == "critical"
+    assert last_alerts["state-2"].dismissed is False
+
+    # enrichments override the event state
+    EnrichmentsBl(SINGLE_TENANT_UUID, db_session).enrich_entity(
+        fingerprint="state-1",
+        enrichments={"status": AlertStatus.ACKNOWLEDGED.value},
+        action_type=ActionType.GENERIC_ENRICH,
+        action_callee="test",
+        action_description="test",
+    )
+    batch_enrich(
+        SINGLE_TENANT_UUID,
+        ["state-2"],
+        {"dismissed": True, "dismissUntil": "forever"},
+        action_type=ActionType.GENERIC_ENRICH,
+        action_callee="test",
+        action_description="test",
+        session=db_session,
+    )
+    # a newer event doesn't override the enriched status
+    create_alert(
+        "state-1",
+        AlertStatus.RESOLVED,
+        now + datetime.timedelta(seconds=1),
+        {"severity": "critical"},
+    )
+
+    db_session.expire_all()
+    last_alerts = {
+        last_alert.fingerprint: last_alert
+        for last_alert in db_session.query(LastAlert).all()
+    }
+    assert last_alerts["state-1"].status == AlertStatus.ACKNOWLEDGED.value
+    assert last_alerts["state-2"].dismissed is True
+    assert last_alerts["state-2"].dismiss_until is None
+
+    auth = AuthenticatedEntity(tenant_id=SINGLE_TENANT_UUID, email="test")
+    for cel_query, fingerprints in [
+        ("status == 'acknowledged'", ["state-1"]),
+        ("dismissed", ["state-2"]),
+        ("severity > 'high' && !dismissed", ["state-1"]),
+    ]:
+        result_query = query_alerts(
+            request=MagicMock(),
+            query=QueryDto(cel=cel_query),
+            bg_tasks=MagicMock(),
+            authenticated_entity=auth,
+        )
+        assert [
+            alert.fingerprint for alert in result_query["results"]
+        ] == fingerprints, cel_query
+
+    # the status lookups read the effective status of the last alert too
+    acknowledged = get_alerts_by_status(
+        AlertStatus.ACKNOWLEDGED, db_session, tenant_id=SINGLE_TENANT_UUID
+    )
+    assert [alert.id for alert in acknowledged] == [last_alerts["state-1"].alert_id]
+    assert get_alerts_by_status(AlertStatus.RESOLVED, db_session) == []
+    assert is_all_alerts_in_status(
+        ["state-1"], status=AlertStatus.ACKNOWLEDGED, session=db_session
+    )
+    assert not is_all_alerts_in_status(
+        ["state-1", "state-2"], status=AlertStatus.ACKNOWLEDGED, session=db_session
+    )
+    assert not is_all_alerts_resolved(["state-1"], session=db_session)
+
 """
 COMMENTED OUT UNTIL WE FIGURE ' something in list'
 
@@ -69,6 +69,8 @@ class TestRecoverStrategySessionCleanup:
     ):
         """Session must be closed even when an exception occurs mid-execution."""
         mock_session = MagicMock()
+        # a tenant to review
+        mock_session.exec.return_value.all.return_value = ["tenant"]
         mock_get_session.return_value = mock_session
         mock_get_alerts.side_effect = RuntimeError("simulated DB error")
 
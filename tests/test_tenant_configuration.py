@@ -0,0 +1,114 @@
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import update
+
+from keep.api.core import tenant_configuration as tenant_configuration_module
+from keep.api.core.db import get_tenant_configuration
+from keep.api.core.dependencies import SINGLE_TENANT_UUID
+from keep.api.core.tenant_configuration import TenantConfiguration
+from keep.api.models.db.tenant import Tenant
+
+
+@pytest.fixture
+def tenant_configuration(db_session, monkeypatch):
+    store = TenantConfiguration._TenantConfiguration()
+    monkeypatch.setattr(TenantConfiguration, "_instance", store)
+    yield store
+    store._refresh_executor.shutdown(wait=True)
+
+
+@pytest.fixture
+def db_lookups():
+    with patch.object(
+        tenant_configuration_module,
+        "get_tenant_configuration",
+        wraps=get_tenant_configuration,
+    ) as lookups:
+        yield lookups
+
+
+def _set_configuration(db_session, configuration):
+    tenant = db_session.get(Tenant, SINGLE_TENANT_UUID)
+    tenant.configuration = configuration
+    db_session.commit()
+
+
+def test_missing_tenant_is_loaded_on_its_own(db_session, tenant_configuration):
+    db_session.add(Tenant(id="new-tenant", name="new", configuration={"a": 1}))
+    db_session.commit()
+
+    with patch.object(
+        tenant_configuration_module, "get_tenants_configurations"
+    ) as load_all:
+        assert tenant_configuration.get_configuration("new-tenant", "a") == 1
+        # an empty configuration is cached as well
+        assert tenant_configuration.get_configuration(SINGLE_TENANT_UUID) == {}
+    load_all.assert_not_called()
+
+
+def test_concurrent_misses_share_one_load(tenant_configuration, db_lookups):
+    tenant_configuration.invalidate(SINGLE_TENANT_UUID)
+    started = threading.Barrier(8)
+
+    def slow_load(tenant_id):
+        time.sleep(0.2)
+        return {"tenant_id": tenant_id}
+
+    db_lookups.side_effect = slow_load
+    results = []
+
+    def lookup():
+        started.wait()
+        results.append(
+            tenant_configuration.get_configuration(SINGLE_TENANT_UUID, "tenant_id")
+        )
+
+    threads = [threading.Thread(target=lookup) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [SINGLE_TENANT_UUID] * 8
+    assert db_lookups.call_count == 1
+
+
+def test_stale_configuration_is_served_while_reloaded(
+    db_session, tenant_configuration, db_lookups
+):
+    _set_configuration(db_session, {"version": 1})
+    assert tenant_configuration.get_configuration(SINGLE_TENANT_UUID, "version") == 1
+
+    # changed by another process, a bulk update doesn't invalidate this one
+    db_session.execute(
+        update(Tenant)
+        .where(Tenant.id == SINGLE_TENANT_UUID)
+        .values(configuration={"version": 2})
+    )
+    db_session.commit()
+    tenant_configuration._loaded_at[SINGLE_TENANT_UUID] -= (
+        tenant_configuration.reload_time * 60 + 1
+    )
+
+    assert tenant_configuration.get_configuration(SINGLE_TENANT_UUID, "version") == 1
+    tenant_configuration._refresh_executor.submit(lambda: None).result()
+    assert tenant_configuration.get_configuration(SINGLE_TENANT_UUID, "version") == 2
+    assert db_lookups.call_count == 2
+
+
+def test_committed_changes_invalidate_the_tenant(db_session, tenant_configuration):
+    assert tenant_configuration.get_configuration(SINGLE_TENANT_UUID, "flag") is None
+
+    _set_configuration(db_session, {"flag": True})
+
+    assert tenant_configuration.get_configuration(SINGLE_TENANT_UUID, "flag") is True
+
+
+def test_unknown_tenant(tenant_configuration):
+    with pytest.raises(HTTPException) as e:
+        tenant_configuration.get_configuration("unknown-tenant")
+    assert e.value.status_code == 401
@@ -1,4 +1,6 @@
+import copy
 from datetime import datetime
+from unittest.mock import patch
 import uuid
 import pytest
 from sqlmodel import select
@@ -7,10 +9,14 @@ from keep.api.core.dependencies import SINGLE_TENANT_UUID
 from keep.api.models.db.topology import (
     TopologyApplication,
     TopologyApplicationDtoIn,
+    TopologyImportResult,
     TopologyService,
     TopologyServiceDependency,
     TopologyServiceDtoIn,
+    TopologyServiceInDto,
+    TopologyServiceUpdateRequestDTO,
 )
+from keep.api.tasks.process_topology_task import merge_provider_topology
 from keep.topologies.topologies_service import (
     TopologiesService,
     ApplicationNotFoundException,
@@ -18,6 +24,11 @@ from keep.topologies.topologies_service import (
     ServiceNotFoundException,
 )
 from keep.api.models.db.alert import Incident
+from keep.api.core.db import get_topology_data_by_dynamic_matcher
+from keep.topologies.topology_matcher_index import (
+    TopologyMatcherIndex,
+    _TenantTopologyIndex,
+)
 from keep.topologies.topology_processor import TopologyProcessor
 from tests.fixtures.client import setup_api_key, client, test_app  # noqa: F401
 
@@ -391,6 +402,132 @@ def test_import_to_db(db_session):
         assert dependencies[0].depends_on_service_id == 2
 
 
+def test_import_to_db_applies_only_changes(db_session):
+    tenant_id = SINGLE_TENANT_UUID
+    topology_data = {
+        "services": [
+            {"id": 1, "service": "test_service_1", "display_name": "Service 1"},
+            {"id": 2, "service": "test_service_2", "display_name": "Service 2"},
+            {"id": 3, "service": "test_service_3", "display_name": "Service 3"},
+        ],
+        "applications": [{"name": "Test Application", "services": [1, 2]}],
+        "dependencies": [
+            {"service_id": 1, "depends_on_service_id": 2},
+            {"service_id": 2, "depends_on_service_id": 3},
+        ],
+    }
+    result = TopologiesService.import_to_db(
+        copy.deepcopy(topology_data), db_session, tenant_id
+    )
+    assert result.services_created == 3
+    assert result.dependencies_created == 2
+    assert result.applications_created == 1
+
+    # Re-importing the same topology is a no-op
+    result = TopologiesService.import_to_db(
+        copy.deepcopy(topology_data), db_session, tenant_id
+    )
+    assert result == TopologyImportResult()
+
+    topology_data["services"][0]["display_name"] = "Service 1 renamed"
+    topology_data["services"].pop()
+    topology_data["dependencies"] = [
+        {"service_id": 1, "depends_on_service_id": 2, "protocol": "grpc"}
+    ]
+    topology_data["applications"][0]["services"] = [1]
+    result = TopologiesService.import_to_db(
+        copy.deepcopy(topology_data), db_session, tenant_id
+    )
+    assert result.services_updated == 1
+    assert result.services_deleted == 1
+    # The 2 -> 3 edge goes away together with service 3
+    assert result.dependencies_updated == 1
+    assert result.dependencies_deleted == 1
+    assert result.applications_updated == 1
+
+    services = db_session.exec(
+        select(TopologyService).where(TopologyService.tenant_id == tenant_id)
+    ).all()
+    assert sorted(service.display_name for service in services) == [
+        "Service 1 renamed",
+        "Service 2",
+    ]
+    dependencies = db_session.exec(select(TopologyServiceDependency)).all()
+    assert [(d.service_id, d.depends_on_service_id, d.protocol) for d in dependencies] == [
+        (1, 2, "grpc")
+    ]
+    application = db_session.exec(select(TopologyApplication)).one()
+    db_session.refresh(application)
+    assert [service.id for service in application.services] == [1]
+
+
+def test_merge_provider_topology(db_session):
+    tenant_id = SINGLE_TENANT_UUID
+    provider_id = "test-provider"
+
+    def pull(*services):
+        return [
+            TopologyServiceInDto(
+                source_provider_id=provider_id,
+                service=service,
+                display_name=display_name,
+                dependencies=dependencies,
+            )
+            for service, display_name, dependencies in services
+        ]
+
+    result, first_ids = merge_provider_topology(
+        tenant_id,
+        pull(("a", "A", {"b": "http"}), ("b", "B", {})),
+        provider_id,
+        db_session,
+    )
+    assert result.services_created == 2
+    assert result.dependencies_created == 1
+
+    # Unrelated services of another provider must not be touched
+    other_service = create_service(db_session, tenant_id, "other")
+
+    result, second_ids = merge_provider_topology(
+        tenant_id,
+        pull(("a", "A renamed", {"c": "grpc"}), ("c", "C", {})),
+        provider_id,
+        db_session,
+    )
+    assert result == TopologyImportResult(
+        services_created=1,
+        services_updated=1,
+        services_deleted=1,
+        dependencies_created=1,
+        # the a -> b edge goes away together with b
+        dependencies_deleted=1,
+    )
+    # Existing services keep their ids across pulls
+    assert second_ids["a"] == first_ids["a"]
+
+    services = {
+        service.service: service
+        for service in db_session.exec(
+            select(TopologyService).where(TopologyService.tenant_id == tenant_id)
+        ).all()
+    }
+    assert set(services) == {"a", "c", other_service.service}
+    assert services["a"].display_name == "A renamed"
+    dependencies = db_session.exec(select(TopologyServiceDependency)).all()
+    assert [
+        (d.service_id, d.depends_on_service_id, d.protocol) for d in dependencies
+    ] == [(second_ids["a"], second_ids["c"], "grpc")]
+
+    # Pulling the same topology again changes nothing
+    result, _ = merge_provider_topology(
+        tenant_id,
+        pull(("a", "A renamed", {"c": "grpc"}), ("c", "C", {})),
+        provider_id,
+        db_session,
+    )
+    assert result == TopologyImportResult()
+
+
 def test_create_application_based_incident_sets_is_predicted(db_session):
     service = create_service(db_session, SINGLE_TENANT_UUID, "1")
     application = TopologyApplication(
@@ -415,3 +552,83 @@ def test_create_application_based_incident_sets_is_predicted(db_session):
     assert incident.is_predicted is True
     assert incident.is_visible is True
     assert incident.is_candidate is False
+
+
+def test_topology_matcher_index(db_session):
+    index = TopologyMatcherIndex.get_instance()
+    index.clear()
+    service = create_service(db_session, SINGLE_TENANT_UUID, "1")
+    application = TopologyApplication(
+        tenant_id=SINGLE_TENANT_UUID,
+        name="Test Application",
+        repository="app_repository",
+        services=[service],
+    )
+    db_session.add(application)
+    db_session.commit()
+
+    enrichments = index.get_enrichments(SINGLE_TENANT_UUID, {"service": "test_service_1"})
+    assert enrichments["display_name"] == "1"
+    assert "id" not in enrichments and "tenant_id" not in enrichments
+    assert index.get_enrichments(SINGLE_TENANT_UUID, {"service": "missing"}) is None
+    assert (
+        index.get_enrichments(
+            SINGLE_TENANT_UUID, {"service": "test_service_1", "environment": "prod"}
+        )
+        is None
+    )
+
+    # Lookups are served from memory until the topology changes
+    with patch(
+        "keep.topologies.topology_matcher_index.get_session_sync"
+    ) as mock_get_session:
+        index.get_enrichments(SINGLE_TENANT_UUID, {"display_name": "1"})
+        mock_get_session.assert_not_called()
+
+    # update_service only updates manual services
+    service.is_manual = True
+    db_session.add(service)
+    db_session.commit()
+    TopologiesService.update_service(
+        TopologyServiceUpdateRequestDTO(
+            id=service.id, service="test_service_1", display_name="renamed"
+        ),
+        SINGLE_TENANT_UUID,
+        db_session,
+    )
+    enrichments = index.get_enrichments(SINGLE_TENANT_UUID, {"service": "test_service_1"})
+    assert enrichments["display_name"] == "renamed"
+    # the payload is a copy, callers can't corrupt the index
+    enrichments["display_name"] = "mutated"
+    assert (
+        index.get_enrichments(SINGLE_TENANT_UUID, {"service": "test_service_1"})[
+            "display_name"
+        ]
+        == "renamed"
+    )
+
+
+def test_topology_matcher_index_compares_as_the_database(db_session):
+    index = TopologyMatcherIndex.get_instance()
+    index.clear()
+    service = create_service(db_session, SINGLE_TENANT_UUID, "1")
+
+    for matchers_value in [
+        {"service": "test_service_1"},
+        {"service": "TEST_SERVICE_1"},
+        # NULL attributes match None
+        {"service": "test_service_1", "namespace": None},
+        {"service": None},
+        {"namespace": "missing"},
+    ]:
+        expected = get_topology_data_by_dynamic_matcher(
+            SINGLE_TENANT_UUID, matchers_value
+        )
+        enrichments = index.get_enrichments(SINGLE_TENANT_UUID, matchers_value)
+        assert (enrichments is not None) == (expected is not None), matchers_value
+
+    # MySQL collations compare strings case-insensitively
+    db_session.refresh(service)
+    mysql_index = _TenantTopologyIndex([service], case_insensitive=True)
+    assert mysql_index.lookup({"service": "TEST_SERVICE_1"})["display_name"] == "1"
+    assert _TenantTopologyIndex([service]).lookup({"service": "TEST_SERVICE_1"}) is None
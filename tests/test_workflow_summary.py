@@ -0,0 +1,210 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+from uuid import uuid4
+
+from keep.api.core.db import (
+    create_workflow_execution,
+    finish_workflow_execution,
+    get_workflows_with_stale_summary,
+    update_workflow_by_id,
+)
+from keep.api.core.dependencies import SINGLE_TENANT_UUID
+from keep.api.models.db.workflow import Workflow, WorkflowExecution, WorkflowSummary
+from keep.api.models.workflow import WorkflowDTO
+from keep.functions import cyaml
+from keep.workflowmanager import workflowstore as workflowstore_module
+from keep.workflowmanager.workflowstore import WorkflowStore
+
+WORKFLOW = """
+id: summary-workflow
+name: Summary Workflow
+description: Workflow for the summary tests
+permissions:
+  - admin
+triggers:
+  - type: manual
+steps:
+  - name: cw-logs
+    provider:
+      config: "{{ providers.cloudwatch }}"
+      type: cloudwatch
+      with:
+        hours: 4
+actions:
+  - name: create-alert
+    provider:
+      type: keep
+      with:
+        alert:
+          name: summary
+"""
+
+
+def _add_workflow(db_session, workflow_id="summary-workflow"):
+    workflow = Workflow(
+        id=workflow_id,
+        name="Summary Workflow",
+        tenant_id=SINGLE_TENANT_UUID,
+        description="Workflow for the summary tests",
+        created_by="test@keephq.dev",
+        interval=0,
+        workflow_raw=WORKFLOW,
+        last_updated=datetime.now(tz=timezone.utc),
+    )
+    db_session.add(workflow)
+    db_session.commit()
+    return workflow
+
+
+def _list_workflows():
+    workflows, _ = WorkflowStore().get_all_workflows_with_last_execution(
+        tenant_id=SINGLE_TENANT_UUID, cel="name == 'Summary Workflow'"
+    )
+    return workflows
+
+
+def _stale_workflow_ids():
+    return [
+        workflow.id for workflow in get_workflows_with_stale_summary(SINGLE_TENANT_UUID)
+    ]
+
+
+def test_summary_created_for_existing_workflows(db_session):
+    workflow = _add_workflow(db_session)
+    started = datetime.now(tz=timezone.utc)
+    for index, is_test_run in enumerate([False, False, True]):
+        db_session.add(
+            WorkflowExecution(
+                id=str(uuid4()),
+                workflow_id=workflow.id,
+                workflow_revision=1,
+                tenant_id=SINGLE_TENANT_UUID,
+                started=started + timedelta(seconds=index),
+                triggered_by="test",
+                execution_number=index + 1,
+                status="success",
+                execution_time=index,
+                is_test_run=is_test_run,
+            )
+        )
+    db_session.commit()
+    assert workflow.id in _stale_workflow_ids()
+
+    [listed] = _list_workflows()
+
+    assert workflow.id not in _stale_workflow_ids()
+    summary = listed["workflow_summary"]
+    assert summary.revision == workflow.revision
+    assert summary.is_alert_rule
+    assert summary.permissions == ["admin"]
+    assert summary.triggers == [{"type": "manual"}]
+    assert [execution["execution_time"] for execution in summary.last_executions] == [
+        1,
+        0,
+    ]
+    assert listed["workflow_last_run_time"] == 1
+    assert [
+        execution["execution_time"] for execution in listed["workflow_last_executions"]
+    ] == [1, 0]
+
+
+def test_summary_matches_the_workflow_definition(db_session):
+    workflow = _add_workflow(db_session)
+    workflowstore = WorkflowStore()
+    summary = workflowstore.build_workflow_summary(workflow)
+
+    providers_dto, triggers = workflowstore.get_workflow_meta_data(
+        tenant_id=SINGLE_TENANT_UUID,
+        workflow=workflow,
+        installed_providers_by_type={},
+    )
+    assert workflowstore.get_providers_dto(summary["providers"], {}) == providers_dto
+    assert summary["triggers"] == triggers
+    workflow_dto = WorkflowDTO(
+        id=workflow.id,
+        created_by=workflow.created_by,
+        creation_time=workflow.creation_time,
+        providers=providers_dto,
+        workflow_raw=cyaml.dump(cyaml.safe_load(workflow.workflow_raw), width=99999),
+    )
+    assert summary["workflow_raw"] == workflow_dto.workflow_raw
+
+
+def test_summary_follows_executions_and_updates(db_session):
+    workflow = WorkflowStore().create_workflow(
+        SINGLE_TENANT_UUID, "test@keephq.dev", cyaml.safe_load(WORKFLOW)
+    )
+    assert workflow.id not in _stale_workflow_ids()
+
+    execution_id = create_workflow_execution(
+        workflow.id, workflow.revision, SINGLE_TENANT_UUID, "manual"
+    )
+    create_workflow_execution(
+        workflow.id,
+        workflow.revision,
+        SINGLE_TENANT_UUID,
+        "manual",
+        execution_number=2,
+        test_run=True,
+    )
+    # starting executions doesn't write the summary
+    summary = db_session.get(WorkflowSummary, workflow.id)
+    db_session.refresh(summary)
+    assert summary.last_execution_id is None
+
+    finish_workflow_execution(
+        SINGLE_TENANT_UUID, workflow.id, execution_id, "success", None
+    )
+    db_session.refresh(summary)
+    assert summary.last_execution_id == execution_id
+    assert summary.last_execution_status == "success"
+    assert [execution["id"] for execution in summary.last_executions] == [execution_id]
+
+    updated_workflow = update_workflow_by_id(
+        id=workflow.id,
+        name=workflow.name,
+        tenant_id=SINGLE_TENANT_UUID,
+        description=workflow.description,
+        interval=0,
+        workflow_raw=WORKFLOW.replace("- admin", "- noc"),
+        is_disabled=False,
+        updated_by="test@keephq.dev",
+    )
+    assert updated_workflow.id in _stale_workflow_ids()
+
+    [listed] = _list_workflows()
+    assert listed["workflow_summary"].revision == updated_workflow.revision
+    assert listed["workflow_summary"].permissions == ["noc"]
+    assert listed["workflow_last_run_status"] == "success"
+
+
+def test_stale_summaries_are_loaded_only_when_some_exist(db_session):
+    workflow = _add_workflow(db_session)
+    stale_summaries = patch.object(
+        workflowstore_module,
+        "get_workflows_with_stale_summary",
+        wraps=get_workflows_with_stale_summary,
+    )
+
+    with stale_summaries as stale_summaries_lookup:
+        _list_workflows()
+        assert stale_summaries_lookup.call_count == 1
+        assert workflow.id not in _stale_workflow_ids()
+
+        # nothing is stale anymore, the list doesn't load the workflows again
+        _list_workflows()
+        assert stale_summaries_lookup.call_count == 1
+
+        # a failed update is retried by the next list request
+        workflow.revision += 1
+        db_session.add(workflow)
+        db_session.commit()
+        with patch.object(
+            workflowstore_module,
+            "update_workflow_summary",
+            side_effect=Exception("db is down"),
+        ):
+            WorkflowStore().update_workflow_summary(workflow)
+        _list_workflows()
+        assert stale_summaries_lookup.call_count == 2
+        assert workflow.id not in _stale_workflow_ids()
@@ -4,6 +4,7 @@ from keep.api.models.db.workflow import (
     Workflow,
     WorkflowExecution,
     WorkflowExecutionLog,
+    WorkflowSummary,
 )
 from keep.workflowmanager.workflowstore import WorkflowStore
 from keep.api.core.db import get_all_provisioned_workflows
@@ -236,6 +237,43 @@ def test_change_workflow_provision_method(monkeypatch, db_session, test_app):
     assert is_workflow_raw_equal(second_provisioned[0].workflow_raw, VALID_WORKFLOW)
 
 
+@pytest.mark.parametrize(
+    "test_app",
+    [
+        {
+            "AUTH_TYPE": "NOAUTH",
+            "KEEP_WORKFLOWS_DIRECTORY": "./tests/provision/workflows_3",
+        },
+    ],
+    indirect=True,
+)
+def test_provisioned_workflows_are_summarized(monkeypatch, db_session, test_app):
+    """Test that the workflows list has a summary of the provisioned workflows."""
+    provisioned = WorkflowStore.provision_workflows(SINGLE_TENANT_UUID)
+    # the provisioned yamls follow the workflows that were already provisioned
+    assert (
+        len([workflow for workflow in provisioned if isinstance(workflow, dict)]) == 1
+    )
+
+    for provisioned_workflow in get_all_provisioned_workflows(SINGLE_TENANT_UUID):
+        summary = db_session.get(WorkflowSummary, provisioned_workflow.id)
+        assert summary is not None
+        assert summary.revision == provisioned_workflow.revision
+
+    # Provision from env instead of dir
+    monkeypatch.delenv("KEEP_WORKFLOWS_DIRECTORY")
+    monkeypatch.setenv("KEEP_WORKFLOW", VALID_WORKFLOW)
+    provisioned = WorkflowStore.provision_workflows(SINGLE_TENANT_UUID)
+    assert (
+        len([workflow for workflow in provisioned if isinstance(workflow, dict)]) == 1
+    )
+
+    (provisioned_workflow,) = get_all_provisioned_workflows(SINGLE_TENANT_UUID)
+    summary = db_session.get(WorkflowSummary, provisioned_workflow.id)
+    assert summary is not None
+    assert summary.triggers == [{"type": "manual"}]
+
+
 def test_workflow_execution_large_results_many_logs_performance(db_session):
     """
     Performance test for the OOM fix: Tests the scenario that caused the original issue: